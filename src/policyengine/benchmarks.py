@@ -0,0 +1,837 @@
+"""Offline performance benchmarks behind ``policyengine bench``.
+
+The suite times each phase of the simulation pipeline against a synthetic
+fixture dataset built in memory, so it needs no downloads of its own:
+importing the country model, saving and loading the dataset, regional
+scoping, building the country-package population, ``run()`` for a baseline
+and a reform, each output family, household calculation (single, with
+axes, and batched) and saving and loading simulation outputs.
+
+Every case runs ``repeats`` times and is summarised by its median. Reports
+are JSON (see :meth:`BenchmarkReport.to_dict`), so a report saved before a
+bundle upgrade can be the baseline for the next run:
+
+.. code-block:: python
+
+    from policyengine.benchmarks import (
+        BenchmarkReport,
+        compare_reports,
+        run_benchmarks,
+    )
+
+    report = run_benchmarks("uk", households=500)
+    report.write("bench.json")
+    regressions = [
+        comparison
+        for comparison in compare_reports(report, BenchmarkReport.read("old.json"))
+        if comparison.status == "regression"
+    ]
+
+A case that raises records its error and the suite moves on. The US
+``run()`` path builds a ``policyengine_us.Microsimulation``, which loads
+the country package's default dataset, so US population, run and output
+cases need that dataset in the local Hugging Face cache.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import importlib.metadata as metadata
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+from microdf import MicroDataFrame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOUSEHOLDS = 1_000
+DEFAULT_REPEATS = 3
+DEFAULT_YEAR = 2026
+# A case regresses when its median slows by more than this fraction...
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+# ...and by more than this many seconds, so timer noise on fast cases is
+# not reported.
+DEFAULT_NOISE_FLOOR_SECONDS = 0.01
+HOUSEHOLD_BATCH_SIZE = 10
+AXIS_COUNT = 50
+
+BENCHMARK_CASES = (
+    "import_model",
+    "dataset_save",
+    "dataset_load",
+    "scoping",
+    "population_build",
+    "run",
+    "run_reform",
+    "outputs.aggregate",
+    "outputs.change_aggregate",
+    "outputs.decile_impact",
+    "outputs.poverty",
+    "outputs.inequality",
+    "household.single",
+    "household.axes",
+    "household.batch",
+    "simulation_save",
+    "simulation_load",
+)
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark case, in seconds per repeat."""
+
+    name: str
+    seconds: list[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def median(self) -> Optional[float]:
+        return statistics.median(self.seconds) if self.seconds else None
+
+    @property
+    def best(self) -> Optional[float]:
+        return min(self.seconds) if self.seconds else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "median_seconds": self.median,
+            "best_seconds": self.best,
+            "seconds": self.seconds,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> BenchmarkResult:
+        return cls(
+            name=payload["name"],
+            seconds=[float(value) for value in payload.get("seconds") or []],
+            error=payload.get("error"),
+        )
+
+
+@dataclass
+class BenchmarkReport:
+    """Results of one ``run_benchmarks`` call and the environment it ran in."""
+
+    country: str
+    households: int
+    repeats: int
+    created_at: str
+    environment: dict[str, Optional[str]] = field(default_factory=dict)
+    results: list[BenchmarkResult] = field(default_factory=list)
+
+    def result(self, name: str) -> Optional[BenchmarkResult]:
+        return next((result for result in self.results if result.name == name), None)
+
+    @property
+    def errors(self) -> list[BenchmarkResult]:
+        return [result for result in self.results if result.error is not None]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "country": self.country,
+            "households": self.households,
+            "repeats": self.repeats,
+            "created_at": self.created_at,
+            "environment": self.environment,
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> BenchmarkReport:
+        return cls(
+            country=payload["country"],
+            households=int(payload["households"]),
+            repeats=int(payload["repeats"]),
+            created_at=payload["created_at"],
+            environment=dict(payload.get("environment") or {}),
+            results=[BenchmarkResult.from_dict(item) for item in payload["results"]],
+        )
+
+    def write(self, path: Union[str, Path]) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+    @classmethod
+    def read(cls, path: Union[str, Path]) -> BenchmarkReport:
+        return cls.from_dict(json.loads(Path(path).read_text()))
+
+
+@dataclass(frozen=True)
+class BenchmarkComparison:
+    """One case's median against the same case in a baseline report."""
+
+    name: str
+    baseline_seconds: Optional[float]
+    current_seconds: Optional[float]
+    status: str  # "ok" | "regression" | "improvement" | "new" | "missing" | "error"
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline_seconds or self.current_seconds is None:
+            return None
+        return self.current_seconds / self.baseline_seconds
+
+
+def compare_reports(
+    current: BenchmarkReport,
+    baseline: BenchmarkReport,
+    *,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+    noise_floor: float = DEFAULT_NOISE_FLOOR_SECONDS,
+) -> list[BenchmarkComparison]:
+    """Compare each case's median with a baseline report.
+
+    A case is a ``"regression"`` when it is more than ``threshold`` (a
+    fraction) and more than ``noise_floor`` seconds slower than the
+    baseline, and an ``"improvement"`` in the mirror case. Cases only in
+    the baseline are ``"missing"`` and cases without a baseline timing
+    are ``"new"``.
+
+    Raises:
+        ValueError: If the reports cover different countries or dataset
+            sizes, whose timings are not comparable.
+    """
+    if (current.country, current.households) != (
+        baseline.country,
+        baseline.households,
+    ):
+        raise ValueError(
+            f"Cannot compare a {current.country} benchmark of "
+            f"{current.households} households with a {baseline.country} "
+            f"baseline of {baseline.households} households."
+        )
+    comparisons = []
+    for result in current.results:
+        previous = baseline.result(result.name)
+        before = previous.median if previous is not None else None
+        after = result.median
+        if result.error is not None:
+            status = "error"
+        elif before is None:
+            status = "new"
+        elif after > before * (1 + threshold) and after - before > noise_floor:
+            status = "regression"
+        elif after * (1 + threshold) < before and before - after > noise_floor:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparisons.append(BenchmarkComparison(result.name, before, after, status))
+    for previous in baseline.results:
+        if current.result(previous.name) is None:
+            comparisons.append(
+                BenchmarkComparison(previous.name, previous.median, None, "missing")
+            )
+    return comparisons
+
+
+# --- fixture datasets --------------------------------------------------
+
+
+def _household_members(
+    households: int, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Household index, age, employment income and weight for each person."""
+    sizes = rng.integers(1, 6, households)
+    household_index = np.repeat(np.arange(households), sizes)
+    # Position of each person within their household: the first two are
+    # adults, the rest children.
+    position = np.arange(len(household_index)) - np.repeat(
+        np.cumsum(sizes) - sizes, sizes
+    )
+    adult = position < 2
+    age = np.where(adult, rng.integers(18, 85, len(position)), 0)
+    age = np.where(adult, age, rng.integers(0, 18, len(position)))
+    earns = adult & (rng.random(len(position)) < 0.75)
+    employment_income = np.where(
+        earns, np.round(rng.lognormal(10.3, 0.8, len(position)), -2), 0.0
+    )
+    weights = np.round(rng.uniform(500, 1_500, households), 1)
+    return household_index, age, employment_income, weights
+
+
+def _weighted(frame: dict[str, Any], weight_column: str) -> MicroDataFrame:
+    return MicroDataFrame(pd.DataFrame(frame), weights=weight_column)
+
+
+def _us_fixture(households: int, year: int, seed: int, filepath: Optional[str]) -> Any:
+    from policyengine.tax_benefit_models.us.datasets import (
+        PolicyEngineUSDataset,
+        USYearData,
+    )
+
+    rng = np.random.default_rng(seed)
+    household_index, age, employment_income, weights = _household_members(
+        households, rng
+    )
+    household_ids = np.arange(1, households + 1)
+    person_household = household_ids[household_index]
+    people = len(household_index)
+    group = {
+        entity: _weighted(
+            {f"{entity}_id": household_ids, f"{entity}_weight": weights},
+            f"{entity}_weight",
+        )
+        for entity in ("tax_unit", "spm_unit", "family")
+    }
+    return PolicyEngineUSDataset(
+        id=f"bench-us-{households}",
+        name="Benchmark fixture",
+        description=f"Synthetic {households}-household US benchmark dataset",
+        filepath=filepath,
+        year=year,
+        data=USYearData(
+            person=_weighted(
+                {
+                    "person_id": np.arange(1, people + 1),
+                    "household_id": person_household,
+                    "tax_unit_id": person_household,
+                    "spm_unit_id": person_household,
+                    "family_id": person_household,
+                    "marital_unit_id": np.arange(1, people + 1),
+                    "person_weight": weights[household_index],
+                    "age": age,
+                    "employment_income": employment_income,
+                },
+                "person_weight",
+            ),
+            marital_unit=_weighted(
+                {
+                    "marital_unit_id": np.arange(1, people + 1),
+                    "marital_unit_weight": weights[household_index],
+                },
+                "marital_unit_weight",
+            ),
+            household=_weighted(
+                {
+                    "household_id": household_ids,
+                    "state_code": rng.choice(["CA", "NY", "TX", "FL"], households),
+                    "household_weight": weights,
+                },
+                "household_weight",
+            ),
+            **group,
+        ),
+    )
+
+
+def _uk_fixture(households: int, year: int, seed: int, filepath: Optional[str]) -> Any:
+    from policyengine.tax_benefit_models.uk.datasets import (
+        PolicyEngineUKDataset,
+        UKYearData,
+    )
+
+    rng = np.random.default_rng(seed)
+    household_index, age, employment_income, weights = _household_members(
+        households, rng
+    )
+    household_ids = np.arange(1, households + 1)
+    renting = rng.random(households) < 0.4
+    return PolicyEngineUKDataset(
+        id=f"bench-uk-{households}",
+        name="Benchmark fixture",
+        description=f"Synthetic {households}-household UK benchmark dataset",
+        filepath=filepath,
+        year=year,
+        data=UKYearData(
+            person=_weighted(
+                {
+                    "person_id": np.arange(1, len(household_index) + 1),
+                    "person_household_id": household_ids[household_index],
+                    "person_benunit_id": household_ids[household_index],
+                    "person_weight": weights[household_index],
+                    "age": age,
+                    "employment_income": employment_income,
+                },
+                "person_weight",
+            ),
+            benunit=_weighted(
+                {"benunit_id": household_ids, "benunit_weight": weights},
+                "benunit_weight",
+            ),
+            household=_weighted(
+                {
+                    "household_id": household_ids,
+                    "household_weight": weights,
+                    "region": rng.choice(
+                        ["LONDON", "NORTH_WEST", "SCOTLAND", "WALES"], households
+                    ),
+                    "tenure_type": np.where(
+                        renting, "RENT_PRIVATELY", "OWNED_OUTRIGHT"
+                    ),
+                    "rent": np.where(renting, 12_000.0, 0.0),
+                    "council_tax": np.full(households, 1_500.0),
+                },
+                "household_weight",
+            ),
+        ),
+    )
+
+
+def fixture_dataset(
+    country: str,
+    households: int = DEFAULT_HOUSEHOLDS,
+    *,
+    year: int = DEFAULT_YEAR,
+    seed: int = 0,
+    filepath: Optional[Union[str, Path]] = None,
+) -> Any:
+    """Build a synthetic, in-memory dataset for benchmarking.
+
+    Households have one to five members (two adults, then children) with
+    log-normal employment income; the same ``seed`` gives the same data.
+    """
+    builders = {"us": _us_fixture, "uk": _uk_fixture}
+    if country not in builders:
+        raise ValueError(f"Unknown country {country!r}; expected one of us, uk.")
+    return builders[country](
+        households, year, seed, None if filepath is None else str(filepath)
+    )
+
+
+# --- cases --------------------------------------------------------------
+
+
+class _Elapsed(float):
+    """Seconds a case measured itself, used instead of the wall time."""
+
+
+@dataclass(frozen=True)
+class _CountryCases:
+    scoping_filter: tuple[str, str]
+    reform: dict[str, Any]
+    household: dict[str, Any]
+    poverty: str
+    inequality: str
+
+
+_COUNTRY_CASES = {
+    "us": _CountryCases(
+        scoping_filter=("state_code", "CA"),
+        reform={"gov.irs.credits.ctc.amount.base[0].amount": 3_000},
+        household={
+            "people": [{"age": 35, "employment_income": 60_000}],
+            "tax_unit": {"filing_status": "SINGLE"},
+        },
+        poverty="calculate_us_poverty_rates",
+        inequality="calculate_us_inequality",
+    ),
+    "uk": _CountryCases(
+        scoping_filter=("region", "LONDON"),
+        reform={"gov.hmrc.income_tax.allowances.personal_allowance.amount": 15_000},
+        household={"people": [{"age": 35, "employment_income": 30_000}]},
+        poverty="calculate_uk_poverty_rates",
+        inequality="calculate_uk_inequality",
+    ),
+}
+
+
+class _BenchmarkContext:
+    """Fixture data and the simulations shared between cases.
+
+    Prerequisites (a saved dataset, a baseline run) are computed once, on
+    first use, outside any timing. A failed prerequisite is remembered so
+    every dependent case reports it without retrying.
+    """
+
+    def __init__(self, country: str, households: int, working_dir: Path) -> None:
+        self.country = country
+        self.households = households
+        self.working_dir = working_dir
+        self.cases = _COUNTRY_CASES[country]
+        self._shared: dict[str, Any] = {}
+
+    def shared(self, key: str, compute: Callable[[], Any]) -> Any:
+        if key not in self._shared:
+            try:
+                self._shared[key] = compute()
+            except Exception as exc:
+                self._shared[key] = exc
+        value = self._shared[key]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    def remember(self, key: str, value: Any) -> None:
+        self._shared[key] = value
+
+    @property
+    def module(self) -> Any:
+        import importlib
+
+        return importlib.import_module(
+            f"policyengine.tax_benefit_models.{self.country}"
+        )
+
+    @property
+    def model(self) -> Any:
+        return self.module.model
+
+    @property
+    def dataset_path(self) -> Path:
+        return self.working_dir / f"bench_{self.country}_{self.households}.h5"
+
+    def dataset(self) -> Any:
+        return self.shared(
+            "dataset",
+            lambda: fixture_dataset(
+                self.country, self.households, filepath=self.dataset_path
+            ),
+        )
+
+    def saved_dataset(self) -> Path:
+        def save() -> Path:
+            self.dataset().save()
+            return self.dataset_path
+
+        return self.shared("saved_dataset", save)
+
+    def simulation(self, policy: Optional[dict[str, Any]] = None) -> Any:
+        from policyengine.core import Simulation
+
+        return Simulation(
+            dataset=self.dataset(),
+            tax_benefit_model_version=self.model,
+            policy=policy,
+        )
+
+    def baseline(self) -> Any:
+        def run() -> Any:
+            simulation = self.simulation()
+            simulation.run()
+            return simulation
+
+        return self.shared("baseline", run)
+
+    def reformed(self) -> Any:
+        def run() -> Any:
+            simulation = self.simulation(self.cases.reform)
+            simulation.run()
+            return simulation
+
+        return self.shared("reformed", run)
+
+
+def _import_model(context: _BenchmarkContext) -> Callable[[], Any]:
+    module = f"policyengine.tax_benefit_models.{context.country}"
+    script = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+
+    # Skip the package-level country imports so only this model is timed.
+    environment = {**os.environ, "POLICYENGINE_SKIP_COUNTRY_IMPORTS": "1"}
+
+    def run() -> _Elapsed:
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=False,
+            env=environment,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        return _Elapsed(result.stdout.strip().splitlines()[-1])
+
+    return run
+
+
+def _dataset_save(context: _BenchmarkContext) -> Callable[[], Any]:
+    dataset = context.dataset()
+    path = context.working_dir / "bench_save.h5"
+
+    def run() -> None:
+        path.unlink(missing_ok=True)
+        dataset.model_copy(update={"filepath": str(path)}).save()
+
+    return run
+
+
+def _dataset_load(context: _BenchmarkContext) -> Callable[[], Any]:
+    path = context.saved_dataset()
+    dataset_class = context.model._dataset_class
+
+    def run() -> None:
+        dataset_class(
+            name="Benchmark fixture",
+            description="Reloaded benchmark dataset",
+            filepath=str(path),
+            year=context.dataset().year,
+        ).load()
+
+    return run
+
+
+def _scoping(context: _BenchmarkContext) -> Callable[[], Any]:
+    from policyengine.core.scoping_strategy import RowFilterStrategy
+
+    dataset = context.dataset()
+    variable_name, variable_value = context.cases.scoping_filter
+    strategy = RowFilterStrategy(
+        variable_name=variable_name, variable_value=variable_value
+    )
+    group_entities = context.model.group_entities
+
+    return lambda: strategy.apply(
+        entity_data=dataset.data.entity_data,
+        group_entities=group_entities,
+        year=dataset.year,
+    )
+
+
+def _population_build(context: _BenchmarkContext) -> Callable[[], Any]:
+    dataset = context.dataset()
+    model = context.model
+    if context.country == "us":
+        from policyengine_us import Microsimulation
+
+        microsim = Microsimulation()
+        return lambda: model._build_simulation_from_dataset(
+            microsim, dataset, microsim.tax_benefit_system
+        )
+
+    from policyengine_uk import Microsimulation
+    from policyengine_uk.data import UKSingleYearDataset
+
+    return lambda: Microsimulation(
+        dataset=UKSingleYearDataset(
+            person=dataset.data.person,
+            benunit=dataset.data.benunit,
+            household=dataset.data.household,
+            fiscal_year=dataset.year,
+        )
+    )
+
+
+def _run(policy_key: str) -> Callable[[_BenchmarkContext], Callable[[], Any]]:
+    def case(context: _BenchmarkContext) -> Callable[[], Any]:
+        context.dataset()
+        policy = context.cases.reform if policy_key == "reformed" else None
+
+        def run() -> None:
+            # Reforms compile when the simulation is constructed, so the
+            # reform case includes compilation.
+            simulation = context.simulation(policy)
+            simulation.run()
+            context.remember(policy_key, simulation)
+
+        return run
+
+    return case
+
+
+def _aggregate(context: _BenchmarkContext) -> Callable[[], Any]:
+    from policyengine.outputs import Aggregate, AggregateType
+
+    baseline = context.baseline()
+    return lambda: Aggregate(
+        simulation=baseline,
+        variable="household_net_income",
+        aggregate_type=AggregateType.SUM,
+    ).run()
+
+
+def _change_aggregate(context: _BenchmarkContext) -> Callable[[], Any]:
+    from policyengine.outputs import ChangeAggregate, ChangeAggregateType
+
+    baseline, reformed = context.baseline(), context.reformed()
+    return lambda: ChangeAggregate(
+        baseline_simulation=baseline,
+        reform_simulation=reformed,
+        variable="household_net_income",
+        aggregate_type=ChangeAggregateType.SUM,
+    ).run()
+
+
+def _decile_impact(context: _BenchmarkContext) -> Callable[[], Any]:
+    from policyengine.outputs import calculate_decile_impacts
+
+    baseline, reformed = context.baseline(), context.reformed()
+    return lambda: calculate_decile_impacts(
+        baseline_simulation=baseline, reform_simulation=reformed
+    )
+
+
+def _output_function(attribute: str) -> Callable[[_BenchmarkContext], Callable]:
+    def case(context: _BenchmarkContext) -> Callable[[], Any]:
+        from policyengine import outputs
+
+        calculate = getattr(outputs, getattr(context.cases, attribute))
+        baseline = context.baseline()
+        return lambda: calculate(baseline)
+
+    return case
+
+
+def _household_single(context: _BenchmarkContext) -> Callable[[], Any]:
+    calculate = context.module.calculate_household
+    return lambda: calculate(**context.cases.household, year=DEFAULT_YEAR)
+
+
+def _household_axes(context: _BenchmarkContext) -> Callable[[], Any]:
+    calculate = context.module.calculate_household
+    axes = [
+        {"name": "employment_income", "min": 0, "max": 150_000, "count": AXIS_COUNT}
+    ]
+    return lambda: calculate(**context.cases.household, year=DEFAULT_YEAR, axes=axes)
+
+
+def _household_batch(context: _BenchmarkContext) -> Callable[[], Any]:
+    calculate = context.module.calculate_households
+    household = context.cases.household
+    adult = household["people"][0]
+    households = [
+        {
+            **household,
+            "people": [{**adult, "employment_income": 10_000 * (index + 1)}],
+        }
+        for index in range(HOUSEHOLD_BATCH_SIZE)
+    ]
+    return lambda: calculate(households, year=DEFAULT_YEAR)
+
+
+def _simulation_save(context: _BenchmarkContext) -> Callable[[], Any]:
+    baseline = context.baseline()
+    return baseline.save
+
+
+def _simulation_load(context: _BenchmarkContext) -> Callable[[], Any]:
+    from policyengine.core import Simulation
+
+    baseline = context.baseline()
+    context.shared("saved_baseline", baseline.save)
+    return lambda: Simulation(
+        id=baseline.id,
+        dataset=baseline.dataset,
+        tax_benefit_model_version=context.model,
+    ).load()
+
+
+_CASES: dict[str, Callable[[_BenchmarkContext], Callable[[], Any]]] = {
+    "import_model": _import_model,
+    "dataset_save": _dataset_save,
+    "dataset_load": _dataset_load,
+    "scoping": _scoping,
+    "population_build": _population_build,
+    "run": _run("baseline"),
+    "run_reform": _run("reformed"),
+    "outputs.aggregate": _aggregate,
+    "outputs.change_aggregate": _change_aggregate,
+    "outputs.decile_impact": _decile_impact,
+    "outputs.poverty": _output_function("poverty"),
+    "outputs.inequality": _output_function("inequality"),
+    "household.single": _household_single,
+    "household.axes": _household_axes,
+    "household.batch": _household_batch,
+    "simulation_save": _simulation_save,
+    "simulation_load": _simulation_load,
+}
+
+
+def select_cases(only: Optional[Iterable[str]] = None) -> list[str]:
+    """Resolve case names, ``fnmatch`` patterns or prefixes (``outputs``).
+
+    Raises:
+        ValueError: If a pattern matches no case.
+    """
+    if not only:
+        return list(BENCHMARK_CASES)
+    selected = set()
+    for pattern in only:
+        matches = {
+            name
+            for name in BENCHMARK_CASES
+            if name.startswith(f"{pattern}.") or fnmatch.fnmatchcase(name, pattern)
+        }
+        if not matches:
+            raise ValueError(
+                f"No benchmark case matches {pattern!r}; cases are "
+                f"{', '.join(BENCHMARK_CASES)}."
+            )
+        selected |= matches
+    return [name for name in BENCHMARK_CASES if name in selected]
+
+
+def _environment(country: str) -> dict[str, Optional[str]]:
+    environment: dict[str, Optional[str]] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+    }
+    for package in ("policyengine", f"policyengine-{country}", "numpy", "pandas"):
+        try:
+            environment[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            environment[package] = None
+    return environment
+
+
+def _time_case(name: str, context: _BenchmarkContext, repeats: int) -> BenchmarkResult:
+    result = BenchmarkResult(name=name)
+    try:
+        run = _CASES[name](context)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            returned = run()
+            elapsed = time.perf_counter() - start
+            result.seconds.append(
+                float(returned) if isinstance(returned, _Elapsed) else elapsed
+            )
+    except Exception as exc:
+        logger.debug("Benchmark case %s failed", name, exc_info=True)
+        result.error = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+def run_benchmarks(
+    country: str = "us",
+    *,
+    households: int = DEFAULT_HOUSEHOLDS,
+    repeats: int = DEFAULT_REPEATS,
+    only: Optional[Iterable[str]] = None,
+    working_dir: Optional[Union[str, Path]] = None,
+    on_result: Optional[Callable[[BenchmarkResult], None]] = None,
+) -> BenchmarkReport:
+    """Time the selected cases against a synthetic ``households`` dataset.
+
+    Files are written under ``working_dir`` (a temporary directory by
+    default). ``on_result`` is called as each case finishes.
+    """
+    if country not in _COUNTRY_CASES:
+        raise ValueError(f"Unknown country {country!r}; expected one of us, uk.")
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1.")
+    names = select_cases(only)
+    report = BenchmarkReport(
+        country=country,
+        households=households,
+        repeats=repeats,
+        created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        environment=_environment(country),
+    )
+    with tempfile.TemporaryDirectory(prefix="policyengine-bench-") as temporary:
+        context = _BenchmarkContext(country, households, Path(working_dir or temporary))
+        context.working_dir.mkdir(parents=True, exist_ok=True)
+        for name in names:
+            result = _time_case(name, context, repeats)
+            report.results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return report
@@ -13,18 +13,22 @@ import json
 import os
 import shutil
 import subprocess
-import tempfile
+import time
 import venv as venv_module
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from importlib import metadata
 from importlib.resources import files
 from pathlib import Path
-from typing import Any, Iterable, Mapping, Optional, Sequence
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
 from urllib.parse import quote
 
 import requests
 
+from policyengine.utils.artifact_store import ArtifactStore, link_or_copy
+from policyengine.utils.digest_cache import file_sha256, record_file_sha256
+
 BUNDLE_MANIFEST_RESOURCE = ("data", "bundle", "manifest.json")
 BUNDLE_HISTORY_RESOURCE = ("data", "bundles")
 DEFAULT_COUNTRIES = ("us", "uk")
@@ -33,6 +37,9 @@ DEFAULT_VENV = Path(".venv")
 RECEIPT_FILENAME = ".policyengine-bundle-receipt.json"
 BACKUP_DIR_NAME = ".policyengine-bundle-backups"
 DOWNLOAD_TIMEOUT_SECONDS = 60
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+DEFAULT_DOWNLOAD_WORKERS = 4
+PARTIAL_DOWNLOAD_PREFIX = ".policyengine-download-"
 
 
 class BundleError(ValueError):
@@ -54,6 +61,31 @@ class DatasetPlan:
     build_id: Optional[str]
 
 
+@dataclass(frozen=True)
+class DownloadProgress:
+    """Progress of one dataset download, reported after every chunk.
+
+    ``resumed_bytes`` were already on disk from an interrupted download, so
+    throughput counts only the bytes transferred since this attempt started.
+    """
+
+    country: str
+    dataset: str
+    bytes_downloaded: int
+    total_bytes: Optional[int]
+    resumed_bytes: int
+    elapsed_seconds: float
+
+    @property
+    def bytes_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.bytes_downloaded - self.resumed_bytes) / self.elapsed_seconds
+
+
+DownloadProgressCallback = Callable[[DownloadProgress], None]
+
+
 class DataProducerRuntimeStrategy:
     """Runtime install/verification behavior for a certified data producer."""
 
@@ -135,8 +167,18 @@ class DataProducerRuntimeStrategy:
         version = release.get("version")
         return str(version) if version is not None else None
 
-    def verify_download(self, plan: DatasetPlan, path: Path) -> str:
-        actual_sha256 = _sha256_file(path)
+    def verify_download(
+        self,
+        plan: DatasetPlan,
+        path: Path,
+        sha256: Optional[str] = None,
+    ) -> str:
+        """Check a downloaded file against the certified sha256.
+
+        Pass ``sha256`` when the digest was computed while streaming the
+        download, to avoid reading the file again.
+        """
+        actual_sha256 = sha256 or file_sha256(path)
         if plan.expected_sha256 and actual_sha256 != plan.expected_sha256:
             raise BundleError(
                 f"Downloaded {plan.country.upper()} dataset {plan.dataset} "
@@ -148,7 +190,14 @@ class DataProducerRuntimeStrategy:
         self,
         plan: DatasetPlan,
         receipt_dataset: Optional[Mapping[str, Any]],
+        *,
+        strict_hashing: Optional[bool] = None,
     ) -> dict[str, Any]:
+        """Compare an installed dataset with the plan and its receipt.
+
+        The file's sha256 comes from the shared digest cache unless
+        ``strict_hashing`` forces a rehash.
+        """
         check: dict[str, Any] = {
             "country": plan.country,
             "dataset": plan.dataset,
@@ -171,7 +220,7 @@ class DataProducerRuntimeStrategy:
         check["installed_version"] = receipt_dataset.get("version")
         check["path"] = str(path)
         if plan.expected_sha256:
-            actual_sha256 = _sha256_file(path)
+            actual_sha256 = file_sha256(path, strict=strict_hashing)
             check["installed_sha256"] = actual_sha256
             if actual_sha256 != plan.expected_sha256:
                 check["status"] = "sha256_mismatch"
@@ -474,34 +523,99 @@ def install_datasets(
     yes: bool = False,
     dry_run: bool = False,
     session=requests,
+    max_workers: Optional[int] = None,
+    progress: Optional[DownloadProgressCallback] = None,
 ) -> list[dict[str, Any]]:
+    """Download, verify and install the certified dataset of each country.
+
+    Datasets download concurrently (up to ``max_workers`` at a time) and are
+    hashed as they stream. An interrupted download leaves a partial file in
+    ``data_dir`` that the next install resumes with an HTTP Range request.
+    Verified files are then installed one at a time, in plan order.
+    ``progress`` is called from the download threads after every chunk.
+
+    Datasets already in the shared artifact store (see
+    :mod:`policyengine.utils.artifact_store`) are linked instead of
+    downloaded, and new downloads are linked into the store.
+    """
     plans = dataset_plans(manifest, countries=countries, data_dir=data_dir)
     if not plans:
         return []
     _confirm_dataset_install(plans, data_dir=data_dir, yes=yes, dry_run=dry_run)
-    installed = []
-    for plan in plans:
-        if dry_run:
+    if dry_run:
+        for plan in plans:
             print(f"download {plan.uri} -> {plan.destination}")
-            installed.append(_receipt_dataset(plan))
+        return [_receipt_dataset(plan) for plan in plans]
+
+    store = ArtifactStore()
+    stored = [
+        store.get(plan.expected_sha256, plan.destination.name)
+        if plan.expected_sha256
+        else None
+        for plan in plans
+    ]
+    to_download = [plan for plan, path in zip(plans, stored) if path is None]
+    downloads = {}
+    if to_download:
+        workers = max(1, min(len(to_download), max_workers or DEFAULT_DOWNLOAD_WORKERS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _download_to_temp,
+                    plan,
+                    data_dir=data_dir,
+                    session=session,
+                    progress=progress,
+                )
+                for plan in to_download
+            ]
+            downloads = {
+                id(plan): future.result() for plan, future in zip(to_download, futures)
+            }
+
+    installed = []
+    for plan, stored_path in zip(plans, stored):
+        if stored_path is not None:
+            _install_from_store(plan, stored_path)
+            installed.append(
+                _receipt_dataset(plan, installed_sha256=plan.expected_sha256)
+            )
             continue
-        downloaded = _download_to_temp(plan, data_dir=data_dir, session=session)
+        downloaded, streamed_sha256 = downloads[id(plan)]
         installed_sha256 = None
         try:
             installed_sha256 = runtime_strategy(plan.data_producer).verify_download(
                 plan,
                 downloaded,
+                sha256=streamed_sha256,
             )
             _backup_existing(plan.destination)
             plan.destination.parent.mkdir(parents=True, exist_ok=True)
             shutil.move(str(downloaded), str(plan.destination))
+            record_file_sha256(plan.destination, installed_sha256)
         finally:
+            # A verified file has moved; anything left is corrupt, so it
+            # must not be resumed.
             if downloaded.exists():
                 downloaded.unlink()
+        try:
+            store.add(plan.destination, installed_sha256)
+        except OSError:
+            # The dataset is installed; sharing it is only an optimisation.
+            pass
         installed.append(_receipt_dataset(plan, installed_sha256=installed_sha256))
     return installed
 
 
+def _install_from_store(plan: DatasetPlan, stored_path: Path) -> None:
+    """Link a verified artifact from the shared store to the plan destination."""
+    if plan.destination.exists() and os.path.samefile(stored_path, plan.destination):
+        return
+    _backup_existing(plan.destination)
+    link_or_copy(stored_path, plan.destination)
+    record_file_sha256(plan.destination, plan.expected_sha256)
+
+
 def _confirm_dataset_install(
     plans: Sequence[DatasetPlan],
     *,
@@ -525,38 +639,95 @@ def _confirm_dataset_install(
         raise BundleError("Dataset installation cancelled.")
 
 
-def _download_to_temp(plan: DatasetPlan, *, data_dir: Path, session=requests) -> Path:
+def _partial_download_path(plan: DatasetPlan, data_dir: Path) -> Path:
+    """Partial-download file for a plan, stable across runs for resuming.
+
+    The name includes a digest of the pinned URI, so a partial file is only
+    ever resumed against the same artifact revision.
+    """
+    uri_digest = hashlib.sha256(plan.uri.encode()).hexdigest()[:16]
+    return data_dir / f"{PARTIAL_DOWNLOAD_PREFIX}{uri_digest}-{plan.filename}.part"
+
+
+def _content_length(response) -> Optional[int]:
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Content-Length")
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _download_to_temp(
+    plan: DatasetPlan,
+    *,
+    data_dir: Path,
+    session=requests,
+    progress: Optional[DownloadProgressCallback] = None,
+) -> tuple[Path, str]:
+    """Download a plan's artifact, resuming any partial file.
+
+    Returns the downloaded file and its sha256, computed while streaming
+    (bytes resumed from disk are hashed once before the request).
+    """
     data_dir.mkdir(parents=True, exist_ok=True)
     url = _download_url(plan.uri, repo_type=plan.repo_type)
     headers = _auth_headers(plan.uri)
-    suffix = Path(plan.filename).suffix or ".download"
-    fd, temp_name = tempfile.mkstemp(
-        prefix=".policyengine-download-", suffix=suffix, dir=data_dir
-    )
-    os.close(fd)
-    temp_path = Path(temp_name)
-    try:
-        with session.get(
-            url,
-            headers=headers,
-            stream=True,
-            timeout=DOWNLOAD_TIMEOUT_SECONDS,
-        ) as response:
-            if response.status_code in {401, 403}:
-                raise BundleError(
-                    f"Could not download {plan.country.upper()} dataset. "
-                    "If this is a private Hugging Face dataset, set HUGGING_FACE_TOKEN."
-                )
-            response.raise_for_status()
-            with temp_path.open("wb") as stream:
-                for chunk in response.iter_content(chunk_size=1024 * 1024):
-                    if chunk:
-                        stream.write(chunk)
-    except Exception:
-        if temp_path.exists():
-            temp_path.unlink()
-        raise
-    return temp_path
+    partial_path = _partial_download_path(plan, data_dir)
+    digest = hashlib.sha256()
+    resumed_bytes = 0
+    if partial_path.exists():
+        with partial_path.open("rb") as file:
+            for chunk in iter(lambda: file.read(DOWNLOAD_CHUNK_BYTES), b""):
+                digest.update(chunk)
+                resumed_bytes += len(chunk)
+    if resumed_bytes:
+        headers = {**headers, "Range": f"bytes={resumed_bytes}-"}
+
+    started = time.monotonic()
+    with session.get(
+        url,
+        headers=headers,
+        stream=True,
+        timeout=DOWNLOAD_TIMEOUT_SECONDS,
+    ) as response:
+        if response.status_code in {401, 403}:
+            raise BundleError(
+                f"Could not download {plan.country.upper()} dataset. "
+                "If this is a private Hugging Face dataset, set HUGGING_FACE_TOKEN."
+            )
+        if resumed_bytes and response.status_code == 416:
+            # Nothing left past the partial file: it is already complete, and
+            # verification rejects it if not.
+            return partial_path, digest.hexdigest()
+        response.raise_for_status()
+        if resumed_bytes and response.status_code != 206:
+            # The server ignored the Range header and sent the whole file.
+            digest = hashlib.sha256()
+            resumed_bytes = 0
+        total_bytes = _content_length(response)
+        if total_bytes is not None:
+            total_bytes += resumed_bytes
+        downloaded_bytes = resumed_bytes
+        with partial_path.open("ab" if resumed_bytes else "wb") as stream:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                if not chunk:
+                    continue
+                stream.write(chunk)
+                digest.update(chunk)
+                downloaded_bytes += len(chunk)
+                if progress is not None:
+                    progress(
+                        DownloadProgress(
+                            country=plan.country,
+                            dataset=plan.dataset,
+                            bytes_downloaded=downloaded_bytes,
+                            total_bytes=total_bytes,
+                            resumed_bytes=resumed_bytes,
+                            elapsed_seconds=time.monotonic() - started,
+                        )
+                    )
+    return partial_path, digest.hexdigest()
 
 
 def _download_url(uri: str, *, repo_type: str = "model") -> str:
@@ -680,6 +851,8 @@ def install_bundle(
     no_datasets: bool = False,
     yes: bool = False,
     dry_run: bool = False,
+    download_workers: Optional[int] = None,
+    progress: Optional[DownloadProgressCallback] = None,
 ) -> dict[str, Any]:
     manifest = load_bundle_manifest(version, manifest_ref=manifest_ref)
     selected_countries = normalise_countries(countries, manifest)
@@ -698,6 +871,8 @@ def install_bundle(
             data_dir=data_dir,
             yes=yes,
             dry_run=dry_run,
+            max_workers=download_workers,
+            progress=progress,
         )
     if not dry_run:
         write_receipt(
@@ -726,6 +901,7 @@ def inspect_bundle_status(
     countries: Optional[Sequence[str]] = None,
     data_dir: Path = DEFAULT_DATA_DIR,
     packages_only: bool = False,
+    strict_hashing: Optional[bool] = None,
 ) -> dict[str, Any]:
     manifest = load_bundle_manifest(version, manifest_ref=manifest_ref)
     selected_countries = normalise_countries(countries, manifest)
@@ -738,7 +914,13 @@ def inspect_bundle_status(
     dataset_checks = (
         []
         if packages_only
-        else _dataset_checks(manifest, selected_countries, data_dir, receipt)
+        else _dataset_checks(
+            manifest,
+            selected_countries,
+            data_dir,
+            receipt,
+            strict_hashing=strict_hashing,
+        )
     )
     passed = all(
         check["status"] == "ok" for check in [*package_checks, *dataset_checks]
@@ -897,6 +1079,8 @@ def _dataset_checks(
     countries: Sequence[str],
     data_dir: Path,
     receipt: Optional[Mapping[str, Any]],
+    *,
+    strict_hashing: Optional[bool] = None,
 ) -> list[dict[str, Any]]:
     receipt_datasets = {}
     if isinstance(receipt, Mapping):
@@ -907,14 +1091,8 @@ def _dataset_checks(
     for plan in dataset_plans(manifest, countries=countries, data_dir=data_dir):
         receipt_dataset = receipt_datasets.get(plan.country)
         checks.append(
-            runtime_strategy(plan.data_producer).dataset_check(plan, receipt_dataset)
+            runtime_strategy(plan.data_producer).dataset_check(
+                plan, receipt_dataset, strict_hashing=strict_hashing
+            )
         )
     return checks
-
-
-def _sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as file:
-        for chunk in iter(lambda: file.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
@@ -7,6 +7,8 @@ Subcommands:
 - ``trace-tro-verify <path>`` fetch and rehash every artifact a TRO claims
 - ``release-manifest <country>`` print the bundled country manifest
 - ``zenodo-mirror <country>`` deposit the certification record on Zenodo
+- ``serve`` run a warm simulation worker (see :mod:`policyengine.server`)
+- ``bench`` time the simulation pipeline (see :mod:`policyengine.benchmarks`)
 
 See :mod:`policyengine.provenance.trace` and ``docs/release-bundles.md``.
 """
@@ -22,6 +24,7 @@ from typing import Optional, Sequence
 
 from policyengine.bundle import (
     BundleError,
+    DownloadProgress,
     inspect_bundle_status,
     install_bundle,
     load_bundle_manifest,
@@ -93,6 +96,17 @@ def _parser() -> argparse.ArgumentParser:
             "verification."
         ),
     )
+    verify.add_argument(
+        "--rehash",
+        action="store_true",
+        help="Rehash local artifacts instead of reusing cached digests.",
+    )
+    verify.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Artifacts to fetch and hash concurrently. Defaults to 4.",
+    )
 
     bundle = subparsers.add_parser(
         "release-manifest",
@@ -158,6 +172,12 @@ def _parser() -> argparse.ArgumentParser:
         default=Path("./data"),
         help="Directory for certified dataset files and the bundle receipt.",
     )
+    bundle_install.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Datasets to download concurrently. Defaults to 4.",
+    )
     bundle_install.add_argument(
         "--yes",
         action="store_true",
@@ -212,6 +232,11 @@ def _parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip dataset receipt checks and verify only installed packages.",
     )
+    bundle_status.add_argument(
+        "--rehash",
+        action="store_true",
+        help="Rehash installed datasets instead of reusing cached digests.",
+    )
 
     bundle_verify = bundle_subparsers.add_parser(
         "verify",
@@ -256,6 +281,11 @@ def _parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Skip dataset receipt checks and verify only installed packages.",
     )
+    bundle_verify.add_argument(
+        "--rehash",
+        action="store_true",
+        help="Rehash installed datasets instead of reusing cached digests.",
+    )
 
     bundle_manifest = bundle_subparsers.add_parser(
         "manifest",
@@ -303,6 +333,113 @@ def _parser() -> argparse.ArgumentParser:
         ),
     )
 
+    serve = subparsers.add_parser(
+        "serve",
+        help=(
+            "Run a warm simulation worker that answers household, simulation "
+            "and economic-impact requests as JSON over HTTP."
+        ),
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    serve.add_argument("--port", type=int, default=8080, help="TCP port.")
+    serve.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Listen on this Unix socket instead of a TCP port.",
+    )
+    serve.add_argument(
+        "--data-dir",
+        type=Path,
+        default=Path("./data"),
+        help="Directory for datasets loaded by simulation requests.",
+    )
+    serve.add_argument(
+        "--preload",
+        action="append",
+        default=[],
+        metavar="COUNTRY",
+        help="Import a country model at start-up. May be repeated.",
+    )
+    serve.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=10.0,
+        help="How long a household request waits for others to batch with.",
+    )
+    serve.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=64,
+        help="Largest household batch.",
+    )
+    serve.add_argument(
+        "--max-datasets",
+        type=int,
+        default=4,
+        help="Datasets kept loaded; the least recently used is dropped beyond this.",
+    )
+    serve.add_argument(
+        "--max-baselines",
+        type=int,
+        default=4,
+        help=(
+            "Baseline simulations kept; the least recently used is dropped beyond this."
+        ),
+    )
+
+    bench = subparsers.add_parser(
+        "bench",
+        help=(
+            "Time the simulation pipeline on a synthetic fixture dataset and "
+            "compare against a baseline report."
+        ),
+    )
+    bench.add_argument(
+        "--country", choices=("us", "uk"), default="us", help="Country model."
+    )
+    bench.add_argument(
+        "--households",
+        type=int,
+        default=1_000,
+        help="Households in the synthetic dataset.",
+    )
+    bench.add_argument(
+        "--repeats", type=int, default=3, help="Timed runs of each case."
+    )
+    bench.add_argument(
+        "--only",
+        action="append",
+        default=[],
+        metavar="CASE",
+        help=(
+            "Run only this case, case prefix (e.g. outputs) or glob. May be repeated."
+        ),
+    )
+    bench.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=None,
+        help="Write the JSON report to this path. Defaults to stdout.",
+    )
+    bench.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help=(
+            "Compare against this earlier report and exit with status 1 if "
+            "any case regressed."
+        ),
+    )
+    bench.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Slowdown, as a fraction of the baseline median, that counts as "
+        "a regression.",
+    )
+
     return parser
 
 
@@ -351,11 +488,26 @@ def _validate_tro(path: Path) -> int:
     return 0
 
 
-def _verify_tro(path: Path, base_dir: Optional[Path], skip: Sequence[str]) -> int:
-    from policyengine.provenance.verify import verify_trace_tro
+def _verify_tro(
+    path: Path,
+    base_dir: Optional[Path],
+    skip: Sequence[str],
+    rehash: bool = False,
+    jobs: Optional[int] = None,
+) -> int:
+    from policyengine.provenance.verify import (
+        DEFAULT_VERIFY_WORKERS,
+        verify_trace_tro,
+    )
 
     tro = json.loads(path.read_text())
-    report = verify_trace_tro(tro, base_dir=base_dir or path.parent, skip=skip)
+    report = verify_trace_tro(
+        tro,
+        base_dir=base_dir or path.parent,
+        skip=skip,
+        strict=rehash or None,
+        max_workers=jobs or DEFAULT_VERIFY_WORKERS,
+    )
     for check in report.artifacts:
         if check.status == "ok":
             print(f"ok: {check.artifact_id} ({check.location})")
@@ -377,6 +529,30 @@ def _emit_release_manifest(country_id: str) -> int:
     return 0
 
 
+class _DownloadProgressPrinter:
+    """Print dataset download progress to stderr, at most once a second."""
+
+    def __init__(self, interval_seconds: float = 1.0):
+        self.interval_seconds = interval_seconds
+        self._last_printed: dict[str, float] = {}
+
+    def __call__(self, progress: DownloadProgress) -> None:
+        key = f"{progress.country}/{progress.dataset}"
+        finished = progress.bytes_downloaded == progress.total_bytes
+        last = self._last_printed.get(key)
+        if not finished and last is not None:
+            if progress.elapsed_seconds - last < self.interval_seconds:
+                return
+        self._last_printed[key] = progress.elapsed_seconds
+        size = f"{progress.bytes_downloaded / 1e6:.1f}"
+        if progress.total_bytes is not None:
+            size += f"/{progress.total_bytes / 1e6:.1f}"
+        print(
+            f"{key}: {size} MB ({progress.bytes_per_second / 1e6:.1f} MB/s)",
+            file=sys.stderr,
+        )
+
+
 def _install_bundle(args: argparse.Namespace) -> int:
     try:
         result = install_bundle(
@@ -389,6 +565,8 @@ def _install_bundle(args: argparse.Namespace) -> int:
             no_datasets=args.no_datasets,
             yes=args.yes,
             dry_run=args.dry_run,
+            download_workers=args.jobs,
+            progress=_DownloadProgressPrinter(),
         )
     except BundleError as exc:
         print(f"error: {exc}", file=sys.stderr)
@@ -407,6 +585,7 @@ def _bundle_status(args: argparse.Namespace) -> int:
             countries=args.country,
             data_dir=args.data_dir,
             packages_only=args.packages_only,
+            strict_hashing=args.rehash or None,
         )
     except BundleError as exc:
         print(f"error: {exc}", file=sys.stderr)
@@ -444,6 +623,7 @@ def _bundle_verify(args: argparse.Namespace) -> int:
             countries=args.country,
             data_dir=args.data_dir,
             packages_only=args.packages_only,
+            strict_hashing=args.rehash or None,
         )
     except BundleError as exc:
         print(f"error: {exc}", file=sys.stderr)
@@ -500,6 +680,78 @@ def _zenodo_mirror(
     return 0
 
 
+def _serve(args: argparse.Namespace) -> int:
+    from policyengine.server import SimulationWorker, make_server
+
+    worker = SimulationWorker(
+        data_folder=args.data_dir,
+        batch_window=args.batch_window_ms / 1000,
+        max_batch_size=args.max_batch_size,
+        max_datasets=args.max_datasets,
+        max_baselines=args.max_baselines,
+    )
+    worker.preload(args.preload)
+    server = make_server(
+        worker, host=args.host, port=args.port, socket_path=args.socket
+    )
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"policyengine serve listening on {where}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _bench(args: argparse.Namespace) -> int:
+    from policyengine.benchmarks import (
+        BenchmarkReport,
+        compare_reports,
+        run_benchmarks,
+    )
+
+    def show(result) -> None:
+        if result.error is not None:
+            print(f"{result.name:<26} error: {result.error}", file=sys.stderr)
+        else:
+            print(f"{result.name:<26} {result.median:10.4f}s", file=sys.stderr)
+
+    try:
+        baseline = BenchmarkReport.read(args.baseline) if args.baseline else None
+        report = run_benchmarks(
+            args.country,
+            households=args.households,
+            repeats=args.repeats,
+            only=args.only,
+            on_result=show,
+        )
+        comparisons = (
+            compare_reports(report, baseline, threshold=args.threshold)
+            if baseline is not None
+            else []
+        )
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if args.output is None:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        report.write(args.output)
+
+    regressions = [c for c in comparisons if c.status == "regression"]
+    for comparison in comparisons:
+        if comparison.status in ("ok", "missing"):
+            continue
+        ratio = f" ({comparison.ratio:.2f}x)" if comparison.ratio else ""
+        print(
+            f"{comparison.status}: {comparison.name}{ratio}",
+            file=sys.stderr,
+        )
+    return 1 if regressions or report.errors else 0
+
+
 def main(argv: Optional[Sequence[str]] = None) -> int:
     args = _parser().parse_args(argv)
     if args.command == "trace-tro":
@@ -507,7 +759,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     if args.command == "trace-tro-validate":
         return _validate_tro(args.path)
     if args.command == "trace-tro-verify":
-        return _verify_tro(args.path, args.base_dir, args.skip)
+        return _verify_tro(args.path, args.base_dir, args.skip, args.rehash, args.jobs)
     if args.command == "release-manifest":
         return _emit_release_manifest(args.country)
     if args.command == "zenodo-mirror":
@@ -518,6 +770,10 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             sandbox=args.sandbox,
             license_id=args.license_id,
         )
+    if args.command == "serve":
+        return _serve(args)
+    if args.command == "bench":
+        return _bench(args)
     if args.command == "bundle":
         if args.bundle_command == "install":
             return _install_bundle(args)
@@ -1,11 +1,18 @@
-from typing import Optional
+from collections.abc import Sequence
+from typing import Literal, Optional
 from uuid import uuid4
 
 import numpy as np
 import pandas as pd
 from microdf import MicroDataFrame
-from pydantic import BaseModel, ConfigDict, Field
-
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from .replicate_weights import (
+    ReplicateWeights,
+    bootstrap_replicate_weights,
+    successive_difference_replicate_weights,
+)
+from .sampling import SamplingDesign, stratified_household_sample
 from .tax_benefit_model import TaxBenefitModel
 
 
@@ -64,6 +71,15 @@ class YearData(BaseModel):
         )
 
 
+def dataset_span_attributes(dataset: "Dataset", *args, **kwargs) -> dict:
+    """Tracing attributes that identify a dataset (see ``tracing.traced``)."""
+    return {
+        "dataset_id": dataset.id,
+        "year": dataset.year,
+        "filepath": dataset.filepath,
+    }
+
+
 class Dataset(BaseModel):
     """Base class for datasets.
 
@@ -93,6 +109,122 @@ class Dataset(BaseModel):
 
     data: Optional[BaseModel] = None
 
+    # Set on datasets drawn by ``stratified_sample``.
+    sampling_design: Optional[SamplingDesign] = None
+
+    # Set by ``add_replicate_weights``; outputs over simulations of this
+    # dataset then report standard errors.
+    replicate_weights: Optional[ReplicateWeights] = None
+
+    # Memoized derivations of ``data`` (for example weighted decile groups).
+    # Entries carry a content fingerprint checked by their producers, so a
+    # replaced or mutated ``data`` never serves a stale result.
+    _derived_cache: dict = PrivateAttr(default_factory=dict)
+
+    def stratified_sample(
+        self,
+        *,
+        fraction: Optional[float] = None,
+        n_households: Optional[int] = None,
+        strata: Sequence[str] = (),
+        income_variable: Optional[str] = None,
+        income_groups: int = 10,
+        min_per_stratum: int = 2,
+        seed: Optional[int] = 0,
+    ) -> "Dataset":
+        """Return an in-memory, household-complete stratified sample.
+
+        Weights are rescaled so each stratum keeps its weighted household
+        total, and the returned dataset's ``sampling_design`` can estimate
+        standard errors. See
+        :func:`policyengine.core.sampling.stratified_household_sample` for
+        the arguments.
+
+        Example:
+            >>> preview = dataset.stratified_sample(
+            ...     fraction=0.05,
+            ...     strata=["state_fips"],
+            ...     income_variable="employment_income",
+            ... )
+        """
+        if self.data is None:
+            raise ValueError("Cannot sample a dataset with no data loaded.")
+        entity_data, design = stratified_household_sample(
+            self.data.entity_data,
+            fraction=fraction,
+            n_households=n_households,
+            strata=strata,
+            income_variable=income_variable,
+            income_groups=income_groups,
+            min_per_stratum=min_per_stratum,
+            seed=seed,
+        )
+        sampled_households = int(design.sampled_households.sum())
+        return type(self)(
+            id=f"{self.id}:sample-{sampled_households}-{seed}",
+            name=self.name,
+            description=(
+                f"Stratified sample of {sampled_households} households from {self.name}"
+            ),
+            filepath=None,
+            is_output_dataset=self.is_output_dataset,
+            tax_benefit_model=self.tax_benefit_model,
+            year=self.year,
+            data=type(self.data)(**entity_data),
+            sampling_design=design,
+        )
+
+    def add_replicate_weights(
+        self,
+        method: Literal["bootstrap", "successive_difference"] = "bootstrap",
+        *,
+        replicates: Optional[int] = None,
+        strata: Sequence[str] = (),
+        sort_by: Sequence[str] = (),
+        seed: Optional[int] = 0,
+    ) -> ReplicateWeights:
+        """Attach replicate weights so outputs report standard errors.
+
+        ``Aggregate``, ``ChangeAggregate`` and ``Poverty`` outputs (and the
+        US budgetary impact) over simulations of this dataset then set a
+        ``standard_error``. See
+        :func:`policyengine.core.replicate_weights.bootstrap_replicate_weights`
+        and
+        :func:`policyengine.core.replicate_weights.successive_difference_replicate_weights`
+        for the methods.
+
+        Args:
+            method: ``"bootstrap"`` (uses ``strata`` and ``seed``) or
+                ``"successive_difference"`` (uses ``sort_by``).
+            replicates: Number of replicates; defaults to 100 for the
+                bootstrap and 64 for successive differences.
+
+        Example:
+            >>> dataset.add_replicate_weights("bootstrap", strata=["state_fips"])
+        """
+        if self.data is None:
+            raise ValueError("Cannot add replicate weights to a dataset with no data.")
+        if method == "bootstrap":
+            replicate_weights = bootstrap_replicate_weights(
+                self.data.entity_data,
+                replicates=replicates or 100,
+                strata=strata,
+                seed=seed,
+            )
+        elif method == "successive_difference":
+            replicate_weights = successive_difference_replicate_weights(
+                self.data.entity_data,
+                replicates=replicates or 64,
+                sort_by=sort_by,
+            )
+        else:
+            raise ValueError(
+                f"Unknown replicate method '{method}'. Use 'bootstrap' or "
+                "'successive_difference'."
+            )
+        self.replicate_weights = replicate_weights
+        return replicate_weights
+
 
 def map_to_entity(
     entity_data: dict[str, MicroDataFrame],
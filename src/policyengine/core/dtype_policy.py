@@ -0,0 +1,112 @@
+"""Compact column dtypes for simulation input and output datasets.
+
+Country ``run`` methods store each calculated variable as the array
+``microsim.calculate(...).values`` returns: float64 for money and counts,
+Python strings for enums and int64 for integers. A :class:`DtypePolicy`
+attached to a ``Simulation`` narrows those columns losslessly before the
+output dataset is held in memory or saved; narrowing monetary amounts to
+float32 is opt-in because it rounds them.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, Field
+
+from .dataset import YearData
+
+
+class DtypePolicy(BaseModel):
+    """Which columns to narrow and how.
+
+    Weight and ID columns are never changed: weights feed every weighted sum
+    and IDs are join keys.
+    """
+
+    float32: bool = Field(
+        default=True,
+        description=(
+            "Store float columns as float32 when that is exact: every value "
+            "is a whole number within ``float32_max_abs`` (counts, ages and "
+            "flags held as floats)."
+        ),
+    )
+    float32_max_abs: float = Field(
+        default=2.0**24,
+        description=(
+            "Largest magnitude narrowed to float32. float32 holds every whole "
+            "number up to 2**24 exactly."
+        ),
+    )
+    float32_fractional: bool = Field(
+        default=False,
+        description=(
+            "Also narrow float columns with fractional values, such as "
+            "monetary amounts. This is lossy: float32 keeps about seven "
+            "significant digits, so values near 10,000 are rounded to about "
+            "0.001 and values near 2**24 to the nearest 1, and cents are not "
+            "preserved for typical incomes."
+        ),
+    )
+    categorical_strings: bool = Field(
+        default=True,
+        description=(
+            "Store string (enum) columns as pandas categoricals when at most "
+            "``max_category_fraction`` of rows hold distinct values. Categories "
+            "are sorted and ordered, so ``<=``/``>=`` filters compare as the "
+            "strings did, against thresholds that are existing values."
+        ),
+    )
+    max_category_fraction: float = 0.5
+    downcast_integers: bool = Field(
+        default=True,
+        description=(
+            "Store integer columns in the smallest signed type that holds "
+            "them (int8 for flags and small counts)."
+        ),
+    )
+
+    def compact_column(self, name: str, values: pd.Series) -> Optional[pd.Series]:
+        """Return a narrowed copy of ``values``, or ``None`` to keep it."""
+        if name.endswith("_weight") or name.endswith("_id"):
+            return None
+        dtype = values.dtype
+        if isinstance(dtype, pd.CategoricalDtype) or dtype == np.bool_:
+            return None
+        if self.float32 and dtype == np.float64:
+            array = values.to_numpy()
+            finite = array[np.isfinite(array)]
+            if finite.size and np.abs(finite).max() > self.float32_max_abs:
+                return None
+            if self.float32_fractional or np.array_equal(finite, np.round(finite)):
+                return values.astype(np.float32)
+            return None
+        if self.downcast_integers and dtype.kind == "i" and dtype.itemsize > 1:
+            narrowed = pd.to_numeric(values, downcast="integer")
+            return narrowed if narrowed.dtype != dtype else None
+        if self.categorical_strings and dtype.kind == "O" and len(values):
+            distinct = values.nunique(dropna=False)
+            if distinct <= self.max_category_fraction * len(values) and all(
+                isinstance(value, str) for value in values.unique()
+            ):
+                return values.astype(
+                    pd.CategoricalDtype(sorted(values.dropna().unique()), ordered=True)
+                )
+        return None
+
+    def compact_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Apply the policy to every column of ``frame`` (in place)."""
+        # Inspect plain pandas columns so MicroSeries weighting never applies.
+        plain = pd.DataFrame(frame)
+        for column in plain.columns:
+            narrowed = self.compact_column(str(column), plain[column])
+            if narrowed is not None:
+                frame[column] = narrowed
+        return frame
+
+    def compact_year_data(self, data: YearData) -> YearData:
+        """Apply the policy to every entity table of ``data`` (in place)."""
+        for frame in data.entity_data.values():
+            self.compact_frame(frame)
+        return data
@@ -3,11 +3,29 @@ from typing import Generic, List, TypeVar
 import pandas as pd
 from pydantic import BaseModel, ConfigDict
 
+from policyengine import tracing
+
 T = TypeVar("T", bound="Output")
 
 
+def _output_span_attributes(output: "Output", *args, **kwargs) -> dict:
+    return {"output": type(output).__name__}
+
+
 class Output(BaseModel):
-    """Base class for all output templates."""
+    """Base class for all output templates.
+
+    Each subclass's ``run()`` is traced as a ``policyengine.output.run``
+    span (see :mod:`policyengine.tracing`).
+    """
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        if "run" in cls.__dict__:
+            cls.run = tracing.traced(
+                "policyengine.output.run", _output_span_attributes
+            )(cls.__dict__["run"])
 
     def run(self):
         """Calculate and populate the output fields.
@@ -0,0 +1,268 @@
+"""Replicate weights for sampling standard errors of aggregate outputs.
+
+A replicate-weight design holds a ``(replicates x households)`` matrix of
+weight factors. Each replicate multiplies every household's weight (and the
+weights of its members and group entities) by that household's factor, and
+the spread of an estimate across replicates measures its sampling error.
+
+Re-running an output once per replicate would repeat all of its work. The
+weights only enter through weighted totals, so every replicate total is one
+entry of ``factors @ household_totals``: each output sums its weighted values
+to households once and takes a single matrix product.
+"""
+
+from collections.abc import Sequence
+from typing import Literal, Optional
+
+import numpy as np
+import pandas as pd
+from microdf import MicroDataFrame
+from pydantic import BaseModel, ConfigDict
+
+from policyengine.utils.household_partition import household_partition_index
+
+
+class ReplicateWeights(BaseModel):
+    """Household weight factors for each replicate.
+
+    ``factors[r, j]`` scales the weights of household ``household_ids[j]``
+    in replicate ``r``. The variance of an estimate ``theta`` with replicate
+    estimates ``theta_r`` is ``variance_multiplier * sum((theta_r - theta)**2)``.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    method: Literal["bootstrap", "successive_difference"]
+    household_ids: np.ndarray
+    factors: np.ndarray
+    variance_multiplier: float
+
+    @property
+    def n_replicates(self) -> int:
+        return int(self.factors.shape[0])
+
+    def _household_columns(
+        self, entity_data: dict[str, MicroDataFrame], entity: str
+    ) -> np.ndarray:
+        """Factor-matrix column of every ``entity`` row (-1 if unlinked)."""
+        household = pd.DataFrame(entity_data["household"])
+        columns = pd.Index(self.household_ids).get_indexer(household["household_id"])
+        if (columns < 0).any():
+            raise ValueError(
+                "The household table contains households that have no "
+                "replicate weights."
+            )
+        group_entities = [name for name in entity_data if name != "person"]
+        positions = household_partition_index(
+            entity_data, group_entities
+        ).household_positions(entity)
+        return np.where(positions >= 0, columns[np.maximum(positions, 0)], -1)
+
+    def replicate_totals(
+        self,
+        entity_data: dict[str, MicroDataFrame],
+        entity: str,
+        values: np.ndarray,
+    ) -> np.ndarray:
+        """Replicate weighted totals of ``values``, one row per ``entity`` row.
+
+        Args:
+            entity_data: Entity tables whose ``{entity}_weight`` column holds
+                the full-sample weights (usually an output dataset's data).
+            entity: Entity the rows of ``values`` belong to.
+            values: ``(rows,)`` or ``(rows, k)`` array; NaN counts as zero.
+
+        Returns:
+            ``(replicates, k)`` array of weighted totals.
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[:, None]
+        weights = pd.DataFrame(entity_data[entity])[f"{entity}_weight"].to_numpy(
+            dtype=float
+        )
+        contributions = np.nan_to_num(values * weights[:, None])
+        columns = self._household_columns(entity_data, entity)
+        linked = columns >= 0
+        household_totals = np.stack(
+            [
+                np.bincount(
+                    columns[linked],
+                    weights=contributions[linked, k],
+                    minlength=len(self.household_ids),
+                )
+                for k in range(contributions.shape[1])
+            ],
+            axis=1,
+        )
+        # Rows without a household keep their weight in every replicate.
+        unlinked = contributions[~linked].sum(axis=0)
+        return self.factors @ household_totals + unlinked
+
+    def series_totals(
+        self,
+        entity_data: dict[str, MicroDataFrame],
+        entity: str,
+        series: pd.Series,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Replicate weighted sums and counts of a (possibly filtered) column.
+
+        ``series`` is a column of ``entity``'s table, or a subset of its rows
+        selected by boolean indexing; rows it lacks count as zero. NaN values
+        are excluded from both sums and counts, as ``MicroSeries`` does.
+        """
+        table = pd.DataFrame(entity_data[entity])
+        rows = table.index.get_indexer(series.index)
+        if (rows < 0).any():
+            raise ValueError(
+                f"The series is not indexed by rows of the '{entity}' table."
+            )
+        values = np.zeros(len(table))
+        present = np.zeros(len(table))
+        observed = np.asarray(pd.Series(series).to_numpy(), dtype=float)
+        values[rows] = np.nan_to_num(observed)
+        present[rows] = ~np.isnan(observed)
+        totals = self.replicate_totals(
+            entity_data, entity, np.column_stack([values, present])
+        )
+        return totals[:, 0], totals[:, 1]
+
+    def standard_error(self, estimate: float, replicate_estimates: np.ndarray) -> float:
+        """Standard error of ``estimate`` from its replicate estimates."""
+        deviations = np.asarray(replicate_estimates, dtype=float) - estimate
+        return float(np.sqrt(self.variance_multiplier * np.nansum(deviations**2)))
+
+
+def simulation_replicate_weights(simulation) -> Optional[ReplicateWeights]:
+    """Return the replicate weights of a simulation's dataset, if any."""
+    replicate_weights = getattr(
+        getattr(simulation, "dataset", None), "replicate_weights", None
+    )
+    return (
+        replicate_weights if isinstance(replicate_weights, ReplicateWeights) else None
+    )
+
+
+def _strata_codes(household: pd.DataFrame, strata: Sequence[str]) -> np.ndarray:
+    for variable in strata:
+        if variable not in household.columns:
+            raise ValueError(
+                f"Stratum variable '{variable}' not found in household data. "
+                f"Available columns: {list(household.columns)}"
+            )
+    if not strata:
+        return np.zeros(len(household), dtype=np.int64)
+    return (
+        household[list(strata)].groupby(list(strata), dropna=False).ngroup().to_numpy()
+    )
+
+
+def bootstrap_replicate_weights(
+    entity_data: dict[str, MicroDataFrame],
+    *,
+    replicates: int = 100,
+    strata: Sequence[str] = (),
+    seed: Optional[int] = 0,
+) -> ReplicateWeights:
+    """Rescaled bootstrap replicate weights (Rao and Wu).
+
+    Each replicate draws ``n_h - 1`` households with replacement within each
+    stratum of ``n_h`` households and scales a household drawn ``c`` times by
+    ``c * n_h / (n_h - 1)``. Strata with one household keep factor one.
+
+    Args:
+        entity_data: Entity tables of the dataset.
+        replicates: Number of bootstrap replicates.
+        strata: Household columns whose value combinations form strata.
+        seed: Random seed; the same seed draws the same replicates.
+    """
+    if replicates < 2:
+        raise ValueError(f"replicates must be at least 2, got {replicates}.")
+    household = pd.DataFrame(entity_data["household"])
+    codes = _strata_codes(household, strata)
+    n_households = len(household)
+    sizes = np.bincount(codes)
+
+    # Households sorted by stratum, so stratum h occupies a contiguous slice.
+    order = np.argsort(codes, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    draws = np.maximum(sizes - 1, 0)
+    draw_starts = np.repeat(starts, draws)
+    draw_sizes = np.repeat(sizes, draws)
+    scale = np.where(sizes > 1, sizes / np.maximum(draws, 1), 1.0)[codes]
+    single = (sizes == 1)[codes]
+
+    rng = np.random.default_rng(seed)
+    factors = np.empty((replicates, n_households))
+    for replicate in range(replicates):
+        picked = draw_starts + (rng.random(len(draw_starts)) * draw_sizes).astype(
+            np.int64
+        )
+        counts = np.bincount(order[picked], minlength=n_households)
+        factors[replicate] = np.where(single, 1.0, counts * scale)
+
+    return ReplicateWeights(
+        method="bootstrap",
+        household_ids=household["household_id"].to_numpy(),
+        factors=factors,
+        variance_multiplier=1 / replicates,
+    )
+
+
+def _sylvester_hadamard(order: int) -> np.ndarray:
+    matrix = np.ones((1, 1))
+    while matrix.shape[0] < order:
+        matrix = np.block([[matrix, matrix], [matrix, -matrix]])
+    return matrix
+
+
+def successive_difference_replicate_weights(
+    entity_data: dict[str, MicroDataFrame],
+    *,
+    replicates: int = 64,
+    sort_by: Sequence[str] = (),
+) -> ReplicateWeights:
+    """Successive difference replicate weights (Fay and Train).
+
+    Households are ordered by ``sort_by`` (dataset order by default) and
+    paired with successive rows of a Hadamard matrix; household ``k`` gets
+    factor ``1 + 2**-1.5 * (H[a_k, r] - H[a_k + 1, r])`` in replicate ``r``.
+    This is the scheme behind the ACS and CPS replicate weights, so a
+    geographic sort order gives similar standard errors.
+
+    Args:
+        entity_data: Entity tables of the dataset.
+        replicates: Number of replicates, a power of two of at least 4.
+        sort_by: Household columns giving the successive-difference order.
+    """
+    if replicates < 4 or replicates & (replicates - 1):
+        raise ValueError(
+            f"replicates must be a power of two of at least 4, got {replicates}."
+        )
+    household = pd.DataFrame(entity_data["household"])
+    for variable in sort_by:
+        if variable not in household.columns:
+            raise ValueError(
+                f"Sort variable '{variable}' not found in household data. "
+                f"Available columns: {list(household.columns)}"
+            )
+    n_households = len(household)
+    order = (
+        np.lexsort([household[variable].to_numpy() for variable in reversed(sort_by)])
+        if sort_by
+        else np.arange(n_households)
+    )
+    # The first Hadamard row is all ones, so cycle through the others.
+    hadamard = _sylvester_hadamard(replicates)
+    rank = np.empty(n_households, dtype=np.int64)
+    rank[order] = np.arange(n_households)
+    first_rows = 1 + rank % (replicates - 1)
+    second_rows = 1 + (rank + 1) % (replicates - 1)
+    factors = 1 + 2**-1.5 * (hadamard[first_rows] - hadamard[second_rows]).T
+
+    return ReplicateWeights(
+        method="successive_difference",
+        household_ids=household["household_id"].to_numpy(),
+        factors=factors,
+        variance_multiplier=4 / replicates,
+    )
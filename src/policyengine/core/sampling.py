@@ -0,0 +1,257 @@
+"""Household-complete stratified subsamples for fast preview runs.
+
+A preview simulation runs on a small sample of households instead of the
+full dataset. :func:`stratified_household_sample` draws whole households
+(every member and every group entity they belong to) within strata such as
+state and income decile. It then rescales weights so that each stratum's
+weighted household total matches the full dataset. The returned
+:class:`SamplingDesign` records the strata so that outputs computed on the
+sample can report approximate standard errors.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from microdf import MicroDataFrame
+from pydantic import BaseModel, ConfigDict
+
+from policyengine.utils.household_partition import household_partition_index
+
+
+class SamplingDesign(BaseModel):
+    """How a household sample was drawn from its full dataset.
+
+    Stratum ``h`` held ``population_households[h]`` households, of which
+    ``sampled_households[h]`` were drawn by simple random sampling.
+    ``household_ids`` and ``household_strata`` give the stratum of every
+    sampled household.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    strata_variables: list[str]
+    income_variable: Optional[str] = None
+    income_groups: int = 0
+    seed: Optional[int] = None
+    stratum_labels: list[tuple]
+    population_households: np.ndarray
+    sampled_households: np.ndarray
+    household_ids: np.ndarray
+    household_strata: np.ndarray
+
+    @property
+    def sampling_fraction(self) -> float:
+        """Share of the full dataset's households in the sample."""
+        return float(self.sampled_households.sum() / self.population_households.sum())
+
+    def total_standard_error(
+        self,
+        household: pd.DataFrame,
+        variable: str,
+        weight_column: str = "household_weight",
+    ) -> float:
+        """Approximate standard error of the weighted total of ``variable``.
+
+        Uses the stratified estimator with a finite population correction,
+        treating each household's weighted value as one draw from its
+        stratum. Strata with a single sampled household contribute no
+        variance.
+
+        Args:
+            household: Household table of the sample or of a simulation run
+                on it (for example ``simulation.output_dataset.data.household``).
+            variable: Household-level column to total.
+            weight_column: Weight column of ``household``.
+        """
+        household = pd.DataFrame(household)
+        positions = pd.Index(self.household_ids).get_indexer(household["household_id"])
+        if (positions < 0).any():
+            raise ValueError(
+                "The household table contains households that are not in this "
+                "sample's design."
+            )
+        strata = self.household_strata[positions]
+        contributions = np.asarray(household[weight_column], dtype=float) * np.asarray(
+            household[variable], dtype=float
+        )
+        n_strata = len(self.population_households)
+        counts = np.bincount(strata, minlength=n_strata)
+        sums = np.bincount(strata, weights=contributions, minlength=n_strata)
+        means = np.divide(sums, counts, out=np.zeros(n_strata), where=counts > 0)
+        squares = np.bincount(
+            strata, weights=(contributions - means[strata]) ** 2, minlength=n_strata
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fpc = 1 - counts / self.population_households
+            variance = np.where(counts > 1, fpc * counts / (counts - 1) * squares, 0.0)
+        return float(np.sqrt(variance.sum()))
+
+
+def _weighted_quantile_groups(
+    values: np.ndarray, weights: np.ndarray, n_groups: int
+) -> np.ndarray:
+    order = np.argsort(values, kind="stable")
+    cumulative = np.cumsum(weights[order])
+    total = cumulative[-1] if len(cumulative) else 0.0
+    groups = np.zeros(len(values), dtype=np.int64)
+    if total > 0:
+        # Group by the weighted share of households below each one.
+        shares = (cumulative - weights[order]) / total
+        groups[order] = np.minimum((shares * n_groups).astype(np.int64), n_groups - 1)
+    return groups
+
+
+def stratified_household_sample(
+    entity_data: dict[str, MicroDataFrame],
+    *,
+    fraction: Optional[float] = None,
+    n_households: Optional[int] = None,
+    strata: Sequence[str] = (),
+    income_variable: Optional[str] = None,
+    income_groups: int = 10,
+    min_per_stratum: int = 2,
+    seed: Optional[int] = 0,
+) -> tuple[dict[str, MicroDataFrame], SamplingDesign]:
+    """Draw a household-complete stratified sample and reweight it.
+
+    Args:
+        entity_data: Entity tables of the full dataset (``YearData.entity_data``).
+        fraction: Share of households to draw. Give this or ``n_households``.
+        n_households: Number of households to draw, allocated to strata in
+            proportion to their size.
+        strata: Household columns whose value combinations form strata, for
+            example ``["state_fips"]``.
+        income_variable: Optional household or person column; households are
+            also stratified by weighted quantile group of its household total.
+        income_groups: Number of income quantile groups (10 for deciles).
+        min_per_stratum: Households drawn from every stratum (when it has that
+            many), so each stratum contributes to standard errors.
+        seed: Random seed; the same seed draws the same sample.
+
+    Returns:
+        The sampled entity tables, with each row's weight scaled by its
+        household's stratum factor, and the sampling design.
+
+    Raises:
+        ValueError: If the sample size is missing or invalid, or a stratum
+            variable is not in the household table.
+    """
+    if (fraction is None) == (n_households is None):
+        raise ValueError("Pass exactly one of fraction or n_households.")
+
+    household = pd.DataFrame(entity_data["household"])
+    person = pd.DataFrame(entity_data["person"])
+    group_entities = [name for name in entity_data if name != "person"]
+    index = household_partition_index(entity_data, group_entities)
+    n_total = len(household)
+    weights = np.asarray(household["household_weight"], dtype=float)
+
+    if n_households is None:
+        if not 0 < fraction <= 1:
+            raise ValueError(f"fraction must be in (0, 1], got {fraction}.")
+        n_households = int(round(fraction * n_total))
+    if not 0 < n_households <= n_total:
+        raise ValueError(
+            f"n_households must be between 1 and {n_total}, got {n_households}."
+        )
+
+    keys: dict[str, Any] = {}
+    for variable in strata:
+        if variable not in household.columns:
+            raise ValueError(
+                f"Stratum variable '{variable}' not found in household data. "
+                f"Available columns: {list(household.columns)}"
+            )
+        keys[variable] = household[variable].values
+    if income_variable is not None:
+        if income_variable in household.columns:
+            income = np.asarray(household[income_variable], dtype=float)
+        elif income_variable in person.columns:
+            positions = index.household_positions("person")
+            linked = positions >= 0
+            income = np.bincount(
+                positions[linked],
+                weights=np.asarray(person[income_variable], dtype=float)[linked],
+                minlength=n_total,
+            )
+        else:
+            raise ValueError(
+                f"Income variable '{income_variable}' not found in household "
+                f"or person data."
+            )
+        keys[f"{income_variable}_group"] = _weighted_quantile_groups(
+            income, weights, income_groups
+        )
+
+    if keys:
+        key_frame = pd.DataFrame(keys)
+        grouped = key_frame.groupby(list(keys), sort=True, dropna=False)
+        codes = grouped.ngroup().to_numpy()
+        labels = [
+            label if isinstance(label, tuple) else (label,)
+            for label in grouped.size().index
+        ]
+    else:
+        codes = np.zeros(n_total, dtype=np.int64)
+        labels = [()]
+
+    population = np.bincount(codes, minlength=len(labels))
+    allocation = np.round(n_households * population / n_total).astype(np.int64)
+    allocation = np.minimum(np.maximum(allocation, min_per_stratum), population)
+
+    # Simple random sample within each stratum: rank households by a random
+    # key inside their stratum and keep the first ``allocation`` of each.
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(n_total), codes))
+    starts = np.concatenate([[0], np.cumsum(population)[:-1]])
+    rank = np.empty(n_total, dtype=np.int64)
+    rank[order] = np.arange(n_total) - starts[codes[order]]
+    selected = rank < allocation[codes]
+
+    # Scale each stratum so its sampled weights sum to the full total.
+    full_weight = np.bincount(codes, weights=weights, minlength=len(labels))
+    sample_weight = np.bincount(
+        codes[selected], weights=weights[selected], minlength=len(labels)
+    )
+    fallback = population / np.maximum(allocation, 1)
+    stratum_factor = np.where(
+        sample_weight > 0,
+        full_weight / np.where(sample_weight > 0, sample_weight, 1.0),
+        fallback,
+    )
+    household_factor = stratum_factor[codes]
+
+    rows = index.entity_rows(selected)
+    sampled = {}
+    for entity, mdf in entity_data.items():
+        frame = pd.DataFrame(mdf)
+        if entity in rows:
+            entity_rows = rows[entity]
+            frame = frame.iloc[entity_rows].reset_index(drop=True)
+            weight_column = f"{entity}_weight"
+            if weight_column in frame.columns:
+                positions = index.household_positions(entity)[entity_rows]
+                factor = np.where(
+                    positions >= 0, household_factor[np.maximum(positions, 0)], 1.0
+                )
+                frame[weight_column] = frame[weight_column].to_numpy() * factor
+        weight_column = f"{entity}_weight"
+        sampled[entity] = MicroDataFrame(
+            frame,
+            weights=weight_column if weight_column in frame.columns else None,
+        )
+
+    design = SamplingDesign(
+        strata_variables=list(strata),
+        income_variable=income_variable,
+        income_groups=income_groups if income_variable is not None else 0,
+        seed=seed,
+        stratum_labels=labels,
+        population_households=population,
+        sampled_households=allocation,
+        household_ids=household["household_id"].to_numpy()[selected],
+        household_strata=codes[selected],
+    )
+    return sampled, design
@@ -15,8 +15,10 @@ Provides three concrete strategies for scoping datasets to sub-national regions:
 """
 
 import logging
+import os
 from abc import abstractmethod
-from typing import Annotated, Literal, Optional, Union
+from functools import lru_cache
+from typing import Annotated, Literal, NamedTuple, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -24,14 +26,76 @@ from microdf import MicroDataFrame
 from pydantic import BaseModel, Discriminator, Field
 
 from policyengine.utils.entity_utils import (
-    filter_dataset_by_household_ids,
+    filter_dataset_by_household_filters,
     filter_dataset_by_household_variable,
-    matching_household_ids,
 )
 
 logger = logging.getLogger(__name__)
 
 
+# Weight-matrix assets are read by path; cache entries are keyed by the file's
+# modification time and size as well, so rewritten assets are re-read.
+_ROW_CACHE_SIZE = 64
+
+
+class _RegionRowLookup(NamedTuple):
+    """Region code/name -> weight-matrix row, parsed once per lookup CSV."""
+
+    rows: dict[str, int]
+    columns: tuple[str, ...]
+
+
+def _file_signature(path: str) -> tuple[str, int, int]:
+    stat = os.stat(path)
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=16)
+def _cached_region_row_lookup(signature: tuple[str, int, int]) -> _RegionRowLookup:
+    lookup_df = pd.read_csv(signature[0])
+    rows: dict[str, int] = {}
+    # Codes take precedence over names, and the first matching row wins.
+    for column in ("code", "name"):
+        if column in lookup_df.columns:
+            for row, value in enumerate(lookup_df[column]):
+                rows.setdefault(value, row)
+                rows.setdefault(str(value), row)
+    return _RegionRowLookup(rows=rows, columns=tuple(lookup_df.columns))
+
+
+def _region_row_lookup(lookup_csv_path: str) -> _RegionRowLookup:
+    return _cached_region_row_lookup(_file_signature(lookup_csv_path))
+
+
+@lru_cache(maxsize=_ROW_CACHE_SIZE)
+def _cached_weight_matrix_row(
+    signature: tuple[str, int, int], year: int, row: int
+) -> np.ndarray:
+    # h5py is only needed here, so import lazily to keep
+    # `from policyengine.core import ...` light. Indexing the dataset with a
+    # single row reads just that hyperslab, never the full matrix. Handles are
+    # not kept open: an open HDF5 handle locks the file against rewrites.
+    import h5py
+
+    with h5py.File(signature[0], "r") as f:
+        weights = np.asarray(f[str(year)][row], dtype=float)
+    weights.setflags(write=False)
+    return weights
+
+
+def _read_weight_matrix_row(weight_matrix_path: str, year: int, row: int) -> np.ndarray:
+    """Return one region's household weights, cached process-wide."""
+    return _cached_weight_matrix_row(
+        _file_signature(weight_matrix_path), int(year), int(row)
+    )
+
+
+def clear_weight_matrix_cache() -> None:
+    """Drop cached weight-matrix rows and region lookups."""
+    _cached_region_row_lookup.cache_clear()
+    _cached_weight_matrix_row.cache_clear()
+
+
 class RegionScopingStrategy(BaseModel):
     """Base class for region scoping strategies.
 
@@ -121,18 +185,14 @@ class WeightReplacementStrategy(RegionScopingStrategy):
     region_code: str
     download_missing_assets: bool = True
 
-    def apply(
-        self,
-        entity_data: dict[str, MicroDataFrame],
-        group_entities: list[str],
-        year: int,
-    ) -> dict[str, MicroDataFrame]:
+    def resolve_asset_paths(self):
+        """Resolve the local weight matrix and lookup CSV paths."""
         from policyengine.data.uk_geography_assets import (
             UKGeographyAssetSpec,
             resolve_uk_geography_asset_paths,
         )
 
-        paths = resolve_uk_geography_asset_paths(
+        return resolve_uk_geography_asset_paths(
             UKGeographyAssetSpec(
                 geography_type="weight replacement",
                 weight_matrix_filename=self.weight_matrix_key,
@@ -144,30 +204,31 @@ class WeightReplacementStrategy(RegionScopingStrategy):
             download_missing_assets=self.download_missing_assets,
         )
 
-        lookup_df = pd.read_csv(paths.lookup_csv_path)
-
-        region_id = self._find_region_index(lookup_df, self.region_code)
-
-        # Load weight matrix and extract weights for this region.
-        # h5py is only needed here, so import lazily to keep
-        # `from policyengine.core import ...` light.
-        import h5py
-
-        with h5py.File(paths.weight_matrix_path, "r") as f:
-            weights = f[str(year)][...]
-
-        region_weights = weights[region_id]
+    def apply(
+        self,
+        entity_data: dict[str, MicroDataFrame],
+        group_entities: list[str],
+        year: int,
+    ) -> dict[str, MicroDataFrame]:
+        paths = self.resolve_asset_paths()
+        region_id = self._find_region_index(
+            _region_row_lookup(paths.lookup_csv_path), self.region_code
+        )
+        region_weights = _read_weight_matrix_row(
+            paths.weight_matrix_path, year, region_id
+        )
 
         # Validate weight row length matches household count
-        household_df = pd.DataFrame(entity_data["household"]).copy()
-        if len(region_weights) != len(household_df):
+        household_ids = np.asarray(entity_data["household"]["household_id"])
+        if len(region_weights) != len(household_ids):
             raise ValueError(
                 f"Weight matrix row length ({len(region_weights)}) does not match "
-                f"household count ({len(household_df)}) for region '{self.region_code}'. "
+                f"household count ({len(household_ids)}) for region '{self.region_code}'. "
                 f"The weight matrix may be out of date."
             )
 
         # Replace household weights
+        household_index = pd.Index(household_ids)
         result = {}
         for entity_name, mdf in entity_data.items():
             df = pd.DataFrame(mdf).copy()
@@ -178,21 +239,15 @@ class WeightReplacementStrategy(RegionScopingStrategy):
                 weight_col = f"{entity_name}_weight"
                 if weight_col in df.columns:
                     # Map new household weights to sub-entities via their
-                    # household membership. Build a mapping from household_id
-                    # to new weight.
-                    hh_ids = household_df["household_id"].values
-                    weight_map = dict(zip(hh_ids, region_weights))
-
-                    # Find the entity's household ID column
+                    # household membership: one integer position per row.
                     person_hh_col = self._find_household_id_column(df, entity_name)
                     if person_hh_col:
-                        new_weights = np.array(
-                            [
-                                weight_map.get(hh_id, 0.0)
-                                for hh_id in df[person_hh_col].values
-                            ]
+                        positions = household_index.get_indexer(df[person_hh_col])
+                        df.loc[:, weight_col] = np.where(
+                            positions >= 0,
+                            region_weights[positions],
+                            0.0,
                         )
-                        df.loc[:, weight_col] = new_weights
 
                 result[entity_name] = MicroDataFrame(
                     df,
@@ -206,11 +261,21 @@ class WeightReplacementStrategy(RegionScopingStrategy):
         return result
 
     @staticmethod
-    def _find_region_index(lookup_df: pd.DataFrame, region_code: str) -> int:
+    def _find_region_index(
+        lookup_df: Union[pd.DataFrame, "_RegionRowLookup"], region_code: str
+    ) -> int:
         """Find the row index for a region in the lookup CSV.
 
         Searches by 'code' column first, then 'name' column.
         """
+        if isinstance(lookup_df, _RegionRowLookup):
+            if region_code in lookup_df.rows:
+                return lookup_df.rows[region_code]
+            raise ValueError(
+                f"Region '{region_code}' not found in lookup CSV. "
+                f"Available columns: {list(lookup_df.columns)}. "
+                f"Searched 'code' and 'name' columns."
+            )
         if "code" in lookup_df.columns and region_code in lookup_df["code"].values:
             return lookup_df[lookup_df["code"] == region_code].index[0]
         if "name" in lookup_df.columns and region_code in lookup_df["name"].values:
@@ -257,16 +322,16 @@ class RegionGroupStrategy(RegionScopingStrategy):
         group_entities: list[str],
         year: int,
     ) -> dict[str, MicroDataFrame]:
-        keep_household_ids: set = set()
-        for member in self.members:
-            keep_household_ids |= matching_household_ids(
-                entity_data,
-                member.variable_name,
-                member.variable_value,
-                member.additional_filters,
-            )
-        return filter_dataset_by_household_ids(
-            entity_data, group_entities, keep_household_ids
+        return filter_dataset_by_household_filters(
+            entity_data,
+            group_entities,
+            [
+                {
+                    member.variable_name: member.variable_value,
+                    **member.additional_filters,
+                }
+                for member in self.members
+            ],
         )
 
     @property
@@ -3,10 +3,13 @@ from datetime import datetime
 from typing import Any, Optional, Union
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+
+from policyengine import tracing
 
 from .cache import LRUCache
 from .dataset import Dataset
+from .dtype_policy import DtypePolicy
 from .dynamic import Dynamic
 from .policy import Policy
 from .scoping_strategy import ScopingStrategy
@@ -87,10 +90,23 @@ class Simulation(BaseModel):
         ),
     )
 
+    dtype_policy: Optional[DtypePolicy] = Field(
+        default=None,
+        description=(
+            "Narrow the output dataset's column dtypes (exact float32, "
+            "categorical enums, small integers) before it is held or saved. "
+            "``None`` keeps the arrays the country package returns."
+        ),
+    )
+
     tax_benefit_model_version: TaxBenefitModelVersion = None
 
     output_dataset: Optional[Dataset] = None
 
+    # Set by use_assembled_output(): the output dataset was built outside
+    # run() and is used by ensure() as it is.
+    _assembled_output: bool = PrivateAttr(default=False)
+
     @model_validator(mode="after")
     def _compile_dict_reforms(self) -> "Simulation":
         """Coerce dict ``policy`` / ``dynamic`` inputs into proper objects.
@@ -127,37 +143,66 @@ class Simulation(BaseModel):
             )
         return self
 
+    def _span(self, name: str):
+        return tracing.span(
+            name,
+            simulation_id=self.id,
+            model_version=getattr(self.tax_benefit_model_version, "version", None),
+            dataset_id=getattr(self.dataset, "id", None),
+        )
+
     def run(self):
-        self.tax_benefit_model_version.run(self)
+        with self._span("policyengine.simulation.run"):
+            self.tax_benefit_model_version.run(self)
+
+    def use_assembled_output(self, output_dataset: Dataset) -> None:
+        """Attach an output dataset built outside ``run()``.
+
+        Progressive analysis combines the outputs of earlier, smaller runs
+        into one stage's output. ``ensure()`` then returns without loading,
+        running, saving or caching, so the assembled output is kept.
+        """
+        self.output_dataset = output_dataset
+        self._assembled_output = True
 
     def ensure(self):
-        cached_result = _cache.get(self.id)
-        if cached_result:
-            self.output_dataset = cached_result.output_dataset
-            return
-        try:
-            self.tax_benefit_model_version.load(self)
-        except FileNotFoundError:
-            self.run()
-            self.save()
-        except Exception:
-            logger.warning(
-                "Unexpected error loading simulation %s; falling back to run()",
-                self.id,
-                exc_info=True,
-            )
-            self.run()
-            self.save()
+        with self._span("policyengine.simulation.ensure") as span:
+            if self._assembled_output:
+                span.set_attribute("source", "assembled")
+                return
+            cached_result = _cache.get(self.id)
+            if cached_result:
+                self.output_dataset = cached_result.output_dataset
+                span.set_attribute("source", "cache")
+                return
+            try:
+                self.load()
+                span.set_attribute("source", "disk")
+            except FileNotFoundError:
+                self.run()
+                self.save()
+                span.set_attribute("source", "run")
+            except Exception:
+                logger.warning(
+                    "Unexpected error loading simulation %s; falling back to run()",
+                    self.id,
+                    exc_info=True,
+                )
+                self.run()
+                self.save()
+                span.set_attribute("source", "run")
 
-        _cache.add(self.id, self)
+            _cache.add(self.id, self)
 
     def save(self):
         """Save the simulation's output dataset."""
-        self.tax_benefit_model_version.save(self)
+        with self._span("policyengine.simulation.save"):
+            self.tax_benefit_model_version.save(self)
 
     def load(self):
         """Load the simulation's output dataset."""
-        self.tax_benefit_model_version.load(self)
+        with self._span("policyengine.simulation.load"):
+            self.tax_benefit_model_version.load(self)
 
     def write_run_record(self, directory, **kwargs):
         """Write a citable, offline-verifiable run record directory.
@@ -1,7 +1,12 @@
 from policyengine.core import Output, OutputCollection
-from policyengine.outputs.aggregate import Aggregate, AggregateType
+from policyengine.outputs.aggregate import (
+    Aggregate,
+    AggregatePartial,
+    AggregateType,
+)
 from policyengine.outputs.change_aggregate import (
     ChangeAggregate,
+    ChangeAggregatePartial,
     ChangeAggregateType,
 )
 from policyengine.outputs.cliff_impact import (
@@ -20,15 +25,27 @@ from policyengine.outputs.constituency_impact import (
 )
 from policyengine.outputs.decile_impact import (
     DecileImpact,
+    DecileImpactPartial,
     calculate_decile_impacts,
 )
+from policyengine.outputs.geography_impact import (
+    GeographyImpact,
+    GroupedIncomeImpacts,
+    compute_geography_impacts,
+    compute_grouped_income_impacts,
+    compute_us_state_impacts,
+)
 from policyengine.outputs.inequality import (
     UK_INEQUALITY_INCOME_VARIABLE,
     US_INEQUALITY_INCOME_VARIABLE,
     Inequality,
+    InequalityPartial,
     USInequalityPreset,
     calculate_uk_inequality,
+    calculate_uk_inequality_batch,
     calculate_us_inequality,
+    calculate_us_inequality_batch,
+    run_inequality_batch,
 )
 from policyengine.outputs.intra_decile_impact import (
     IntraDecileImpact,
@@ -45,6 +62,7 @@ from policyengine.outputs.local_authority_impact import (
     LocalAuthorityImpact,
     compute_uk_local_authority_impacts,
 )
+from policyengine.outputs.partial import QuantileSketch, merge_partials
 from policyengine.outputs.poverty import (
     AGE_GROUPS,
     GENDER_GROUPS,
@@ -52,6 +70,7 @@ from policyengine.outputs.poverty import (
     UK_POVERTY_VARIABLES,
     US_POVERTY_VARIABLES,
     Poverty,
+    PovertyPartial,
     UKPovertyType,
     USPovertyType,
     calculate_uk_poverty_by_age,
@@ -67,6 +86,20 @@ from policyengine.outputs.program_statistics import (
     build_program_statistics,
     validate_program_statistics_config,
 )
+from policyengine.outputs.region_decomposition import (
+    RegionDecomposition,
+    RegionNotDerivableError,
+    decompose_by_region,
+    decompose_output_by_region,
+    simulation_for_region,
+)
+from policyengine.outputs.region_weight_matrix import (
+    RegionWeightMatrix,
+    RegionWeightMatrixImpact,
+    compute_region_weight_matrix_impacts,
+    load_region_weight_matrix,
+    region_weight_matrix_for_strategy,
+)
 from policyengine.outputs.uk_geography_assets import (
     CONSTITUENCY_ASSET_SPEC,
     LOCAL_AUTHORITY_ASSET_SPEC,
@@ -84,13 +117,18 @@ __all__ = [
     "OutputCollection",
     "Aggregate",
     "AggregateType",
+    "AggregatePartial",
     "ChangeAggregate",
     "ChangeAggregateType",
+    "ChangeAggregatePartial",
+    "QuantileSketch",
+    "merge_partials",
     "CliffImpact",
     "CliffImpactInSimulation",
     "calculate_cliff_impact",
     "configure_cliff_impact_variables",
     "DecileImpact",
+    "DecileImpactPartial",
     "calculate_decile_impacts",
     "ProgramStatistics",
     "build_program_statistics",
@@ -103,6 +141,7 @@ __all__ = [
     "configure_labor_supply_response_variables",
     "labor_supply_response_is_active",
     "Poverty",
+    "PovertyPartial",
     "UKPovertyType",
     "USPovertyType",
     "UK_POVERTY_VARIABLES",
@@ -118,13 +157,32 @@ __all__ = [
     "GENDER_GROUPS",
     "RACE_GROUPS",
     "Inequality",
+    "InequalityPartial",
     "USInequalityPreset",
     "UK_INEQUALITY_INCOME_VARIABLE",
     "US_INEQUALITY_INCOME_VARIABLE",
     "calculate_uk_inequality",
     "calculate_us_inequality",
+    "calculate_uk_inequality_batch",
+    "calculate_us_inequality_batch",
+    "run_inequality_batch",
     "CongressionalDistrictImpact",
     "compute_us_congressional_district_impacts",
+    "GeographyImpact",
+    "GroupedIncomeImpacts",
+    "compute_geography_impacts",
+    "compute_grouped_income_impacts",
+    "compute_us_state_impacts",
+    "RegionDecomposition",
+    "RegionNotDerivableError",
+    "decompose_by_region",
+    "decompose_output_by_region",
+    "simulation_for_region",
+    "RegionWeightMatrix",
+    "RegionWeightMatrixImpact",
+    "compute_region_weight_matrix_impacts",
+    "load_region_weight_matrix",
+    "region_weight_matrix_for_strategy",
     "ConstituencyImpact",
     "compute_uk_constituency_impacts",
     "LocalAuthorityImpact",
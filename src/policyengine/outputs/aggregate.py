@@ -2,7 +2,12 @@ from difflib import get_close_matches
 from enum import Enum
 from typing import Any, Optional
 
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
 from policyengine.core import Output, Simulation, Variable
+from policyengine.core.replicate_weights import simulation_replicate_weights
+from policyengine.outputs.partial import DEFAULT_MAX_CENTROIDS, QuantileSketch
 
 
 class AggregateType(str, Enum):
@@ -77,6 +82,155 @@ def require_output_column(
     )
 
 
+def quantile_filter_thresholds(
+    filter_variable_eq: Optional[Any],
+    filter_variable_leq: Optional[Any],
+    filter_variable_geq: Optional[Any],
+) -> list[tuple[str, float]]:
+    """Quantile filters as ``(comparison, quantile)`` pairs.
+
+    ``filter_variable_eq`` keeps rows at or below its quantile, as the
+    inline filters always have.
+    """
+    thresholds = []
+    if filter_variable_eq is not None:
+        thresholds.append(("leq", filter_variable_eq))
+    if filter_variable_leq is not None:
+        thresholds.append(("leq", filter_variable_leq))
+    if filter_variable_geq is not None:
+        thresholds.append(("geq", filter_variable_geq))
+    return thresholds
+
+
+def filter_mask(
+    filter_series: Any,
+    *,
+    filter_variable_eq: Optional[Any],
+    filter_variable_leq: Optional[Any],
+    filter_variable_geq: Optional[Any],
+    describes_quantiles: bool,
+) -> np.ndarray:
+    """Boolean row mask for an output's ``filter_variable`` settings."""
+    mask = np.ones(len(filter_series), dtype=bool)
+    if describes_quantiles:
+        for comparison, quantile in quantile_filter_thresholds(
+            filter_variable_eq, filter_variable_leq, filter_variable_geq
+        ):
+            threshold = filter_series.quantile(quantile)
+            if comparison == "leq":
+                mask &= np.asarray(filter_series <= threshold)
+            else:
+                mask &= np.asarray(filter_series >= threshold)
+        return mask
+    if filter_variable_eq is not None:
+        mask &= np.asarray(filter_series == filter_variable_eq)
+    if filter_variable_leq is not None:
+        mask &= np.asarray(filter_series <= filter_variable_leq)
+    if filter_variable_geq is not None:
+        mask &= np.asarray(filter_series >= filter_variable_geq)
+    return mask
+
+
+def _weighted_columns(series: Any) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Values (NaN as zero), non-NaN indicator and weights of a MicroSeries."""
+    values = np.asarray(series, dtype=float)
+    present = ~np.isnan(values)
+    return np.where(present, values, 0.0), present, np.asarray(series.weights)
+
+
+class AggregatePartial(BaseModel):
+    """Mergeable state of an :class:`Aggregate` or :class:`ChangeAggregate`.
+
+    Holds weighted sums and counts of the filtered rows. With a quantile
+    filter, rows are instead summarised in a sketch keyed by the filter
+    variable, whose payloads are each row's weighted value and weight, and
+    thresholds are read from the merged sketch.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    output_fields: dict[str, Any]
+    weighted_sum: float = 0.0
+    weighted_count: float = 0.0
+    filter_sketch: Optional[QuantileSketch] = None
+
+    def merge(self, other: "AggregatePartial") -> "AggregatePartial":
+        if self.output_fields != other.output_fields:
+            raise ValueError("Cannot merge partial states of different outputs.")
+        filter_sketch = None
+        if self.filter_sketch is not None and other.filter_sketch is not None:
+            filter_sketch = self.filter_sketch.merge(other.filter_sketch)
+        return type(self)(
+            output_fields=self.output_fields,
+            weighted_sum=self.weighted_sum + other.weighted_sum,
+            weighted_count=self.weighted_count + other.weighted_count,
+            filter_sketch=filter_sketch,
+        )
+
+    def result(self) -> float:
+        """The aggregate of the merged rows."""
+        weighted_sum, weighted_count = self.weighted_sum, self.weighted_count
+        if self.filter_sketch is not None:
+            sketch = self.filter_sketch
+            keep = np.ones(len(sketch.keys), dtype=bool)
+            for comparison, quantile in quantile_filter_thresholds(
+                self.output_fields.get("filter_variable_eq"),
+                self.output_fields.get("filter_variable_leq"),
+                self.output_fields.get("filter_variable_geq"),
+            ):
+                threshold = sketch.quantile(quantile)
+                if comparison == "leq":
+                    keep &= sketch.keys <= threshold
+                else:
+                    keep &= sketch.keys >= threshold
+            weighted_sum, weighted_count = sketch.payloads[keep].sum(axis=0)
+        aggregate_type = self.output_fields["aggregate_type"]
+        if aggregate_type == AggregateType.SUM:
+            return float(weighted_sum)
+        if aggregate_type == AggregateType.COUNT:
+            return float(weighted_count)
+        return float(weighted_sum / weighted_count) if weighted_count else float("nan")
+
+    def to_output(self) -> "Aggregate":
+        """Build the output (without a simulation) from the merged state."""
+        return Aggregate.model_construct(**self.output_fields, result=self.result())
+
+
+def aggregate_partial(
+    output_fields: dict[str, Any],
+    series: Any,
+    mask: np.ndarray,
+    quantile_filter_series: Optional[Any] = None,
+    partial_type: type[AggregatePartial] = AggregatePartial,
+    max_centroids: int = DEFAULT_MAX_CENTROIDS,
+) -> AggregatePartial:
+    """Partial state of the ``series`` rows selected by ``mask``.
+
+    ``mask`` holds every filter except a quantile filter; when
+    ``quantile_filter_series`` is given, every row of it keys the sketch
+    (so shard thresholds match the full run) and unselected rows carry
+    zero payloads.
+    """
+    values, present, weights = _weighted_columns(series)
+    weighted_values = np.where(mask, weights * values, 0.0)
+    weighted_present = np.where(mask & present, weights, 0.0)
+    if quantile_filter_series is not None:
+        return partial_type(
+            output_fields=output_fields,
+            filter_sketch=QuantileSketch.from_values(
+                np.asarray(quantile_filter_series, dtype=float),
+                np.asarray(quantile_filter_series.weights),
+                np.column_stack([weighted_values, weighted_present]),
+                max_centroids=max_centroids,
+            ),
+        )
+    return partial_type(
+        output_fields=output_fields,
+        weighted_sum=float(weighted_values.sum()),
+        weighted_count=float(weighted_present.sum()),
+    )
+
+
 class Aggregate(Output):
     simulation: Simulation
     variable: str
@@ -100,8 +254,11 @@ class Aggregate(Output):
     quantile_geq: Optional[int] = None  # Minimum quantile (e.g., 9 for top 2 deciles)
 
     result: Optional[Any] = None
+    # Set by run() when the simulation's dataset has replicate weights.
+    standard_error: Optional[float] = None
 
-    def run(self):
+    def _series_and_filter(self) -> tuple[str, Any, Optional[Any]]:
+        """Return the target entity, the variable and the filter variable."""
         # Convert quantile specification to describes_quantiles format
         if self.quantile is not None:
             self.filter_variable_describes_quantiles = True
@@ -150,58 +307,53 @@ class Aggregate(Output):
             )
             series = data[self.variable]
 
-        # Apply filters
-        if self.filter_variable is not None:
-            filter_var_obj = get_aggregate_variable(
-                self.simulation, self.filter_variable, "Aggregate.filter_variable"
+        if self.filter_variable is None:
+            return target_entity, series, None
+
+        filter_var_obj = get_aggregate_variable(
+            self.simulation, self.filter_variable, "Aggregate.filter_variable"
+        )
+        if filter_var_obj.entity != target_entity:
+            filter_source_data = get_output_entity_data(
+                self.simulation,
+                filter_var_obj.entity,
+                "Aggregate.filter_variable",
+            )
+            require_output_column(
+                filter_source_data,
+                self.filter_variable,
+                filter_var_obj.entity,
+                self.simulation,
+                "Aggregate.filter_variable",
+            )
+            filter_mapped = self.simulation.output_dataset.data.map_to_entity(
+                filter_var_obj.entity,
+                target_entity,
+                columns=[self.filter_variable],
             )
+            return target_entity, series, filter_mapped[self.filter_variable]
 
-            if filter_var_obj.entity != target_entity:
-                filter_source_data = get_output_entity_data(
-                    self.simulation,
-                    filter_var_obj.entity,
-                    "Aggregate.filter_variable",
-                )
-                require_output_column(
-                    filter_source_data,
-                    self.filter_variable,
-                    filter_var_obj.entity,
-                    self.simulation,
-                    "Aggregate.filter_variable",
-                )
-                filter_mapped = self.simulation.output_dataset.data.map_to_entity(
-                    filter_var_obj.entity,
-                    target_entity,
-                    columns=[self.filter_variable],
-                )
-                filter_series = filter_mapped[self.filter_variable]
-            else:
-                require_output_column(
-                    data,
-                    self.filter_variable,
-                    target_entity,
-                    self.simulation,
-                    "Aggregate.filter_variable",
-                )
-                filter_series = data[self.filter_variable]
+        require_output_column(
+            data,
+            self.filter_variable,
+            target_entity,
+            self.simulation,
+            "Aggregate.filter_variable",
+        )
+        return target_entity, series, data[self.filter_variable]
 
-            if self.filter_variable_describes_quantiles:
-                if self.filter_variable_eq is not None:
-                    threshold = filter_series.quantile(self.filter_variable_eq)
-                    series = series[filter_series <= threshold]
-                if self.filter_variable_leq is not None:
-                    threshold = filter_series.quantile(self.filter_variable_leq)
-                    series = series[filter_series <= threshold]
-                if self.filter_variable_geq is not None:
-                    threshold = filter_series.quantile(self.filter_variable_geq)
-                    series = series[filter_series >= threshold]
-            else:
-                if self.filter_variable_eq is not None:
-                    series = series[filter_series == self.filter_variable_eq]
-                if self.filter_variable_leq is not None:
-                    series = series[filter_series <= self.filter_variable_leq]
-                if self.filter_variable_geq is not None:
-                    series = series[filter_series >= self.filter_variable_geq]
+    def run(self):
+        target_entity, series, filter_series = self._series_and_filter()
+        if filter_series is not None:
+            series = series[
+                filter_mask(
+                    filter_series,
+                    filter_variable_eq=self.filter_variable_eq,
+                    filter_variable_leq=self.filter_variable_leq,
+                    filter_variable_geq=self.filter_variable_geq,
+                    describes_quantiles=self.filter_variable_describes_quantiles,
+                )
+            ]
 
         # Aggregate - MicroSeries will automatically apply weights
         if self.aggregate_type == AggregateType.SUM:
@@ -210,3 +362,64 @@ class Aggregate(Output):
             self.result = series.mean()
         elif self.aggregate_type == AggregateType.COUNT:
             self.result = series.count()
+
+        self.standard_error = replicate_standard_error(
+            self.simulation, target_entity, series, self.aggregate_type, self.result
+        )
+
+    def partial(self, max_centroids: int = DEFAULT_MAX_CENTROIDS) -> AggregatePartial:
+        """Return this output's mergeable state for the simulation's shard.
+
+        Merge the states of every shard with
+        :func:`~policyengine.outputs.partial.merge_partials` and call
+        ``to_output()`` for the combined result.
+        """
+        _, series, filter_series = self._series_and_filter()
+        mask = np.ones(len(series), dtype=bool)
+        quantile_filter_series = None
+        if filter_series is not None:
+            if self.filter_variable_describes_quantiles:
+                quantile_filter_series = filter_series
+            else:
+                mask = filter_mask(
+                    filter_series,
+                    filter_variable_eq=self.filter_variable_eq,
+                    filter_variable_leq=self.filter_variable_leq,
+                    filter_variable_geq=self.filter_variable_geq,
+                    describes_quantiles=False,
+                )
+        return aggregate_partial(
+            self.model_dump(exclude={"simulation", "result", "standard_error"}),
+            series,
+            mask,
+            quantile_filter_series,
+            max_centroids=max_centroids,
+        )
+
+
+def replicate_standard_error(
+    simulation: Simulation,
+    entity: str,
+    series: Any,
+    aggregate_type: str,
+    result: Any,
+) -> Optional[float]:
+    """Replicate-weight standard error of a sum, mean or count of ``series``.
+
+    Returns ``None`` when the simulation's dataset has no replicate weights.
+    Quantile filter thresholds stay at their full-sample values.
+    """
+    replicate_weights = simulation_replicate_weights(simulation)
+    if replicate_weights is None:
+        return None
+    sums, counts = replicate_weights.series_totals(
+        simulation.output_dataset.data.entity_data, entity, series
+    )
+    if aggregate_type == AggregateType.SUM:
+        replicates = sums
+    elif aggregate_type == AggregateType.COUNT:
+        replicates = counts
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            replicates = sums / counts
+    return replicate_weights.standard_error(float(result), replicates)
@@ -1,12 +1,19 @@
 from enum import Enum
 from typing import Any, Optional
 
+import numpy as np
+
 from policyengine.core import Output, Simulation
 from policyengine.outputs.aggregate import (
+    AggregatePartial,
+    aggregate_partial,
+    filter_mask,
     get_aggregate_variable,
     get_output_entity_data,
+    replicate_standard_error,
     require_output_column,
 )
+from policyengine.outputs.partial import DEFAULT_MAX_CENTROIDS
 
 
 class ChangeAggregateType(str, Enum):
@@ -15,6 +22,16 @@ class ChangeAggregateType(str, Enum):
     MEAN = "mean"
 
 
+class ChangeAggregatePartial(AggregatePartial):
+    """Mergeable state of a :class:`ChangeAggregate`."""
+
+    def to_output(self) -> "ChangeAggregate":
+        """Build the output (without simulations) from the merged state."""
+        return ChangeAggregate.model_construct(
+            **self.output_fields, result=self.result()
+        )
+
+
 class ChangeAggregate(Output):
     baseline_simulation: Simulation
     reform_simulation: Simulation
@@ -50,8 +67,16 @@ class ChangeAggregate(Output):
     quantile_geq: Optional[int] = None  # Minimum quantile (e.g., 9 for top 2 deciles)
 
     result: Optional[Any] = None
+    # Set by run() when the baseline dataset has replicate weights.
+    standard_error: Optional[float] = None
 
-    def run(self):
+    def _prepare(self) -> tuple[str, Any, np.ndarray, Optional[Any]]:
+        """Return the target entity, the change, the row mask and the
+        quantile filter variable.
+
+        The mask holds every filter except a quantile filter, which is
+        left to the caller so that partial states can defer its thresholds.
+        """
         # Convert quantile specification to describes_quantiles format
         if self.quantile is not None:
             self.filter_variable_describes_quantiles = True
@@ -141,8 +166,6 @@ class ChangeAggregate(Output):
 
         # Calculate relative change (handling division by zero)
         # Where baseline is 0, relative change is undefined; we'll mask these out if relative filters are used
-        import numpy as np
-
         with np.errstate(divide="ignore", invalid="ignore"):
             relative_change_series = change_series / baseline_series
             relative_change_series = relative_change_series.replace(
@@ -150,23 +173,23 @@ class ChangeAggregate(Output):
             )
 
         # Start with all rows
-        mask = baseline_series.notna()
+        mask = np.array(baseline_series.notna(), dtype=bool)
 
         # Apply absolute change filters
         if self.change_eq is not None:
-            mask &= change_series == self.change_eq
+            mask &= np.asarray(change_series == self.change_eq)
         if self.change_leq is not None:
-            mask &= change_series <= self.change_leq
+            mask &= np.asarray(change_series <= self.change_leq)
         if self.change_geq is not None:
-            mask &= change_series >= self.change_geq
+            mask &= np.asarray(change_series >= self.change_geq)
 
         # Apply relative change filters
         if self.relative_change_eq is not None:
-            mask &= relative_change_series == self.relative_change_eq
+            mask &= np.asarray(relative_change_series == self.relative_change_eq)
         if self.relative_change_leq is not None:
-            mask &= relative_change_series <= self.relative_change_leq
+            mask &= np.asarray(relative_change_series <= self.relative_change_leq)
         if self.relative_change_geq is not None:
-            mask &= relative_change_series >= self.relative_change_geq
+            mask &= np.asarray(relative_change_series >= self.relative_change_geq)
 
         # Apply filter_variable filters
         if self.filter_variable is not None:
@@ -208,22 +231,27 @@ class ChangeAggregate(Output):
                 filter_series = baseline_data[self.filter_variable]
 
             if self.filter_variable_describes_quantiles:
-                if self.filter_variable_eq is not None:
-                    threshold = filter_series.quantile(self.filter_variable_eq)
-                    mask &= filter_series <= threshold
-                if self.filter_variable_leq is not None:
-                    threshold = filter_series.quantile(self.filter_variable_leq)
-                    mask &= filter_series <= threshold
-                if self.filter_variable_geq is not None:
-                    threshold = filter_series.quantile(self.filter_variable_geq)
-                    mask &= filter_series >= threshold
-            else:
-                if self.filter_variable_eq is not None:
-                    mask &= filter_series == self.filter_variable_eq
-                if self.filter_variable_leq is not None:
-                    mask &= filter_series <= self.filter_variable_leq
-                if self.filter_variable_geq is not None:
-                    mask &= filter_series >= self.filter_variable_geq
+                return target_entity, change_series, mask, filter_series
+            mask &= filter_mask(
+                filter_series,
+                filter_variable_eq=self.filter_variable_eq,
+                filter_variable_leq=self.filter_variable_leq,
+                filter_variable_geq=self.filter_variable_geq,
+                describes_quantiles=False,
+            )
+
+        return target_entity, change_series, mask, None
+
+    def run(self):
+        target_entity, change_series, mask, quantile_filter_series = self._prepare()
+        if quantile_filter_series is not None:
+            mask &= filter_mask(
+                quantile_filter_series,
+                filter_variable_eq=self.filter_variable_eq,
+                filter_variable_leq=self.filter_variable_leq,
+                filter_variable_geq=self.filter_variable_geq,
+                describes_quantiles=True,
+            )
 
         # Apply mask to get filtered data
         filtered_change = change_series[mask]
@@ -235,3 +263,35 @@ class ChangeAggregate(Output):
             self.result = filtered_change.sum()
         elif self.aggregate_type == ChangeAggregateType.MEAN:
             self.result = filtered_change.mean()
+
+        self.standard_error = replicate_standard_error(
+            self.baseline_simulation,
+            target_entity,
+            filtered_change,
+            self.aggregate_type.value,
+            self.result,
+        )
+
+    def partial(
+        self, max_centroids: int = DEFAULT_MAX_CENTROIDS
+    ) -> ChangeAggregatePartial:
+        """Return this output's mergeable state for the simulations' shard.
+
+        Both simulations must cover the same shard of households.
+        """
+        _, change_series, mask, quantile_filter_series = self._prepare()
+        return aggregate_partial(
+            self.model_dump(
+                exclude={
+                    "baseline_simulation",
+                    "reform_simulation",
+                    "result",
+                    "standard_error",
+                }
+            ),
+            change_series,
+            mask,
+            quantile_filter_series,
+            partial_type=ChangeAggregatePartial,
+            max_centroids=max_centroids,
+        )
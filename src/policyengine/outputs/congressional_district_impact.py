@@ -2,10 +2,12 @@
 
 from typing import TYPE_CHECKING, Optional
 
-import numpy as np
 from pydantic import ConfigDict
 
 from policyengine.core import Output
+from policyengine.outputs.geography_impact import (
+    grouped_income_impacts_for_simulations,
+)
 
 if TYPE_CHECKING:
     from policyengine.core.simulation import Simulation
@@ -30,80 +32,23 @@ class CongressionalDistrictImpact(Output):
 
     def run(self) -> None:
         """Group households by geoid and compute per-district metrics."""
-        baseline_hh = self.baseline_simulation.output_dataset.data.household
-        reform_hh = self.reform_simulation.output_dataset.data.household
-
-        geoids = baseline_hh["congressional_district_geoid"].values
-        baseline_income = baseline_hh["household_net_income"].values
-        reform_income = reform_hh["household_net_income"].values
-        weights = baseline_hh["household_weight"].values
-        household_count_people = (
-            baseline_hh["household_count_people"].values
-            if "household_count_people" in baseline_hh.columns
-            else np.ones_like(weights)
+        impacts = grouped_income_impacts_for_simulations(
+            self.baseline_simulation,
+            self.reform_simulation,
+            "congressional_district_geoid",
+            # Only include valid geoids (positive integers)
+            positive_keys_only=True,
         )
 
-        # Only include valid geoids (positive integers)
-        unique_geoids = np.unique(geoids[geoids > 0])
-
         results: list[dict] = []
-        for geoid in unique_geoids:
-            mask = geoids == geoid
-            w = weights[mask]
-            total_weight = float(w.sum())
-            if total_weight == 0:
-                continue
-
-            b_inc = baseline_income[mask]
-            r_inc = reform_income[mask]
-            people_weights = household_count_people[mask] * w
-
-            weighted_baseline = float((b_inc * w).sum())
-            weighted_reform = float((r_inc * w).sum())
-
-            avg_change = (weighted_reform - weighted_baseline) / total_weight
-            rel_change = (
-                (weighted_reform / weighted_baseline - 1.0)
-                if weighted_baseline != 0
-                else 0.0
-            )
-            capped_baseline = np.maximum(b_inc, 1.0)
-            income_change = (r_inc - b_inc) / capped_baseline
-            people_total = float(people_weights.sum())
-
-            if people_total == 0:
-                winner_percentage = 0.0
-                loser_percentage = 0.0
-                no_change_percentage = 1.0
-            else:
-                winner_percentage = float(
-                    people_weights[income_change > 1e-3].sum() / people_total
-                )
-                loser_percentage = float(
-                    people_weights[income_change <= -1e-3].sum() / people_total
-                )
-                no_change_percentage = float(
-                    people_weights[
-                        (income_change > -1e-3) & (income_change <= 1e-3)
-                    ].sum()
-                    / people_total
-                )
-
-            geoid_int = int(geoid)
-            state_fips = geoid_int // 100
-            district_number = geoid_int % 100
-
+        for record in impacts.records():
+            geoid_int = int(record.pop("key"))
             results.append(
                 {
                     "district_geoid": geoid_int,
-                    "state_fips": state_fips,
-                    "district_number": district_number,
-                    "average_household_income_change": float(avg_change),
-                    "relative_household_income_change": float(rel_change),
-                    "winner_percentage": winner_percentage,
-                    "loser_percentage": loser_percentage,
-                    "no_change_percentage": no_change_percentage,
-                    "population": total_weight,
+                    "state_fips": geoid_int // 100,
+                    "district_number": geoid_int % 100,
+                    **record,
                 }
             )
 
@@ -10,7 +10,7 @@ from policyengine.core import Simulation
 from policyengine.outputs.decile_grouping import (
     _get_analysis_weight,
     _get_decile_weights,
-    calculate_decile_groups,
+    cached_decile_groups,
 )
 
 
@@ -138,12 +138,15 @@ def _prepare_decile_analysis(
         # household size. Keep the prepared shape uniform without imposing an
         # unrelated input requirement.
         effective_weight = analysis_weight.copy()
-    groups = calculate_decile_groups(
+    groups = cached_decile_groups(
+        baseline_output,
         baseline_data,
         baseline_income_series,
+        income_variable=income_variable,
         decile_variable=decile_variable,
         entity=target_entity,
         quantiles=quantiles,
+        weighting="people" if target_entity == "household" else "entity",
         validated_effective_weight=effective_weight,
     )
     included = groups.isin(range(1, quantiles + 1)).to_numpy(dtype=bool)
@@ -1,5 +1,6 @@
 """Shared weighted grouping for decile-based outputs."""
 
+import hashlib
 from typing import Any, Optional
 
 import numpy as np
@@ -151,3 +152,71 @@ def calculate_decile_groups(
     finite_groups[ranking_array[finite] < 0] = -1
     groups.loc[finite] = finite_groups
     return groups
+
+
+def _array_fingerprint(*arrays: np.ndarray) -> bytes:
+    """Return a content digest of ``arrays`` (linear time, no sort)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        contiguous = np.ascontiguousarray(array)
+        digest.update(f"{contiguous.dtype.str}:{contiguous.shape}".encode())
+        digest.update(memoryview(contiguous).cast("B"))
+    return digest.digest()
+
+
+def cached_decile_groups(
+    dataset: Any,
+    baseline_data: Any,
+    ranking_values: Any,
+    *,
+    income_variable: str,
+    decile_variable: Optional[str],
+    entity: str,
+    quantiles: int,
+    weighting: str,
+    validated_effective_weight: np.ndarray,
+) -> pd.Series:
+    """Return ``calculate_decile_groups`` memoized on the baseline output dataset.
+
+    Weighted ranking sorts every observation, and decile impacts, intra-decile
+    impacts and repeated report queries all rank the same baseline income with
+    the same weights. Results are stored on ``dataset`` keyed by income
+    variable, entity, weighting scheme (``"people"`` or ``"entity"``) and
+    quantile count. Each entry records a fingerprint of the ranking values and
+    effective weights, so a cached grouping is only reused while the dataset
+    content it was computed from is unchanged. Precomputed ``decile_variable``
+    groups are cheap to read and are never cached.
+    """
+    if decile_variable or dataset is None:
+        return calculate_decile_groups(
+            baseline_data,
+            ranking_values,
+            decile_variable=decile_variable,
+            entity=entity,
+            quantiles=quantiles,
+            validated_effective_weight=validated_effective_weight,
+        )
+
+    ranking_array = np.asarray(ranking_values, dtype=float)
+    effective_weight = np.asarray(validated_effective_weight, dtype=float)
+    fingerprint = _array_fingerprint(ranking_array, effective_weight)
+    cache = dataset._derived_cache
+    key = ("decile_groups", income_variable, entity, weighting, quantiles)
+    cached = cache.get(key)
+    if (
+        cached is not None
+        and cached[0] == fingerprint
+        and len(cached[1]) == len(baseline_data)
+    ):
+        return pd.Series(cached[1].copy(), index=baseline_data.index)
+
+    groups = calculate_decile_groups(
+        baseline_data,
+        ranking_array,
+        decile_variable=None,
+        entity=entity,
+        quantiles=quantiles,
+        validated_effective_weight=effective_weight,
+    )
+    cache[key] = (fingerprint, groups.array.copy())
+    return groups
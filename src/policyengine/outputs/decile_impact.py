@@ -1,9 +1,9 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Optional
 
 import numpy as np
 import pandas as pd
-from pydantic import ConfigDict
+from pydantic import BaseModel, ConfigDict
 
 from policyengine.core import Output, OutputCollection, Simulation
 from policyengine.core.dataset import Dataset
@@ -15,6 +15,7 @@ from policyengine.outputs.decile_analysis import (
     _PreparedDecileAnalysis,
     _weighted_mean,
 )
+from policyengine.outputs.partial import DEFAULT_MAX_CENTROIDS, QuantileSketch
 
 _DECILE_RESULT_COLUMNS = [
     "baseline_mean",
@@ -87,6 +88,120 @@ def _calculate_decile_impact_values(
     )
 
 
+def _decile_impact_payloads(analysis: _PreparedDecileAnalysis) -> np.ndarray:
+    """Per-observation weighted sums behind every decile impact statistic.
+
+    Columns are the analysis weight, weighted baseline and reform income and
+    the weight of observations better off, worse off and unchanged.
+    """
+    weights = analysis.analysis_weight
+    income_change = analysis.reform_income - analysis.baseline_income
+    return np.column_stack(
+        [
+            weights,
+            weights * analysis.baseline_income,
+            weights * analysis.reform_income,
+            weights * (income_change > 0),
+            weights * (income_change < 0),
+            weights * (income_change == 0),
+        ]
+    )
+
+
+def _decile_impact_values_from_totals(totals: np.ndarray) -> _DecileImpactValues:
+    """Decile statistics from one group's summed payloads."""
+    weight, baseline_total, reform_total, better_off, worse_off, no_change = (
+        float(value) for value in totals
+    )
+    if weight == 0:
+        return _DecileImpactValues(
+            baseline_mean=None,
+            reform_mean=None,
+            absolute_change=None,
+            relative_change=None,
+            count_better_off=0.0,
+            count_worse_off=0.0,
+            count_no_change=0.0,
+        )
+    baseline_mean = baseline_total / weight
+    reform_mean = reform_total / weight
+    absolute_change = reform_mean - baseline_mean
+    return _DecileImpactValues(
+        baseline_mean=baseline_mean,
+        reform_mean=reform_mean,
+        absolute_change=absolute_change,
+        relative_change=(
+            None if baseline_mean == 0 else float(100 * absolute_change / baseline_mean)
+        ),
+        count_better_off=better_off,
+        count_worse_off=worse_off,
+        count_no_change=no_change,
+    )
+
+
+class DecileImpactPartial(BaseModel):
+    """Mergeable state of :class:`DecileImpact` outputs.
+
+    With a ``decile_variable``, groups are known on every shard and the
+    state is each group's summed payloads. Otherwise observations are held
+    in a :class:`QuantileSketch` keyed by baseline income and weighted by
+    the grouping weight, and groups are ranked once the sketch is merged.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    output_fields: dict[str, Any]
+    group_totals: Optional[np.ndarray] = None
+    sketch: Optional[QuantileSketch] = None
+
+    def merge(self, other: "DecileImpactPartial") -> "DecileImpactPartial":
+        if self.output_fields != other.output_fields:
+            raise ValueError("Cannot merge partial states of different outputs.")
+        if self.sketch is not None and other.sketch is not None:
+            return DecileImpactPartial(
+                output_fields=self.output_fields,
+                sketch=self.sketch.merge(other.sketch),
+            )
+        return DecileImpactPartial(
+            output_fields=self.output_fields,
+            group_totals=self.group_totals + other.group_totals,
+        )
+
+    def _group_totals(self) -> np.ndarray:
+        if self.sketch is None:
+            return self.group_totals
+        quantiles = self.output_fields["quantiles"]
+        sketch = self.sketch
+        if sketch.total_weight == 0:
+            return np.zeros((quantiles, sketch.payloads.shape[1]))
+        groups = np.clip(np.ceil(sketch.rank_fractions() * quantiles), 1, quantiles)
+        # Negative incomes carry zero payloads, so only ranking uses them.
+        return np.stack(
+            [
+                sketch.payloads[groups == group].sum(axis=0)
+                for group in range(1, quantiles + 1)
+            ]
+        )
+
+    def to_outputs(self) -> list["DecileImpact"]:
+        """Build every decile's output (without simulations)."""
+        totals = self._group_totals()
+        outputs = []
+        for decile in range(1, self.output_fields["quantiles"] + 1):
+            values = _decile_impact_values_from_totals(totals[decile - 1])
+            outputs.append(
+                DecileImpact.model_construct(
+                    **{**self.output_fields, "decile": decile},
+                    **vars(values),
+                )
+            )
+        return outputs
+
+    def to_output(self) -> "DecileImpact":
+        """Build this output's decile (without simulations)."""
+        return self.to_outputs()[self.output_fields["decile"] - 1]
+
+
 class DecileImpact(Output):
     """Single decile's impact from a policy reform - represents one database row."""
 
@@ -121,6 +236,55 @@ class DecileImpact(Output):
         )
         self._run_from_prepared(analysis)
 
+    def partial(
+        self, max_centroids: int = DEFAULT_MAX_CENTROIDS
+    ) -> DecileImpactPartial:
+        """Return the mergeable state of every decile for the simulations' shard.
+
+        Both simulations must cover the same shard of observations.
+        """
+        analysis = _prepare_decile_analysis(
+            self.baseline_simulation,
+            self.reform_simulation,
+            income_variable=self.income_variable,
+            decile_variable=self.decile_variable,
+            entity=self.entity,
+            quantiles=self.quantiles,
+            require_effective_weight=self.decile_variable is None,
+        )
+        output_fields = self.model_dump(
+            include={
+                "income_variable",
+                "decile_variable",
+                "entity",
+                "decile",
+                "quantiles",
+            }
+        )
+        payloads = _decile_impact_payloads(analysis)
+        if self.decile_variable is not None:
+            groups = analysis.groups.to_numpy(dtype=float, na_value=np.nan)
+            return DecileImpactPartial(
+                output_fields=output_fields,
+                group_totals=np.stack(
+                    [
+                        payloads[analysis.included & (groups == group)].sum(axis=0)
+                        for group in range(1, self.quantiles + 1)
+                    ]
+                ),
+            )
+        ranked = np.isfinite(analysis.baseline_income)
+        payloads[~(ranked & (analysis.baseline_income >= 0))] = 0.0
+        return DecileImpactPartial(
+            output_fields=output_fields,
+            sketch=QuantileSketch.from_values(
+                analysis.baseline_income[ranked],
+                analysis.effective_weight[ranked],
+                payloads[ranked],
+                max_centroids=max_centroids,
+            ),
+        )
+
     def _run_from_prepared(
         self,
         analysis: _PreparedDecileAnalysis,
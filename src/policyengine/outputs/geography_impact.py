@@ -0,0 +1,332 @@
+"""Grouped household income-change impacts for any geography key.
+
+Every region's statistics are computed in one pass: the household-level
+geography key is factorized into integer group codes and weighted totals
+are accumulated with ``np.bincount``, so the cost is linear in households
+regardless of how many regions (districts, states, places, constituencies,
+local authorities) the key defines.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import ConfigDict
+
+from policyengine.core import Output
+
+if TYPE_CHECKING:
+    from policyengine.core.simulation import Simulation
+
+# Relative income changes within this band count as "no change".
+_NO_CHANGE_THRESHOLD = 1e-3
+
+
+def income_change_classes(
+    baseline_income: np.ndarray,
+    reform_income: np.ndarray,
+    people: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split each household's ``people`` into winners, losers and no change.
+
+    A household wins when its relative income change exceeds
+    ``_NO_CHANGE_THRESHOLD`` and loses when it falls by at least that much;
+    incomes below 1 are treated as 1 for the relative change. Returns three
+    arrays aligned with the inputs, each holding ``people`` where the
+    household falls in that class and ``0`` elsewhere.
+    """
+    income_change = (reform_income - baseline_income) / np.maximum(baseline_income, 1.0)
+    winners = np.where(income_change > _NO_CHANGE_THRESHOLD, people, 0.0)
+    losers = np.where(income_change <= -_NO_CHANGE_THRESHOLD, people, 0.0)
+    unchanged = np.where(
+        (income_change > -_NO_CHANGE_THRESHOLD)
+        & (income_change <= _NO_CHANGE_THRESHOLD),
+        people,
+        0.0,
+    )
+    return winners, losers, unchanged
+
+
+@dataclass(frozen=True)
+class GroupedIncomeImpacts:
+    """Per-group weighted income-change statistics.
+
+    Arrays are aligned with ``keys`` (sorted unique geography values). Groups
+    with zero total household weight are dropped.
+    """
+
+    keys: np.ndarray
+    population: np.ndarray
+    baseline_income: np.ndarray
+    reform_income: np.ndarray
+    average_household_income_change: np.ndarray
+    relative_household_income_change: np.ndarray
+    winner_percentage: np.ndarray
+    loser_percentage: np.ndarray
+    no_change_percentage: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def records(self) -> list[dict[str, Any]]:
+        """Return one plain-Python dict of statistics per group."""
+        return [
+            {
+                "key": self.keys[i].item()
+                if isinstance(self.keys[i], np.generic)
+                else self.keys[i],
+                "average_household_income_change": float(
+                    self.average_household_income_change[i]
+                ),
+                "relative_household_income_change": float(
+                    self.relative_household_income_change[i]
+                ),
+                "winner_percentage": float(self.winner_percentage[i]),
+                "loser_percentage": float(self.loser_percentage[i]),
+                "no_change_percentage": float(self.no_change_percentage[i]),
+                "population": float(self.population[i]),
+            }
+            for i in range(len(self.keys))
+        ]
+
+
+def compute_grouped_income_impacts(
+    keys: Any,
+    baseline_income: Any,
+    reform_income: Any,
+    weights: Any,
+    household_count_people: Optional[Any] = None,
+    include: Optional[Any] = None,
+) -> GroupedIncomeImpacts:
+    """Compute every group's weighted income change with weighted bincounts.
+
+    Args:
+        keys: Household-level geography key (any hashable dtype). Missing
+            values are excluded.
+        baseline_income: Baseline household net income.
+        reform_income: Reform household net income.
+        weights: Household survey weights.
+        household_count_people: Optional people per household. Winner and
+            loser shares are people-weighted when given, household-weighted
+            otherwise.
+        include: Optional boolean mask of households to consider.
+
+    Returns:
+        GroupedIncomeImpacts with one entry per group with positive weight.
+        Relative change is ``0.0`` for groups with zero baseline income, and
+        groups without people weight report everyone as unchanged.
+    """
+    keys = np.asarray(keys)
+    baseline_income = np.asarray(baseline_income, dtype=float)
+    reform_income = np.asarray(reform_income, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    people = (
+        np.ones_like(weights)
+        if household_count_people is None
+        else np.asarray(household_count_people, dtype=float)
+    )
+    if not (
+        len(keys)
+        == len(baseline_income)
+        == len(reform_income)
+        == len(weights)
+        == len(people)
+    ):
+        raise ValueError(
+            "Geography keys, incomes, weights and people counts must have the "
+            "same length"
+        )
+
+    codes, uniques = pd.factorize(keys, sort=True)
+    grouped = codes >= 0
+    if include is not None:
+        grouped &= np.asarray(include, dtype=bool)
+    codes = codes[grouped]
+    baseline_income = baseline_income[grouped]
+    reform_income = reform_income[grouped]
+    weights = weights[grouped]
+    people_weights = people[grouped] * weights
+    n_groups = len(uniques)
+
+    def total(values: np.ndarray) -> np.ndarray:
+        return np.bincount(codes, weights=values, minlength=n_groups)
+
+    population = total(weights)
+    baseline_total = total(baseline_income * weights)
+    reform_total = total(reform_income * weights)
+
+    people_total = total(people_weights)
+    winners, losers, unchanged = (
+        total(values)
+        for values in income_change_classes(
+            baseline_income, reform_income, people_weights
+        )
+    )
+
+    keep = population != 0
+    has_people = people_total[keep] != 0
+    safe_people = np.where(has_people, people_total[keep], 1.0)
+    baseline_kept = baseline_total[keep]
+    reform_kept = reform_total[keep]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        relative_change = np.where(
+            baseline_kept != 0, reform_kept / baseline_kept - 1.0, 0.0
+        )
+    return GroupedIncomeImpacts(
+        keys=np.asarray(uniques)[keep],
+        population=population[keep],
+        baseline_income=baseline_kept,
+        reform_income=reform_kept,
+        average_household_income_change=(reform_kept - baseline_kept)
+        / population[keep],
+        relative_household_income_change=relative_change,
+        winner_percentage=np.where(has_people, winners[keep] / safe_people, 0.0),
+        loser_percentage=np.where(has_people, losers[keep] / safe_people, 0.0),
+        no_change_percentage=np.where(has_people, unchanged[keep] / safe_people, 1.0),
+    )
+
+
+def _household_column(
+    household: pd.DataFrame,
+    column: str,
+    *,
+    role: str,
+) -> np.ndarray:
+    if column not in household.columns:
+        raise ValueError(
+            f"Geography impacts require {role} household column '{column}'."
+        )
+    return np.asarray(household[column])
+
+
+def grouped_income_impacts_for_simulations(
+    baseline_simulation: "Simulation",
+    reform_simulation: "Simulation",
+    geography_column: str,
+    *,
+    key_divisor: Optional[int] = None,
+    positive_keys_only: bool = False,
+) -> GroupedIncomeImpacts:
+    """Group a baseline/reform pair's household outputs by ``geography_column``.
+
+    ``key_divisor`` integer-divides numeric keys before grouping (for example
+    ``100`` turns ``SSDD`` district GEOIDs into state FIPS codes), and
+    ``positive_keys_only`` drops households whose key is not positive.
+    """
+    baseline_hh = pd.DataFrame(baseline_simulation.output_dataset.data.household)
+    reform_hh = pd.DataFrame(reform_simulation.output_dataset.data.household)
+    if len(baseline_hh) != len(reform_hh):
+        raise ValueError(
+            "Baseline and reform household outputs must have the same row "
+            "count for geography impacts."
+        )
+    keys = _household_column(baseline_hh, geography_column, role="baseline")
+    if key_divisor is not None:
+        keys = np.asarray(keys, dtype=np.int64) // key_divisor
+    return compute_grouped_income_impacts(
+        keys,
+        _household_column(baseline_hh, "household_net_income", role="baseline"),
+        _household_column(reform_hh, "household_net_income", role="reform"),
+        _household_column(baseline_hh, "household_weight", role="baseline"),
+        household_count_people=(
+            baseline_hh["household_count_people"]
+            if "household_count_people" in baseline_hh.columns
+            else None
+        ),
+        include=keys > 0 if positive_keys_only else None,
+    )
+
+
+class GeographyImpact(Output):
+    """Per-region income change from a policy reform, for any household key.
+
+    Groups households by ``geography_column`` (for example ``state_fips`` or
+    a place code) and reports each region's weighted average and relative
+    household income change, winner/loser/no-change shares and population.
+    Results are keyed by ``result_key`` (default: ``geography_column``).
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    baseline_simulation: "Simulation"
+    reform_simulation: "Simulation"
+    geography_column: str
+    result_key: Optional[str] = None
+    key_divisor: Optional[int] = None
+    positive_keys_only: bool = False
+
+    # Results populated by run()
+    geography_results: Optional[list[dict]] = None
+
+    def run(self) -> None:
+        """Group household output rows and compute per-region metrics."""
+        impacts = grouped_income_impacts_for_simulations(
+            self.baseline_simulation,
+            self.reform_simulation,
+            self.geography_column,
+            key_divisor=self.key_divisor,
+            positive_keys_only=self.positive_keys_only,
+        )
+        result_key = self.result_key or self.geography_column
+        results = impacts.records()
+        for record in results:
+            record[result_key] = record.pop("key")
+        self.geography_results = results
+
+
+def compute_geography_impacts(
+    baseline_simulation: "Simulation",
+    reform_simulation: "Simulation",
+    geography_column: str,
+) -> GeographyImpact:
+    """Compute per-region income changes for any household geography column.
+
+    Args:
+        baseline_simulation: Completed baseline simulation.
+        reform_simulation: Completed reform simulation.
+        geography_column: Household output column holding the region key,
+            e.g. a place code once the dataset carries one.
+
+    Returns:
+        GeographyImpact with geography_results populated.
+    """
+    impact = GeographyImpact.model_construct(
+        baseline_simulation=baseline_simulation,
+        reform_simulation=reform_simulation,
+        geography_column=geography_column,
+        result_key=None,
+        key_divisor=None,
+        positive_keys_only=False,
+    )
+    impact.run()
+    return impact
+
+
+def compute_us_state_impacts(
+    baseline_simulation: "Simulation",
+    reform_simulation: "Simulation",
+) -> GeographyImpact:
+    """Compute per-state income changes for US.
+
+    Uses a household ``state_fips`` column when the output dataset carries
+    one, and otherwise derives state FIPS from ``congressional_district_geoid``
+    (``SSDD``). Households without a positive key are excluded.
+
+    Returns:
+        GeographyImpact with geography_results keyed by ``state_fips``.
+    """
+    household = baseline_simulation.output_dataset.data.household
+    derive_from_district = "state_fips" not in household.columns
+    impact = GeographyImpact.model_construct(
+        baseline_simulation=baseline_simulation,
+        reform_simulation=reform_simulation,
+        geography_column=(
+            "congressional_district_geoid" if derive_from_district else "state_fips"
+        ),
+        result_key="state_fips",
+        key_divisor=100 if derive_from_district else None,
+        positive_keys_only=True,
+    )
+    impact.run()
+    return impact
@@ -1,13 +1,15 @@
 """Inequality analysis output types."""
 
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Optional, Union
 
 import numpy as np
 import pandas as pd
-from pydantic import ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from policyengine.core import Output, Simulation
+from policyengine.outputs.partial import DEFAULT_MAX_CENTROIDS, QuantileSketch
 
 
 class USInequalityPreset(str, Enum):
@@ -17,6 +19,185 @@ class USInequalityPreset(str, Enum):
     CBO_COMPARABLE = "cbo_comparable"
 
 
+@dataclass(frozen=True)
+class _LorenzArrays:
+    """Sorted cumulative arrays shared by every inequality metric.
+
+    Each array has one row per evaluated distribution (for example baseline
+    and reform), so a single ``argsort`` call serves all of them. Rows are
+    padded with zero-weight observations, which leave every metric unchanged.
+    """
+
+    sorted_values: np.ndarray
+    sorted_weights: np.ndarray
+    cumulative_weights: np.ndarray
+    cumulative_values: np.ndarray
+
+    @property
+    def total_weight(self) -> np.ndarray:
+        return self.cumulative_weights[:, -1]
+
+    @property
+    def total_value(self) -> np.ndarray:
+        return self.cumulative_values[:, -1]
+
+    @property
+    def weight_fractions(self) -> np.ndarray:
+        """Cumulative population share at each sorted observation."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.cumulative_weights / self.total_weight[:, None]
+
+
+def _lorenz_arrays(values: np.ndarray, weights: np.ndarray) -> _LorenzArrays:
+    """Sort ``values`` once (per row) and build the cumulative arrays."""
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    if values.shape[1] == 0:
+        values = np.zeros((values.shape[0], 1))
+        weights = np.zeros((weights.shape[0], 1))
+    order = np.argsort(values, axis=1, kind="stable")
+    sorted_values = np.take_along_axis(values, order, axis=1)
+    sorted_weights = np.take_along_axis(weights, order, axis=1)
+    return _LorenzArrays(
+        sorted_values=sorted_values,
+        sorted_weights=sorted_weights,
+        cumulative_weights=np.cumsum(sorted_weights, axis=1),
+        cumulative_values=np.cumsum(sorted_values * sorted_weights, axis=1),
+    )
+
+
+def _gini_from_lorenz(arrays: _LorenzArrays) -> np.ndarray:
+    """Weighted Gini coefficient per row, using the Lorenz-area formula."""
+    total_weight = arrays.total_weight
+    total_value = arrays.total_value
+    defined = (total_weight != 0) & (total_value != 0)
+    safe_weight = np.where(defined, total_weight, 1.0)
+    safe_value = np.where(defined, total_value, 1.0)
+    lorenz_curve = arrays.cumulative_values / safe_value[:, None]
+    weight_fractions = arrays.sorted_weights / safe_weight[:, None]
+    # Gini = 1 - 2 * (area under Lorenz curve), trapezoidal rule.
+    area = np.sum(weight_fractions * (lorenz_curve - weight_fractions / 2), axis=1)
+    return np.where(defined, 1 - 2 * area, 0.0)
+
+
+def _income_share(
+    arrays: _LorenzArrays,
+    fraction: float,
+    *,
+    top: bool,
+) -> np.ndarray:
+    """Share of total income held by the top or bottom ``fraction`` of people.
+
+    Observations are assigned whole to the bottom group when their cumulative
+    population share is at most ``fraction`` (``1 - fraction`` for top
+    shares); rows without positive total income report ``0.0``.
+    """
+    if not 0 <= fraction <= 1:
+        raise ValueError("Income share fractions must be between 0 and 1")
+    threshold = 1 - fraction if top else fraction
+    bottom_mask = arrays.weight_fractions <= threshold
+    bottom_income = np.sum(
+        np.where(bottom_mask, arrays.sorted_values * arrays.sorted_weights, 0.0),
+        axis=1,
+    )
+    total_value = arrays.total_value
+    positive = (total_value > 0) & (arrays.total_weight > 0)
+    safe_total = np.where(positive, total_value, 1.0)
+    group_income = total_value - bottom_income if top else bottom_income
+    return np.where(positive, group_income / safe_total, 0.0)
+
+
+def _lorenz_points(arrays: _LorenzArrays, points: int) -> np.ndarray:
+    """Cumulative income share at ``points + 1`` evenly spaced population shares."""
+    population_shares = np.linspace(0.0, 1.0, points + 1)
+    curves = []
+    for row in range(arrays.sorted_values.shape[0]):
+        total_weight = arrays.total_weight[row]
+        total_value = arrays.total_value[row]
+        if total_weight <= 0 or total_value == 0:
+            curves.append(np.full_like(population_shares, np.nan))
+            continue
+        x = np.concatenate([[0.0], arrays.cumulative_weights[row] / total_weight])
+        y = np.concatenate([[0.0], arrays.cumulative_values[row] / total_value])
+        curves.append(np.interp(population_shares, x, y))
+    return np.vstack(curves)
+
+
+def _positive_income_terms(
+    arrays: _LorenzArrays,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return weights, values and mean restricted to positive incomes.
+
+    Theil and Atkinson indices take logarithms or powers of income and are
+    only defined over positive values, so other observations get zero weight.
+    """
+    positive = arrays.sorted_values > 0
+    weights = np.where(positive, arrays.sorted_weights, 0.0)
+    values = np.where(positive, arrays.sorted_values, 1.0)
+    total_weight = np.sum(weights, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.sum(weights * values, axis=1) / total_weight
+    return weights, values, mean
+
+
+def _theil(arrays: _LorenzArrays) -> np.ndarray:
+    """Theil T index per row (``nan`` without positive incomes)."""
+    weights, values, mean = _positive_income_terms(arrays)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = values / mean[:, None]
+        return np.sum(weights * ratio * np.log(ratio), axis=1) / np.sum(weights, axis=1)
+
+
+def _atkinson(arrays: _LorenzArrays, epsilon: float) -> np.ndarray:
+    """Atkinson index with inequality aversion ``epsilon`` per row."""
+    if epsilon < 0:
+        raise ValueError("Atkinson inequality aversion must be non-negative")
+    weights, values, mean = _positive_income_terms(arrays)
+    total_weight = np.sum(weights, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if epsilon == 1:
+            equally_distributed = np.exp(
+                np.sum(weights * np.log(values), axis=1) / total_weight
+            )
+        else:
+            power_mean = np.sum(weights * values ** (1 - epsilon), axis=1)
+            equally_distributed = (power_mean / total_weight) ** (1 / (1 - epsilon))
+        return 1 - equally_distributed / mean
+
+
+class _BatchMetrics:
+    """Every metric over all rows of the shared arrays, each computed once.
+
+    Outputs in a batch may ask for different share fractions, Atkinson
+    epsilons or Lorenz resolutions; each distinct request is evaluated for
+    the whole batch on first use and every output then reads its own row.
+    """
+
+    def __init__(self, arrays: _LorenzArrays):
+        self.arrays = arrays
+        self.gini = _gini_from_lorenz(arrays)
+        self.theil = _theil(arrays)
+        self._shares: dict[tuple[float, bool], np.ndarray] = {}
+        self._atkinson: dict[float, np.ndarray] = {}
+        self._lorenz: dict[int, np.ndarray] = {}
+
+    def share(self, fraction: float, *, top: bool) -> np.ndarray:
+        key = (fraction, top)
+        if key not in self._shares:
+            self._shares[key] = _income_share(self.arrays, fraction, top=top)
+        return self._shares[key]
+
+    def atkinson(self, epsilon: float) -> np.ndarray:
+        if epsilon not in self._atkinson:
+            self._atkinson[epsilon] = _atkinson(self.arrays, epsilon)
+        return self._atkinson[epsilon]
+
+    def lorenz_points(self, points: int) -> np.ndarray:
+        if points not in self._lorenz:
+            self._lorenz[points] = _lorenz_points(self.arrays, points)
+        return self._lorenz[points]
+
+
 def _gini(values: np.ndarray, weights: np.ndarray) -> float:
     """Calculate weighted Gini coefficient.
 
@@ -30,30 +211,11 @@ def _gini(values: np.ndarray, weights: np.ndarray) -> float:
     # Handle edge cases
     if len(values) == 0 or weights.sum() == 0:
         return 0.0
+    return float(_gini_from_lorenz(_lorenz_arrays(values, weights))[0])
 
-    # Sort by values
-    sorted_indices = np.argsort(values)
-    sorted_values = values[sorted_indices]
-    sorted_weights = weights[sorted_indices]
-
-    # Cumulative weights and weighted values
-    cumulative_weights = np.cumsum(sorted_weights)
-    total_weight = cumulative_weights[-1]
-    cumulative_weighted_values = np.cumsum(sorted_values * sorted_weights)
-    total_weighted_value = cumulative_weighted_values[-1]
-
-    if total_weighted_value == 0:
-        return 0.0
 
-    # Calculate Gini using the area formula
-    # Gini = 1 - 2 * (area under Lorenz curve)
-    lorenz_curve = cumulative_weighted_values / total_weighted_value
-    weight_fractions = sorted_weights / total_weight
-
-    # Area under Lorenz curve using trapezoidal rule
-    area = np.sum(weight_fractions * (lorenz_curve - weight_fractions / 2))
-
-    return float(1 - 2 * area)
+def _optional_float(value: float) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
 
 
 def _series_for_entity(
@@ -73,12 +235,42 @@ def _series_for_entity(
     return data[variable_name]
 
 
+class InequalityPartial(BaseModel):
+    """Mergeable state of an :class:`Inequality` output.
+
+    The income distribution is held in a :class:`QuantileSketch`; every
+    metric is read from the merged sketch, exactly while it has not been
+    compressed.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    output_fields: dict[str, Any]
+    sketch: QuantileSketch
+
+    def merge(self, other: "InequalityPartial") -> "InequalityPartial":
+        if self.output_fields != other.output_fields:
+            raise ValueError("Cannot merge partial states of different outputs.")
+        return InequalityPartial(
+            output_fields=self.output_fields, sketch=self.sketch.merge(other.sketch)
+        )
+
+    def to_output(self) -> "Inequality":
+        """Build the output (without a simulation) from the merged state."""
+        inequality = Inequality.model_construct(**self.output_fields)
+        arrays = _lorenz_arrays(self.sketch.keys, self.sketch.weights)
+        inequality._populate(_BatchMetrics(arrays), 0)
+        return inequality
+
+
 class Inequality(Output):
     """Single inequality measure result - represents one database row.
 
     This is a single-simulation output type that calculates inequality
     metrics for a given income variable, optionally filtered by
-    demographic variables.
+    demographic variables. Every metric is derived from one weighted sort
+    of the income distribution; use :func:`run_inequality_batch` to share
+    that sort between several outputs (for example baseline and reform).
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -96,14 +288,30 @@ class Inequality(Output):
     filter_variable_leq: Optional[Any] = None
     filter_variable_geq: Optional[Any] = None
 
+    # Extended metric configuration
+    top_share_fractions: list[float] = Field(default_factory=lambda: [0.1, 0.01])
+    bottom_share_fractions: list[float] = Field(default_factory=lambda: [0.5, 0.4])
+    atkinson_epsilons: list[float] = Field(default_factory=lambda: [0.5, 1.0, 2.0])
+    lorenz_points: int = 10
+
     # Results populated by run()
     gini: Optional[float] = None
     top_10_share: Optional[float] = None
     top_1_share: Optional[float] = None
     bottom_50_share: Optional[float] = None
+    top_shares: Optional[dict[float, float]] = None
+    bottom_shares: Optional[dict[float, float]] = None
+    palma_ratio: Optional[float] = None
+    theil: Optional[float] = None
+    atkinson: Optional[dict[float, Optional[float]]] = None
+    lorenz_curve: Optional[list[Optional[float]]] = None
 
     def run(self):
         """Calculate inequality metrics."""
+        run_inequality_batch([self])
+
+    def _income_and_weights(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return filtered, equivalised income values and their weights."""
         # Get target entity data
         target_entity = self.entity
         data = getattr(self.simulation.output_dataset.data, target_entity)
@@ -176,55 +384,94 @@ class Inequality(Output):
             values = values / np.power(
                 equivalization_arr[valid_mask], self.equivalization_power
             )
+        return values, weights_arr
+
+    def partial(self, max_centroids: int = DEFAULT_MAX_CENTROIDS) -> InequalityPartial:
+        """Return this output's mergeable state for the simulation's shard."""
+        if self.lorenz_points < 1:
+            raise ValueError("lorenz_points must be at least 1")
+        values, weights = self._income_and_weights()
+        return InequalityPartial(
+            output_fields=self.model_dump(
+                include={
+                    "income_variable",
+                    "entity",
+                    "weight_multiplier_variable",
+                    "equivalization_variable",
+                    "equivalization_power",
+                    "filter_variable",
+                    "filter_variable_eq",
+                    "filter_variable_leq",
+                    "filter_variable_geq",
+                    "top_share_fractions",
+                    "bottom_share_fractions",
+                    "atkinson_epsilons",
+                    "lorenz_points",
+                }
+            ),
+            sketch=QuantileSketch.from_values(
+                values, weights, max_centroids=max_centroids
+            ),
+        )
+
+    def _populate(self, metrics: _BatchMetrics, row: int) -> None:
+        """Populate result fields from one row of the batch's metrics."""
+        self.gini = float(metrics.gini[row])
+        self.top_shares = {
+            fraction: float(metrics.share(fraction, top=True)[row])
+            for fraction in self.top_share_fractions
+        }
+        self.bottom_shares = {
+            fraction: float(metrics.share(fraction, top=False)[row])
+            for fraction in self.bottom_share_fractions
+        }
+        self.top_10_share = float(metrics.share(0.1, top=True)[row])
+        self.top_1_share = float(metrics.share(0.01, top=True)[row])
+        self.bottom_50_share = float(metrics.share(0.5, top=False)[row])
+        bottom_40_share = float(metrics.share(0.4, top=False)[row])
+        self.palma_ratio = (
+            self.top_10_share / bottom_40_share if bottom_40_share > 0 else None
+        )
+        self.theil = _optional_float(metrics.theil[row])
+        self.atkinson = {
+            epsilon: _optional_float(metrics.atkinson(epsilon)[row])
+            for epsilon in self.atkinson_epsilons
+        }
+        self.lorenz_curve = [
+            _optional_float(point)
+            for point in metrics.lorenz_points(self.lorenz_points)[row]
+        ]
 
-        # Calculate Gini coefficient
-        self.gini = _gini(values, weights_arr)
-
-        # Calculate income shares
-        if len(values) > 0 and weights_arr.sum() > 0:
-            total_income = np.sum(values * weights_arr)
-
-            if total_income > 0:
-                # Sort by income
-                sorted_indices = np.argsort(values)
-                sorted_values = values[sorted_indices]
-                sorted_weights = weights_arr[sorted_indices]
-
-                # Cumulative weight fractions
-                cumulative_weights = np.cumsum(sorted_weights)
-                total_weight = cumulative_weights[-1]
-                weight_fractions = cumulative_weights / total_weight
-
-                # Top 10% share
-                top_10_mask = weight_fractions > 0.9
-                self.top_10_share = float(
-                    np.sum(sorted_values[top_10_mask] * sorted_weights[top_10_mask])
-                    / total_income
-                )
-
-                # Top 1% share
-                top_1_mask = weight_fractions > 0.99
-                self.top_1_share = float(
-                    np.sum(sorted_values[top_1_mask] * sorted_weights[top_1_mask])
-                    / total_income
-                )
-
-                # Bottom 50% share
-                bottom_50_mask = weight_fractions <= 0.5
-                self.bottom_50_share = float(
-                    np.sum(
-                        sorted_values[bottom_50_mask] * sorted_weights[bottom_50_mask]
-                    )
-                    / total_income
-                )
-            else:
-                self.top_10_share = 0.0
-                self.top_1_share = 0.0
-                self.bottom_50_share = 0.0
-        else:
-            self.top_10_share = 0.0
-            self.top_1_share = 0.0
-            self.bottom_50_share = 0.0
+
+def run_inequality_batch(inequalities: list[Inequality]) -> list[Inequality]:
+    """Run several inequality outputs with one stacked weighted sort.
+
+    Each output's income distribution becomes a row of a zero-weight-padded
+    matrix, sorted in a single ``argsort`` call; Gini, income shares, the
+    Palma ratio, Theil and Atkinson indices and Lorenz points are then all
+    read from the shared cumulative arrays. Typical use is a baseline and
+    reform pair.
+
+    Returns:
+        The same ``Inequality`` objects, populated in place.
+    """
+    if not inequalities:
+        return inequalities
+    for inequality in inequalities:
+        if inequality.lorenz_points < 1:
+            raise ValueError("lorenz_points must be at least 1")
+    prepared = [inequality._income_and_weights() for inequality in inequalities]
+    width = max(1, max(len(values) for values, _ in prepared))
+    values_matrix = np.zeros((len(prepared), width))
+    weights_matrix = np.zeros((len(prepared), width))
+    for row, (values, weights) in enumerate(prepared):
+        values_matrix[row, : len(values)] = values
+        weights_matrix[row, : len(weights)] = weights
+
+    metrics = _BatchMetrics(_lorenz_arrays(values_matrix, weights_matrix))
+    for row, inequality in enumerate(inequalities):
+        inequality._populate(metrics, row)
+    return inequalities
 
 
 # Default income variables for each country
@@ -232,6 +479,35 @@ UK_INEQUALITY_INCOME_VARIABLE = "equiv_hbai_household_net_income"
 US_INEQUALITY_INCOME_VARIABLE = "household_net_income"
 
 
+def calculate_uk_inequality_batch(
+    simulations: list[Simulation],
+    income_variable: str = UK_INEQUALITY_INCOME_VARIABLE,
+    filter_variable: Optional[str] = None,
+    filter_variable_eq: Optional[Any] = None,
+    filter_variable_leq: Optional[Any] = None,
+    filter_variable_geq: Optional[Any] = None,
+) -> list[Inequality]:
+    """Calculate UK inequality metrics for several simulations at once.
+
+    Same arguments as :func:`calculate_uk_inequality`, applied to every
+    simulation; the income distributions share one sort.
+    """
+    return run_inequality_batch(
+        [
+            Inequality(
+                simulation=simulation,
+                income_variable=income_variable,
+                entity="household",
+                filter_variable=filter_variable,
+                filter_variable_eq=filter_variable_eq,
+                filter_variable_leq=filter_variable_leq,
+                filter_variable_geq=filter_variable_geq,
+            )
+            for simulation in simulations
+        ]
+    )
+
+
 def calculate_uk_inequality(
     simulation: Simulation,
     income_variable: str = UK_INEQUALITY_INCOME_VARIABLE,
@@ -253,17 +529,55 @@ def calculate_uk_inequality(
     Returns:
         Inequality object with Gini and income share metrics
     """
-    inequality = Inequality(
-        simulation=simulation,
+    return calculate_uk_inequality_batch(
+        [simulation],
         income_variable=income_variable,
-        entity="household",
         filter_variable=filter_variable,
         filter_variable_eq=filter_variable_eq,
         filter_variable_leq=filter_variable_leq,
         filter_variable_geq=filter_variable_geq,
+    )[0]
+
+
+def calculate_us_inequality_batch(
+    simulations: list[Simulation],
+    income_variable: str = US_INEQUALITY_INCOME_VARIABLE,
+    preset: Union[USInequalityPreset, str] = USInequalityPreset.STANDARD,
+    filter_variable: Optional[str] = None,
+    filter_variable_eq: Optional[Any] = None,
+    filter_variable_leq: Optional[Any] = None,
+    filter_variable_geq: Optional[Any] = None,
+) -> list[Inequality]:
+    """Calculate US inequality metrics for several simulations at once.
+
+    Same arguments as :func:`calculate_us_inequality`, applied to every
+    simulation; the income distributions share one sort.
+    """
+    preset = USInequalityPreset(preset)
+    inequality_kwargs = {}
+
+    if preset == USInequalityPreset.CBO_COMPARABLE:
+        inequality_kwargs = {
+            "weight_multiplier_variable": "household_count_people",
+            "equivalization_variable": "household_count_people",
+            "equivalization_power": 0.5,
+        }
+
+    return run_inequality_batch(
+        [
+            Inequality(
+                simulation=simulation,
+                income_variable=income_variable,
+                entity="household",
+                **inequality_kwargs,
+                filter_variable=filter_variable,
+                filter_variable_eq=filter_variable_eq,
+                filter_variable_leq=filter_variable_leq,
+                filter_variable_geq=filter_variable_geq,
+            )
+            for simulation in simulations
+        ]
     )
-    inequality.run()
-    return inequality
 
 
 def calculate_us_inequality(
@@ -289,25 +603,12 @@ def calculate_us_inequality(
     Returns:
         Inequality object with Gini and income share metrics
     """
-    preset = USInequalityPreset(preset)
-    inequality_kwargs = {}
-
-    if preset == USInequalityPreset.CBO_COMPARABLE:
-        inequality_kwargs = {
-            "weight_multiplier_variable": "household_count_people",
-            "equivalization_variable": "household_count_people",
-            "equivalization_power": 0.5,
-        }
-
-    inequality = Inequality(
-        simulation=simulation,
+    return calculate_us_inequality_batch(
+        [simulation],
         income_variable=income_variable,
-        entity="household",
-        **inequality_kwargs,
+        preset=preset,
         filter_variable=filter_variable,
         filter_variable_eq=filter_variable_eq,
         filter_variable_leq=filter_variable_leq,
         filter_variable_geq=filter_variable_geq,
-    )
-    inequality.run()
-    return inequality
+    )[0]
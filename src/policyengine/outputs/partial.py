@@ -0,0 +1,162 @@
+"""Mergeable partial states for sharded output computation.
+
+An output normally reads one in-memory output dataset. To compute it over
+shards instead (regions, chunks of households, or workers), call the
+output's ``partial()`` on each shard, combine the partial states with
+:func:`merge_partials` and build the final output with ``to_output()``.
+Merging is associative and commutative, so shards can be combined in any
+order or tree shape.
+
+Sums and counts merge exactly. Results that depend on the whole
+distribution (quantile filters, income deciles, Gini and income shares)
+carry a :class:`QuantileSketch`: a weighted, t-digest style summary that
+holds every observation until it exceeds ``max_centroids`` and then merges
+neighbouring observations, more coarsely in the middle of the distribution
+than in the tails.
+"""
+
+from collections.abc import Iterable
+from functools import reduce
+from typing import Optional, TypeVar
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict
+
+# Centroids kept per sketch. Tail centroids are narrowest, so top 1% shares
+# stay well resolved at this size.
+DEFAULT_MAX_CENTROIDS = 2_000
+
+
+class QuantileSketch(BaseModel):
+    """Weighted quantile summary whose centroids carry payload sums.
+
+    Each centroid has a mean ``key``, a total ``weight`` and ``payloads``,
+    the sums of per-observation payload columns (for example weighted
+    values to total under a quantile filter). While ``is_exact`` no two
+    observations have been merged and every query is exact.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    keys: np.ndarray
+    weights: np.ndarray
+    payloads: np.ndarray
+    max_centroids: int = DEFAULT_MAX_CENTROIDS
+    is_exact: bool = True
+
+    @classmethod
+    def from_values(
+        cls,
+        keys: np.ndarray,
+        weights: np.ndarray,
+        payloads: Optional[np.ndarray] = None,
+        max_centroids: int = DEFAULT_MAX_CENTROIDS,
+    ) -> "QuantileSketch":
+        """Summarise observations; rows with a NaN key are dropped."""
+        keys = np.asarray(keys, dtype=float)
+        weights = np.asarray(weights, dtype=float)
+        payloads = (
+            np.zeros((len(keys), 0))
+            if payloads is None
+            else np.asarray(payloads, dtype=float).reshape(len(keys), -1)
+        )
+        keep = ~np.isnan(keys)
+        order = np.argsort(keys[keep], kind="stable")
+        sketch = cls(
+            keys=keys[keep][order],
+            weights=weights[keep][order],
+            payloads=payloads[keep][order],
+            max_centroids=max_centroids,
+        )
+        return sketch._compressed()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Return a sketch of both sketches' observations."""
+        if self.payloads.shape[1] != other.payloads.shape[1]:
+            raise ValueError("Cannot merge sketches with different payload columns.")
+        keys = np.concatenate([self.keys, other.keys])
+        order = np.argsort(keys, kind="stable")
+        return QuantileSketch(
+            keys=keys[order],
+            weights=np.concatenate([self.weights, other.weights])[order],
+            payloads=np.concatenate([self.payloads, other.payloads])[order],
+            max_centroids=min(self.max_centroids, other.max_centroids),
+            is_exact=self.is_exact and other.is_exact,
+        )._compressed()
+
+    def _compressed(self) -> "QuantileSketch":
+        if len(self.keys) <= self.max_centroids:
+            return self
+        cumulative = np.cumsum(self.weights)
+        total = cumulative[-1]
+        if total > 0:
+            midpoints = (cumulative - self.weights / 2) / total
+        else:
+            midpoints = (np.arange(len(self.keys)) + 0.5) / len(self.keys)
+        # t-digest k1 scale: equal steps in arcsin(2q - 1) give narrow tails.
+        scaled = np.arcsin(np.clip(2 * midpoints - 1, -1, 1)) / np.pi + 0.5
+        bins = np.minimum(
+            (scaled * self.max_centroids).astype(np.int64), self.max_centroids - 1
+        )
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        weights = np.add.reduceat(self.weights, starts)
+        weighted_keys = np.add.reduceat(self.keys * self.weights, starts)
+        plain_keys = np.add.reduceat(self.keys, starts) / np.diff(
+            np.r_[starts, len(self.keys)]
+        )
+        keys = np.where(
+            weights > 0, weighted_keys / np.where(weights > 0, weights, 1), plain_keys
+        )
+        payloads = (
+            np.add.reduceat(self.payloads, starts, axis=0)
+            if self.payloads.shape[1]
+            else np.zeros((len(starts), 0))
+        )
+        return QuantileSketch(
+            keys=keys,
+            weights=weights,
+            payloads=payloads,
+            max_centroids=self.max_centroids,
+            is_exact=False,
+        )
+
+    @property
+    def total_weight(self) -> float:
+        return float(self.weights.sum())
+
+    def quantile(self, q: float) -> float:
+        """Weighted inverse-CDF quantile, as ``MicroSeries.quantile``."""
+        positive = self.weights > 0
+        if not positive.any():
+            return float("nan")
+        keys = self.keys[positive]
+        cumulative = np.cumsum(self.weights[positive])
+        position = np.searchsorted(cumulative / cumulative[-1], q)
+        return float(keys[min(position, len(keys) - 1)])
+
+    def rank_fractions(self) -> np.ndarray:
+        """Weighted percentile rank of each centroid, as ``MicroSeries.rank``.
+
+        Tied keys share the cumulative weight at the end of their group.
+        """
+        total = self.total_weight
+        if total == 0:
+            raise ZeroDivisionError("Cannot rank a sketch with zero total weight.")
+        cumulative = np.cumsum(self.weights)
+        group_end = np.searchsorted(self.keys, self.keys, side="right") - 1
+        return np.minimum(cumulative[group_end] / total, 1.0)
+
+
+PartialT = TypeVar("PartialT")
+
+
+def merge_partials(partials: Iterable[PartialT]) -> PartialT:
+    """Merge partial states computed on shards into one.
+
+    Raises:
+        ValueError: If ``partials`` is empty.
+    """
+    partials = list(partials)
+    if not partials:
+        raise ValueError("merge_partials needs at least one partial state.")
+    return reduce(lambda left, right: left.merge(right), partials)
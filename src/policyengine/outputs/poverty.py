@@ -3,10 +3,12 @@
 from enum import Enum
 from typing import Any, Optional
 
+import numpy as np
 import pandas as pd
-from pydantic import ConfigDict
+from pydantic import BaseModel, ConfigDict
 
 from policyengine.core import Output, OutputCollection, Simulation
+from policyengine.core.replicate_weights import simulation_replicate_weights
 
 
 class UKPovertyType(str, Enum):
@@ -39,6 +41,36 @@ US_POVERTY_VARIABLES = {
 }
 
 
+class PovertyPartial(BaseModel):
+    """Mergeable state of a :class:`Poverty` output: weighted counts."""
+
+    output_fields: dict[str, Any]
+    headcount: float = 0.0
+    total_population: float = 0.0
+
+    def merge(self, other: "PovertyPartial") -> "PovertyPartial":
+        if self.output_fields != other.output_fields:
+            raise ValueError("Cannot merge partial states of different outputs.")
+        return PovertyPartial(
+            output_fields=self.output_fields,
+            headcount=self.headcount + other.headcount,
+            total_population=self.total_population + other.total_population,
+        )
+
+    def to_output(self) -> "Poverty":
+        """Build the output (without a simulation) from the merged state."""
+        return Poverty.model_construct(
+            **self.output_fields,
+            headcount=self.headcount,
+            total_population=self.total_population,
+            rate=(
+                self.headcount / self.total_population
+                if self.total_population > 0
+                else 0.0
+            ),
+        )
+
+
 class Poverty(Output):
     """Single poverty measure result - represents one database row.
 
@@ -67,9 +99,12 @@ class Poverty(Output):
     headcount: Optional[float] = None
     total_population: Optional[float] = None
     rate: Optional[float] = None
+    # Set by run() when the simulation's dataset has replicate weights.
+    headcount_standard_error: Optional[float] = None
+    rate_standard_error: Optional[float] = None
 
-    def run(self):
-        """Calculate poverty headcount and rate."""
+    def _poverty_series(self) -> Any:
+        """Return the poverty indicator of the filtered target entity rows."""
         # Get poverty variable info
         poverty_var_obj = self.simulation.tax_benefit_model_version.get_variable(
             self.poverty_variable
@@ -118,6 +153,13 @@ class Poverty(Output):
             # Apply mask
             poverty_series = poverty_series[mask]
 
+        return poverty_series
+
+    def run(self):
+        """Calculate poverty headcount and rate."""
+        target_entity = self.entity
+        poverty_series = self._poverty_series()
+
         # Calculate results using weighted counts
         self.headcount = float((poverty_series == True).sum())  # noqa: E712
         self.total_population = float(poverty_series.count())
@@ -125,6 +167,46 @@ class Poverty(Output):
             self.headcount / self.total_population if self.total_population > 0 else 0.0
         )
 
+        replicate_weights = simulation_replicate_weights(self.simulation)
+        if replicate_weights is not None:
+            entity_data = self.simulation.output_dataset.data.entity_data
+            headcounts, _ = replicate_weights.series_totals(
+                entity_data,
+                target_entity,
+                poverty_series == True,  # noqa: E712
+            )
+            _, populations = replicate_weights.series_totals(
+                entity_data, target_entity, poverty_series
+            )
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rates = np.where(populations > 0, headcounts / populations, 0.0)
+            self.headcount_standard_error = replicate_weights.standard_error(
+                self.headcount, headcounts
+            )
+            self.rate_standard_error = replicate_weights.standard_error(
+                self.rate, rates
+            )
+
+    def partial(self) -> PovertyPartial:
+        """Return this output's mergeable state for the simulation's shard."""
+        poverty_series = self._poverty_series()
+        return PovertyPartial(
+            output_fields=self.model_dump(
+                include={
+                    "poverty_variable",
+                    "poverty_type",
+                    "entity",
+                    "filter_variable",
+                    "filter_variable_eq",
+                    "filter_variable_leq",
+                    "filter_variable_geq",
+                    "filter_group",
+                }
+            ),
+            headcount=float((poverty_series == True).sum()),  # noqa: E712
+            total_population=float(poverty_series.count()),
+        )
+
 
 def calculate_uk_poverty_rates(
     simulation: Simulation,
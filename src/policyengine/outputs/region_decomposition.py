@@ -0,0 +1,298 @@
+"""Region-decomposed outputs from a single national run.
+
+Households are simulated independently, so a national baseline/reform pair
+already holds every row-filtered region's answer: a state's output is the
+national output restricted to that state's households. This module builds
+per-region *views* of completed national simulations (scoped output datasets
+with no engine rerun) and evaluates any ``Output``, or any function of
+simulations such as ``calculate_decile_impacts``, once per region.
+
+Regions whose results cannot be read off the national output (weight
+replacement regions, regions with their own dataset, or row filters on a
+household column the run does not carry) are reported in
+``RegionDecomposition.not_derivable`` with a reason instead of being
+silently re-simulated.
+"""
+
+from typing import Any, Callable, Generic, Iterable, Optional, TypeVar, Union
+
+import numpy as np
+import pandas as pd
+from microdf import MicroDataFrame
+from pydantic import BaseModel, ConfigDict, Field
+
+from policyengine.core import Output, OutputCollection
+from policyengine.core.region import Region, RegionRegistry
+from policyengine.core.scoping_strategy import (
+    RegionGroupStrategy,
+    RowFilterStrategy,
+    WeightReplacementStrategy,
+)
+from policyengine.core.simulation import Simulation
+
+T = TypeVar("T")
+
+
+class RegionNotDerivableError(ValueError):
+    """A region's results cannot be read off a national simulation."""
+
+
+class RegionDecomposition(BaseModel, Generic[T]):
+    """Per-region results derived from one national run.
+
+    ``outputs`` maps region code to the result for that region, in the order
+    the regions were given. ``not_derivable`` maps region code to the reason
+    a region was skipped.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    outputs: dict[str, T] = Field(default_factory=dict)
+    not_derivable: dict[str, str] = Field(default_factory=dict)
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        """Results as one table with a leading ``region_code`` column.
+
+        ``OutputCollection`` results contribute their own rows; single
+        ``Output`` results contribute one row of their non-simulation fields.
+        """
+        frames = []
+        for code, result in self.outputs.items():
+            if isinstance(result, OutputCollection):
+                frame = result.dataframe.copy()
+            elif isinstance(result, BaseModel):
+                frame = pd.DataFrame([_scalar_fields(result)])
+            else:
+                frame = pd.DataFrame([{"result": result}])
+            frame.insert(0, "region_code", code)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["region_code"])
+        return pd.concat(frames, ignore_index=True)
+
+
+def _scalar_fields(model: BaseModel) -> dict[str, Any]:
+    return {
+        name: value
+        for name, value in model.__dict__.items()
+        if not isinstance(value, (Simulation, BaseModel))
+    }
+
+
+def _filter_columns(strategy: Any) -> list[str]:
+    if isinstance(strategy, RowFilterStrategy):
+        return [strategy.variable_name, *strategy.additional_filters]
+    if isinstance(strategy, RegionGroupStrategy):
+        columns: list[str] = []
+        for member in strategy.members:
+            columns.extend(_filter_columns(member))
+        return list(dict.fromkeys(columns))
+    return []
+
+
+class _RegionViews:
+    """Scoped views of one completed national simulation.
+
+    The output entity tables are copied once (so household key columns can
+    be borrowed from the input dataset without touching the simulation) and
+    reused for every region, which lets the household partition index and its
+    per-region row cache serve all of them.
+    """
+
+    def __init__(self, simulation: Simulation):
+        if simulation.output_dataset is None or simulation.output_dataset.data is None:
+            raise ValueError(
+                "Region decomposition needs a completed simulation; call "
+                "simulation.ensure() (or run()) first."
+            )
+        if simulation.scoping_strategy is not None:
+            raise ValueError(
+                "Region decomposition needs a national simulation, but this "
+                "simulation is already scoped to a region."
+            )
+        self.simulation = simulation
+        data = simulation.output_dataset.data
+        self.entity_data: dict[str, MicroDataFrame] = dict(data.entity_data)
+        self.entity_data["household"] = MicroDataFrame(
+            pd.DataFrame(data.household).copy(), weights="household_weight"
+        )
+        self.group_entities = [
+            name for name in self.entity_data if name != data.person_entity
+        ]
+
+    def _ensure_household_column(self, column: str) -> Optional[str]:
+        """Make ``column`` available; return a reason if it cannot be."""
+        household = self.entity_data["household"]
+        if column in household.columns:
+            return None
+        input_data = getattr(self.simulation.dataset, "data", None)
+        input_household = (
+            pd.DataFrame(input_data.household) if input_data is not None else None
+        )
+        if (
+            input_household is not None
+            and column in input_household.columns
+            and len(input_household) == len(household)
+            and np.array_equal(
+                np.asarray(input_household["household_id"]),
+                np.asarray(household["household_id"]),
+            )
+        ):
+            household[column] = input_household[column].values
+            return None
+        return (
+            f"Household column '{column}' is not in the simulation output or "
+            f"its input dataset; add it via Simulation.extra_variables."
+        )
+
+    def view(self, region: Region) -> Simulation:
+        strategy = region.scoping_strategy
+        if strategy is None:
+            if region.region_type == "national":
+                return self.simulation
+            raise RegionNotDerivableError(
+                f"Region '{region.code}' has its own dataset and no scoping "
+                f"strategy; simulate it directly."
+            )
+        if isinstance(strategy, WeightReplacementStrategy):
+            raise RegionNotDerivableError(
+                f"Region '{region.code}' reweights every household from a weight "
+                f"matrix, so it is not a subset of the national output; use "
+                f"compute_region_weight_matrix_impacts for all such regions at once."
+            )
+        for column in _filter_columns(strategy):
+            reason = self._ensure_household_column(column)
+            if reason is not None:
+                raise RegionNotDerivableError(f"Region '{region.code}': {reason}")
+
+        output_dataset = self.simulation.output_dataset
+        scoped = strategy.apply(
+            entity_data=self.entity_data,
+            group_entities=self.group_entities,
+            year=output_dataset.year,
+        )
+        data_class = type(output_dataset.data)
+        scoped_output = type(output_dataset)(
+            id=f"{output_dataset.id}:{region.code}",
+            name=output_dataset.name,
+            description=output_dataset.description,
+            filepath=None,
+            year=output_dataset.year,
+            is_output_dataset=True,
+            data=data_class(**{name: scoped[name] for name in data_class.model_fields}),
+        )
+        view = self.simulation.model_copy(
+            update={
+                "id": f"{self.simulation.id}:{region.code}",
+                "scoping_strategy": strategy,
+            }
+        )
+        # Outputs that call ensure() must read the scoped rows, not re-run.
+        view.use_assembled_output(scoped_output)
+        return view
+
+
+def _resolve_regions(
+    regions: Union[Iterable[Region], RegionRegistry],
+    region_type: Optional[str],
+) -> list[Region]:
+    if isinstance(regions, RegionRegistry):
+        if region_type is None:
+            return list(regions.get_filter_regions())
+        return list(regions.get_by_type(region_type))
+    regions = list(regions)
+    if region_type is not None:
+        regions = [region for region in regions if region.region_type == region_type]
+    return regions
+
+
+def simulation_for_region(simulation: Simulation, region: Region) -> Simulation:
+    """Return a view of a completed national simulation scoped to ``region``.
+
+    The view's ``output_dataset`` holds only the region's rows of the national
+    output and is attached as an assembled output, so outputs that call
+    ``ensure()`` read it instead of re-simulating.
+
+    Raises:
+        RegionNotDerivableError: If the region cannot be read off the
+            national output.
+    """
+    return _RegionViews(simulation).view(region)
+
+
+def decompose_by_region(
+    function: Callable[..., T],
+    regions: Union[Iterable[Region], RegionRegistry],
+    *,
+    region_type: Optional[str] = None,
+    **simulations: Simulation,
+) -> RegionDecomposition[T]:
+    """Evaluate ``function`` once per region on views of national simulations.
+
+    Args:
+        function: Called as ``function(**region_views)`` for each region, for
+            example ``calculate_decile_impacts`` or a lambda building an
+            output.
+        regions: Regions to evaluate, or a ``RegionRegistry``.
+        region_type: Keep only regions of this type (e.g. ``"state"``). With
+            a registry and no type, every scoped region is used.
+        **simulations: Completed national simulations, passed to ``function``
+            under the same keyword names after scoping.
+
+    Returns:
+        RegionDecomposition with one result per derivable region and a reason
+        for every other region.
+    """
+    views = {name: _RegionViews(simulation) for name, simulation in simulations.items()}
+    decomposition: RegionDecomposition[T] = RegionDecomposition()
+    for region in _resolve_regions(regions, region_type):
+        try:
+            scoped = {name: view.view(region) for name, view in views.items()}
+        except RegionNotDerivableError as exc:
+            decomposition.not_derivable[region.code] = str(exc)
+            continue
+        decomposition.outputs[region.code] = function(**scoped)
+    return decomposition
+
+
+def decompose_output_by_region(
+    output: Output,
+    regions: Union[Iterable[Region], RegionRegistry],
+    *,
+    region_type: Optional[str] = None,
+) -> RegionDecomposition[Output]:
+    """Run a configured national ``Output`` for every region.
+
+    Every field of ``output`` holding a ``Simulation`` (``simulation``,
+    ``baseline_simulation``, ``reform_simulation``, ...) is replaced by its
+    region view in a copy of the output, which is then run.
+
+    Example:
+        >>> snap = Aggregate(simulation=baseline, variable="snap")
+        >>> by_state = decompose_output_by_region(
+        ...     snap, registry, region_type="state"
+        ... )
+        >>> by_state.outputs["state/ca"].result
+    """
+    simulation_fields = {
+        name: value
+        for name, value in output.__dict__.items()
+        if isinstance(value, Simulation)
+    }
+    if not simulation_fields:
+        raise ValueError(
+            f"{type(output).__name__} has no Simulation fields to decompose."
+        )
+
+    def run_for_region(**scoped: Simulation) -> Output:
+        regional = output.model_copy(update=scoped)
+        regional.run()
+        return regional
+
+    return decompose_by_region(
+        run_for_region,
+        regions,
+        region_type=region_type,
+        **simulation_fields,
+    )
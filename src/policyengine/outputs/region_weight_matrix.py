@@ -0,0 +1,363 @@
+"""All-regions-at-once impacts from a (regions x households) weight matrix.
+
+``WeightReplacementStrategy`` scopes a simulation to one region by swapping
+in that region's row of a weight matrix, which means one simulation per
+region. Because reweighting leaves every household's calculated values
+unchanged, the same per-region statistics can instead be read off a single
+national baseline/reform pair: each region's weighted total of a household
+quantity is one entry of ``weights @ values``. Stacking every quantity as a
+column turns hundreds of scoped runs into one run plus one matrix product.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+import pandas as pd
+from pydantic import ConfigDict, Field
+
+from policyengine.core import Output
+from policyengine.outputs.geography_impact import income_change_classes
+
+if TYPE_CHECKING:
+    from policyengine.core.scoping_strategy import WeightReplacementStrategy
+    from policyengine.core.simulation import Simulation
+
+# Rows of a dense matrix converted to float64 per matrix product, bounding the
+# temporary copy when the matrix is held as float32.
+_DENSE_ROW_CHUNK = 64
+
+
+def _require_scipy_sparse():
+    try:
+        from scipy import sparse
+    except ImportError as exc:
+        raise ImportError(
+            "Sparse region weight matrices require scipy. "
+            "Install it with: pip install scipy"
+        ) from exc
+    return sparse
+
+
+@dataclass(frozen=True)
+class RegionWeightMatrix:
+    """Household weights for every region of a geography.
+
+    ``weights`` has one row per region and one column per household, in
+    output-dataset household order. It may be a dense ``numpy`` array
+    (``float64`` or ``float32``) or a ``scipy.sparse`` matrix.
+    """
+
+    weights: Any
+    region_codes: list[str]
+    region_names: list[str]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return tuple(self.weights.shape)
+
+    def weighted_totals(self, columns: np.ndarray) -> np.ndarray:
+        """Return ``weights @ columns`` as a ``(regions x k)`` float64 array.
+
+        Dense reduced-precision matrices are upcast a block of rows at a time
+        so totals accumulate in float64 without copying the whole matrix.
+        """
+        columns = np.asarray(columns, dtype=float)
+        if columns.ndim == 1:
+            columns = columns[:, None]
+        if columns.shape[0] != self.shape[1]:
+            raise ValueError(
+                f"Weight matrix has {self.shape[1]} household columns but "
+                f"{columns.shape[0]} household values were supplied."
+            )
+        if hasattr(self.weights, "tocsr"):
+            return np.asarray(self.weights @ columns, dtype=float)
+        weights = np.asarray(self.weights)
+        if weights.dtype == np.float64:
+            return weights @ columns
+        totals = np.empty((weights.shape[0], columns.shape[1]))
+        for start in range(0, weights.shape[0], _DENSE_ROW_CHUNK):
+            stop = start + _DENSE_ROW_CHUNK
+            totals[start:stop] = weights[start:stop].astype(np.float64) @ columns
+        return totals
+
+
+def load_region_weight_matrix(
+    weight_matrix_path: str,
+    lookup_csv_path: str,
+    year: int,
+    *,
+    dtype: Any = np.float64,
+    sparse: bool = False,
+) -> RegionWeightMatrix:
+    """Load a region weight matrix and its lookup CSV.
+
+    Args:
+        weight_matrix_path: HDF5 file with one ``(regions x households)``
+            dataset per year, keyed by the year as a string.
+        lookup_csv_path: CSV mapping matrix rows to region ``code`` (and
+            optionally ``name``) values, in row order.
+        year: Dataset year to read.
+        dtype: Storage dtype, e.g. ``np.float32`` to halve memory.
+        sparse: Store the matrix as a ``scipy.sparse`` CSR matrix, built a
+            block of rows at a time so the dense matrix is never held whole.
+
+    Returns:
+        RegionWeightMatrix ready for ``compute_region_weight_matrix_impacts``.
+    """
+    import h5py
+
+    lookup_df = pd.read_csv(lookup_csv_path)
+    if "code" in lookup_df.columns:
+        codes = [str(code) for code in lookup_df["code"]]
+    elif "name" in lookup_df.columns:
+        codes = [str(name) for name in lookup_df["name"]]
+    else:
+        raise ValueError(
+            f"Region lookup CSV must contain a 'code' or 'name' column: "
+            f"{lookup_csv_path}"
+        )
+    names = (
+        [str(name) for name in lookup_df["name"]]
+        if "name" in lookup_df.columns
+        else list(codes)
+    )
+
+    with h5py.File(weight_matrix_path, "r") as f:
+        dataset = f[str(year)]
+        if sparse:
+            scipy_sparse = _require_scipy_sparse()
+            blocks = [
+                scipy_sparse.csr_matrix(
+                    dataset[start : start + _DENSE_ROW_CHUNK].astype(dtype)
+                )
+                for start in range(0, dataset.shape[0], _DENSE_ROW_CHUNK)
+            ]
+            weights = scipy_sparse.vstack(blocks, format="csr")
+        else:
+            weights = dataset[...].astype(dtype, copy=False)
+
+    if weights.shape[0] != len(codes):
+        raise ValueError(
+            f"Weight matrix has {weights.shape[0]} rows but the lookup CSV "
+            f"lists {len(codes)} regions."
+        )
+    return RegionWeightMatrix(weights=weights, region_codes=codes, region_names=names)
+
+
+def region_weight_matrix_for_strategy(
+    strategy: "WeightReplacementStrategy",
+    year: int,
+    *,
+    dtype: Any = np.float64,
+    sparse: bool = False,
+) -> RegionWeightMatrix:
+    """Load the full weight matrix behind a ``WeightReplacementStrategy``.
+
+    The strategy's ``region_code`` is ignored; every region is returned.
+    """
+    paths = strategy.resolve_asset_paths()
+    return load_region_weight_matrix(
+        paths.weight_matrix_path,
+        paths.lookup_csv_path,
+        year,
+        dtype=dtype,
+        sparse=sparse,
+    )
+
+
+def _household_values(simulation: "Simulation", variable: str) -> np.ndarray:
+    """Return ``variable`` summed to household level, in household order."""
+    data = simulation.output_dataset.data
+    household = data.household
+    if variable in household.columns:
+        return np.asarray(household[variable], dtype=float)
+    entity = simulation.tax_benefit_model_version.get_variable(variable).entity
+    mapped = data.map_to_entity(entity, "household", columns=[variable])
+    return np.asarray(mapped[variable], dtype=float)
+
+
+def _household_person_counts(
+    simulation: "Simulation",
+    variable: Optional[str] = None,
+) -> np.ndarray:
+    """Count people per household, optionally only those with ``variable``."""
+    data = simulation.output_dataset.data
+    if variable is None:
+        person_values = np.ones(len(data.person))
+    else:
+        entity = simulation.tax_benefit_model_version.get_variable(variable).entity
+        if entity == "person":
+            person_values = np.asarray(data.person[variable], dtype=float)
+        else:
+            mapped = data.map_to_entity(entity, "person", columns=[variable])
+            person_values = np.asarray(mapped[variable], dtype=float)
+    counts = data.map_to_entity("person", "household", values=person_values)
+    return np.asarray(counts, dtype=float)
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return float(numerator / denominator) if denominator != 0 else None
+
+
+class RegionWeightMatrixImpact(Output):
+    """Per-region impacts for every row of a region weight matrix.
+
+    Computed from one national baseline/reform pair: every region's
+    household population, weighted income change, people-weighted winner and
+    loser shares, optional variable totals and optional poverty rates come
+    from a single ``weights @ values`` product.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    baseline_simulation: "Simulation"
+    reform_simulation: "Simulation"
+    weight_matrix: RegionWeightMatrix
+    income_variable: str = "household_net_income"
+    total_variables: list[str] = Field(default_factory=list)
+    poverty_variables: list[str] = Field(default_factory=list)
+
+    # Results populated by run()
+    region_results: Optional[list[dict]] = None
+
+    def run(self) -> None:
+        """Build the household value columns and take one matrix product."""
+        baseline_hh = self.baseline_simulation.output_dataset.data.household
+        n_households = len(baseline_hh)
+        if len(self.reform_simulation.output_dataset.data.household) != n_households:
+            raise ValueError(
+                "Baseline and reform household outputs must have the same row "
+                "count for weight-matrix region impacts."
+            )
+        if self.weight_matrix.shape[1] != n_households:
+            raise ValueError(
+                f"Weight matrix row length ({self.weight_matrix.shape[1]}) does "
+                f"not match household count ({n_households}). The weight matrix "
+                f"may be out of date."
+            )
+
+        baseline_income = _household_values(
+            self.baseline_simulation, self.income_variable
+        )
+        reform_income = _household_values(self.reform_simulation, self.income_variable)
+        person_count = _household_person_counts(self.baseline_simulation)
+        people = (
+            np.asarray(baseline_hh["household_count_people"], dtype=float)
+            if "household_count_people" in baseline_hh.columns
+            else person_count
+        )
+        winners, losers, unchanged = income_change_classes(
+            baseline_income, reform_income, people
+        )
+
+        columns: dict[str, np.ndarray] = {
+            "households": np.ones(n_households),
+            "people": people,
+            "person_count": person_count,
+            "baseline_income": baseline_income,
+            "reform_income": reform_income,
+            "winners": winners,
+            "losers": losers,
+            "no_change": unchanged,
+        }
+        for variable in self.total_variables:
+            columns[f"baseline_{variable}"] = _household_values(
+                self.baseline_simulation, variable
+            )
+            columns[f"reform_{variable}"] = _household_values(
+                self.reform_simulation, variable
+            )
+        for variable in self.poverty_variables:
+            columns[f"baseline_{variable}"] = _household_person_counts(
+                self.baseline_simulation, variable
+            )
+            columns[f"reform_{variable}"] = _household_person_counts(
+                self.reform_simulation, variable
+            )
+
+        names = list(columns)
+        totals = self.weight_matrix.weighted_totals(
+            np.column_stack([columns[name] for name in names])
+        )
+        by_name = {name: totals[:, i] for i, name in enumerate(names)}
+
+        results: list[dict] = []
+        for row, code in enumerate(self.weight_matrix.region_codes):
+            population = float(by_name["households"][row])
+            people_total = float(by_name["people"][row])
+            person_total = float(by_name["person_count"][row])
+            baseline_total = float(by_name["baseline_income"][row])
+            reform_total = float(by_name["reform_income"][row])
+            result = {
+                "region_code": code,
+                "region_name": self.weight_matrix.region_names[row],
+                "population": population,
+                "baseline_income_total": baseline_total,
+                "reform_income_total": reform_total,
+                "average_household_income_change": _ratio(
+                    reform_total - baseline_total, population
+                ),
+                "relative_household_income_change": (
+                    reform_total / baseline_total - 1.0 if baseline_total != 0 else 0.0
+                ),
+                "winner_percentage": _ratio(by_name["winners"][row], people_total),
+                "loser_percentage": _ratio(by_name["losers"][row], people_total),
+                "no_change_percentage": _ratio(by_name["no_change"][row], people_total),
+            }
+            for variable in self.total_variables:
+                baseline_value = float(by_name[f"baseline_{variable}"][row])
+                reform_value = float(by_name[f"reform_{variable}"][row])
+                result[f"baseline_{variable}_total"] = baseline_value
+                result[f"reform_{variable}_total"] = reform_value
+                result[f"{variable}_change"] = reform_value - baseline_value
+                result[f"baseline_{variable}_mean"] = _ratio(baseline_value, population)
+                result[f"reform_{variable}_mean"] = _ratio(reform_value, population)
+            for variable in self.poverty_variables:
+                result[f"baseline_{variable}_rate"] = _ratio(
+                    by_name[f"baseline_{variable}"][row], person_total
+                )
+                result[f"reform_{variable}_rate"] = _ratio(
+                    by_name[f"reform_{variable}"][row], person_total
+                )
+            results.append(result)
+
+        self.region_results = results
+
+
+def compute_region_weight_matrix_impacts(
+    baseline_simulation: "Simulation",
+    reform_simulation: "Simulation",
+    weight_matrix: RegionWeightMatrix,
+    income_variable: str = "household_net_income",
+    total_variables: Optional[list[str]] = None,
+    poverty_variables: Optional[list[str]] = None,
+) -> RegionWeightMatrixImpact:
+    """Compute impacts for every region of a weight matrix from one run.
+
+    Args:
+        baseline_simulation: Completed national baseline simulation.
+        reform_simulation: Completed national reform simulation.
+        weight_matrix: Region weights, e.g. from ``load_region_weight_matrix``.
+        income_variable: Household income used for average/relative change
+            and winner/loser shares.
+        total_variables: Variables (any entity, summed to household) whose
+            regional baseline/reform totals and household means to report.
+        poverty_variables: Boolean poverty variables (e.g.
+            ``in_poverty_bhc``) whose person-level regional rates to report.
+
+    Returns:
+        RegionWeightMatrixImpact with region_results populated, one entry per
+        matrix row in lookup order. Statistics without a positive
+        denominator are ``None``.
+    """
+    impact = RegionWeightMatrixImpact.model_construct(
+        baseline_simulation=baseline_simulation,
+        reform_simulation=reform_simulation,
+        weight_matrix=weight_matrix,
+        income_variable=income_variable,
+        total_variables=list(total_variables or []),
+        poverty_variables=list(poverty_variables or []),
+    )
+    impact.run()
+    return impact
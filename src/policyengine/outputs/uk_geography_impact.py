@@ -10,6 +10,7 @@ from policyengine.data.uk_geography_assets import (
     default_download_dir,
     default_local_search_dirs,
 )
+from policyengine.outputs.geography_impact import compute_grouped_income_impacts
 
 
 def _normalise_code(value) -> str:
@@ -131,43 +132,33 @@ def compute_longwise_uk_geography_impacts(
     codes = (
         pd.Series(baseline_household[geography_column]).map(_normalise_code).to_numpy()
     )
-    present_codes = {code for code in pd.unique(codes) if code}
-    ordered_codes = [code for code in lookup_order if code in present_codes] + sorted(
-        present_codes - set(lookup_order)
+    impacts = compute_grouped_income_impacts(
+        codes,
+        baseline_household["household_net_income"],
+        reform_household["household_net_income"],
+        baseline_household["household_weight"],
+        household_count_people=(
+            baseline_household["household_count_people"]
+            if "household_count_people" in baseline_household.columns
+            else None
+        ),
+        include=codes != "",
+    )
+    by_code = {record.pop("key"): record for record in impacts.records()}
+    ordered_codes = [code for code in lookup_order if code in by_code] + sorted(
+        set(by_code) - set(lookup_order)
     )
-
-    baseline_income = baseline_household["household_net_income"].to_numpy(dtype=float)
-    reform_income = reform_household["household_net_income"].to_numpy(dtype=float)
-    weights = baseline_household["household_weight"].to_numpy(dtype=float)
 
     results: list[dict] = []
     for code in ordered_codes:
-        mask = codes == code
-        w = weights[mask]
-        total_weight = float(w.sum())
-        if total_weight == 0:
-            continue
-
-        baseline_weighted = float((baseline_income[mask] * w).sum())
-        reform_weighted = float((reform_income[mask] * w).sum())
-
-        avg_change = (reform_weighted - baseline_weighted) / total_weight
-        rel_change = (
-            (reform_weighted / baseline_weighted - 1.0)
-            if baseline_weighted != 0
-            else 0.0
-        )
         row_metadata = metadata.get(code, {})
-
         results.append(
             {
                 f"{result_key_prefix}_code": code,
                 f"{result_key_prefix}_name": row_metadata.get("name", code),
                 "x": row_metadata.get("x"),
                 "y": row_metadata.get("y"),
-                "average_household_income_change": float(avg_change),
-                "relative_household_income_change": float(rel_change),
-                "population": total_weight,
+                **by_code[code],
             }
         )
 
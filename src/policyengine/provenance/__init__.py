@@ -51,6 +51,9 @@ from .manifest import (
 from .manifest import (
     PackageVersion as PackageVersion,
 )
+from .manifest import (
+    certified_dataset_sha256 as certified_dataset_sha256,
+)
 from .manifest import (
     certify_data_release_compatibility as certify_data_release_compatibility,
 )
@@ -69,6 +72,12 @@ from .manifest import (
 from .manifest import (
     https_release_manifest_uri as https_release_manifest_uri,
 )
+from .manifest import (
+    manifest_cache_dir as manifest_cache_dir,
+)
+from .manifest import (
+    offline_mode as offline_mode,
+)
 from .manifest import (
     resolve_dataset_reference as resolve_dataset_reference,
 )
@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
+from policyengine.utils.artifact_store import ArtifactStore
 from policyengine.utils.google_cloud_bucket import download_file_from_gcs
 
 
@@ -78,9 +79,36 @@ def materialize_dataset_source(
     dataset_source: str,
     *,
     version: Optional[str] = None,
+    sha256: Optional[str] = None,
 ) -> str:
-    """Return a local file path for supported remote dataset URIs."""
+    """Return a local file path for supported remote dataset URIs.
+
+    When ``sha256`` is given (the digest pinned by the release manifest),
+    the shared artifact store is checked first and a download is verified
+    against it and linked into the store, so every resolver and the bundle
+    installer share one copy. Concurrent callers download it once.
+    """
+
+    if sha256 is None or not dataset_source.startswith(("gs://", "hf://")):
+        return _download_dataset_source(dataset_source, version=version)
+    return str(
+        ArtifactStore().fetch(
+            sha256,
+            lambda: _download_dataset_source(dataset_source, version=version),
+            name=_source_file_name(dataset_source),
+        )
+    )
+
+
+def _source_file_name(dataset_source: str) -> str:
+    return dataset_source.rsplit("@", 1)[0].rsplit("/", 1)[-1]
+
 
+def _download_dataset_source(
+    dataset_source: str,
+    *,
+    version: Optional[str] = None,
+) -> str:
     if dataset_source.startswith("gs://"):
         reference = parse_gs_uri(dataset_source)
         local_path, _ = download_file_from_gcs(
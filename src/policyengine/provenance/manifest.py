@@ -12,6 +12,8 @@ from pydantic import BaseModel, Field
 
 HF_REQUEST_TIMEOUT_SECONDS = 30
 PYPI_REQUEST_TIMEOUT_SECONDS = 30
+MANIFEST_CACHE_DIR_ENV = "POLICYENGINE_MANIFEST_CACHE_DIR"
+OFFLINE_ENV = "POLICYENGINE_OFFLINE"
 LOCAL_DATA_REPO_HINTS = {
     "us": ("policyengine_us", "policyengine-us-data", "policyengine_us_data"),
     "uk": ("policyengine_uk", "policyengine-uk-data", "policyengine_uk_data"),
@@ -318,10 +320,76 @@ def get_release_manifest(country_id: str) -> CountryReleaseManifest:
     return manifest
 
 
-@lru_cache
-def get_data_release_manifest(country_id: str) -> DataReleaseManifest:
-    country_manifest = get_release_manifest(country_id)
+def offline_mode() -> bool:
+    """Return whether network fetches of release metadata are disabled.
+
+    Set ``POLICYENGINE_OFFLINE=1`` (or Hugging Face's ``HF_HUB_OFFLINE=1``)
+    to read data release manifests only from the on-disk cache.
+    """
+    return any(
+        os.environ.get(name, "").strip().lower() in ("1", "true", "yes")
+        for name in (OFFLINE_ENV, "HF_HUB_OFFLINE")
+    )
+
+
+def manifest_cache_dir() -> Path:
+    """Return the directory holding cached data release manifests."""
+    configured = os.environ.get(MANIFEST_CACHE_DIR_ENV)
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".policyengine" / "manifests"
+
+
+def _cached_manifest_path(data_package: "DataPackageVersion") -> Path:
+    """Cache location for a release manifest, keyed by repo and revision.
+
+    Release manifests are immutable per revision, so an entry never goes
+    stale; a new release pins a new revision and gets a new entry.
+    """
+    repo_type = getattr(data_package, "repo_type", None) or "model"
+    return (
+        manifest_cache_dir()
+        / repo_type
+        / data_package.repo_id
+        / _artifact_revision(data_package)
+        / data_package.release_manifest_path
+    )
+
+
+def _read_cached_manifest(data_package: "DataPackageVersion") -> Optional[bytes]:
+    """Return cached manifest bytes whose recorded sha256 still matches."""
+    path = _cached_manifest_path(data_package)
+    digest_path = path.with_name(path.name + ".sha256")
+    try:
+        source_bytes = path.read_bytes()
+        expected_sha256 = digest_path.read_text().strip()
+    except OSError:
+        return None
+    if hashlib.sha256(source_bytes).hexdigest() != expected_sha256:
+        return None
+    return source_bytes
+
+
+def _write_cached_manifest(
+    data_package: "DataPackageVersion", source_bytes: bytes
+) -> None:
+    """Store fetched manifest bytes; an unwritable cache is not an error."""
+    path = _cached_manifest_path(data_package)
+    digest_path = path.with_name(path.name + ".sha256")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for target, content in (
+            (path, source_bytes),
+            (digest_path, hashlib.sha256(source_bytes).hexdigest().encode()),
+        ):
+            temporary = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            temporary.write_bytes(content)
+            os.replace(temporary, target)
+    except OSError:
+        return
+
 
+def _fetch_data_release_manifest_bytes(data_package: "DataPackageVersion") -> bytes:
     headers = {}
     token = os.environ.get("HUGGING_FACE_TOKEN")
     if token:
@@ -329,7 +397,7 @@ def get_data_release_manifest(country_id: str) -> DataReleaseManifest:
 
     try:
         response = requests.get(
-            https_release_manifest_uri(country_manifest.data_package),
+            https_release_manifest_uri(data_package),
             headers=headers,
             timeout=HF_REQUEST_TIMEOUT_SECONDS,
         )
@@ -353,17 +421,44 @@ def get_data_release_manifest(country_id: str) -> DataReleaseManifest:
         raise DataReleaseManifestUnavailableError(
             "Could not fetch the data release manifest from Hugging Face."
         ) from exc
-    data_release_manifest = DataReleaseManifest.model_validate_json(response.text)
     source_bytes = response.content
     if not isinstance(source_bytes, bytes):
         source_bytes = response.text.encode("utf-8")
+    return source_bytes
+
+
+@lru_cache
+def get_data_release_manifest(country_id: str) -> DataReleaseManifest:
+    """Return the data release manifest pinned by the bundled release.
+
+    Manifests are read from the on-disk cache (see :func:`manifest_cache_dir`)
+    when present, so only the first process to use a release fetches it
+    from Hugging Face. In :func:`offline_mode` a missing cache entry raises
+    :class:`DataReleaseManifestUnavailableError` without a network request.
+    """
+    country_manifest = get_release_manifest(country_id)
+    data_package = country_manifest.data_package
+
+    source_bytes = _read_cached_manifest(data_package)
+    if source_bytes is None:
+        if offline_mode():
+            raise DataReleaseManifestUnavailableError(
+                "Offline mode is enabled and the data release manifest for "
+                f"{data_package.repo_id}@{_artifact_revision(data_package)} is "
+                f"not cached in {manifest_cache_dir()}."
+            )
+        source_bytes = _fetch_data_release_manifest_bytes(data_package)
+        data_release_manifest = DataReleaseManifest.model_validate_json(source_bytes)
+        _write_cached_manifest(data_package, source_bytes)
+    else:
+        data_release_manifest = DataReleaseManifest.model_validate_json(source_bytes)
     data_release_manifest.source_sha256 = hashlib.sha256(source_bytes).hexdigest()
-    release_revision = country_manifest.data_package.release_manifest_revision
+    release_revision = data_package.release_manifest_revision
     if release_revision is not None:
         for artifact in data_release_manifest.artifacts.values():
             if (
-                artifact.repo_id == country_manifest.data_package.repo_id
-                and artifact.revision == country_manifest.data_package.version
+                artifact.repo_id == data_package.repo_id
+                and artifact.revision == data_package.version
             ):
                 artifact.revision = release_revision
     return data_release_manifest
@@ -537,6 +632,30 @@ def resolve_dataset_reference(country_id: str, dataset: str) -> str:
     return artifact.uri
 
 
+def certified_dataset_sha256(country_id: str, dataset_uri: str) -> Optional[str]:
+    """Return the sha256 the bundled release manifest pins for a dataset URI.
+
+    Only the bundled manifest is consulted, so this never makes a network
+    request. Returns ``None`` for URIs the manifest does not pin.
+    """
+    manifest = get_release_manifest(country_id)
+    certified = manifest.certified_data_artifact
+    if certified is not None and certified.uri == dataset_uri and certified.sha256:
+        return certified.sha256
+    for path_reference in manifest.datasets.values():
+        if path_reference.sha256 is None:
+            continue
+        uri = build_hf_uri(
+            repo_id=path_reference.repo_id or manifest.data_package.repo_id,
+            path_in_repo=path_reference.path,
+            revision=path_reference.revision
+            or _artifact_revision(manifest.data_package),
+        )
+        if uri == dataset_uri:
+            return path_reference.sha256
+    return None
+
+
 def resolve_managed_dataset_reference(
     country_id: str,
     dataset: Optional[str] = None,
@@ -24,14 +24,22 @@ skipped — silence is not verification.
 from __future__ import annotations
 
 import hashlib
-from collections.abc import Callable, Iterable, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
+
+from policyengine.utils.digest_cache import file_sha256
 
 from .trace import compute_trace_composition_fingerprint
 
 _ARTIFACT_ID_SEPARATOR = "/artifact/"
+FETCH_CHUNK_BYTES = 1024 * 1024
+DEFAULT_VERIFY_WORKERS = 4
+
+Fetch = Callable[[str], Union[bytes, Iterable[bytes]]]
 
 
 @dataclass(frozen=True)
@@ -59,12 +67,13 @@ class TROVerificationReport:
         )
 
 
-def _default_fetch(url: str, *, timeout: float = 60.0) -> bytes:
+def _default_fetch(url: str, *, timeout: float = 60.0) -> Iterator[bytes]:
+    """Stream a remote artifact in chunks, never holding it whole."""
     import requests
 
-    response = requests.get(url, timeout=timeout)
-    response.raise_for_status()
-    return response.content
+    with requests.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        yield from response.iter_content(chunk_size=FETCH_CHUNK_BYTES)
 
 
 def _find_tro_node(tro: Mapping) -> Mapping:
@@ -116,25 +125,75 @@ def _resolve_local(location: str, base_dir: Optional[Path]) -> Path:
     return resolved
 
 
-def _artifact_bytes(
+def _artifact_sha256(
     location: str,
     *,
     base_dir: Optional[Path],
-    fetch: Callable[[str], bytes],
-) -> bytes:
+    fetch: Fetch,
+    strict: Optional[bool],
+) -> str:
+    """Hash an artifact; local files go through the shared digest cache."""
     if location.startswith("https://"):
-        return fetch(location)
+        payload = fetch(location)
+        if isinstance(payload, (bytes, bytearray)):
+            return hashlib.sha256(payload).hexdigest()
+        digest = hashlib.sha256()
+        for chunk in payload:
+            digest.update(chunk)
+        return digest.hexdigest()
     if location.startswith(("http://", "file://", "hf://")):
         raise ValueError(f"unsupported artifact location scheme: {location}")
-    return _resolve_local(location, base_dir).read_bytes()
+    return file_sha256(_resolve_local(location, base_dir), strict=strict)
+
+
+def _check_artifact(
+    artifact: Mapping,
+    *,
+    locations: Mapping[str, str],
+    skip: set[str],
+    base_dir: Optional[Path],
+    fetch: Fetch,
+    strict: Optional[bool],
+) -> ArtifactCheck:
+    full_id = artifact.get("@id", "")
+    short_id = _short_artifact_id(full_id)
+    expected = artifact.get("trov:sha256")
+    location = locations.get(full_id)
+    if short_id in skip:
+        return ArtifactCheck(short_id, expected, location, "skipped")
+    if location is None:
+        return ArtifactCheck(
+            short_id,
+            expected,
+            None,
+            "unfetchable",
+            "no arrangement location for artifact",
+        )
+    try:
+        actual = _artifact_sha256(
+            location, base_dir=base_dir, fetch=fetch, strict=strict
+        )
+    except Exception as exc:
+        return ArtifactCheck(short_id, expected, location, "unfetchable", str(exc))
+    if actual == expected:
+        return ArtifactCheck(short_id, expected, location, "ok")
+    return ArtifactCheck(
+        short_id,
+        expected,
+        location,
+        "mismatch",
+        f"sha256 {actual} != claimed {expected}",
+    )
 
 
 def verify_trace_tro(
     tro: Mapping,
     *,
     base_dir: Optional[Path] = None,
-    fetch: Optional[Callable[[str], bytes]] = None,
+    fetch: Optional[Fetch] = None,
     skip: Optional[Iterable[str]] = None,
+    strict: Optional[bool] = None,
+    max_workers: int = DEFAULT_VERIFY_WORKERS,
 ) -> TROVerificationReport:
     """Rehash every composition artifact and the composition fingerprint.
 
@@ -143,13 +202,16 @@ def verify_trace_tro(
     such as restricted-access inputs. Skipped artifacts do not fail the
     report, but they are listed so the verification is honest about its
     coverage.
+
+    Up to ``max_workers`` artifacts are checked at once. Each is streamed
+    through the hasher in chunks: ``fetch`` may return the payload as bytes
+    or as an iterable of chunks. Local artifacts reuse digests from the
+    shared digest cache while their size, mtime and inode are unchanged;
+    ``strict=True`` rehashes them.
     """
-    fetch = fetch or _default_fetch
-    skip_set = set(skip or ())
     node = _find_tro_node(tro)
     composition = node.get("trov:hasComposition") or {}
     artifacts = composition.get("trov:hasArtifact") or []
-    locations = _artifact_locations(node)
 
     claimed_fingerprint = (composition.get("trov:hasFingerprint") or {}).get(
         "trov:sha256"
@@ -159,46 +221,20 @@ def verify_trace_tro(
     )
     fingerprint_status = "ok" if recomputed == claimed_fingerprint else "mismatch"
 
-    checks: list[ArtifactCheck] = []
-    for artifact in artifacts:
-        full_id = artifact.get("@id", "")
-        short_id = _short_artifact_id(full_id)
-        expected = artifact.get("trov:sha256")
-        location = locations.get(full_id)
-        if short_id in skip_set:
-            checks.append(ArtifactCheck(short_id, expected, location, "skipped"))
-            continue
-        if location is None:
-            checks.append(
-                ArtifactCheck(
-                    short_id,
-                    expected,
-                    None,
-                    "unfetchable",
-                    "no arrangement location for artifact",
-                )
-            )
-            continue
-        try:
-            payload = _artifact_bytes(location, base_dir=base_dir, fetch=fetch)
-        except Exception as exc:
-            checks.append(
-                ArtifactCheck(short_id, expected, location, "unfetchable", str(exc))
-            )
-            continue
-        actual = hashlib.sha256(payload).hexdigest()
-        if actual == expected:
-            checks.append(ArtifactCheck(short_id, expected, location, "ok"))
-        else:
-            checks.append(
-                ArtifactCheck(
-                    short_id,
-                    expected,
-                    location,
-                    "mismatch",
-                    f"sha256 {actual} != claimed {expected}",
-                )
-            )
+    check = partial(
+        _check_artifact,
+        locations=_artifact_locations(node),
+        skip=set(skip or ()),
+        base_dir=base_dir,
+        fetch=fetch or _default_fetch,
+        strict=strict,
+    )
+    workers = max(1, min(max_workers, len(artifacts)))
+    if workers == 1:
+        checks = [check(artifact) for artifact in artifacts]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            checks = list(executor.map(check, artifacts))
 
     return TROVerificationReport(
         fingerprint_status=fingerprint_status, artifacts=checks
@@ -208,12 +244,21 @@ def verify_trace_tro(
 def verify_trace_tro_path(
     path: Path | str,
     *,
-    fetch: Optional[Callable[[str], bytes]] = None,
+    fetch: Optional[Fetch] = None,
     skip: Optional[Iterable[str]] = None,
+    strict: Optional[bool] = None,
+    max_workers: int = DEFAULT_VERIFY_WORKERS,
 ) -> TROVerificationReport:
     """Verify a TRO file, resolving relative locations against its directory."""
     import json
 
     path = Path(path)
     tro = json.loads(path.read_text())
-    return verify_trace_tro(tro, base_dir=path.parent, fetch=fetch, skip=skip)
+    return verify_trace_tro(
+        tro,
+        base_dir=path.parent,
+        fetch=fetch,
+        skip=skip,
+        strict=strict,
+        max_workers=max_workers,
+    )
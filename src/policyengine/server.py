@@ -0,0 +1,616 @@
+"""Warm simulation worker behind ``policyengine serve``.
+
+Starting a process, importing a country model and loading a dataset cost
+far more than most single requests. :class:`SimulationWorker` keeps all of
+that warm in one long-lived process: country models are imported once,
+datasets and baseline simulations are cached, identical requests that are
+in flight at the same time share one computation, and household requests
+that arrive within a short window are calculated as one batch.
+
+The worker speaks JSON over HTTP on a TCP port or a Unix socket:
+
+- ``GET /health``: liveness and what is loaded.
+- ``GET /metrics``: request, coalescing, batching and latency counters.
+- ``POST /household``: ``calculate_household`` keyword arguments plus
+  ``country`` (default ``us``). Returns ``{"result": ...}``.
+- ``POST /simulation``: ``country``, ``year``, optional ``dataset`` (defaults
+  to the release's default dataset), ``reform`` and ``variables``. Returns
+  the weighted total of each variable.
+- ``POST /economic-impact``: ``country``, ``year``, optional ``dataset`` and
+  ``reform``. Returns the ``economic_impact_analysis`` result against the
+  cached baseline.
+
+Requests that fail validation before any computation starts return status
+400 with ``{"error": ...}``; failures during computation return 500.
+"""
+
+from __future__ import annotations
+
+import enum
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import math
+import queue
+import socketserver
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_BATCH_WINDOW_SECONDS = 0.01
+DEFAULT_MAX_BATCH_SIZE = 64
+# Datasets and baseline simulations are whole populations; keep only the
+# most recently used, however many a client asks for.
+DEFAULT_MAX_DATASETS = 4
+DEFAULT_MAX_BASELINES = 4
+# Household keyword arguments shared by every household in one batch.
+_BATCH_OPTIONS = ("year", "reform", "extra_variables")
+
+
+class InvalidRequestError(ValueError):
+    """A request that fails validation before any computation starts."""
+
+
+def _request_key(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert a result (pydantic models, DataFrames, numpy values) to JSON."""
+    import numpy as np
+    import pandas as pd
+    from pydantic import BaseModel
+
+    from policyengine.core import Dataset, Simulation
+    from policyengine.core.output import OutputCollection
+
+    if isinstance(value, (Simulation, Dataset)):
+        return value.id
+    if isinstance(value, OutputCollection):
+        return _jsonable(value.dataframe)
+    if isinstance(value, BaseModel):
+        return {
+            name: _jsonable(getattr(value, name)) for name in type(value).model_fields
+        }
+    if isinstance(value, pd.DataFrame):
+        return _jsonable(value.to_dict(orient="records"))
+    if isinstance(value, (pd.Series, np.ndarray)):
+        return _jsonable(value.tolist())
+    if isinstance(value, Mapping):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, enum.Enum):
+        return _jsonable(value.value)
+    if isinstance(value, np.generic):
+        return _jsonable(value.item())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class RequestCoalescer:
+    """Share one computation between identical requests in flight together."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future] = {}
+
+    def run(self, key: str, compute: Callable[[], Any]) -> tuple[Any, bool]:
+        """Return ``compute()``'s result and whether it was shared.
+
+        A caller whose key is already being computed waits for that result
+        (or exception) instead of computing it again.
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+        if not owner:
+            return future.result(), True
+        try:
+            future.set_result(compute())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result(), False
+
+
+class HouseholdBatcher:
+    """Calculate household requests that arrive close together as one batch.
+
+    The first request of a batch waits up to ``window`` seconds for others
+    (at most ``max_batch_size``). Requests sharing a country, year, reform
+    and extra variables go to ``calculate_batch`` together. If a batch
+    fails, its requests are retried one at a time so an invalid household
+    only fails its own request.
+    """
+
+    def __init__(
+        self,
+        calculate_batch: Callable[[str, dict[str, Any], list[dict[str, Any]]], list],
+        *,
+        window: float = DEFAULT_BATCH_WINDOW_SECONDS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        on_batch: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        self.calculate_batch = calculate_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.on_batch = on_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="household-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, country_id: str, request: Mapping[str, Any]) -> Future:
+        """Queue one ``calculate_household`` request; resolves to its result."""
+        options = {key: request[key] for key in _BATCH_OPTIONS if key in request}
+        household = {
+            key: value for key, value in request.items() if key not in _BATCH_OPTIONS
+        }
+        future: Future = Future()
+        self._queue.put((country_id, options, household, future))
+        return future
+
+    def _run(self) -> None:
+        while True:
+            pending = [self._queue.get()]
+            try:
+                self._collect(pending)
+                groups: dict[str, list] = {}
+                for item in pending:
+                    country_id, options, _, _ = item
+                    key = _request_key(country_id, options)
+                    groups.setdefault(key, []).append(item)
+                for group in groups.values():
+                    self._calculate(group)
+            except Exception as exc:
+                # Keep the thread alive for later requests, and fail the
+                # ones that would otherwise wait forever.
+                logger.exception("Household batch failed")
+                for _, _, _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _collect(self, pending: list) -> None:
+        """Add requests arriving within the window to ``pending``."""
+        deadline = time.monotonic() + self.window
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                return
+
+    def _calculate(self, group: list) -> None:
+        country_id, options, _, _ = group[0]
+        if self.on_batch is not None:
+            self.on_batch(len(group))
+        try:
+            results = list(
+                self.calculate_batch(
+                    country_id, options, [household for _, _, household, _ in group]
+                )
+            )
+            if len(results) != len(group):
+                raise RuntimeError(
+                    f"calculate_batch returned {len(results)} results for "
+                    f"{len(group)} households."
+                )
+        except Exception as exc:
+            if len(group) == 1:
+                group[0][3].set_exception(exc)
+                return
+            for item in group:
+                self._calculate([item])
+            return
+        for (_, _, _, future), result in zip(group, results):
+            future.set_result(result)
+
+
+class ServerMetrics:
+    """Thread-safe counters reported by ``GET /metrics``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.counters: Counter = Counter()
+        self.latency_seconds: Counter = Counter()
+        self.in_flight = 0
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def start(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self, endpoint: str, seconds: float, *, error: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.counters[f"requests.{endpoint}"] += 1
+            if error:
+                self.counters[f"errors.{endpoint}"] += 1
+            self.latency_seconds[endpoint] += seconds
+
+    def record_batch(self, size: int) -> None:
+        with self._lock:
+            self.counters["household_batches"] += 1
+            self.counters["household_batched_requests"] += size
+            self.counters["household_max_batch_size"] = max(
+                self.counters["household_max_batch_size"], size
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "uptime_seconds": time.monotonic() - self._started,
+                "in_flight": self.in_flight,
+                "counters": dict(self.counters),
+                "latency_seconds": dict(self.latency_seconds),
+            }
+
+
+class SimulationWorker:
+    """Long-lived state behind the server: models, datasets and baselines.
+
+    Args:
+        data_folder: Directory for datasets loaded with the country's
+            ``ensure_datasets``.
+        batch_window: Seconds a household request waits for others to
+            batch with.
+        max_batch_size: Largest household batch.
+        max_datasets: Datasets kept loaded; the least recently used is
+            dropped beyond this.
+        max_baselines: Baseline simulations kept; the least recently used
+            is dropped beyond this.
+    """
+
+    def __init__(
+        self,
+        *,
+        data_folder: Union[str, Path] = "./data",
+        batch_window: float = DEFAULT_BATCH_WINDOW_SECONDS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_datasets: int = DEFAULT_MAX_DATASETS,
+        max_baselines: int = DEFAULT_MAX_BASELINES,
+    ) -> None:
+        from policyengine.core.cache import LRUCache
+
+        self.data_folder = str(data_folder)
+        self.metrics = ServerMetrics()
+        self.coalescer = RequestCoalescer()
+        self.batcher = HouseholdBatcher(
+            self._calculate_batch,
+            window=batch_window,
+            max_batch_size=max_batch_size,
+            on_batch=self.metrics.record_batch,
+        )
+        self._lock = threading.Lock()
+        self._countries: dict[str, Any] = {}
+        self._datasets: LRUCache[Any] = LRUCache(max_size=max_datasets)
+        self._baselines: LRUCache[Any] = LRUCache(max_size=max_baselines)
+        self._routes: dict[tuple[str, str], Callable[[dict[str, Any]], Any]] = {
+            ("GET", "/health"): lambda _: self.health(),
+            ("GET", "/metrics"): lambda _: self.metrics_snapshot(),
+            ("POST", "/household"): self.household,
+            ("POST", "/simulation"): self.simulation,
+            ("POST", "/economic-impact"): self.economic_impact,
+        }
+
+    def country(self, country_id: str) -> Any:
+        """Import (once) and return the ``policyengine.<country>`` module."""
+        with self._lock:
+            module = self._countries.get(country_id)
+        if module is not None:
+            return module
+        import policyengine
+
+        module = getattr(policyengine, country_id, None) if country_id else None
+        if country_id not in ("us", "uk") or module is None:
+            raise InvalidRequestError(f"Country {country_id!r} is not installed.")
+        with self._lock:
+            self._countries[country_id] = module
+        return module
+
+    def preload(self, country_ids: list[str]) -> None:
+        """Import country models before the first request needs them."""
+        for country_id in country_ids:
+            self.country(country_id).model
+
+    def health(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "status": "ok",
+                "countries": sorted(self._countries),
+                "datasets": len(self._datasets),
+                "baselines": len(self._baselines),
+            }
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        return {**self.metrics.snapshot(), **self.health()}
+
+    def handle(
+        self, method: str, path: str, body: Optional[dict[str, Any]]
+    ) -> tuple[HTTPStatus, dict[str, Any]]:
+        """Route one request and return the status and JSON payload."""
+        route = self._routes.get((method, path.split("?", 1)[0]))
+        if route is None:
+            return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {path}."}
+        endpoint = path.strip("/").split("?", 1)[0]
+        self.metrics.start()
+        started = time.perf_counter()
+        error = True
+        try:
+            if method == "GET":
+                payload = route(body or {})
+            else:
+                payload, shared = self.coalescer.run(
+                    _request_key(path, body), lambda: route(dict(body or {}))
+                )
+                if shared:
+                    self.metrics.increment("coalesced")
+            error = False
+            return HTTPStatus.OK, payload
+        except InvalidRequestError as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+        except Exception as exc:
+            logger.exception("Request %s %s failed", method, path)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+        finally:
+            self.metrics.finish(endpoint, time.perf_counter() - started, error=error)
+
+    def household(self, body: dict[str, Any]) -> dict[str, Any]:
+        country_id = body.pop("country", "us")
+        module = self.country(country_id)
+        _check_arguments(module.calculate_household, body)
+        if body.get("axes") is not None:
+            result = module.calculate_household(**body)
+        else:
+            result = self.batcher.submit(country_id, body).result()
+        return {"result": result.to_dict()}
+
+    def _calculate_batch(
+        self,
+        country_id: str,
+        options: dict[str, Any],
+        households: list[dict[str, Any]],
+    ) -> list:
+        return self.country(country_id).calculate_households(households, **options)
+
+    def dataset(self, country_id: str, year: int, dataset: Optional[str] = None) -> Any:
+        """Load (once) the dataset for a country and year."""
+        key = _request_key("dataset", country_id, dataset, int(year))
+        with self._lock:
+            cached = self._datasets.get(key)
+        if cached is not None:
+            return cached
+
+        def load() -> Any:
+            kwargs = {"datasets": [dataset]} if dataset else {}
+            loaded = self.country(country_id).ensure_datasets(
+                years=[int(year)], data_folder=self.data_folder, **kwargs
+            )
+            return next(iter(loaded.values()))
+
+        loaded, _ = self.coalescer.run(key, load)
+        with self._lock:
+            self._datasets.add(key, loaded)
+        return loaded
+
+    def baseline(
+        self,
+        country_id: str,
+        year: int,
+        dataset: Optional[str] = None,
+        extra_variables: Optional[dict[str, list[str]]] = None,
+    ):
+        """Run (once) and return the baseline simulation for a dataset.
+
+        Baselines with different ``extra_variables`` are cached separately.
+        """
+        extra_variables = extra_variables or {}
+        key = _request_key("baseline", country_id, dataset, int(year), extra_variables)
+        with self._lock:
+            cached = self._baselines.get(key)
+        if cached is not None:
+            return cached
+
+        def run() -> Any:
+            simulation = self._simulation(
+                country_id, year, dataset, None, extra_variables
+            )
+            return _run_in_memory(simulation)
+
+        simulation, _ = self.coalescer.run(key, run)
+        with self._lock:
+            self._baselines.add(key, simulation)
+        return simulation
+
+    def _simulation(
+        self,
+        country_id: str,
+        year: int,
+        dataset: Optional[str],
+        reform: Optional[Mapping[str, Any]],
+        extra_variables: Optional[dict[str, list[str]]] = None,
+    ):
+        from policyengine.core import Simulation
+
+        return Simulation(
+            dataset=self.dataset(country_id, year, dataset),
+            tax_benefit_model_version=self.country(country_id).model,
+            policy=dict(reform) if reform else None,
+            extra_variables=extra_variables or {},
+        )
+
+    def _scenario_request(self, body: dict[str, Any]):
+        """Validate and return a request's country, year, dataset and reform."""
+        country_id = body.get("country", "us")
+        self.country(country_id)
+        year = _request_year(body)
+        reform = body.get("reform")
+        if reform is not None and not isinstance(reform, Mapping):
+            raise InvalidRequestError("reform must be an object of parameter values.")
+        return country_id, year, body.get("dataset"), reform
+
+    def _scenario(self, body: dict[str, Any]):
+        country_id, year, dataset, reform = self._scenario_request(body)
+        if not reform:
+            return country_id, self.baseline(country_id, year, dataset)
+        simulation = self._simulation(country_id, year, dataset, reform)
+        return country_id, _run_in_memory(simulation)
+
+    def simulation(self, body: dict[str, Any]) -> dict[str, Any]:
+        from policyengine.outputs.aggregate import Aggregate, AggregateType
+
+        _, simulation = self._scenario(body)
+        variables = body.get("variables") or ["household_net_income"]
+        totals = {}
+        for variable in variables:
+            aggregate = Aggregate(
+                simulation=simulation,
+                variable=variable,
+                aggregate_type=AggregateType.SUM,
+            )
+            aggregate.run()
+            totals[variable] = aggregate.result
+        return _jsonable({"simulation_id": simulation.id, "totals": totals})
+
+    def economic_impact(self, body: dict[str, Any]) -> dict[str, Any]:
+        if not body.get("reform"):
+            raise InvalidRequestError("economic-impact requests need a reform.")
+        country_id, year, dataset, reform = self._scenario_request(body)
+        reform_simulation = self._simulation(country_id, year, dataset, reform)
+        # Add the analysis's output variables before either simulation runs,
+        # so the analysis reads both results rather than re-running them.
+        baseline_template = self._simulation(country_id, year, dataset, None)
+        analysis = importlib.import_module(
+            f"policyengine.tax_benefit_models.{country_id}.analysis"
+        )
+        analysis._configure_economic_impact_variables(
+            baseline_template, reform_simulation, False
+        )
+        baseline = self.baseline(
+            country_id, year, dataset, baseline_template.extra_variables
+        )
+        _run_in_memory(reform_simulation)
+        return _jsonable(analysis.economic_impact_analysis(baseline, reform_simulation))
+
+
+def _run_in_memory(simulation: Any) -> Any:
+    """Run ``simulation`` and attach its output as assembled.
+
+    ``ensure()`` then returns the in-memory output instead of loading,
+    re-running or saving the simulation to the data folder.
+    """
+    simulation.run()
+    simulation.use_assembled_output(simulation.output_dataset)
+    return simulation
+
+
+def _check_arguments(function: Callable[..., Any], kwargs: Mapping[str, Any]) -> None:
+    """Reject keyword arguments ``function`` does not name or is missing."""
+    signature = inspect.signature(function)
+    try:
+        bound = signature.bind(**kwargs)
+    except TypeError as exc:
+        raise InvalidRequestError(f"Invalid request: {exc}.") from exc
+    for name, parameter in signature.parameters.items():
+        if parameter.kind is inspect.Parameter.VAR_KEYWORD and bound.arguments.get(
+            name
+        ):
+            unknown = ", ".join(sorted(bound.arguments[name]))
+            raise InvalidRequestError(f"Unsupported request fields: {unknown}.")
+
+
+def _request_year(body: Mapping[str, Any]) -> int:
+    year = body.get("year")
+    if isinstance(year, bool) or not isinstance(year, (int, str)):
+        raise InvalidRequestError("Requests need an integer year.")
+    try:
+        return int(year)
+    except ValueError as exc:
+        raise InvalidRequestError(f"Invalid year {year!r}.") from exc
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    worker: SimulationWorker
+
+    def do_GET(self) -> None:
+        self._respond(*self.worker.handle("GET", self.path, None))
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as exc:
+            self._respond(HTTPStatus.BAD_REQUEST, {"error": f"Invalid JSON: {exc}"})
+            return
+        if not isinstance(body, dict):
+            self._respond(
+                HTTPStatus.BAD_REQUEST, {"error": "Request body must be an object."}
+            )
+            return
+        self._respond(*self.worker.handle("POST", self.path, body))
+
+    def _respond(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s %s", self.address_string(), format % args)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(
+    worker: SimulationWorker,
+    *,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[Union[str, Path]] = None,
+) -> socketserver.BaseServer:
+    """Bind a threaded HTTP server for ``worker`` without starting it.
+
+    ``socket_path`` listens on a Unix socket instead of ``host``/``port``.
+    Call ``serve_forever()`` on the result to handle requests.
+    """
+    handler = type("RequestHandler", (_RequestHandler,), {"worker": worker})
+    if socket_path is not None:
+        Path(socket_path).unlink(missing_ok=True)
+        return _UnixHTTPServer(str(socket_path), handler)
+    return ThreadingHTTPServer((host, port), handler)
@@ -8,6 +8,9 @@ their public ``calculate_household`` / ``analyze_reform`` entry points.
 from .axes import normalize_axes as normalize_axes
 from .axes import values_for_entity as values_for_entity
 from .extra_variables import dispatch_extra_variables as dispatch_extra_variables
+from .household import (
+    household_span_attributes as household_span_attributes,
+)
 from .household import (
     validate_annual_household_inputs as validate_annual_household_inputs,
 )
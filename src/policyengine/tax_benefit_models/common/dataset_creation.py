@@ -0,0 +1,130 @@
+"""Shared machinery for building per-year datasets from a country package.
+
+``create_datasets`` in the country modules turns one source dataset into one
+``{stem}_year_{year}.h5`` file per year, by default in-process from a single
+``Microsimulation``. Years are independent, so with ``max_workers`` above one
+they are split into contiguous batches and built concurrently in a process
+pool (each worker constructs one ``Microsimulation`` from its own copy of the
+source file and reuses it for its batch). ``ensure_datasets`` only builds the years whose files are missing.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def year_dataset_filepath(data_folder: str, dataset_stem: str, year: int) -> str:
+    """Return the conventional file path of one year of a dataset."""
+    return f"{data_folder}/{dataset_stem}_year_{year}.h5"
+
+
+def missing_years(data_folder: str, dataset_stem: str, years: Sequence[int]) -> list:
+    """Return the years whose dataset file does not exist yet, in order."""
+    return [
+        year
+        for year in years
+        if not Path(year_dataset_filepath(data_folder, dataset_stem, year)).exists()
+    ]
+
+
+def resolve_year_workers(max_workers: Optional[int], n_years: int) -> int:
+    """Number of worker processes for ``n_years`` years.
+
+    ``1`` (or a single year) builds in-process; ``None`` uses one process per
+    year, bounded by the CPU count.
+    """
+    if n_years <= 1:
+        return 1
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    return max(1, min(max_workers, n_years))
+
+
+def year_worker_options(max_workers: Optional[int]) -> dict[str, Any]:
+    """Keyword arguments forwarding ``max_workers`` unless it is the default."""
+    return {} if max_workers == 1 else {"max_workers": max_workers}
+
+
+def run_year_batches(
+    worker: Callable[..., Any],
+    years: Sequence[int],
+    n_workers: int,
+    source: str,
+    *args: Any,
+) -> list:
+    """Run ``worker(source_copy, *args, batch)`` over contiguous year batches.
+
+    ``worker`` must be a module-level function: batches run in ``spawn``ed
+    processes so no simulation state is inherited from the parent. Country
+    packages open their source dataset through ``pandas.HDFStore`` in append
+    mode, so each worker gets its own temporary copy of ``source`` rather
+    than sharing (and possibly corrupting) one file held open for writing.
+    The copies cost one source file of disk per worker and are removed
+    afterwards. Returns the workers' results in batch order.
+    """
+    batches = [
+        [int(year) for year in batch]
+        for batch in np.array_split(np.asarray(list(years)), n_workers)
+        if len(batch)
+    ]
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="policyengine-years-") as scratch:
+        copies = []
+        for index in range(len(batches)):
+            # Keep the file name, which country packages may read.
+            copy = Path(scratch) / str(index) / Path(source).name
+            copy.parent.mkdir()
+            shutil.copyfile(source, copy)
+            copies.append(str(copy))
+        with ProcessPoolExecutor(max_workers=len(batches), mp_context=context) as pool:
+            futures = [
+                pool.submit(worker, copy, *args, batch)
+                for copy, batch in zip(copies, batches)
+            ]
+            return [future.result() for future in futures]
+
+
+def person_household_weights(
+    person_household_ids: Any,
+    household_ids: Any,
+    household_weights: Any,
+) -> np.ndarray:
+    """Give every person the weight of their household (``NaN`` if absent)."""
+    household_weights = np.asarray(household_weights, dtype=float)
+    positions = pd.Index(np.asarray(household_ids)).get_indexer(
+        np.asarray(person_household_ids)
+    )
+    weights = np.full(len(positions), np.nan)
+    linked = positions >= 0
+    weights[linked] = household_weights[positions[linked]]
+    return weights
+
+
+def entity_household_weights(
+    entity_ids: Any,
+    person_entity_ids: Any,
+    person_weights: Any,
+) -> np.ndarray:
+    """Give every group entity row the household weight of its members.
+
+    One ``get_indexer`` lookup replaces the person/entity/household merge
+    chain. Entities without members get ``NaN``, as the left merges did.
+    """
+    person_weights = np.asarray(person_weights, dtype=float)
+    positions = pd.Index(np.asarray(entity_ids)).get_indexer(
+        np.asarray(person_entity_ids)
+    )
+    weights = np.full(len(entity_ids), np.nan)
+    linked = positions >= 0
+    weights[positions[linked]] = person_weights[linked]
+    return weights
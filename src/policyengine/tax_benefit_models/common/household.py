@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping, Sequence
+from collections.abc import Callable, Mapping, Sequence, Sized
 from typing import Any
 
 
@@ -58,3 +58,20 @@ def _input_location(
     if record_count == 1 and entity != "people":
         return f"{entity}.{variable}"
     return f"{entity}[{index}].{variable}"
+
+
+def household_span_attributes(country: str) -> Callable[..., dict[str, Any]]:
+    """Tracing attributes for the household calculator entry points."""
+
+    def attributes(*args: Any, **kwargs: Any) -> dict[str, Any]:
+        households = args[0] if args else kwargs.get("households")
+        people = kwargs.get("people")
+        return {
+            "country": country,
+            "households": len(households) if isinstance(households, Sized) else None,
+            "people": len(people) if isinstance(people, Sized) else None,
+            "axes": kwargs.get("axes") is not None,
+            "reformed": bool(kwargs.get("reform")),
+        }
+
+    return attributes
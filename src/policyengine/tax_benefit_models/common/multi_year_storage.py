@@ -0,0 +1,318 @@
+"""One-file storage for several years of a dataset, deduplicated across years.
+
+Per-year files repeat every column that does not change between years: IDs,
+demographics, geography and often weights. A multi-year file keeps the first
+year written as the *base* and stores, for each later year, only what differs
+from it:
+
+``/base/{entity}/{column}``
+    Base-year values.
+``/years/{year}/{entity}``
+    Group whose ``columns`` attribute lists the year's columns in order.
+    Columns equal to the base have no data. A column whose changes touch few
+    rows stores ``delta/{column}/index`` and ``delta/{column}/values``;
+    otherwise (new columns, changed dtype or row count, broad changes such
+    as uprated incomes) it stores ``full/{column}``.
+
+Every stored column carries its pandas dtype in attributes (with the
+categories of a categorical), and a ``{column}__nulls`` sibling lists the
+missing rows of text and nullable columns, so a year reads back with the
+dtypes it was written with.
+
+Reading a year touches only the base columns it needs and that year's own
+groups, so loading one year of a ten-year projection reads roughly one year
+of data.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import h5py
+import numpy as np
+import pandas as pd
+
+MULTI_YEAR_FORMAT = "policyengine-multi-year-dataset"
+MULTI_YEAR_FORMAT_VERSION = 2
+
+# Store a changed column as a sparse delta while at most this share of rows
+# differ; an index and value per changed row costs about twice a full value.
+_DELTA_MAX_FRACTION = 0.4
+
+# Sibling dataset holding the positions of a column's missing values, for
+# dtypes (text, nullable integers and booleans) that cannot store them inline.
+_NULLS_SUFFIX = "__nulls"
+
+
+def multi_year_dataset_filepath(data_folder: str, dataset_stem: str) -> str:
+    """Return the conventional path of a dataset's multi-year file."""
+    return f"{data_folder}/{dataset_stem}_years.h5"
+
+
+def is_multi_year_dataset_file(path: str | Path) -> bool:
+    """Return whether ``path`` is a multi-year dataset file."""
+    try:
+        with h5py.File(path, "r") as h5_file:
+            return h5_file.attrs.get("format") == MULTI_YEAR_FORMAT
+    except OSError:
+        return False
+
+
+def multi_year_dataset_years(path: str | Path) -> list[int]:
+    """Return the years stored in a multi-year file (empty if it is absent)."""
+    if not Path(path).exists():
+        return []
+    with h5py.File(path, "r") as h5_file:
+        if "years" not in h5_file:
+            return []
+        return sorted(int(year) for year in h5_file["years"])
+
+
+@dataclass
+class _StoredColumn:
+    """A column as stored: plain values, a null mask and its pandas dtype.
+
+    ``values`` is an array h5py can write (text as UTF-8 strings,
+    categoricals as their integer codes, nullable extension arrays as their
+    NumPy dtype with nulls filled). ``nulls`` marks missing entries that
+    ``values`` cannot hold itself, and ``attrs`` records what
+    :func:`_restore_column` needs to rebuild the original dtype.
+    """
+
+    values: np.ndarray
+    nulls: np.ndarray
+    attrs: dict[str, Any]
+
+    def rows(self, index: np.ndarray) -> _StoredColumn:
+        return _StoredColumn(self.values[index], self.nulls[index], self.attrs)
+
+
+def _encode_column(values: pd.Series) -> _StoredColumn:
+    """Split a column into storable values, a null mask and dtype attributes."""
+    dtype = values.dtype
+    attrs: dict[str, Any] = {"pandas_dtype": str(dtype)}
+    no_nulls = np.zeros(len(values), dtype=bool)
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Codes are -1 where missing, so no separate mask is needed.
+        attrs["ordered"] = bool(dtype.ordered)
+        attrs["categories"] = _encode_column(pd.Series(dtype.categories)).values
+        return _StoredColumn(values.cat.codes.to_numpy(), no_nulls, attrs)
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        # NaN is its own missing value in float columns.
+        return _StoredColumn(values.to_numpy(), no_nulls, attrs)
+    nulls = values.isna().to_numpy()
+    numpy_dtype = getattr(dtype, "numpy_dtype", None)
+    if numpy_dtype is not None and numpy_dtype.kind in "biuf":
+        # Nullable Int64/Float64/boolean columns.
+        array = values.to_numpy(dtype=numpy_dtype, na_value=0)
+    else:
+        text = values.astype(object).where(~nulls, "").astype(str)
+        array = np.asarray(text, dtype=object)
+    return _StoredColumn(array, nulls, attrs)
+
+
+def _restore_column(column: _StoredColumn) -> Any:
+    """Rebuild the values (with their pandas dtype) written by ``_encode_column``.
+
+    Columns without dtype attributes, written by earlier versions, are
+    returned as stored.
+    """
+    pandas_dtype = column.attrs.get("pandas_dtype")
+    if pandas_dtype is None:
+        return column.values
+    if pandas_dtype == "category":
+        return pd.Series(
+            pd.Categorical.from_codes(
+                column.values,
+                categories=column.attrs["categories"],
+                ordered=bool(column.attrs["ordered"]),
+            )
+        )
+    if not column.nulls.any() and column.values.dtype.kind in "biuf":
+        return pd.Series(column.values, dtype=pandas_dtype)
+    values = pd.Series(column.values, dtype=object)
+    values[column.nulls] = None
+    return values.astype(pandas_dtype)
+
+
+def _write_column(group: h5py.Group, name: str, column: _StoredColumn) -> None:
+    values = column.values
+    if values.dtype.kind == "O":
+        dataset = group.create_dataset(name, data=values, dtype=h5py.string_dtype())
+    else:
+        dataset = group.create_dataset(name, data=values)
+    for key, value in column.attrs.items():
+        if isinstance(value, np.ndarray) and value.dtype.kind == "O":
+            dataset.attrs.create(key, value, dtype=h5py.string_dtype())
+        else:
+            dataset.attrs[key] = value
+    if column.nulls.any():
+        group.create_dataset(
+            f"{name}{_NULLS_SUFFIX}", data=np.flatnonzero(column.nulls)
+        )
+
+
+def _read_values(dataset: h5py.Dataset) -> np.ndarray:
+    if h5py.check_string_dtype(dataset.dtype) is not None:
+        return dataset.asstr()[()].astype(object)
+    return dataset[()]
+
+
+def _read_column(group: h5py.Group, name: str) -> _StoredColumn:
+    dataset = group[name]
+    values = _read_values(dataset)
+    nulls = np.zeros(len(values), dtype=bool)
+    null_positions = group.get(f"{name}{_NULLS_SUFFIX}")
+    if null_positions is not None:
+        nulls[null_positions[()]] = True
+    attrs = {}
+    for key, value in dataset.attrs.items():
+        if isinstance(value, np.ndarray) and value.dtype.kind == "O":
+            value = value.astype(str).astype(object)
+        attrs[key] = value
+    return _StoredColumn(values, nulls, attrs)
+
+
+def _same_attrs(first: dict[str, Any], second: dict[str, Any]) -> bool:
+    return first.keys() == second.keys() and all(
+        np.array_equal(first[key], second[key]) for key in first
+    )
+
+
+def _changed_rows(base: _StoredColumn, column: _StoredColumn) -> Optional[np.ndarray]:
+    """Positions where ``column`` differs from ``base``, or ``None`` if the two
+    cannot be compared row by row."""
+    if (
+        base.values.shape != column.values.shape
+        or base.values.dtype != column.values.dtype
+        or not _same_attrs(base.attrs, column.attrs)
+    ):
+        return None
+    changed = (base.values != column.values) | (base.nulls != column.nulls)
+    changed &= ~(base.nulls & column.nulls)
+    if column.values.dtype.kind == "f":
+        changed &= ~(np.isnan(base.values) & np.isnan(column.values))
+    return np.flatnonzero(changed)
+
+
+def append_multi_year_dataset_year(
+    path: str | Path,
+    year: int,
+    entity_frames: Mapping[str, pd.DataFrame],
+) -> None:
+    """Add one year of entity tables to a multi-year file.
+
+    The first year written becomes the base; later years are stored as
+    differences from it. Years are never rewritten in place, because every
+    other year is stored relative to the base. A year is built under
+    ``/pending`` and moved into ``/years`` only once every column is
+    written, so a failed or interrupted append leaves no partial year.
+
+    Raises:
+        ValueError: If ``year`` is already stored.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(path, "a") as h5_file:
+        if "format" not in h5_file.attrs:
+            h5_file.attrs["format"] = MULTI_YEAR_FORMAT
+            h5_file.attrs["version"] = MULTI_YEAR_FORMAT_VERSION
+        years = h5_file.require_group("years")
+        if str(year) in years:
+            raise ValueError(f"Year {year} is already stored in {path}.")
+        is_base_year = "base" not in h5_file
+
+        pending = h5_file.require_group("pending")
+        if str(year) in pending:
+            # Left behind by an interrupted append.
+            del pending[str(year)]
+        staging = pending.create_group(str(year))
+        try:
+            base = staging.create_group("base") if is_base_year else h5_file["base"]
+            _write_year(staging.create_group("year"), base, entity_frames, is_base_year)
+        except BaseException:
+            del pending[str(year)]
+            raise
+        if is_base_year:
+            h5_file.move(staging["base"].name, "/base")
+            h5_file.attrs["base_year"] = int(year)
+        h5_file.move(staging["year"].name, f"/years/{year}")
+        del pending[str(year)]
+
+
+def _write_year(
+    year_group: h5py.Group,
+    base: h5py.Group,
+    entity_frames: Mapping[str, pd.DataFrame],
+    is_base_year: bool,
+) -> None:
+    for entity, frame in entity_frames.items():
+        entity_group = year_group.create_group(entity)
+        entity_group.attrs["columns"] = [str(column) for column in frame.columns]
+        base_entity = base.require_group(entity) if is_base_year else base.get(entity)
+        for column in frame.columns:
+            name = str(column)
+            stored = _encode_column(frame[column])
+            if is_base_year:
+                _write_column(base_entity, name, stored)
+                continue
+            changed = None
+            if base_entity is not None and name in base_entity:
+                changed = _changed_rows(_read_column(base_entity, name), stored)
+            if changed is None or len(changed) > _DELTA_MAX_FRACTION * len(
+                stored.values
+            ):
+                _write_column(entity_group.require_group("full"), name, stored)
+            elif len(changed):
+                delta = entity_group.require_group("delta").create_group(name)
+                delta.create_dataset("index", data=changed)
+                _write_column(delta, "values", stored.rows(changed))
+
+
+def read_multi_year_dataset_year(
+    path: str | Path,
+    year: int,
+    columns: Optional[Iterable[str]] = None,
+) -> dict[str, pd.DataFrame]:
+    """Reconstruct one year's entity tables from a multi-year file.
+
+    Args:
+        path: Multi-year dataset file.
+        year: Year to reconstruct.
+        columns: Optional allow-list of columns to read; others are skipped
+            without being read.
+
+    Raises:
+        ValueError: If ``year`` is not stored in the file.
+    """
+    keep = None if columns is None else set(columns)
+    frames = {}
+    with h5py.File(path, "r") as h5_file:
+        years = h5_file.get("years")
+        if years is None or str(year) not in years:
+            stored = sorted(int(key) for key in years) if years is not None else []
+            raise ValueError(
+                f"Year {year} is not stored in {path}. Stored years: {stored}."
+            )
+        for entity, entity_group in years[str(year)].items():
+            full = entity_group.get("full")
+            delta = entity_group.get("delta")
+            data = {}
+            for column in entity_group.attrs["columns"]:
+                if keep is not None and column not in keep:
+                    continue
+                if full is not None and column in full:
+                    data[column] = _restore_column(_read_column(full, column))
+                    continue
+                stored = _read_column(h5_file["base"][entity], column)
+                if delta is not None and column in delta:
+                    index = delta[column]["index"][()]
+                    changes = _read_column(delta[column], "values")
+                    stored.values[index] = changes.values
+                    stored.nulls[index] = changes.nulls
+                data[column] = _restore_column(stored)
+            frames[entity] = pd.DataFrame(data)
+    return frames
@@ -0,0 +1,323 @@
+"""Progressive refinement of population reform analyses.
+
+A full-dataset reform analysis takes minutes. :func:`progressive_reform_analysis`
+instead runs the analysis on a small stratified household sample first,
+yields the provisional result with confidence intervals for headline totals,
+and refines on larger samples until it reaches the full dataset.
+
+Samples are drawn with one seed, so each stage's households include every
+household of the stage before. Households are simulated independently, so a
+stage only runs the baseline and reform microsimulations on the households
+it adds; earlier outputs are reused and reweighted to the stage's sample.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from statistics import NormalDist
+from typing import Generic, Optional, TypeVar
+
+import numpy as np
+import pandas as pd
+from microdf import MicroDataFrame
+from pydantic import BaseModel, ConfigDict
+
+from policyengine.core import Dataset, Simulation
+from policyengine.core.sampling import SamplingDesign
+from policyengine.utils.household_partition import household_partition_index
+
+AnalysisT = TypeVar("AnalysisT")
+
+
+class TotalChangeEstimate(BaseModel):
+    """Weighted total of a household-level reform-minus-baseline change."""
+
+    variable: str
+    estimate: float
+    standard_error: float
+    lower: float
+    upper: float
+
+
+class ProgressiveReformAnalysis(BaseModel, Generic[AnalysisT]):
+    """One stage of a progressively refined reform analysis.
+
+    ``analysis`` is the country's full reform analysis computed on the
+    stage's sample. Provisional stages (``is_final`` false) carry sampling
+    error; ``intervals`` quantifies it for headline totals. The final stage
+    covers the full dataset, so its intervals have zero width.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    stage: int
+    sampling_fraction: float
+    households: int
+    is_final: bool
+    analysis: AnalysisT
+    intervals: dict[str, TotalChangeEstimate]
+    sampling_design: Optional[SamplingDesign] = None
+
+
+def _household_subset(dataset: Dataset, household_mask: np.ndarray) -> Dataset:
+    """In-memory copy of ``dataset`` holding only the selected households."""
+    entity_data = dataset.data.entity_data
+    group_entities = [name for name in entity_data if name != "person"]
+    rows = household_partition_index(entity_data, group_entities).entity_rows(
+        household_mask
+    )
+    subset = {}
+    for entity, mdf in entity_data.items():
+        frame = pd.DataFrame(mdf)
+        if entity in rows:
+            frame = frame.iloc[rows[entity]].reset_index(drop=True)
+        weight_column = f"{entity}_weight"
+        subset[entity] = MicroDataFrame(
+            frame,
+            weights=weight_column if weight_column in frame.columns else None,
+        )
+    return type(dataset)(
+        id=f"{dataset.id}:households-{int(household_mask.sum())}",
+        name=dataset.name,
+        description=dataset.description,
+        filepath=None,
+        tax_benefit_model=dataset.tax_benefit_model,
+        year=dataset.year,
+        data=type(dataset.data)(**subset),
+    )
+
+
+def _combined_output(
+    simulation: Simulation,
+    parts: list[Dataset],
+    sample: Dataset,
+) -> Dataset:
+    """Concatenate output ``parts`` in ``sample`` row order, with its weights.
+
+    Parts hold the households each stage added, so concatenated rows follow
+    the order they were sampled in; they are put back in ``sample``'s order
+    for consumers that align output rows by position. Output tables copy
+    their weights from the input they were run on, so rows simulated at an
+    earlier stage still carry that stage's weights.
+    """
+    template = parts[-1]
+    combined = {}
+    for entity in template.data.entity_data:
+        frame = pd.concat(
+            [pd.DataFrame(part.data.entity_data[entity]) for part in parts],
+            ignore_index=True,
+        )
+        id_column = f"{entity}_id"
+        weight_column = f"{entity}_weight"
+        source = pd.DataFrame(sample.data.entity_data[entity])
+        if id_column in frame.columns and id_column in source.columns:
+            positions = pd.Index(source[id_column]).get_indexer(frame[id_column])
+            if (positions < 0).any():
+                raise ValueError(
+                    f"Simulated {entity} rows are missing from the stage sample."
+                )
+            order = np.argsort(positions, kind="stable")
+            frame = frame.iloc[order].reset_index(drop=True)
+            if weight_column in frame.columns:
+                frame[weight_column] = source[weight_column].to_numpy()[
+                    positions[order]
+                ]
+        combined[entity] = MicroDataFrame(
+            frame,
+            weights=weight_column if weight_column in frame.columns else None,
+        )
+    return type(template)(
+        id=simulation.id,
+        name=template.name,
+        description=template.description,
+        filepath=None,
+        is_output_dataset=True,
+        year=template.year,
+        data=type(template.data)(**combined),
+    )
+
+
+def _total_change_estimate(
+    name: str,
+    variable: str,
+    baseline_output: Dataset,
+    reform_output: Dataset,
+    design: Optional[SamplingDesign],
+    z: float,
+) -> TotalChangeEstimate:
+    baseline_household = pd.DataFrame(baseline_output.data.household)
+    reform_household = pd.DataFrame(reform_output.data.household)
+    change = pd.DataFrame(
+        {
+            "household_id": baseline_household["household_id"].to_numpy(),
+            "household_weight": baseline_household["household_weight"].to_numpy(),
+            name: reform_household[variable].to_numpy(dtype=float)
+            - baseline_household[variable].to_numpy(dtype=float),
+        }
+    )
+    estimate = float(
+        (change["household_weight"].to_numpy() * change[name].to_numpy()).sum()
+    )
+    standard_error = (
+        design.total_standard_error(change, name) if design is not None else 0.0
+    )
+    return TotalChangeEstimate(
+        variable=variable,
+        estimate=estimate,
+        standard_error=standard_error,
+        lower=estimate - z * standard_error,
+        upper=estimate + z * standard_error,
+    )
+
+
+def progressive_reform_analysis(
+    baseline_simulation: Simulation,
+    reform_simulation: Simulation,
+    analyze: Callable[[Simulation, Simulation], AnalysisT],
+    configure: Callable[[Simulation, Simulation], None],
+    interval_variables: Mapping[str, str],
+    *,
+    fractions: Sequence[float] = (0.02, 0.2, 1.0),
+    strata: Sequence[str] = (),
+    income_variable: Optional[str] = None,
+    seed: int = 0,
+    confidence: float = 0.95,
+) -> Iterator[ProgressiveReformAnalysis[AnalysisT]]:
+    """Yield reform analyses on growing household samples.
+
+    Country modules wrap this with their own ``analyze`` and ``configure``
+    steps; see ``progressive_economic_impact_analysis`` in
+    :mod:`policyengine.tax_benefit_models.us.analysis` and
+    :mod:`policyengine.tax_benefit_models.uk.analysis`.
+
+    Args:
+        baseline_simulation: Baseline simulation over the full dataset.
+        reform_simulation: Reform simulation over the same dataset.
+        analyze: Runs the country analysis on a stage's simulations, whose
+            outputs are already populated.
+        configure: Adds the analysis's extra output variables to both
+            simulations; it runs once, before the first stage.
+        interval_variables: Interval name -> household variable whose
+            reform-minus-baseline weighted total gets a confidence interval.
+        fractions: Increasing sample fractions. A final ``1.0`` stage
+            analyses the full dataset and attaches the combined outputs to
+            the caller's simulations with ``use_assembled_output``, so their
+            later ``ensure()`` calls reuse those outputs and never cache or
+            save them.
+        strata: Household columns to stratify the samples by.
+        income_variable: Optional column whose quantile groups also stratify.
+        seed: Random seed shared by every stage, which nests the samples.
+        confidence: Confidence level of the intervals.
+
+    Raises:
+        ValueError: If ``fractions`` is empty, not increasing or outside
+            ``(0, 1]``, the simulations do not share a dataset, or a
+            simulation has a scoping strategy (sample weights would be
+            overwritten by the scoping step).
+    """
+    fractions = [float(fraction) for fraction in fractions]
+    if not fractions:
+        raise ValueError("fractions must contain at least one stage.")
+    if any(not 0 < fraction <= 1 for fraction in fractions) or any(
+        later <= earlier for earlier, later in zip(fractions, fractions[1:])
+    ):
+        raise ValueError(
+            f"fractions must be increasing values in (0, 1], got {fractions}."
+        )
+    if baseline_simulation.dataset is not reform_simulation.dataset and (
+        baseline_simulation.dataset.id != reform_simulation.dataset.id
+    ):
+        raise ValueError(
+            "Progressive analysis needs baseline and reform simulations over "
+            "the same dataset."
+        )
+    if (
+        baseline_simulation.scoping_strategy is not None
+        or reform_simulation.scoping_strategy is not None
+    ):
+        raise ValueError(
+            "Progressive analysis does not support scoped simulations; "
+            "scope the dataset before sampling instead."
+        )
+
+    configure(baseline_simulation, reform_simulation)
+    dataset = baseline_simulation.dataset
+    if dataset.data is None:
+        dataset.load()
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    baseline_parts: list[Dataset] = []
+    reform_parts: list[Dataset] = []
+    simulated_households = np.array([], dtype=np.int64)
+    for stage, fraction in enumerate(fractions):
+        is_final = fraction == 1.0
+        sample = (
+            dataset
+            if is_final
+            else dataset.stratified_sample(
+                fraction=fraction,
+                strata=strata,
+                income_variable=income_variable,
+                seed=seed,
+            )
+        )
+        household_ids = pd.DataFrame(sample.data.household)["household_id"].to_numpy()
+        new_households = ~np.isin(household_ids, simulated_households)
+        if new_households.any():
+            increment = _household_subset(sample, new_households)
+            for simulation, parts in (
+                (baseline_simulation, baseline_parts),
+                (reform_simulation, reform_parts),
+            ):
+                part = simulation.model_copy(
+                    update={
+                        "id": f"{simulation.id}:increment-{stage}",
+                        "dataset": increment,
+                        "output_dataset": None,
+                    }
+                )
+                part.run()
+                parts.append(part.output_dataset)
+            simulated_households = np.concatenate(
+                [simulated_households, household_ids[new_households]]
+            )
+
+        if is_final:
+            stage_baseline, stage_reform = baseline_simulation, reform_simulation
+        else:
+            stage_baseline, stage_reform = (
+                simulation.model_copy(
+                    update={
+                        "id": f"{simulation.id}:sample-{fraction}-{seed}",
+                        "dataset": sample,
+                    }
+                )
+                for simulation in (baseline_simulation, reform_simulation)
+            )
+        stage_baseline.use_assembled_output(
+            _combined_output(stage_baseline, baseline_parts, sample)
+        )
+        stage_reform.use_assembled_output(
+            _combined_output(stage_reform, reform_parts, sample)
+        )
+
+        design = sample.sampling_design if not is_final else None
+        yield ProgressiveReformAnalysis(
+            stage=stage,
+            sampling_fraction=fraction if design is None else design.sampling_fraction,
+            households=len(household_ids),
+            is_final=is_final,
+            analysis=analyze(stage_baseline, stage_reform),
+            intervals={
+                name: _total_change_estimate(
+                    name,
+                    variable,
+                    stage_baseline.output_dataset,
+                    stage_reform.output_dataset,
+                    design,
+                    z,
+                )
+                for name, variable in interval_variables.items()
+            },
+            sampling_design=design,
+        )
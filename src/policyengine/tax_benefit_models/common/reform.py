@@ -42,12 +42,19 @@ from collections.abc import Mapping
 from difflib import get_close_matches
 from typing import TYPE_CHECKING, Any, Optional
 
+from policyengine import tracing
+
 if TYPE_CHECKING:
     from policyengine.core.dynamic import Dynamic
     from policyengine.core.policy import Policy
     from policyengine.core.tax_benefit_model_version import TaxBenefitModelVersion
 
 
+def _reform_span_attributes(reform: Any = None, **kwargs: Any) -> dict[str, Any]:
+    return {"parameters": len(reform) if isinstance(reform, Mapping) else None}
+
+
+@tracing.traced("policyengine.reform.compile", _reform_span_attributes)
 def compile_reform(
     reform: Optional[Mapping[str, Any]],
     *,
@@ -17,7 +17,10 @@ if find_spec("policyengine_uk") is not None:
     from policyengine.core import Dataset
     from policyengine.outputs import LaborSupplyResponse, ProgramStatistics
 
-    from .analysis import economic_impact_analysis
+    from .analysis import (
+        economic_impact_analysis,
+        progressive_economic_impact_analysis,
+    )
     from .datasets import (
         PolicyEngineUKDataset,
         UKYearData,
@@ -25,7 +28,7 @@ if find_spec("policyengine_uk") is not None:
         ensure_datasets,
         load_datasets,
     )
-    from .household import calculate_household
+    from .household import calculate_household, calculate_households
     from .model import (
         PolicyEngineUK,
         PolicyEngineUKLatest,
@@ -55,7 +58,9 @@ if find_spec("policyengine_uk") is not None:
         "model",
         "uk_latest",
         "calculate_household",
+        "calculate_households",
         "economic_impact_analysis",
+        "progressive_economic_impact_analysis",
         "ProgramStatistics",
         "LaborSupplyResponse",
     ]
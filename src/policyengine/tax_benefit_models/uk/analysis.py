@@ -6,6 +6,9 @@ holds the population-level reform-analysis helpers.
 
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
+from typing import Optional
+
 from pydantic import BaseModel
 
 from policyengine.core import OutputCollection, Simulation
@@ -26,7 +29,7 @@ from policyengine.outputs.decile_impact import (
 )
 from policyengine.outputs.inequality import (
     Inequality,
-    calculate_uk_inequality,
+    calculate_uk_inequality_batch,
 )
 from policyengine.outputs.intra_decile_impact import (
     IntraDecileImpact,
@@ -36,6 +39,10 @@ from policyengine.outputs.poverty import (
     Poverty,
     calculate_uk_poverty_rates,
 )
+from policyengine.tax_benefit_models.common.progressive_analysis import (
+    ProgressiveReformAnalysis,
+    progressive_reform_analysis,
+)
 
 # Map of UK program-statistics variable name -> program metadata. The
 # entity for each program is derived from the variable's own metadata at
@@ -90,12 +97,12 @@ def _validate_program_statistics_config(
     )
 
 
-def economic_impact_analysis(
+def _configure_economic_impact_variables(
     baseline_simulation: Simulation,
     reform_simulation: Simulation,
-    include_cliff_impacts: bool = False,
-) -> PolicyReformAnalysis:
-    """Perform comprehensive analysis of a UK policy reform."""
+    include_cliff_impacts: bool,
+) -> None:
+    """Add the analysis's extra output variables before the simulations run."""
     configure_labor_supply_response_variables(
         baseline_simulation,
         reform_simulation,
@@ -105,6 +112,17 @@ def economic_impact_analysis(
         configure_cliff_impact_variables(baseline_simulation, reform_simulation)
     _validate_program_statistics_config(baseline_simulation, reform_simulation)
 
+
+def economic_impact_analysis(
+    baseline_simulation: Simulation,
+    reform_simulation: Simulation,
+    include_cliff_impacts: bool = False,
+) -> PolicyReformAnalysis:
+    """Perform comprehensive analysis of a UK policy reform."""
+    _configure_economic_impact_variables(
+        baseline_simulation, reform_simulation, include_cliff_impacts
+    )
+
     baseline_simulation.ensure()
     reform_simulation.ensure()
 
@@ -145,8 +163,9 @@ def economic_impact_analysis(
 
     baseline_poverty = calculate_uk_poverty_rates(baseline_simulation)
     reform_poverty = calculate_uk_poverty_rates(reform_simulation)
-    baseline_inequality = calculate_uk_inequality(baseline_simulation)
-    reform_inequality = calculate_uk_inequality(reform_simulation)
+    baseline_inequality, reform_inequality = calculate_uk_inequality_batch(
+        [baseline_simulation, reform_simulation]
+    )
     labor_supply_response = calculate_labor_supply_response(
         baseline_simulation,
         reform_simulation,
@@ -170,3 +189,47 @@ def economic_impact_analysis(
         labor_supply_response=labor_supply_response,
         cliff_impact=cliff_impact,
     )
+
+
+# Household totals reported with confidence intervals at every stage.
+_PROGRESSIVE_INTERVAL_VARIABLES: dict[str, str] = {
+    "household_tax": "household_tax",
+    "household_benefits": "household_benefits",
+    "household_net_income": "household_net_income",
+}
+
+
+def progressive_economic_impact_analysis(
+    baseline_simulation: Simulation,
+    reform_simulation: Simulation,
+    include_cliff_impacts: bool = False,
+    *,
+    fractions: Sequence[float] = (0.05, 0.3, 1.0),
+    strata: Sequence[str] = ("region",),
+    income_variable: Optional[str] = "employment_income",
+    seed: int = 0,
+    confidence: float = 0.95,
+) -> Iterator[ProgressiveReformAnalysis[PolicyReformAnalysis]]:
+    """Yield :func:`economic_impact_analysis` results on growing samples.
+
+    The UK counterpart of
+    :func:`policyengine.tax_benefit_models.us.analysis.progressive_economic_impact_analysis`,
+    stratified by region and employment-income decile by default. Every
+    stage must sample more than 100 households.
+    """
+    return progressive_reform_analysis(
+        baseline_simulation,
+        reform_simulation,
+        analyze=lambda baseline, reform: economic_impact_analysis(
+            baseline, reform, include_cliff_impacts=include_cliff_impacts
+        ),
+        configure=lambda baseline, reform: _configure_economic_impact_variables(
+            baseline, reform, include_cliff_impacts
+        ),
+        interval_variables=_PROGRESSIVE_INTERVAL_VARIABLES,
+        fractions=fractions,
+        strata=strata,
+        income_variable=income_variable,
+        seed=seed,
+        confidence=confidence,
+    )
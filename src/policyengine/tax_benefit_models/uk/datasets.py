@@ -1,16 +1,35 @@
 from pathlib import Path
-from typing import Optional
+from typing import Any, Literal, Optional
 
 import pandas as pd
 from microdf import MicroDataFrame
 from pydantic import ConfigDict
 
+from policyengine import tracing
 from policyengine.core import Dataset, YearData
+from policyengine.core.dataset import dataset_span_attributes
 from policyengine.provenance.dataset_sources import materialize_dataset_source
 from policyengine.provenance.manifest import (
+    certified_dataset_sha256,
     dataset_logical_name,
     resolve_dataset_reference,
 )
+from policyengine.tax_benefit_models.common.dataset_creation import (
+    entity_household_weights,
+    missing_years,
+    person_household_weights,
+    resolve_year_workers,
+    run_year_batches,
+    year_dataset_filepath,
+    year_worker_options,
+)
+from policyengine.tax_benefit_models.common.multi_year_storage import (
+    append_multi_year_dataset_year,
+    is_multi_year_dataset_file,
+    multi_year_dataset_filepath,
+    multi_year_dataset_years,
+    read_multi_year_dataset_year,
+)
 
 
 class UKYearData(YearData):
@@ -51,6 +70,7 @@ class PolicyEngineUKDataset(Dataset):
         if self.data is None and self.filepath:
             self.load()
 
+    @tracing.traced("policyengine.dataset.save", dataset_span_attributes)
     def save(self) -> None:
         """Save dataset to HDF5 file.
 
@@ -90,17 +110,27 @@ class PolicyEngineUKDataset(Dataset):
             store.put("benunit", benunit_df, format="table")
             store.put("household", household_df, format="table")
 
+    @tracing.traced("policyengine.dataset.load", dataset_span_attributes)
     def load(self) -> None:
-        """Load dataset from HDF5 file into this instance."""
+        """Load dataset from HDF5 file into this instance.
+
+        Multi-year files (see ``ensure_datasets(storage="multi_year")``) are
+        reconstructed for ``self.year`` only.
+        """
         filepath = self.filepath
-        with pd.HDFStore(filepath, mode="r") as store:
-            self.data = UKYearData(
-                person=MicroDataFrame(store["person"], weights="person_weight"),
-                benunit=MicroDataFrame(store["benunit"], weights="benunit_weight"),
-                household=MicroDataFrame(
-                    store["household"], weights="household_weight"
-                ),
-            )
+        if is_multi_year_dataset_file(filepath):
+            frames = read_multi_year_dataset_year(filepath, self.year)
+        else:
+            with pd.HDFStore(filepath, mode="r") as store:
+                frames = {
+                    entity: store[entity]
+                    for entity in ("person", "benunit", "household")
+                }
+        self.data = UKYearData(
+            person=MicroDataFrame(frames["person"], weights="person_weight"),
+            benunit=MicroDataFrame(frames["benunit"], weights="benunit_weight"),
+            household=MicroDataFrame(frames["household"], weights="household_weight"),
+        )
 
     def __repr__(self) -> str:
         if self.data is None:
@@ -112,83 +142,127 @@ class PolicyEngineUKDataset(Dataset):
             return f"<PolicyEngineUKDataset id={self.id} year={self.year} filepath={self.filepath} people={n_people} benunits={n_benunits} households={n_households}>"
 
 
+def _build_uk_year_dataset(
+    sim: Any,
+    dataset_stem: str,
+    year: int,
+    data_folder: str,
+) -> PolicyEngineUKDataset:
+    """Take one year of ``sim``'s dataset, add weight columns and save it."""
+    year_dataset = sim.dataset[year]
+
+    # Convert to pandas DataFrames and add weight columns
+    person_df = pd.DataFrame(year_dataset.person)
+    benunit_df = pd.DataFrame(year_dataset.benunit)
+    household_df = pd.DataFrame(year_dataset.household)
+
+    # Map household weights to person and benunit levels through each row's
+    # household (vectorised index lookups, not merges)
+    person_df["person_weight"] = person_household_weights(
+        person_df["person_household_id"],
+        household_df["household_id"],
+        household_df["household_weight"],
+    )
+    benunit_df["benunit_weight"] = entity_household_weights(
+        benunit_df["benunit_id"],
+        person_df["person_benunit_id"],
+        person_df["person_weight"],
+    )
+
+    uk_dataset = PolicyEngineUKDataset(
+        id=f"{dataset_stem}_year_{year}",
+        name=f"{dataset_stem}-year-{year}",
+        description=f"UK Dataset for year {year} based on {dataset_stem}",
+        filepath=year_dataset_filepath(data_folder, dataset_stem, year),
+        year=int(year),
+        data=UKYearData(
+            person=MicroDataFrame(person_df, weights="person_weight"),
+            benunit=MicroDataFrame(benunit_df, weights="benunit_weight"),
+            household=MicroDataFrame(household_df, weights="household_weight"),
+        ),
+    )
+    uk_dataset.save()
+    return uk_dataset
+
+
+def _create_uk_year_files(
+    runtime_dataset: str,
+    dataset_stem: str,
+    data_folder: str,
+    years: list[int],
+) -> list[int]:
+    """Process-pool worker: build and save a contiguous batch of years."""
+    from policyengine_uk import Microsimulation
+
+    sim = Microsimulation(dataset=runtime_dataset)
+    for year in years:
+        _build_uk_year_dataset(sim, dataset_stem, year, data_folder)
+    return years
+
+
 def create_datasets(
     datasets: list[str] = [
         "populace_uk_2023",
     ],
     years: list[int] = [2026, 2027, 2028, 2029, 2030],
     data_folder: str = "./data",
+    max_workers: Optional[int] = 1,
 ) -> dict[str, PolicyEngineUKDataset]:
+    """Create PolicyEngineUKDataset instances for each dataset and year.
+
+    Args:
+        datasets: List of logical dataset names or HuggingFace dataset URLs
+        years: List of years to extract data for
+        data_folder: Directory to save the dataset files
+        max_workers: Worker processes for building years concurrently.
+            The default, ``1``, builds every year in this process from one
+            ``Microsimulation``. Larger values (or ``None``, one per year
+            bounded by the CPU count) load a ``Microsimulation`` in each
+            worker from its own temporary copy of the source file, so peak
+            memory and disk use grow with the worker count, and the built
+            years are then read back from disk.
+
+    Returns:
+        Dictionary mapping dataset keys to PolicyEngineUKDataset objects
+    """
     result = {}
     for dataset in datasets:
         resolved_dataset = resolve_dataset_reference("uk", dataset)
         dataset_stem = dataset_logical_name(resolved_dataset)
-        runtime_dataset = materialize_dataset_source(resolved_dataset)
-        from policyengine_uk import Microsimulation
-
-        sim = Microsimulation(dataset=runtime_dataset)
+        runtime_dataset = materialize_dataset_source(
+            resolved_dataset,
+            sha256=certified_dataset_sha256("uk", resolved_dataset),
+        )
+
+        n_workers = resolve_year_workers(max_workers, len(years))
+        if n_workers == 1:
+            from policyengine_uk import Microsimulation
+
+            sim = Microsimulation(dataset=runtime_dataset)
+            for year in years:
+                result[f"{dataset_stem}_{year}"] = _build_uk_year_dataset(
+                    sim, dataset_stem, year, data_folder
+                )
+            continue
+
+        run_year_batches(
+            _create_uk_year_files,
+            years,
+            n_workers,
+            runtime_dataset,
+            dataset_stem,
+            data_folder,
+        )
         for year in years:
-            year_dataset = sim.dataset[year]
-
-            # Convert to pandas DataFrames and add weight columns
-            person_df = pd.DataFrame(year_dataset.person)
-            benunit_df = pd.DataFrame(year_dataset.benunit)
-            household_df = pd.DataFrame(year_dataset.household)
-
-            # Map household weights to person and benunit levels
-            person_df = person_df.merge(
-                household_df[["household_id", "household_weight"]],
-                left_on="person_household_id",
-                right_on="household_id",
-                how="left",
-            )
-            person_df = person_df.rename(columns={"household_weight": "person_weight"})
-            person_df = person_df.drop(columns=["household_id"])
-
-            # Get household_id for each benunit from person table
-            benunit_household_map = person_df[
-                ["person_benunit_id", "person_household_id"]
-            ].drop_duplicates()
-            benunit_df = benunit_df.merge(
-                benunit_household_map,
-                left_on="benunit_id",
-                right_on="person_benunit_id",
-                how="left",
-            )
-            benunit_df = benunit_df.merge(
-                household_df[["household_id", "household_weight"]],
-                left_on="person_household_id",
-                right_on="household_id",
-                how="left",
-            )
-            benunit_df = benunit_df.rename(
-                columns={"household_weight": "benunit_weight"}
-            )
-            benunit_df = benunit_df.drop(
-                columns=[
-                    "person_benunit_id",
-                    "person_household_id",
-                    "household_id",
-                ],
-                errors="ignore",
-            )
-
             uk_dataset = PolicyEngineUKDataset(
                 id=f"{dataset_stem}_year_{year}",
                 name=f"{dataset_stem}-year-{year}",
                 description=f"UK Dataset for year {year} based on {dataset_stem}",
-                filepath=f"{data_folder}/{dataset_stem}_year_{year}.h5",
+                filepath=year_dataset_filepath(data_folder, dataset_stem, year),
                 year=int(year),
-                data=UKYearData(
-                    person=MicroDataFrame(person_df, weights="person_weight"),
-                    benunit=MicroDataFrame(benunit_df, weights="benunit_weight"),
-                    household=MicroDataFrame(household_df, weights="household_weight"),
-                ),
             )
-            uk_dataset.save()
-
-            dataset_key = f"{dataset_stem}_{year}"
-            result[dataset_key] = uk_dataset
+            uk_dataset.load()
+            result[f"{dataset_stem}_{year}"] = uk_dataset
 
     return result
 
@@ -205,7 +279,7 @@ def load_datasets(
         resolved_dataset = resolve_dataset_reference("uk", dataset)
         dataset_stem = dataset_logical_name(resolved_dataset)
         for year in years:
-            filepath = f"{data_folder}/{dataset_stem}_year_{year}.h5"
+            filepath = year_dataset_filepath(data_folder, dataset_stem, year)
             uk_dataset = PolicyEngineUKDataset(
                 name=f"{dataset_stem}-year-{year}",
                 description=f"UK Dataset for year {year} based on {dataset_stem}",
@@ -220,37 +294,120 @@ def load_datasets(
     return result
 
 
+def _ensure_multi_year_dataset(
+    dataset: str,
+    dataset_stem: str,
+    years: list[int],
+    data_folder: str,
+    max_workers: Optional[int],
+) -> dict[str, PolicyEngineUKDataset]:
+    filepath = multi_year_dataset_filepath(data_folder, dataset_stem)
+    stored = set(multi_year_dataset_years(filepath))
+    to_create = [year for year in years if year not in stored]
+
+    result = {}
+    if to_create:
+        created = create_datasets(
+            datasets=[dataset],
+            years=to_create,
+            data_folder=data_folder,
+            **year_worker_options(max_workers),
+        )
+        for year in to_create:
+            uk_dataset = created[f"{dataset_stem}_{year}"]
+            append_multi_year_dataset_year(
+                filepath,
+                year,
+                {
+                    entity: pd.DataFrame(frame)
+                    for entity, frame in uk_dataset.data.entity_data.items()
+                },
+            )
+            # The year now lives in the multi-year file.
+            Path(uk_dataset.filepath).unlink(missing_ok=True)
+            uk_dataset.filepath = filepath
+            result[f"{dataset_stem}_{year}"] = uk_dataset
+
+    for year in years:
+        key = f"{dataset_stem}_{year}"
+        if key not in result:
+            result[key] = PolicyEngineUKDataset(
+                id=f"{dataset_stem}_year_{year}",
+                name=f"{dataset_stem}-year-{year}",
+                description=f"UK Dataset for year {year} based on {dataset_stem}",
+                filepath=filepath,
+                year=int(year),
+            )
+    return {
+        f"{dataset_stem}_{year}": result[f"{dataset_stem}_{year}"] for year in years
+    }
+
+
 def ensure_datasets(
     datasets: list[str] = [
         "populace_uk_2023",
     ],
     years: list[int] = [2026, 2027, 2028, 2029, 2030],
     data_folder: str = "./data",
+    max_workers: Optional[int] = 1,
+    storage: Literal["per_year", "multi_year"] = "per_year",
 ) -> dict[str, PolicyEngineUKDataset]:
-    """Ensure datasets exist, loading if available or creating if not.
+    """Ensure datasets exist, loading years that are saved and creating the rest.
+
+    Only the years whose files are missing are created, so adding a year to
+    an existing panel does not rebuild the others.
 
     Args:
         datasets: List of HuggingFace dataset paths
         years: List of years to load/create data for
         data_folder: Directory containing or to save the dataset files
+        max_workers: Worker processes for creating missing years; see
+            :func:`create_datasets`.
+        storage: ``"per_year"`` writes one ``{stem}_year_{year}.h5`` per
+            year. ``"multi_year"`` keeps every year in one
+            ``{stem}_years.h5`` that stores columns shared between years
+            once and only the differences for later years.
 
     Returns:
         Dictionary mapping dataset keys to PolicyEngineUKDataset objects
     """
-    # Check if all dataset files exist
-    all_exist = True
+    if storage not in ("per_year", "multi_year"):
+        raise ValueError(
+            f"Unknown dataset storage {storage!r}; use 'per_year' or 'multi_year'."
+        )
+    result = {}
     for dataset in datasets:
         resolved_dataset = resolve_dataset_reference("uk", dataset)
         dataset_stem = dataset_logical_name(resolved_dataset)
+        if storage == "multi_year":
+            result.update(
+                _ensure_multi_year_dataset(
+                    dataset, dataset_stem, years, data_folder, max_workers
+                )
+            )
+            continue
+
+        to_create = missing_years(data_folder, dataset_stem, years)
+        to_load = [year for year in years if year not in to_create]
+
+        available = {}
+        if to_load:
+            available.update(
+                load_datasets(
+                    datasets=[dataset], years=to_load, data_folder=data_folder
+                )
+            )
+        if to_create:
+            available.update(
+                create_datasets(
+                    datasets=[dataset],
+                    years=to_create,
+                    data_folder=data_folder,
+                    **year_worker_options(max_workers),
+                )
+            )
         for year in years:
-            filepath = Path(f"{data_folder}/{dataset_stem}_year_{year}.h5")
-            if not filepath.exists():
-                all_exist = False
-                break
-        if not all_exist:
-            break
-
-    if all_exist:
-        return load_datasets(datasets=datasets, years=years, data_folder=data_folder)
-    else:
-        return create_datasets(datasets=datasets, years=years, data_folder=data_folder)
+            key = f"{dataset_stem}_{year}"
+            result[key] = available[key]
+
+    return result
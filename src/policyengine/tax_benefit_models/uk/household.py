@@ -23,11 +23,13 @@ from __future__ import annotations
 from collections.abc import Mapping
 from typing import Any, Optional
 
+from policyengine import tracing
 from policyengine.tax_benefit_models.common import (
     EntityResult,
     HouseholdResult,
     compile_reform,
     dispatch_extra_variables,
+    household_span_attributes,
     normalize_axes,
     validate_annual_household_inputs,
     values_for_entity,
@@ -91,6 +93,8 @@ def _build_situation(
 _ALLOWED_KWARGS = frozenset(
     {"people", "benunit", "household", "year", "reform", "extra_variables", "axes"}
 )
+_GROUP_ENTITIES = ("benunit", "household")
+_HOUSEHOLD_KWARGS = frozenset({"people", *_GROUP_ENTITIES})
 
 
 def _raise_unexpected_kwargs(unexpected: Mapping[str, Any]) -> None:
@@ -111,6 +115,54 @@ def _raise_unexpected_kwargs(unexpected: Mapping[str, Any]) -> None:
     raise TypeError("\n".join(lines))
 
 
+def _household_result(
+    simulation: Any,
+    output_columns: Mapping[str, list[str]],
+    *,
+    year: int,
+    person_count: int,
+    axes_active: bool,
+) -> HouseholdResult:
+    result = HouseholdResult()
+    for entity, columns in output_columns.items():
+        raw = {}
+        for variable in columns:
+            with tracing.span(
+                "policyengine.variable.calculate", variable=variable
+            ) as span:
+                values = simulation.calculate(variable, period=year, map_to=entity)
+                tracing.record_array(span, values, entity=entity)
+            raw[variable] = list(values)
+        if entity == "person":
+            result["person"] = [
+                EntityResult(
+                    {
+                        variable: values_for_entity(
+                            [_safe_convert(value) for value in raw[variable]],
+                            entity_index=i,
+                            entity_count=person_count,
+                            axes_active=axes_active,
+                        )
+                        for variable in columns
+                    }
+                )
+                for i in range(person_count)
+            ]
+        else:
+            result[entity] = EntityResult(
+                {
+                    variable: (
+                        [_safe_convert(value) for value in raw[variable]]
+                        if axes_active
+                        else _safe_convert(raw[variable][0])
+                    )
+                    for variable in columns
+                }
+            )
+    return result
+
+
+@tracing.traced("policyengine.household.calculate", household_span_attributes("uk"))
 def calculate_household(
     *,
     people: list[Mapping[str, Any]],
@@ -185,47 +237,101 @@ def calculate_household(
     normalized_axes = normalize_axes(axes=axes, year=year, model_version=uk_latest)
     axes_active = normalized_axes is not None
 
-    simulation = Simulation(
-        situation=_build_situation(
-            people=people,
-            benunit=benunit_dict,
-            household=household_dict,
-            year=year,
-            axes=normalized_axes,
-        ),
-        reform=reform_dict,
+    with tracing.span("policyengine.household.build", reformed=bool(reform_dict)):
+        simulation = Simulation(
+            situation=_build_situation(
+                people=people,
+                benunit=benunit_dict,
+                household=household_dict,
+                year=year,
+                axes=normalized_axes,
+            ),
+            reform=reform_dict,
+        )
+
+    return _household_result(
+        simulation,
+        output_columns,
+        year=year,
+        person_count=len(people),
+        axes_active=axes_active,
     )
 
-    result = HouseholdResult()
-    for entity, columns in output_columns.items():
-        raw = {
-            variable: list(simulation.calculate(variable, period=year, map_to=entity))
-            for variable in columns
+
+@tracing.traced("policyengine.household.batch", household_span_attributes("uk"))
+def calculate_households(
+    households: list[Mapping[str, Any]],
+    *,
+    year: int = 2026,
+    reform: Optional[Mapping[str, Any]] = None,
+    extra_variables: Optional[list[str]] = None,
+) -> list[HouseholdResult]:
+    """Compute several UK households that share a year and reform.
+
+    Each entry holds the per-household keyword arguments of
+    :func:`calculate_household`: ``people`` plus optional ``benunit`` and
+    ``household`` overrides. Inputs are validated and the reform compiled
+    once for the batch; each household gets its own simulation, so
+    results match ``calculate_household``. Axes are not supported here;
+    use :func:`calculate_household`.
+
+    Returns:
+        One :class:`HouseholdResult` per household, in order.
+
+    Raises:
+        ValueError: on the same invalid inputs as ``calculate_household``.
+        TypeError: if an entry has keys other than ``people``, ``benunit``
+            and ``household``.
+    """
+    year = validate_annual_household_inputs(year=year, entities={})
+    specs = []
+    for spec in households:
+        unexpected = {
+            key: value for key, value in spec.items() if key not in _HOUSEHOLD_KWARGS
         }
-        if entity == "person":
-            result["person"] = [
-                EntityResult(
-                    {
-                        variable: values_for_entity(
-                            [_safe_convert(value) for value in raw[variable]],
-                            entity_index=i,
-                            entity_count=len(people),
-                            axes_active=axes_active,
-                        )
-                        for variable in columns
-                    }
-                )
-                for i in range(len(people))
-            ]
-        else:
-            result[entity] = EntityResult(
-                {
-                    variable: (
-                        [_safe_convert(value) for value in raw[variable]]
-                        if axes_active
-                        else _safe_convert(raw[variable][0])
-                    )
-                    for variable in columns
-                }
+        if unexpected:
+            _raise_unexpected_kwargs(unexpected)
+        people = list(spec["people"])
+        entities = {entity: dict(spec.get(entity) or {}) for entity in _GROUP_ENTITIES}
+        validate_annual_household_inputs(
+            year=year,
+            entities={
+                "people": people,
+                **{name: [value] for name, value in entities.items()},
+            },
+        )
+        validate_household_input(
+            model_version=uk_latest,
+            entities={
+                "person": people,
+                **{name: [value] for name, value in entities.items()},
+            },
+        )
+        specs.append((people, entities))
+
+    from policyengine_uk import Simulation
+
+    extra_by_entity = dispatch_extra_variables(
+        model_version=uk_latest,
+        names=extra_variables or [],
+    )
+    output_columns = _default_output_columns(extra_by_entity)
+    reform_dict = compile_reform(reform, year=year, model_version=uk_latest)
+
+    results = []
+    for people, entities in specs:
+        with tracing.span("policyengine.household.build", reformed=bool(reform_dict)):
+            simulation = Simulation(
+                situation=_build_situation(people=people, **entities, year=year),
+                reform=reform_dict,
             )
-    return result
+        results.append(
+            _household_result(
+                simulation,
+                output_columns,
+                year=year,
+                person_count=len(people),
+                axes_active=False,
+            )
+        )
+    return results
@@ -4,9 +4,11 @@ from typing import TYPE_CHECKING, Optional
 import pandas as pd
 from microdf import MicroDataFrame
 
+from policyengine import tracing
 from policyengine.core import TaxBenefitModel
 from policyengine.provenance.dataset_sources import materialize_dataset_source
 from policyengine.provenance.manifest import (
+    certified_dataset_sha256,
     dataset_logical_name,
     resolve_local_managed_dataset_source,
     resolve_managed_dataset_reference,
@@ -177,11 +179,17 @@ class PolicyEngineUKLatest(MicrosimulationModelVersion):
 
         # Apply regional scoping if specified
         if simulation.scoping_strategy:
-            scoped_data = simulation.scoping_strategy.apply(
-                entity_data=dataset.data.entity_data,
-                group_entities=UK_GROUP_ENTITIES,
-                year=dataset.year,
-            )
+            with tracing.span(
+                "policyengine.simulation.scope",
+                strategy=simulation.scoping_strategy.strategy_type,
+                rows_before=len(dataset.data.household),
+            ) as span:
+                scoped_data = simulation.scoping_strategy.apply(
+                    entity_data=dataset.data.entity_data,
+                    group_entities=UK_GROUP_ENTITIES,
+                    year=dataset.year,
+                )
+                span.set_attribute("rows_after", len(scoped_data["household"]))
             dataset = PolicyEngineUKDataset(
                 id=dataset.id + "_scoped",
                 name=dataset.name,
@@ -199,29 +207,39 @@ class PolicyEngineUKLatest(MicrosimulationModelVersion):
                 ),
             )
 
-        input_data = UKSingleYearDataset(
-            person=dataset.data.person,
-            benunit=dataset.data.benunit,
-            household=dataset.data.household,
-            fiscal_year=dataset.year,
-        )
-        microsim = Microsimulation(dataset=input_data)
-
-        if simulation.policy and simulation.policy.simulation_modifier is not None:
-            simulation.policy.simulation_modifier(microsim)
-        elif simulation.policy:
-            modifier = simulation_modifier_from_parameter_values(
-                simulation.policy.parameter_values
+        with tracing.span(
+            "policyengine.population.build", rows=len(dataset.data.person)
+        ):
+            input_data = UKSingleYearDataset(
+                person=dataset.data.person,
+                benunit=dataset.data.benunit,
+                household=dataset.data.household,
+                fiscal_year=dataset.year,
             )
-            modifier(microsim)
-
-        if simulation.dynamic and simulation.dynamic.simulation_modifier is not None:
-            simulation.dynamic.simulation_modifier(microsim)
-        elif simulation.dynamic:
-            modifier = simulation_modifier_from_parameter_values(
-                simulation.dynamic.parameter_values
-            )
-            modifier(microsim)
+            microsim = Microsimulation(dataset=input_data)
+
+        with tracing.span(
+            "policyengine.reform.apply",
+            reformed=bool(simulation.policy or simulation.dynamic),
+        ):
+            if simulation.policy and simulation.policy.simulation_modifier is not None:
+                simulation.policy.simulation_modifier(microsim)
+            elif simulation.policy:
+                modifier = simulation_modifier_from_parameter_values(
+                    simulation.policy.parameter_values
+                )
+                modifier(microsim)
+
+            if (
+                simulation.dynamic
+                and simulation.dynamic.simulation_modifier is not None
+            ):
+                simulation.dynamic.simulation_modifier(microsim)
+            elif simulation.dynamic:
+                modifier = simulation_modifier_from_parameter_values(
+                    simulation.dynamic.parameter_values
+                )
+                modifier(microsim)
 
         data = {
             "person": pd.DataFrame(),
@@ -234,20 +252,33 @@ class PolicyEngineUKLatest(MicrosimulationModelVersion):
         # entity keys or variable names raise with close-match hints.
         for entity, variables in self.resolve_entity_variables(simulation).items():
             for var in variables:
-                data[entity][var] = microsim.calculate(
-                    var, period=simulation.dataset.year, map_to=entity
-                ).values
-
-        household_input_df = pd.DataFrame(dataset.data.household)
-        for column in UK_HOUSEHOLD_PASSTHROUGH_COLUMNS:
-            if column in household_input_df.columns and column not in data["household"]:
-                data["household"][column] = household_input_df[column].values
-
-        data["person"] = MicroDataFrame(data["person"], weights="person_weight")
-        data["benunit"] = MicroDataFrame(data["benunit"], weights="benunit_weight")
-        data["household"] = MicroDataFrame(
-            data["household"], weights="household_weight"
-        )
+                with tracing.span(
+                    "policyengine.variable.calculate", variable=var
+                ) as span:
+                    values = microsim.calculate(
+                        var, period=simulation.dataset.year, map_to=entity
+                    ).values
+                    tracing.record_array(span, values, entity=entity)
+                data[entity][var] = values
+
+        with tracing.span("policyengine.output.assemble"):
+            household_input_df = pd.DataFrame(dataset.data.household)
+            for column in UK_HOUSEHOLD_PASSTHROUGH_COLUMNS:
+                if (
+                    column in household_input_df.columns
+                    and column not in data["household"]
+                ):
+                    data["household"][column] = household_input_df[column].values
+
+            if simulation.dtype_policy is not None:
+                for frame in data.values():
+                    simulation.dtype_policy.compact_frame(frame)
+
+            data["person"] = MicroDataFrame(data["person"], weights="person_weight")
+            data["benunit"] = MicroDataFrame(data["benunit"], weights="benunit_weight")
+            data["household"] = MicroDataFrame(
+                data["household"], weights="household_weight"
+            )
 
         simulation.output_dataset = PolicyEngineUKDataset(
             id=simulation.id,
@@ -310,7 +341,10 @@ def managed_microsimulation(
             allow_unmanaged and dataset is not None and "://" in dataset
         ),
     )
-    runtime_dataset_source = materialize_dataset_source(dataset_source)
+    runtime_dataset_source = materialize_dataset_source(
+        dataset_source,
+        sha256=certified_dataset_sha256("uk", dataset_source),
+    )
     runtime_dataset = runtime_dataset_source
     if isinstance(runtime_dataset_source, str) and "://" not in runtime_dataset_source:
         from policyengine_uk.data.dataset_schema import (
@@ -34,6 +34,7 @@ if find_spec("policyengine_us") is not None:
         BudgetaryImpact,
         calculate_budgetary_impact,
         economic_impact_analysis,
+        progressive_economic_impact_analysis,
     )
     from .datasets import (
         PolicyEngineUSDataset,
@@ -45,7 +46,7 @@ if find_spec("policyengine_us") is not None:
         load_managed_long_term_datasets,
         validate_long_term_dataset_metadata,
     )
-    from .household import calculate_household
+    from .household import calculate_household, calculate_households
     from .model import (
         PolicyEngineUS,
         PolicyEngineUSLatest,
@@ -78,7 +79,9 @@ if find_spec("policyengine_us") is not None:
         "model",
         "us_latest",
         "calculate_household",
+        "calculate_households",
         "economic_impact_analysis",
+        "progressive_economic_impact_analysis",
         "calculate_budgetary_impact",
         "BudgetaryImpact",
         "ProgramStatistics",
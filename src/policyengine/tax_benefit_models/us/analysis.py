@@ -6,11 +6,15 @@ holds the population-level reform-analysis helpers.
 
 from __future__ import annotations
 
-from typing import Union
+from collections.abc import Iterator, Sequence
+from typing import Optional, Union
 
+import numpy as np
+import pandas as pd
 from pydantic import BaseModel, Field, computed_field
 
 from policyengine.core import OutputCollection, Simulation
+from policyengine.core.replicate_weights import simulation_replicate_weights
 from policyengine.outputs import (
     CliffImpact,
     LaborSupplyResponse,
@@ -34,12 +38,16 @@ from policyengine.outputs.extra_variables import add_extra_variables
 from policyengine.outputs.inequality import (
     Inequality,
     USInequalityPreset,
-    calculate_us_inequality,
+    calculate_us_inequality_batch,
 )
 from policyengine.outputs.poverty import (
     Poverty,
     calculate_us_poverty_rates,
 )
+from policyengine.tax_benefit_models.common.progressive_analysis import (
+    ProgressiveReformAnalysis,
+    progressive_reform_analysis,
+)
 
 # Map of US program-statistics variable name -> program metadata. The
 # entity for each program is derived from the variable's own metadata
@@ -96,6 +104,14 @@ class BudgetaryImpact(BaseModel):
         ),
     )
 
+    total_standard_error: Optional[float] = Field(
+        default=None,
+        description=(
+            "Replicate-weight standard error of ``total``, USD; set when the "
+            "baseline dataset has replicate weights."
+        ),
+    )
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def total(self) -> float:
@@ -119,6 +135,44 @@ def _sum_change(
     return float(agg.result)
 
 
+def _replicate_sum_changes(
+    baseline_simulation: Simulation,
+    reform_simulation: Simulation,
+    variables: list[str],
+) -> Optional[dict[str, np.ndarray]]:
+    """Replicate reform-minus-baseline totals of ``variables``.
+
+    Changes of variables on the same entity share one matrix product.
+    Returns ``None`` when the baseline dataset has no replicate weights.
+    """
+    replicate_weights = simulation_replicate_weights(baseline_simulation)
+    if replicate_weights is None:
+        return None
+    entity_data = baseline_simulation.output_dataset.data.entity_data
+    reform_data = reform_simulation.output_dataset.data.entity_data
+    by_entity: dict[str, list[str]] = {}
+    for variable in variables:
+        entity = baseline_simulation.tax_benefit_model_version.get_variable(
+            variable
+        ).entity
+        by_entity.setdefault(entity, []).append(variable)
+    replicates = {}
+    for entity, entity_variables in by_entity.items():
+        baseline = pd.DataFrame(entity_data[entity])
+        reform = pd.DataFrame(reform_data[entity])
+        changes = np.column_stack(
+            [
+                reform[variable].to_numpy(dtype=float)
+                - baseline[variable].to_numpy(dtype=float)
+                for variable in entity_variables
+            ]
+        )
+        totals = replicate_weights.replicate_totals(entity_data, entity, changes)
+        for k, variable in enumerate(entity_variables):
+            replicates[variable] = totals[:, k]
+    return replicates
+
+
 # Budgetary-impact variables that are not in the default US output
 # (household_tax, household_benefits, and the three tax variables are). They
 # must be materialized before the reform simulations run.
@@ -243,7 +297,34 @@ def calculate_budgetary_impact(
     )
 
     unattributed = total - federal - state
-    return BudgetaryImpact(federal=federal, state=state, unattributed=unattributed)
+
+    total_standard_error = None
+    replicates = _replicate_sum_changes(
+        baseline_simulation,
+        reform_simulation,
+        [
+            "household_tax",
+            "household_benefits",
+            "federal_benefit_cost",
+            "state_benefit_cost",
+        ],
+    )
+    if replicates is not None:
+        replicate_total = replicates["household_tax"] - replicates["household_benefits"]
+        if not _include_health_benefits_in_net_income(baseline_simulation):
+            replicate_total -= (
+                replicates["federal_benefit_cost"] + replicates["state_benefit_cost"]
+            )
+        total_standard_error = simulation_replicate_weights(
+            baseline_simulation
+        ).standard_error(total, replicate_total)
+
+    return BudgetaryImpact(
+        federal=federal,
+        state=state,
+        unattributed=unattributed,
+        total_standard_error=total_standard_error,
+    )
 
 
 class PolicyReformAnalysis(BaseModel):
@@ -273,6 +354,23 @@ def _validate_program_statistics_config(
     )
 
 
+def _configure_economic_impact_variables(
+    baseline_simulation: Simulation,
+    reform_simulation: Simulation,
+    include_cliff_impacts: bool,
+) -> None:
+    """Add the analysis's extra output variables before the simulations run."""
+    configure_labor_supply_response_variables(
+        baseline_simulation,
+        reform_simulation,
+        country_code="us",
+    )
+    if include_cliff_impacts:
+        configure_cliff_impact_variables(baseline_simulation, reform_simulation)
+    configure_budgetary_impact_variables(baseline_simulation, reform_simulation)
+    _validate_program_statistics_config(baseline_simulation, reform_simulation)
+
+
 def economic_impact_analysis(
     baseline_simulation: Simulation,
     reform_simulation: Simulation,
@@ -290,15 +388,9 @@ def economic_impact_analysis(
         ``PolicyReformAnalysis`` with decile impacts, program
         statistics, baseline and reform poverty, and inequality.
     """
-    configure_labor_supply_response_variables(
-        baseline_simulation,
-        reform_simulation,
-        country_code="us",
+    _configure_economic_impact_variables(
+        baseline_simulation, reform_simulation, include_cliff_impacts
     )
-    if include_cliff_impacts:
-        configure_cliff_impact_variables(baseline_simulation, reform_simulation)
-    configure_budgetary_impact_variables(baseline_simulation, reform_simulation)
-    _validate_program_statistics_config(baseline_simulation, reform_simulation)
 
     baseline_simulation.ensure()
     reform_simulation.ensure()
@@ -324,11 +416,8 @@ def economic_impact_analysis(
 
     baseline_poverty = calculate_us_poverty_rates(baseline_simulation)
     reform_poverty = calculate_us_poverty_rates(reform_simulation)
-    baseline_inequality = calculate_us_inequality(
-        baseline_simulation, preset=inequality_preset
-    )
-    reform_inequality = calculate_us_inequality(
-        reform_simulation, preset=inequality_preset
+    baseline_inequality, reform_inequality = calculate_us_inequality_batch(
+        [baseline_simulation, reform_simulation], preset=inequality_preset
     )
     labor_supply_response = calculate_labor_supply_response(
         baseline_simulation,
@@ -356,3 +445,61 @@ def economic_impact_analysis(
         labor_supply_response=labor_supply_response,
         cliff_impact=cliff_impact,
     )
+
+
+# Household totals reported with confidence intervals at every stage.
+_PROGRESSIVE_INTERVAL_VARIABLES: dict[str, str] = {
+    "household_tax": "household_tax",
+    "household_benefits": "household_benefits",
+    "household_net_income": "household_net_income",
+}
+
+
+def progressive_economic_impact_analysis(
+    baseline_simulation: Simulation,
+    reform_simulation: Simulation,
+    inequality_preset: Union[USInequalityPreset, str] = USInequalityPreset.STANDARD,
+    include_cliff_impacts: bool = False,
+    *,
+    fractions: Sequence[float] = (0.02, 0.2, 1.0),
+    strata: Sequence[str] = ("state_fips",),
+    income_variable: Optional[str] = "employment_income",
+    seed: int = 0,
+    confidence: float = 0.95,
+) -> Iterator[ProgressiveReformAnalysis[PolicyReformAnalysis]]:
+    """Yield :func:`economic_impact_analysis` results on growing samples.
+
+    Each stage analyses a stratified household sample (by state and
+    employment-income decile by default) and reports confidence intervals
+    for the total change in household tax, benefits and net income. Later
+    stages only simulate the households they add. A final ``1.0`` stage
+    matches ``economic_impact_analysis`` on the full dataset and leaves the
+    caller's simulations with their full output datasets.
+
+    Every stage must sample more than 100 households, like
+    :func:`economic_impact_analysis` requires.
+
+    Example:
+        >>> for stage in progressive_economic_impact_analysis(baseline, reform):
+        ...     impact = stage.intervals["household_tax"]
+        ...     print(stage.sampling_fraction, impact.lower, impact.upper)
+    """
+    return progressive_reform_analysis(
+        baseline_simulation,
+        reform_simulation,
+        analyze=lambda baseline, reform: economic_impact_analysis(
+            baseline,
+            reform,
+            inequality_preset=inequality_preset,
+            include_cliff_impacts=include_cliff_impacts,
+        ),
+        configure=lambda baseline, reform: _configure_economic_impact_variables(
+            baseline, reform, include_cliff_impacts
+        ),
+        interval_variables=_PROGRESSIVE_INTERVAL_VARIABLES,
+        fractions=fractions,
+        strata=strata,
+        income_variable=income_variable,
+        seed=seed,
+        confidence=confidence,
+    )
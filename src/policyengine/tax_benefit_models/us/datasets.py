@@ -1,25 +1,51 @@
-import hashlib
 import importlib.util
 import json
+import threading
 import warnings
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from importlib import metadata as importlib_metadata
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Literal, Optional
 
 import h5py
+import numpy as np
 import pandas as pd
 from microdf import MicroDataFrame
 from pydantic import ConfigDict, Field
 
+from policyengine import tracing
 from policyengine.core import Dataset, YearData
+from policyengine.core.dataset import dataset_span_attributes
 from policyengine.provenance.dataset_sources import materialize_dataset_source
 from policyengine.provenance.manifest import (
+    certified_dataset_sha256,
     dataset_logical_name,
     get_release_manifest,
     resolve_dataset_reference,
     resolve_local_managed_dataset_source,
     resolve_managed_dataset_reference,
 )
+from policyengine.tax_benefit_models.common.dataset_creation import (
+    entity_household_weights,
+    missing_years,
+    person_household_weights,
+    resolve_year_workers,
+    run_year_batches,
+    year_dataset_filepath,
+    year_worker_options,
+)
+from policyengine.tax_benefit_models.common.multi_year_storage import (
+    append_multi_year_dataset_year,
+    is_multi_year_dataset_file,
+    multi_year_dataset_filepath,
+    multi_year_dataset_years,
+    read_multi_year_dataset_year,
+)
+from policyengine.utils.digest_cache import directory_sha256, file_sha256
+
+_HDF_STORE_LOCK = threading.Lock()
 
 
 class USYearData(YearData):
@@ -68,6 +94,7 @@ class PolicyEngineUSDataset(Dataset):
         if self.data is None and self.filepath:
             self.load()
 
+    @tracing.traced("policyengine.dataset.save", dataset_span_attributes)
     def save(self) -> None:
         """Save dataset to HDF5 file."""
         if not self.filepath:
@@ -86,33 +113,65 @@ class PolicyEngineUSDataset(Dataset):
                 message=".*PyTables will pickle object types.*",
             )
             with pd.HDFStore(filepath, mode="w") as store:
-                store["person"] = pd.DataFrame(self.data.person)
-                store["marital_unit"] = pd.DataFrame(self.data.marital_unit)
-                store["family"] = pd.DataFrame(self.data.family)
-                store["spm_unit"] = pd.DataFrame(self.data.spm_unit)
-                store["tax_unit"] = pd.DataFrame(self.data.tax_unit)
-                store["household"] = pd.DataFrame(self.data.household)
-
-    def load(self) -> None:
-        """Load dataset from HDF5 file into this instance."""
+                for entity, frame in self.data.entity_data.items():
+                    frame = pd.DataFrame(frame)
+                    # Categorical columns (see DtypePolicy) need the table
+                    # format; everything else keeps the faster fixed format.
+                    has_categories = any(
+                        isinstance(dtype, pd.CategoricalDtype) for dtype in frame.dtypes
+                    )
+                    store.put(
+                        entity,
+                        frame,
+                        format="table" if has_categories else "fixed",
+                    )
+
+    @tracing.traced("policyengine.dataset.load", dataset_span_attributes)
+    def load(self, columns: Optional[Iterable[str]] = None) -> None:
+        """Load dataset from HDF5 file into this instance.
+
+        Multi-year files (see ``ensure_datasets(storage="multi_year")``) are
+        reconstructed for ``self.year`` only.
+
+        Args:
+            columns: Optional allow-list of variables to keep. Entity ID,
+                membership and weight columns are always kept. For
+                PolicyEngine core variable/period files only the listed
+                variables are read from disk.
+        """
         filepath = self.filepath
         if _is_policyengine_core_h5(Path(filepath)):
-            self.data = _load_policyengine_core_h5(Path(filepath), self.year)
+            self.data = _load_policyengine_core_h5(
+                Path(filepath), self.year, columns=columns
+            )
             return
 
-        with pd.HDFStore(filepath, mode="r") as store:
-            self.data = USYearData(
-                person=MicroDataFrame(store["person"], weights="person_weight"),
-                marital_unit=MicroDataFrame(
-                    store["marital_unit"], weights="marital_unit_weight"
-                ),
-                family=MicroDataFrame(store["family"], weights="family_weight"),
-                spm_unit=MicroDataFrame(store["spm_unit"], weights="spm_unit_weight"),
-                tax_unit=MicroDataFrame(store["tax_unit"], weights="tax_unit_weight"),
-                household=MicroDataFrame(
-                    store["household"], weights="household_weight"
-                ),
+        if is_multi_year_dataset_file(filepath):
+            frames = read_multi_year_dataset_year(
+                filepath,
+                self.year,
+                columns=None if columns is None else _core_h5_required_columns(columns),
             )
+        else:
+            # PyTables is not thread-safe; years may load concurrently.
+            with _HDF_STORE_LOCK, pd.HDFStore(filepath, mode="r") as store:
+                frames = {entity: store[entity] for entity in US_ENTITY_KEYS}
+        if columns is not None:
+            keep = _core_h5_required_columns(columns)
+            frames = {
+                entity: frame[[column for column in frame.columns if column in keep]]
+                for entity, frame in frames.items()
+            }
+        self.data = USYearData(
+            person=MicroDataFrame(frames["person"], weights="person_weight"),
+            marital_unit=MicroDataFrame(
+                frames["marital_unit"], weights="marital_unit_weight"
+            ),
+            family=MicroDataFrame(frames["family"], weights="family_weight"),
+            spm_unit=MicroDataFrame(frames["spm_unit"], weights="spm_unit_weight"),
+            tax_unit=MicroDataFrame(frames["tax_unit"], weights="tax_unit_weight"),
+            household=MicroDataFrame(frames["household"], weights="household_weight"),
+        )
 
     def __repr__(self) -> str:
         if self.data is None:
@@ -158,59 +217,93 @@ def _is_policyengine_core_h5(path: Path) -> bool:
         return False
 
 
-def _read_core_h5_period_values(
+def _core_h5_required_columns(columns: Iterable[str]) -> set[str]:
+    """Expand a column allow-list with the structural ID and weight columns."""
+    return (
+        set(columns)
+        | set(US_ENTITY_ID_COLUMNS.values())
+        | set(US_ENTITY_WEIGHT_COLUMNS.values())
+        | set(US_PERSON_ENTITY_ID_COLUMNS.values())
+    )
+
+
+def _core_h5_period_dataset(
     h5_file: h5py.File,
     variable_name: str,
     year: int,
-) -> Any:
+) -> h5py.Dataset:
     group = h5_file[variable_name]
     period = str(year)
     if period not in group:
         periods = [key for key in group.keys() if key != "ETERNITY"]
         period = sorted(periods)[0] if periods else sorted(group.keys())[0]
-    values = group[period][:]
-    if getattr(values, "dtype", None) is not None and values.dtype.kind in {"O", "S"}:
-        return (
-            pd.Series(values)
-            .map(
-                lambda value: (
-                    value.decode("utf-8") if isinstance(value, bytes) else value
-                )
-            )
-            .to_numpy()
-        )
+    return group[period]
+
+
+def _decode_core_h5_strings(values: np.ndarray) -> np.ndarray:
+    """Decode byte strings to an object array of ``str`` without a Python map."""
+    if values.dtype.kind == "S":
+        return np.char.decode(values, "utf-8").astype(object)
+    if values.dtype.kind == "O":
+        is_bytes = np.fromiter(
+            (isinstance(value, bytes) for value in values.flat),
+            dtype=bool,
+            count=values.size,
+        ).reshape(values.shape)
+        if is_bytes.any():
+            values = values.copy()
+            values[is_bytes] = np.char.decode(
+                values[is_bytes].astype(bytes), "utf-8"
+            ).astype(object)
     return values
 
 
+def _read_core_h5_dataset(dataset: h5py.Dataset) -> np.ndarray:
+    if h5py.check_string_dtype(dataset.dtype) is not None:
+        # Variable-length strings: h5py decodes the whole array in C.
+        return dataset.asstr()[()].astype(object)
+    return _decode_core_h5_strings(dataset[()])
+
+
+def _read_core_h5_period_values(
+    h5_file: h5py.File,
+    variable_name: str,
+    year: int,
+) -> Any:
+    return _read_core_h5_dataset(_core_h5_period_dataset(h5_file, variable_name, year))
+
+
 def _core_h5_entity_lengths(h5_file: h5py.File, year: int) -> dict[str, int]:
     lengths: dict[str, int] = {}
     for entity, id_column in US_ENTITY_ID_COLUMNS.items():
         if id_column in h5_file:
-            lengths[entity] = len(_read_core_h5_period_values(h5_file, id_column, year))
+            dataset = _core_h5_period_dataset(h5_file, id_column, year)
+            lengths[entity] = len(dataset)
     return lengths
 
 
+@lru_cache(maxsize=1)
 def _core_h5_variable_entities() -> dict[str, str]:
     from policyengine_us.system import system
 
     return {name: variable.entity.key for name, variable in system.variables.items()}
 
 
-def _assign_missing_entity_weights(data: dict[str, pd.DataFrame]) -> None:
+def _assign_missing_entity_weights(data: dict[str, dict[str, Any]]) -> None:
     household = data["household"]
     if "household_id" not in household or "household_weight" not in household:
         return
 
-    household_weights = household[["household_id", "household_weight"]]
     person = data["person"]
-    if (
-        "person_weight" not in person
-        and "person_household_id" in person
-        and len(person) > 0
-    ):
-        person.loc[:, "person_weight"] = person["person_household_id"].map(
-            household_weights.set_index("household_id")["household_weight"]
-        )
+    if "person_household_id" not in person:
+        return
+    person_weights = person_household_weights(
+        person["person_household_id"],
+        household["household_id"],
+        household["household_weight"],
+    )
+    if "person_weight" not in person and len(person_weights) > 0:
+        person["person_weight"] = person_weights
 
     for entity, person_entity_id in US_PERSON_ENTITY_ID_COLUMNS.items():
         if entity == "household":
@@ -221,64 +314,185 @@ def _assign_missing_entity_weights(data: dict[str, pd.DataFrame]) -> None:
             entity_weight in data[entity]
             or entity_id not in data[entity]
             or person_entity_id not in person
-            or "person_household_id" not in person
         ):
             continue
+        data[entity][entity_weight] = entity_household_weights(
+            data[entity][entity_id], person[person_entity_id], person_weights
+        )
 
-        entity_households = person[
-            [person_entity_id, "person_household_id"]
-        ].drop_duplicates(subset=[person_entity_id])
-        weight_lookup = entity_households.merge(
-            household_weights,
-            left_on="person_household_id",
-            right_on="household_id",
-            how="left",
-        ).set_index(person_entity_id)["household_weight"]
-        data[entity].loc[:, entity_weight] = data[entity][entity_id].map(weight_lookup)
 
+def _load_policyengine_core_h5(
+    path: Path,
+    year: int,
+    columns: Optional[Iterable[str]] = None,
+) -> USYearData:
+    """Load a PolicyEngine core variable/period H5 into .py entity DataFrames.
 
-def _load_policyengine_core_h5(path: Path, year: int) -> USYearData:
-    """Load a PolicyEngine core variable/period H5 into .py entity DataFrames."""
+    Args:
+        path: File in the variable/period layout.
+        year: Period to read; the earliest stored period is used for
+            variables without it.
+        columns: Optional allow-list of variables. ID, membership and
+            weight columns are always read; other groups are skipped
+            without being read.
+    """
 
-    data = {entity: pd.DataFrame() for entity in US_ENTITY_KEYS}
+    data: dict[str, dict[str, Any]] = {entity: {} for entity in US_ENTITY_KEYS}
     variable_entities = _core_h5_variable_entities()
+    keep = None if columns is None else _core_h5_required_columns(columns)
 
     with h5py.File(path, "r") as h5_file:
         entity_lengths = _core_h5_entity_lengths(h5_file, year)
         for variable_name in h5_file.keys():
-            values = _read_core_h5_period_values(h5_file, variable_name, year)
+            if keep is not None and variable_name not in keep:
+                continue
+            dataset = _core_h5_period_dataset(h5_file, variable_name, year)
             entity = variable_entities.get(variable_name)
             if entity is None:
+                # Resolve the entity from the stored length before reading.
                 matching_entities = [
                     key
                     for key, length in entity_lengths.items()
-                    if length == len(values)
+                    if length == len(dataset)
                 ]
                 if len(matching_entities) != 1:
                     continue
                 entity = matching_entities[0]
             if entity not in data:
                 continue
-            data[entity][variable_name] = values
+            data[entity][variable_name] = _read_core_h5_dataset(dataset)
 
     _assign_missing_entity_weights(data)
 
+    # Build each entity frame once from its column arrays.
+    frames = {entity: pd.DataFrame(columns) for entity, columns in data.items()}
     return USYearData(
-        person=MicroDataFrame(data["person"], weights="person_weight"),
-        household=MicroDataFrame(data["household"], weights="household_weight"),
-        tax_unit=MicroDataFrame(data["tax_unit"], weights="tax_unit_weight"),
-        spm_unit=MicroDataFrame(data["spm_unit"], weights="spm_unit_weight"),
-        family=MicroDataFrame(data["family"], weights="family_weight"),
+        person=MicroDataFrame(frames["person"], weights="person_weight"),
+        household=MicroDataFrame(frames["household"], weights="household_weight"),
+        tax_unit=MicroDataFrame(frames["tax_unit"], weights="tax_unit_weight"),
+        spm_unit=MicroDataFrame(frames["spm_unit"], weights="spm_unit_weight"),
+        family=MicroDataFrame(frames["family"], weights="family_weight"),
         marital_unit=MicroDataFrame(
-            data["marital_unit"], weights="marital_unit_weight"
+            frames["marital_unit"], weights="marital_unit_weight"
         ),
     )
 
 
+_US_ID_VARIABLES = {
+    "person": [
+        "person_id",
+        "person_household_id",
+        "person_marital_unit_id",
+        "person_family_id",
+        "person_spm_unit_id",
+        "person_tax_unit_id",
+    ],
+    "household": ["household_id"],
+    "marital_unit": ["marital_unit_id"],
+    "family": ["family_id"],
+    "spm_unit": ["spm_unit_id"],
+    "tax_unit": ["tax_unit_id"],
+}
+
+
+def _build_us_year_dataset(
+    sim: Any,
+    dataset_stem: str,
+    year: int,
+    data_folder: str,
+) -> PolicyEngineUSDataset:
+    """Extract one year of input variables from ``sim`` and save it."""
+    # Get all input variables from the simulation
+    # We'll calculate each input variable for the specified year
+    entity_data = {entity: {} for entity in _US_ID_VARIABLES}
+
+    # First, get ID columns which are structural (not input variables)
+    # These define entity membership and relationships
+    # For person-level links to group entities, use person_X_id naming
+    for entity_key, var_names in _US_ID_VARIABLES.items():
+        for id_var in var_names:
+            if id_var in sim.tax_benefit_system.variables:
+                values = sim.calculate(id_var, period=year).values
+                entity_data[entity_key][id_var] = values
+
+    # Get input variables and calculate them for this year
+    for variable_name in sim.input_variables:
+        variable = sim.tax_benefit_system.variables[variable_name]
+        entity_key = variable.entity.key
+
+        # Calculate the variable for the given year
+        values = sim.calculate(variable_name, period=year).values
+
+        # Store in the appropriate entity dictionary
+        entity_data[entity_key][variable_name] = values
+
+    frames = {entity: pd.DataFrame(columns) for entity, columns in entity_data.items()}
+    person_df = frames["person"]
+    household_df = frames["household"]
+
+    # Add weight columns - household weights are primary, map to all entities
+    # through each row's household (vectorised index lookups, not merges).
+    if "household_weight" in household_df.columns:
+        person_household_weight = person_household_weights(
+            person_df["person_household_id"],
+            household_df["household_id"],
+            household_df["household_weight"],
+        )
+        # Only add person_weight if it doesn't already exist
+        if "person_weight" not in person_df.columns:
+            person_df["person_weight"] = person_household_weight
+
+        for entity_name in ("marital_unit", "family", "spm_unit", "tax_unit"):
+            entity_df = frames[entity_name]
+            # Only add entity weight if it doesn't already exist
+            if f"{entity_name}_weight" not in entity_df.columns:
+                entity_df[f"{entity_name}_weight"] = entity_household_weights(
+                    entity_df[f"{entity_name}_id"],
+                    person_df[f"person_{entity_name}_id"],
+                    person_household_weight,
+                )
+
+    us_dataset = PolicyEngineUSDataset(
+        id=f"{dataset_stem}_year_{year}",
+        name=f"{dataset_stem}-year-{year}",
+        description=f"US Dataset for year {year} based on {dataset_stem}",
+        filepath=year_dataset_filepath(data_folder, dataset_stem, year),
+        year=int(year),
+        data=USYearData(
+            person=MicroDataFrame(person_df, weights="person_weight"),
+            household=MicroDataFrame(household_df, weights="household_weight"),
+            marital_unit=MicroDataFrame(
+                frames["marital_unit"], weights="marital_unit_weight"
+            ),
+            family=MicroDataFrame(frames["family"], weights="family_weight"),
+            spm_unit=MicroDataFrame(frames["spm_unit"], weights="spm_unit_weight"),
+            tax_unit=MicroDataFrame(frames["tax_unit"], weights="tax_unit_weight"),
+        ),
+    )
+    us_dataset.save()
+    return us_dataset
+
+
+def _create_us_year_files(
+    runtime_dataset: str,
+    dataset_stem: str,
+    data_folder: str,
+    years: list[int],
+) -> list[int]:
+    """Process-pool worker: build and save a contiguous batch of years."""
+    from policyengine_us import Microsimulation
+
+    sim = Microsimulation(dataset=runtime_dataset)
+    for year in years:
+        _build_us_year_dataset(sim, dataset_stem, year, data_folder)
+    return years
+
+
 def create_datasets(
     datasets: Optional[list[str]] = None,
     years: list[int] = [2024, 2025, 2026, 2027, 2028],
     data_folder: str = "./data",
+    max_workers: Optional[int] = 1,
 ) -> dict[str, PolicyEngineUSDataset]:
     """Create PolicyEngineUSDataset instances from logical dataset names or URLs.
 
@@ -286,6 +500,13 @@ def create_datasets(
         datasets: List of logical dataset names or HuggingFace dataset URLs
         years: List of years to extract data for
         data_folder: Directory to save the dataset files
+        max_workers: Worker processes for building years concurrently.
+            The default, ``1``, builds every year in this process from one
+            ``Microsimulation``. Larger values (or ``None``, one per year
+            bounded by the CPU count) load a ``Microsimulation`` in each
+            worker from its own temporary copy of the source file, so peak
+            memory and disk use grow with the worker count, and the built
+            years are then read back from disk.
 
     Returns:
         Dictionary mapping dataset keys (e.g., "populace_us_2024") to PolicyEngineUSDataset objects
@@ -297,166 +518,38 @@ def create_datasets(
     for dataset in datasets:
         resolved_dataset = resolve_dataset_reference("us", dataset)
         dataset_stem = dataset_logical_name(resolved_dataset)
-        runtime_dataset = materialize_dataset_source(resolved_dataset)
-        sim = Microsimulation(dataset=runtime_dataset)
-
-        for year in years:
-            # Get all input variables from the simulation
-            # We'll calculate each input variable for the specified year
-            entity_data = {
-                "person": {},
-                "household": {},
-                "marital_unit": {},
-                "family": {},
-                "spm_unit": {},
-                "tax_unit": {},
-            }
-
-            # First, get ID columns which are structural (not input variables)
-            # These define entity membership and relationships
-            # For person-level links to group entities, use person_X_id naming
-            id_variables = {
-                "person": [
-                    "person_id",
-                    "person_household_id",
-                    "person_marital_unit_id",
-                    "person_family_id",
-                    "person_spm_unit_id",
-                    "person_tax_unit_id",
-                ],
-                "household": ["household_id"],
-                "marital_unit": ["marital_unit_id"],
-                "family": ["family_id"],
-                "spm_unit": ["spm_unit_id"],
-                "tax_unit": ["tax_unit_id"],
-            }
-
-            for entity_key, var_names in id_variables.items():
-                for id_var in var_names:
-                    if id_var in sim.tax_benefit_system.variables:
-                        values = sim.calculate(id_var, period=year).values
-                        entity_data[entity_key][id_var] = values
-
-            # Get input variables and calculate them for this year
-            for variable_name in sim.input_variables:
-                variable = sim.tax_benefit_system.variables[variable_name]
-                entity_key = variable.entity.key
-
-                # Calculate the variable for the given year
-                values = sim.calculate(variable_name, period=year).values
-
-                # Store in the appropriate entity dictionary
-                entity_data[entity_key][variable_name] = values
-
-            # Build entity DataFrames
-            person_df = pd.DataFrame(entity_data["person"])
-            household_df = pd.DataFrame(entity_data["household"])
-            marital_unit_df = pd.DataFrame(entity_data["marital_unit"])
-            family_df = pd.DataFrame(entity_data["family"])
-            spm_unit_df = pd.DataFrame(entity_data["spm_unit"])
-            tax_unit_df = pd.DataFrame(entity_data["tax_unit"])
-
-            # Add weight columns - household weights are primary, map to all entities
-            # Person weights = household weights (mapped via person_household_id)
-            if "household_weight" in household_df.columns:
-                # Only add person_weight if it doesn't already exist
-                if "person_weight" not in person_df.columns:
-                    person_df = person_df.merge(
-                        household_df[["household_id", "household_weight"]],
-                        left_on="person_household_id",
-                        right_on="household_id",
-                        how="left",
-                    )
-                    person_df = person_df.rename(
-                        columns={"household_weight": "person_weight"}
-                    )
-                    person_df = person_df.drop(
-                        columns=["household_id"], errors="ignore"
-                    )
+        runtime_dataset = materialize_dataset_source(
+            resolved_dataset,
+            sha256=certified_dataset_sha256("us", resolved_dataset),
+        )
 
-                # Map household weights to other group entities via person table
-                for entity_name, entity_df, person_id_col, entity_id_col in [
-                    (
-                        "marital_unit",
-                        marital_unit_df,
-                        "person_marital_unit_id",
-                        "marital_unit_id",
-                    ),
-                    ("family", family_df, "person_family_id", "family_id"),
-                    (
-                        "spm_unit",
-                        spm_unit_df,
-                        "person_spm_unit_id",
-                        "spm_unit_id",
-                    ),
-                    (
-                        "tax_unit",
-                        tax_unit_df,
-                        "person_tax_unit_id",
-                        "tax_unit_id",
-                    ),
-                ]:
-                    # Only add entity weight if it doesn't already exist
-                    if f"{entity_name}_weight" not in entity_df.columns:
-                        # Get household_id for each entity from person table
-                        entity_household_map = person_df[
-                            [person_id_col, "person_household_id"]
-                        ].drop_duplicates()
-                        entity_df = entity_df.merge(
-                            entity_household_map,
-                            left_on=entity_id_col,
-                            right_on=person_id_col,
-                            how="left",
-                        )
-                        entity_df = entity_df.merge(
-                            household_df[["household_id", "household_weight"]],
-                            left_on="person_household_id",
-                            right_on="household_id",
-                            how="left",
-                        )
-                        entity_df = entity_df.rename(
-                            columns={"household_weight": f"{entity_name}_weight"}
-                        )
-                        entity_df = entity_df.drop(
-                            columns=[
-                                "household_id",
-                                "person_household_id",
-                                person_id_col,
-                            ],
-                            errors="ignore",
-                        )
-
-                    # Update the entity_data
-                    if entity_name == "marital_unit":
-                        marital_unit_df = entity_df
-                    elif entity_name == "family":
-                        family_df = entity_df
-                    elif entity_name == "spm_unit":
-                        spm_unit_df = entity_df
-                    elif entity_name == "tax_unit":
-                        tax_unit_df = entity_df
+        n_workers = resolve_year_workers(max_workers, len(years))
+        if n_workers == 1:
+            sim = Microsimulation(dataset=runtime_dataset)
+            for year in years:
+                result[f"{dataset_stem}_{year}"] = _build_us_year_dataset(
+                    sim, dataset_stem, year, data_folder
+                )
+            continue
 
+        run_year_batches(
+            _create_us_year_files,
+            years,
+            n_workers,
+            runtime_dataset,
+            dataset_stem,
+            data_folder,
+        )
+        for year in years:
             us_dataset = PolicyEngineUSDataset(
                 id=f"{dataset_stem}_year_{year}",
                 name=f"{dataset_stem}-year-{year}",
                 description=f"US Dataset for year {year} based on {dataset_stem}",
-                filepath=f"{data_folder}/{dataset_stem}_year_{year}.h5",
+                filepath=year_dataset_filepath(data_folder, dataset_stem, year),
                 year=int(year),
-                data=USYearData(
-                    person=MicroDataFrame(person_df, weights="person_weight"),
-                    household=MicroDataFrame(household_df, weights="household_weight"),
-                    marital_unit=MicroDataFrame(
-                        marital_unit_df, weights="marital_unit_weight"
-                    ),
-                    family=MicroDataFrame(family_df, weights="family_weight"),
-                    spm_unit=MicroDataFrame(spm_unit_df, weights="spm_unit_weight"),
-                    tax_unit=MicroDataFrame(tax_unit_df, weights="tax_unit_weight"),
-                ),
             )
-            us_dataset.save()
-
-            dataset_key = f"{dataset_stem}_{year}"
-            result[dataset_key] = us_dataset
+            us_dataset.load()
+            result[f"{dataset_stem}_{year}"] = us_dataset
 
     return result
 
@@ -482,7 +575,7 @@ def load_datasets(
         resolved_dataset = resolve_dataset_reference("us", dataset)
         dataset_stem = dataset_logical_name(resolved_dataset)
         for year in years:
-            filepath = f"{data_folder}/{dataset_stem}_year_{year}.h5"
+            filepath = year_dataset_filepath(data_folder, dataset_stem, year)
             us_dataset = PolicyEngineUSDataset(
                 name=f"{dataset_stem}-year-{year}",
                 description=f"US Dataset for year {year} based on {dataset_stem}",
@@ -572,11 +665,31 @@ def _runtime_policyengine_us_metadata() -> dict[str, Any]:
             result["direct_url"] = {}
     package_file = _runtime_policyengine_us_package_file()
     if package_file is not None:
-        result["package_file_sha256"] = _sha256_file(package_file)
-        result["package_tree_sha256"] = _sha256_directory(package_file.parent)
+        result["package_file_sha256"] = file_sha256(package_file)
+        result["package_tree_sha256"] = directory_sha256(
+            package_file.parent,
+            manifest=_installed_distribution_record(distribution, result),
+        )
     return result
 
 
+def _installed_distribution_record(
+    distribution: importlib_metadata.Distribution,
+    metadata: dict[str, Any],
+) -> Optional[str]:
+    """The distribution's ``RECORD``, if it pins every installed file.
+
+    ``RECORD`` lists each installed file with its hash, so it changes
+    whenever the package tree does and can key the cached tree digest. An
+    editable install's ``RECORD`` does not list the source tree, whose
+    digest is then keyed by file stats instead.
+    """
+    dir_info = (metadata.get("direct_url") or {}).get("dir_info") or {}
+    if dir_info.get("editable"):
+        return None
+    return distribution.read_text("RECORD")
+
+
 def _runtime_policyengine_us_version() -> Optional[str]:
     try:
         return importlib_metadata.version("policyengine-us")
@@ -592,24 +705,6 @@ def _runtime_policyengine_us_package_file() -> Optional[Path]:
     return path if path.exists() else None
 
 
-def _sha256_directory(path: Path) -> str:
-    digest = hashlib.sha256()
-    for file_path in sorted(path.rglob("*")):
-        if not file_path.is_file():
-            continue
-        if "__pycache__" in file_path.parts or file_path.suffix in {".pyc", ".pyo"}:
-            continue
-        relative_path = file_path.relative_to(path).as_posix()
-        contents = file_path.read_bytes()
-        digest.update(relative_path.encode("utf-8"))
-        digest.update(b"\0")
-        digest.update(str(len(contents)).encode("utf-8"))
-        digest.update(b"\0")
-        digest.update(contents)
-        digest.update(b"\0")
-    return digest.hexdigest()
-
-
 def _validate_runtime_policyengine_us_match(
     metadata: dict,
     *,
@@ -914,12 +1009,21 @@ def _validate_loaded_long_term_metadata(
     )
 
 
-def _sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as file:
-        for chunk in iter(lambda: file.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+def _load_long_term_years(
+    years: list[int],
+    load_year: Callable[[int], tuple[str, PolicyEngineUSDataset]],
+    max_workers: Optional[int],
+) -> dict[str, PolicyEngineUSDataset]:
+    """Run ``load_year`` over ``years`` on a thread pool, keeping year order.
+
+    Hashing and reading H5 files release the GIL for most of their work, so
+    threads overlap the I/O of independent years.
+    """
+    n_workers = resolve_year_workers(max_workers, len(years))
+    if n_workers == 1:
+        return dict(load_year(year) for year in years)
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        return dict(executor.map(load_year, years))
 
 
 def load_long_term_datasets(
@@ -947,6 +1051,7 @@ def load_long_term_datasets(
     required_policyengine_us_git_sha: Optional[str] = None,
     require_policyengine_us_clean_build: bool = False,
     require_runtime_policyengine_us_match: bool = False,
+    max_workers: Optional[int] = None,
 ) -> dict[str, PolicyEngineUSDataset]:
     """Load pre-built long-term US projected datasets.
 
@@ -954,11 +1059,15 @@ def load_long_term_datasets(
     build. This helper lets policyengine.py consume those year-specific H5
     artifacts with sidecar metadata validation, including optional checks that
     the installed ``policyengine-us`` runtime matches the H5 build metadata.
+
+    Years load concurrently on up to ``max_workers`` threads (by default one
+    per year, bounded by the CPU count). The installed package tree is
+    hashed at most once per process for the runtime match check.
     """
 
-    result = {}
     root = Path(data_folder).expanduser()
-    for year in years:
+
+    def load_year(year: int) -> tuple[str, PolicyEngineUSDataset]:
         path = root / dataset_template.format(year=year)
         if not path.exists():
             raise FileNotFoundError(f"Long-term dataset not found: {path}")
@@ -1005,9 +1114,9 @@ def load_long_term_datasets(
             metadata=metadata,
             metadata_path=metadata_path,
         )
-        result[_long_term_dataset_key(dataset_name, year)] = dataset
+        return _long_term_dataset_key(dataset_name, year), dataset
 
-    return result
+    return _load_long_term_years(years, load_year, max_workers)
 
 
 def load_managed_long_term_datasets(
@@ -1033,6 +1142,7 @@ def load_managed_long_term_datasets(
     required_policyengine_us_git_sha: Optional[str] = None,
     require_policyengine_us_clean_build: bool = False,
     require_runtime_policyengine_us_match: bool = True,
+    max_workers: Optional[int] = None,
 ) -> dict[str, PolicyEngineUSDataset]:
     """Load bundled long-term US datasets from the managed release manifest.
 
@@ -1043,6 +1153,9 @@ def load_managed_long_term_datasets(
     helper intentionally refuses to stream remote files directly; callers should
     either provide the published local mirror or use ``load_long_term_datasets``
     with an explicit local data folder.
+
+    Years load concurrently on up to ``max_workers`` threads, as in
+    ``load_long_term_datasets``.
     """
 
     manifest = get_release_manifest("us")
@@ -1056,8 +1169,7 @@ def load_managed_long_term_datasets(
         and required_policyengine_us_version == runtime_policyengine_us_version
     )
 
-    result = {}
-    for year in years:
+    def load_year(year: int) -> tuple[str, PolicyEngineUSDataset]:
         key = _long_term_dataset_key(dataset_name, year)
         path_reference = manifest.datasets.get(key)
         if path_reference is None:
@@ -1082,7 +1194,7 @@ def load_managed_long_term_datasets(
             )
 
         path = Path(dataset_source).expanduser()
-        actual_sha256 = _sha256_file(path)
+        actual_sha256 = file_sha256(path)
         if actual_sha256 != path_reference.sha256:
             raise ValueError(
                 f"Managed long-term dataset {key!r} at {path} has sha256 "
@@ -1095,7 +1207,7 @@ def load_managed_long_term_datasets(
                     f"Managed long-term dataset {key!r} at {path} is missing "
                     "metadata sidecar required by the bundled manifest."
                 )
-            metadata_sha256 = _sha256_file(metadata_path)
+            metadata_sha256 = file_sha256(metadata_path)
             if metadata_sha256 != path_reference.metadata_sha256:
                 raise ValueError(
                     f"Managed long-term dataset {key!r} metadata at "
@@ -1137,7 +1249,7 @@ def load_managed_long_term_datasets(
         )
         if require_runtime_policyengine_us_match:
             _validate_runtime_policyengine_us_version(runtime_policyengine_us_version)
-        result[key] = _build_long_term_dataset(
+        return key, _build_long_term_dataset(
             path=path,
             year=year,
             dataset_name=dataset_name,
@@ -1146,40 +1258,123 @@ def load_managed_long_term_datasets(
             dataset_uri=dataset_uri,
         )
 
-    return result
+    return _load_long_term_years(years, load_year, max_workers)
+
+
+def _ensure_multi_year_dataset(
+    dataset: str,
+    dataset_stem: str,
+    years: list[int],
+    data_folder: str,
+    max_workers: Optional[int],
+) -> dict[str, PolicyEngineUSDataset]:
+    filepath = multi_year_dataset_filepath(data_folder, dataset_stem)
+    stored = set(multi_year_dataset_years(filepath))
+    to_create = [year for year in years if year not in stored]
+
+    result = {}
+    if to_create:
+        created = create_datasets(
+            datasets=[dataset],
+            years=to_create,
+            data_folder=data_folder,
+            **year_worker_options(max_workers),
+        )
+        for year in to_create:
+            us_dataset = created[f"{dataset_stem}_{year}"]
+            append_multi_year_dataset_year(
+                filepath,
+                year,
+                {
+                    entity: pd.DataFrame(frame)
+                    for entity, frame in us_dataset.data.entity_data.items()
+                },
+            )
+            # The year now lives in the multi-year file.
+            Path(us_dataset.filepath).unlink(missing_ok=True)
+            us_dataset.filepath = filepath
+            result[f"{dataset_stem}_{year}"] = us_dataset
+
+    for year in years:
+        key = f"{dataset_stem}_{year}"
+        if key not in result:
+            result[key] = PolicyEngineUSDataset(
+                id=f"{dataset_stem}_year_{year}",
+                name=f"{dataset_stem}-year-{year}",
+                description=f"US Dataset for year {year} based on {dataset_stem}",
+                filepath=filepath,
+                year=int(year),
+            )
+    return {
+        f"{dataset_stem}_{year}": result[f"{dataset_stem}_{year}"] for year in years
+    }
 
 
 def ensure_datasets(
     datasets: Optional[list[str]] = None,
     years: list[int] = [2024, 2025, 2026, 2027, 2028],
     data_folder: str = "./data",
+    max_workers: Optional[int] = 1,
+    storage: Literal["per_year", "multi_year"] = "per_year",
 ) -> dict[str, PolicyEngineUSDataset]:
-    """Ensure datasets exist, loading if available or creating if not.
+    """Ensure datasets exist, loading years that are saved and creating the rest.
+
+    Only the years whose files are missing are created, so adding a year to
+    an existing panel does not rebuild the others.
 
     Args:
         datasets: List of HuggingFace dataset paths
         years: List of years to load/create data for
         data_folder: Directory containing or to save the dataset files
+        max_workers: Worker processes for creating missing years; see
+            :func:`create_datasets`.
+        storage: ``"per_year"`` writes one ``{stem}_year_{year}.h5`` per
+            year. ``"multi_year"`` keeps every year in one
+            ``{stem}_years.h5`` that stores columns shared between years
+            once and only the differences for later years.
 
     Returns:
         Dictionary mapping dataset keys to PolicyEngineUSDataset objects
     """
+    if storage not in ("per_year", "multi_year"):
+        raise ValueError(
+            f"Unknown dataset storage {storage!r}; use 'per_year' or 'multi_year'."
+        )
     datasets = datasets or [get_release_manifest("us").default_dataset]
 
-    # Check if all dataset files exist
-    all_exist = True
+    result = {}
     for dataset in datasets:
         resolved_dataset = resolve_dataset_reference("us", dataset)
         dataset_stem = dataset_logical_name(resolved_dataset)
+        if storage == "multi_year":
+            result.update(
+                _ensure_multi_year_dataset(
+                    dataset, dataset_stem, years, data_folder, max_workers
+                )
+            )
+            continue
+
+        to_create = missing_years(data_folder, dataset_stem, years)
+        to_load = [year for year in years if year not in to_create]
+
+        available = {}
+        if to_load:
+            available.update(
+                load_datasets(
+                    datasets=[dataset], years=to_load, data_folder=data_folder
+                )
+            )
+        if to_create:
+            available.update(
+                create_datasets(
+                    datasets=[dataset],
+                    years=to_create,
+                    data_folder=data_folder,
+                    **year_worker_options(max_workers),
+                )
+            )
         for year in years:
-            filepath = Path(f"{data_folder}/{dataset_stem}_year_{year}.h5")
-            if not filepath.exists():
-                all_exist = False
-                break
-        if not all_exist:
-            break
-
-    if all_exist:
-        return load_datasets(datasets=datasets, years=years, data_folder=data_folder)
-    else:
-        return create_datasets(datasets=datasets, years=years, data_folder=data_folder)
+            key = f"{dataset_stem}_{year}"
+            result[key] = available[key]
+
+    return result
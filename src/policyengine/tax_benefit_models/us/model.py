@@ -4,9 +4,11 @@ from typing import TYPE_CHECKING, Optional
 import pandas as pd
 from microdf import MicroDataFrame
 
+from policyengine import tracing
 from policyengine.core import TaxBenefitModel
 from policyengine.provenance.dataset_sources import materialize_dataset_source
 from policyengine.provenance.manifest import (
+    certified_dataset_sha256,
     dataset_logical_name,
     resolve_local_managed_dataset_source,
     resolve_managed_dataset_reference,
@@ -159,11 +161,17 @@ class PolicyEngineUSLatest(MicrosimulationModelVersion):
 
         # Apply regional scoping if specified
         if simulation.scoping_strategy:
-            scoped_data = simulation.scoping_strategy.apply(
-                entity_data=dataset.data.entity_data,
-                group_entities=US_GROUP_ENTITIES,
-                year=dataset.year,
-            )
+            with tracing.span(
+                "policyengine.simulation.scope",
+                strategy=simulation.scoping_strategy.strategy_type,
+                rows_before=len(dataset.data.household),
+            ) as span:
+                scoped_data = simulation.scoping_strategy.apply(
+                    entity_data=dataset.data.entity_data,
+                    group_entities=US_GROUP_ENTITIES,
+                    year=dataset.year,
+                )
+                span.set_attribute("rows_after", len(scoped_data["household"]))
             dataset = PolicyEngineUSDataset(
                 id=dataset.id + "_scoped",
                 name=dataset.name,
@@ -190,7 +198,10 @@ class PolicyEngineUSLatest(MicrosimulationModelVersion):
         dynamic_reform = build_reform_dict(simulation.dynamic)
         reform_dict = merge_reform_dicts(policy_reform, dynamic_reform)
 
-        microsim = Microsimulation(reform=reform_dict)
+        with tracing.span(
+            "policyengine.microsimulation.build", reformed=bool(reform_dict)
+        ):
+            microsim = Microsimulation(reform=reform_dict)
         # Use ``microsim.tax_benefit_system``, not the module-level
         # ``system``: ``Microsimulation.__init__`` applies structural
         # reforms (e.g. ``gov.contrib.ctc.*``) to its per-sim system but
@@ -261,20 +272,34 @@ class PolicyEngineUSLatest(MicrosimulationModelVersion):
         for entity, variables in self.resolve_entity_variables(simulation).items():
             for var in variables:
                 if var not in id_columns and var not in weight_columns:
-                    data[entity][var] = microsim.calculate(
-                        var, period=simulation.dataset.year, map_to=entity
-                    ).values
-
-        data["person"] = MicroDataFrame(data["person"], weights="person_weight")
-        data["marital_unit"] = MicroDataFrame(
-            data["marital_unit"], weights="marital_unit_weight"
-        )
-        data["family"] = MicroDataFrame(data["family"], weights="family_weight")
-        data["spm_unit"] = MicroDataFrame(data["spm_unit"], weights="spm_unit_weight")
-        data["tax_unit"] = MicroDataFrame(data["tax_unit"], weights="tax_unit_weight")
-        data["household"] = MicroDataFrame(
-            data["household"], weights="household_weight"
-        )
+                    with tracing.span(
+                        "policyengine.variable.calculate", variable=var
+                    ) as span:
+                        values = microsim.calculate(
+                            var, period=simulation.dataset.year, map_to=entity
+                        ).values
+                        tracing.record_array(span, values, entity=entity)
+                    data[entity][var] = values
+
+        with tracing.span("policyengine.output.assemble"):
+            if simulation.dtype_policy is not None:
+                for frame in data.values():
+                    simulation.dtype_policy.compact_frame(frame)
+
+            data["person"] = MicroDataFrame(data["person"], weights="person_weight")
+            data["marital_unit"] = MicroDataFrame(
+                data["marital_unit"], weights="marital_unit_weight"
+            )
+            data["family"] = MicroDataFrame(data["family"], weights="family_weight")
+            data["spm_unit"] = MicroDataFrame(
+                data["spm_unit"], weights="spm_unit_weight"
+            )
+            data["tax_unit"] = MicroDataFrame(
+                data["tax_unit"], weights="tax_unit_weight"
+            )
+            data["household"] = MicroDataFrame(
+                data["household"], weights="household_weight"
+            )
 
         simulation.output_dataset = PolicyEngineUSDataset(
             id=simulation.id,
@@ -293,6 +318,10 @@ class PolicyEngineUSLatest(MicrosimulationModelVersion):
             ),
         )
 
+    @tracing.traced(
+        "policyengine.population.build",
+        lambda self, microsim, dataset, system: {"rows": len(dataset.data.person)},
+    )
     def _build_simulation_from_dataset(self, microsim, dataset, system):
         """Build a PolicyEngine Core simulation from dataset entity IDs.
 
@@ -453,7 +482,10 @@ def managed_microsimulation(
             allow_unmanaged and dataset is not None and "://" in dataset
         ),
     )
-    runtime_dataset_source = materialize_dataset_source(dataset_source)
+    runtime_dataset_source = materialize_dataset_source(
+        dataset_source,
+        sha256=certified_dataset_sha256("us", dataset_source),
+    )
     microsim = Microsimulation(dataset=runtime_dataset_source, **kwargs)
     microsim.policyengine_bundle = _managed_release_bundle(
         dataset_uri,
@@ -0,0 +1,282 @@
+"""Pluggable tracing for the simulation pipeline.
+
+The library reports where time goes through one small interface, shaped
+like OpenTelemetry's: ``start_as_current_span(name, attributes)`` opens a
+span (a context manager yielding an object with ``set_attribute`` and
+``set_attributes``) and ``add(name, amount, attributes)`` increments a
+counter. The default tracer does nothing, so instrumentation costs a few
+function calls per phase.
+
+Spans emitted by the library:
+
+- ``policyengine.simulation.ensure``, ``.run``, ``.save`` and ``.load``
+- ``policyengine.dataset.load`` and ``policyengine.dataset.save``
+- ``policyengine.simulation.scope``: regional scoping, with rows before and
+  after
+- ``policyengine.reform.compile``: dict reforms into policies
+- ``policyengine.microsimulation.build``: the US country-package simulation
+  and its reformed tax-benefit system
+- ``policyengine.population.build``: entities and inputs from the dataset
+- ``policyengine.reform.apply``: UK reforms applied to the built simulation
+- ``policyengine.variable.calculate``: one per output variable, with its
+  entity, rows and bytes
+- ``policyengine.output.assemble``: output DataFrame assembly
+- ``policyengine.output.run``: every :class:`~policyengine.core.Output`
+- ``policyengine.household.calculate`` and ``policyengine.household.batch``,
+  with ``policyengine.household.build`` for each household simulation
+
+Counters: ``policyengine.variable.calculations``,
+``policyengine.variable.rows`` and ``policyengine.variable.bytes``.
+
+Send them to OpenTelemetry, or record them in memory:
+
+.. code-block:: python
+
+    from policyengine import tracing
+
+    tracing.set_tracer(tracing.OpenTelemetryTracer())
+
+    with tracing.use_tracer(tracing.RecordingTracer()) as recorder:
+        simulation.run()
+    print(recorder.durations())
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+Attributes = Mapping[str, Any]
+
+
+class Span:
+    """A span that records nothing; also the base for recorded spans."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Attributes) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def is_recording(self) -> bool:
+        """Whether attributes are kept; skip expensive ones when not."""
+        return False
+
+
+_NO_OP_SPAN = Span()
+
+
+class Tracer:
+    """The no-op tracer. Subclass it, or pass any object with the same methods."""
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: Optional[Attributes] = None
+    ) -> Iterator[Span]:
+        yield _NO_OP_SPAN
+
+    def add(
+        self, name: str, amount: float, attributes: Optional[Attributes] = None
+    ) -> None:
+        """Increment the counter ``name`` by ``amount``."""
+
+
+_tracer: Tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Install ``tracer`` for the whole process; ``None`` restores the no-op."""
+    global _tracer
+    _tracer = tracer if tracer is not None else Tracer()
+
+
+@contextmanager
+def use_tracer(tracer: Tracer) -> Iterator[Tracer]:
+    """Install ``tracer`` for the duration of a ``with`` block."""
+    previous = _tracer
+    set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_tracer(previous)
+
+
+def span(name: str, **attributes: Any):
+    """Open a span on the current tracer; ``None`` attributes are dropped."""
+    return _tracer.start_as_current_span(
+        name,
+        attributes={
+            key: value for key, value in attributes.items() if value is not None
+        },
+    )
+
+
+def traced(
+    name: str, attributes: Optional[Callable[..., Attributes]] = None
+) -> Callable[[Callable], Callable]:
+    """Run the decorated function inside a span named ``name``.
+
+    ``attributes``, if given, receives the call's arguments and returns the
+    span's attributes.
+    """
+
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            extra = attributes(*args, **kwargs) if attributes is not None else {}
+            with span(name, **extra):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def count(name: str, amount: float = 1, **attributes: Any) -> None:
+    """Increment a counter on the current tracer."""
+    _tracer.add(name, amount, attributes=attributes)
+
+
+def record_array(active_span: Span, values: Any, **attributes: Any) -> None:
+    """Attach the rows and bytes of a calculated array to a span and counters."""
+    if not active_span.is_recording():
+        return
+    rows = len(values)
+    size = getattr(values, "nbytes", 0)
+    active_span.set_attributes({**attributes, "rows": rows, "bytes": size})
+    count("policyengine.variable.calculations", 1, **attributes)
+    count("policyengine.variable.rows", rows, **attributes)
+    count("policyengine.variable.bytes", size, **attributes)
+
+
+# --- recording ----------------------------------------------------------
+
+
+@dataclass
+class RecordedSpan(Span):
+    """A finished (or open) span kept by :class:`RecordingTracer`."""
+
+    name: str
+    attributes: dict[str, Any] = field(default_factory=dict)
+    parent: Optional[RecordedSpan] = None
+    start: float = 0.0
+    end: Optional[float] = None
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def is_recording(self) -> bool:
+        return True
+
+    @property
+    def seconds(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+
+_current_span: contextvars.ContextVar[Optional[RecordedSpan]] = contextvars.ContextVar(
+    "policyengine_current_span", default=None
+)
+
+
+class RecordingTracer(Tracer):
+    """Keep spans and counters in memory, for tests and ad-hoc profiling.
+
+    Spans nest by context: a span opened inside another (on the same
+    thread) records it as ``parent``.
+    """
+
+    def __init__(self) -> None:
+        self.spans: list[RecordedSpan] = []
+        self.counters: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def start_as_current_span(
+        self, name: str, attributes: Optional[Attributes] = None
+    ) -> Iterator[RecordedSpan]:
+        recorded = RecordedSpan(
+            name=name,
+            attributes=dict(attributes or {}),
+            parent=_current_span.get(),
+            start=time.perf_counter(),
+        )
+        token = _current_span.set(recorded)
+        try:
+            yield recorded
+        except BaseException as exc:
+            recorded.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            recorded.end = time.perf_counter()
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(recorded)
+
+    def add(
+        self, name: str, amount: float, attributes: Optional[Attributes] = None
+    ) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def named(self, name: str) -> list[RecordedSpan]:
+        return [recorded for recorded in self.spans if recorded.name == name]
+
+    def durations(self) -> dict[str, float]:
+        """Total seconds spent in each span name, slowest first."""
+        totals: Counter[str] = Counter()
+        for recorded in self.spans:
+            totals[recorded.name] += recorded.seconds or 0.0
+        return dict(totals.most_common())
+
+
+# --- OpenTelemetry ------------------------------------------------------
+
+
+class OpenTelemetryTracer(Tracer):
+    """Forward spans and counters to OpenTelemetry.
+
+    Uses the global tracer and meter providers unless ``tracer`` or
+    ``meter`` are given. Requires ``opentelemetry-api``
+    (``pip install 'policyengine[tracing]'``).
+    """
+
+    def __init__(self, tracer: Any = None, meter: Any = None) -> None:
+        if tracer is None or meter is None:
+            try:
+                from opentelemetry import metrics, trace
+            except ImportError as exc:
+                raise ImportError(
+                    "OpenTelemetryTracer requires opentelemetry-api. "
+                    "Install the optional extra: pip install 'policyengine[tracing]'."
+                ) from exc
+            tracer = tracer or trace.get_tracer("policyengine")
+            meter = meter or metrics.get_meter("policyengine")
+        self.tracer = tracer
+        self.meter = meter
+        self._counters: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def start_as_current_span(self, name: str, attributes: Optional[Attributes] = None):
+        return self.tracer.start_as_current_span(name, attributes=attributes)
+
+    def add(
+        self, name: str, amount: float, attributes: Optional[Attributes] = None
+    ) -> None:
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._counters[name] = self.meter.create_counter(name)
+        counter.add(amount, attributes=attributes)
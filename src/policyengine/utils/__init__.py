@@ -1,5 +1,7 @@
 from .dates import parse_safe_date as parse_safe_date
 from .design import COLORS as COLORS
+from .digest_cache import directory_sha256 as directory_sha256
+from .digest_cache import file_sha256 as file_sha256
 from .errors import format_conditional_error_detail as format_conditional_error_detail
 from .parameter_labels import build_scale_lookup as build_scale_lookup
 from .parameter_labels import (
@@ -0,0 +1,290 @@
+"""Content-addressed local store for downloaded data artifacts.
+
+Certified datasets reach disk through several routes: Hugging Face and GCS
+dataset sources, and ``policyengine bundle install``. Each used to keep its
+own copy. The artifact store holds one file per sha256 under
+``~/.policyengine/artifacts`` (or ``POLICYENGINE_ARTIFACT_STORE_DIR``), and
+every route checks it first and links its own path to the stored file, so a
+certified artifact is downloaded and stored once.
+
+Writers take a per-digest file lock, so parallel workers (threads or
+processes) that need the same artifact download it once. When the store
+exceeds its disk budget (``POLICYENGINE_ARTIFACT_STORE_MAX_BYTES``, 50 GiB by
+default) the least recently used artifacts are evicted.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Optional, TypeVar, Union
+
+from .digest_cache import file_sha256, record_file_sha256
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_STORE_DIR_ENV = "POLICYENGINE_ARTIFACT_STORE_DIR"
+ARTIFACT_STORE_MAX_BYTES_ENV = "POLICYENGINE_ARTIFACT_STORE_MAX_BYTES"
+DEFAULT_ARTIFACT_STORE_MAX_BYTES = 50 * 1024**3
+# Linux ioctl that clones a file's extents (copy-on-write) on Btrfs/XFS.
+_FICLONE = 0x40049409
+
+T = TypeVar("T")
+
+
+def artifact_store_dir() -> Path:
+    """Return the directory of the shared artifact store."""
+    configured = os.environ.get(ARTIFACT_STORE_DIR_ENV)
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".policyengine" / "artifacts"
+
+
+def _default_max_bytes() -> int:
+    configured = os.environ.get(ARTIFACT_STORE_MAX_BYTES_ENV)
+    return int(configured) if configured else DEFAULT_ARTIFACT_STORE_MAX_BYTES
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with source.open("rb") as source_file, target.open("wb") as target_file:
+            fcntl.ioctl(target_file.fileno(), _FICLONE, source_file.fileno())
+    except OSError:
+        target.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """Atomically point ``target`` at ``source``'s bytes without duplicating them.
+
+    Tries a hard link, then a reflink, and copies only when the two paths
+    are on filesystems that support neither.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    temp_path.unlink(missing_ok=True)
+    try:
+        try:
+            os.link(source, temp_path)
+        except OSError:
+            if not _reflink(source, temp_path):
+                shutil.copyfile(source, temp_path)
+        os.replace(temp_path, target)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+class _HashingWriter:
+    """File wrapper that computes the sha256 of everything written to it."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        if self.digest is not None:
+            self.digest.update(data)
+        return self.file.write(data)
+
+    def seek(self, *args) -> int:
+        # A rewinding writer (a retried download) invalidates the running
+        # digest; the file is hashed once complete instead.
+        self.digest = None
+        return self.file.seek(*args)
+
+    def __getattr__(self, name: str):
+        return getattr(self.file, name)
+
+
+class ArtifactStore:
+    """Files keyed by the sha256 of their contents, with LRU eviction.
+
+    Each digest has a directory, ``<root>/<sha256[:2]>/<sha256>/``, holding
+    the artifact under its file name (loaders recognise formats by
+    extension). Further names for the same bytes are hard links in the same
+    directory.
+    """
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        *,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.root = Path(root) if root is not None else artifact_store_dir()
+        self.max_bytes = _default_max_bytes() if max_bytes is None else max_bytes
+
+    def entry(self, sha256: str) -> Path:
+        """Directory holding the artifact with this digest."""
+        return self.root / sha256[:2] / sha256
+
+    def _entries(self) -> Iterator[Path]:
+        if not self.root.exists():
+            return
+        for shard in self.root.iterdir():
+            if shard.is_dir() and not shard.name.startswith("."):
+                yield from shard.iterdir()
+
+    @staticmethod
+    def _names(entry: Path) -> list[Path]:
+        """Stored names in an entry, skipping links still being created."""
+        try:
+            return [path for path in entry.iterdir() if not path.name.startswith(".")]
+        except OSError:
+            return []
+
+    def get(self, sha256: str, name: Optional[str] = None) -> Optional[Path]:
+        """Return the stored file for a digest, or ``None`` if absent.
+
+        ``name`` asks for the file under that name, linking it if the bytes
+        were stored under another. A stored file whose contents no longer
+        match its digest is removed.
+        """
+        entry = self.entry(sha256)
+        names = self._names(entry)
+        if not names:
+            return None
+        stored = names[0]
+        try:
+            matches = file_sha256(stored) == sha256
+        except OSError:
+            return None
+        if not matches:
+            logger.warning("Removing corrupt artifact %s from the store", sha256)
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        # Record the access in atime only; the mtime keeps the digest cache
+        # entry valid.
+        os.utime(stored, ns=(time.time_ns(), stored.stat().st_mtime_ns))
+        if name is None or stored.name == name:
+            return stored
+        path = entry / name
+        if not path.exists():
+            link_or_copy(stored, path)
+        return path
+
+    def add(
+        self,
+        source: Union[str, Path],
+        sha256: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> Path:
+        """Link a local file into the store and return its stored path.
+
+        Raises:
+            ValueError: If ``sha256`` is given and the file does not match it.
+        """
+        source = Path(source).resolve()
+        actual = file_sha256(source)
+        if sha256 is not None and actual != sha256:
+            raise ValueError(f"{source} has sha256 {actual}, expected {sha256}.")
+        path = self.entry(actual) / (name or source.name)
+        if not path.exists():
+            link_or_copy(source, path)
+            record_file_sha256(path, actual)
+            self.evict(keep=path.parent)
+        return path
+
+    def write(self, write: Callable[[BinaryIO], T], name: str) -> tuple[Path, T]:
+        """Stream new content into the store under ``name``.
+
+        ``write`` receives a binary file to write the artifact into; the
+        sha256 is computed on the fly. Returns the stored path and
+        ``write``'s return value.
+        """
+        incoming = self.root / ".incoming"
+        incoming.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temp_name = tempfile.mkstemp(dir=incoming)
+        temp_path = Path(temp_name)
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                writer = _HashingWriter(file)
+                result = write(writer)
+            sha256 = (
+                writer.digest.hexdigest()
+                if writer.digest is not None
+                else file_sha256(temp_path, strict=True)
+            )
+            path = self.entry(sha256) / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path.chmod(0o444)
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        record_file_sha256(path, sha256)
+        self.evict(keep=path.parent)
+        return path, result
+
+    @contextmanager
+    def lock(self, sha256: str) -> Iterator[None]:
+        """Hold an exclusive, cross-process lock on one digest."""
+        locks = self.root / ".locks"
+        locks.mkdir(parents=True, exist_ok=True)
+        with (locks / f"{sha256}.lock").open("a") as handle:
+            try:
+                import fcntl
+            except ImportError:
+                yield
+                return
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def fetch(
+        self,
+        sha256: str,
+        produce: Callable[[], Union[str, Path]],
+        name: Optional[str] = None,
+    ) -> Path:
+        """Return the stored file for a digest, producing it at most once.
+
+        ``produce`` returns a local file with the expected contents (usually
+        a download). Concurrent callers for the same digest wait for the
+        first one instead of downloading again.
+        """
+        path = self.get(sha256, name)
+        if path is not None:
+            return path
+        with self.lock(sha256):
+            path = self.get(sha256, name)
+            if path is not None:
+                return path
+            return self.add(produce(), sha256, name)
+
+    def evict(self, keep: Optional[Path] = None) -> None:
+        """Remove least recently used artifacts until the store fits."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stats = [path.stat() for path in self._names(entry)]
+            except OSError:
+                continue
+            if not stats:
+                continue
+            # Names of one artifact are hard links to the same bytes.
+            last_access = max(stat.st_atime_ns for stat in stats)
+            entries.append((last_access, max(stat.st_size for stat in stats), entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            logger.info("Evicting artifact %s from the store", entry.name)
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
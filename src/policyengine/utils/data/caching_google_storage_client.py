@@ -4,49 +4,71 @@ from __future__ import annotations
 
 import logging
 import os
-import tempfile
 from contextlib import AbstractContextManager
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import diskcache
 
+from policyengine.utils.artifact_store import ArtifactStore, link_or_copy
+
 from .version_aware_storage_client import VersionAwareStorageClient
 
 logger = logging.getLogger(__name__)
 
+GCS_CACHE_DIR_ENV = "POLICYENGINE_GCS_CACHE_DIR"
+DEFAULT_METADATA_TTL_SECONDS = 300
 
-def _atomic_write(target: Path, content: bytes) -> None:
-    target.parent.mkdir(parents=True, exist_ok=True)
-    temp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            dir=target.parent,
-            delete=False,
-        ) as temp_file:
-            temp_path = Path(temp_file.name)
-            temp_file.write(content)
-        os.replace(temp_path, target)
-    finally:
-        if temp_path is not None and temp_path.exists():
-            temp_path.unlink()
 
+def gcs_cache_dir() -> Path:
+    """Return the directory holding the GCS object index."""
+    configured = os.environ.get(GCS_CACHE_DIR_ENV)
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".policyengine" / "gcs"
 
-class CachingGoogleStorageClient(AbstractContextManager):
-    """Download GCS objects through a CRC-keyed disk cache."""
 
-    def __init__(self) -> None:
+class CachingGoogleStorageClient(AbstractContextManager):
+    """Download GCS objects through the shared content-addressed artifact store.
+
+    Objects stream straight into an :class:`ArtifactStore` (the shared one
+    by default) and download targets are hard links (or reflinks) to the
+    stored file, so a large object is never held in memory or stored twice.
+    An index under ``cache_dir`` maps each object version and crc32c to its
+    sha256; crc32c and latest-version lookups are cached for
+    ``metadata_ttl`` seconds. The store's disk budget evicts least recently
+    used objects.
+
+    Stored objects are read-only, and hard-linked targets share their mode.
+    Leaving the client's context clears the index; stored objects stay in
+    the artifact store until evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        *,
+        store: Optional[ArtifactStore] = None,
+        metadata_ttl: float = DEFAULT_METADATA_TTL_SECONDS,
+    ) -> None:
         self.client = VersionAwareStorageClient()
-        self.cache = diskcache.Cache()
+        self.cache_dir = Path(cache_dir) if cache_dir else gcs_cache_dir()
+        self.cache = diskcache.Cache(str(self.cache_dir / "index"))
+        self.store = store if store is not None else ArtifactStore()
+        self.metadata_ttl = metadata_ttl
 
     @staticmethod
-    def _data_key(bucket: str, key: str, version: Optional[str] = None) -> str:
-        return f"{bucket}.{key}.{version}.data"
+    def _object_key(bucket: str, key: str, version: Optional[str], crc: str) -> str:
+        return f"{bucket}.{key}.{version}.{crc}.sha256"
 
     @staticmethod
     def _crc_key(bucket: str, key: str, version: Optional[str] = None) -> str:
         return f"{bucket}.{key}.{version}.crc"
 
+    @staticmethod
+    def _latest_version_key(bucket: str, key: str) -> str:
+        return f"{bucket}.{key}.latest_version"
+
     def download(
         self,
         bucket: str,
@@ -56,7 +78,7 @@ class CachingGoogleStorageClient(AbstractContextManager):
         return_version: bool = False,
     ) -> Optional[str]:
         if version is None:
-            version = self.client.latest_metadata_version(bucket, key)
+            version = self._latest_metadata_version(bucket, key)
             logger.warning(
                 "No version specified for %s/%s; using latest metadata version %s",
                 bucket,
@@ -64,35 +86,61 @@ class CachingGoogleStorageClient(AbstractContextManager):
                 version,
             )
 
-        self.sync(bucket, key, version)
-        data = self.cache.get(self._data_key(bucket, key, version))
-        if isinstance(data, bytes):
-            _atomic_write(target, data)
-            return version if return_version else None
-
-        raise TypeError(
-            f"Expected cached data for {bucket}/{key}@{version} to be bytes"
-        )
+        link_or_copy(self.sync(bucket, key, version), Path(target))
+        return version if return_version else None
 
     def sync(
         self,
         bucket: str,
         key: str,
         version: Optional[str] = None,
-    ) -> None:
-        crc = self.client.crc32c(bucket, key, version=version)
+    ) -> Path:
+        """Make sure an object version is in the store and return its path."""
+        crc = self._crc32c(bucket, key, version)
         if crc is None:
             raise FileNotFoundError(f"Unable to find gs://{bucket}/{key}")
 
-        data_key = self._data_key(bucket, key, version)
-        crc_key = self._crc_key(bucket, key, version)
-        if self.cache.get(crc_key, default=None) == crc:
-            return
-
-        content, downloaded_crc = self.client.download(bucket, key, version=version)
+        sha256 = self.cache.get(self._object_key(bucket, key, version, crc))
+        if sha256 is not None:
+            path = self.store.get(sha256, Path(key).name)
+            if path is not None:
+                return path
+
+        path, downloaded_crc = self.store.write(
+            lambda file: self.client.download_to_file(
+                bucket, key, file, version=version
+            ),
+            name=Path(key).name,
+        )
         with self.cache as cache:
-            cache.set(data_key, content)
-            cache.set(crc_key, downloaded_crc)
+            cache.set(
+                self._crc_key(bucket, key, version),
+                downloaded_crc,
+                expire=self.metadata_ttl,
+            )
+            cache.set(
+                self._object_key(bucket, key, version, downloaded_crc),
+                path.parent.name,
+            )
+        return path
+
+    def _crc32c(self, bucket: str, key: str, version: Optional[str]) -> Optional[str]:
+        crc_key = self._crc_key(bucket, key, version)
+        crc = self.cache.get(crc_key)
+        if crc is None:
+            crc = self.client.crc32c(bucket, key, version=version)
+            if crc is not None:
+                self.cache.set(crc_key, crc, expire=self.metadata_ttl)
+        return crc
+
+    def _latest_metadata_version(self, bucket: str, key: str) -> Optional[str]:
+        version_key = self._latest_version_key(bucket, key)
+        version = self.cache.get(version_key)
+        if version is None:
+            version = self.client.latest_metadata_version(bucket, key)
+            if version is not None:
+                self.cache.set(version_key, version, expire=self.metadata_ttl)
+        return version
 
     def clear(self) -> None:
         self.cache.clear()
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import BinaryIO, Optional
 
 from google.cloud.storage import Blob, Bucket, Client
 
@@ -109,6 +109,22 @@ class VersionAwareStorageClient:
         content = blob.download_as_bytes()
         return content, blob.crc32c
 
+    def download_to_file(
+        self,
+        bucket_name: str,
+        key: str,
+        file_obj: BinaryIO,
+        version: Optional[str] = None,
+    ) -> Optional[str]:
+        """Stream an object into ``file_obj`` and return its crc32c.
+
+        The client checks the streamed bytes against the object's checksum,
+        so the object is never held in memory.
+        """
+        blob = self.get_blob(bucket_name, key, version)
+        blob.download_to_file(file_obj)
+        return blob.crc32c
+
     def latest_metadata_version(
         self,
         bucket_name: str,
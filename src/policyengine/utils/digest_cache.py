@@ -0,0 +1,245 @@
+"""Shared sha256 cache for large local artifacts.
+
+Bundle status checks, run records, long-term dataset loading and TRO
+verification all hash the same multi-hundred-MB datasets and installed
+package trees. This module hashes each file once and remembers the digest
+in a small SQLite database, keyed by the file's resolved path, size,
+``st_mtime_ns`` and inode. Any write that changes the file (or replaces
+it with a new one) changes one of those, so the cached digest is only
+reused for the bytes it was computed from.
+
+The database lives under ``~/.policyengine/digests``, or
+``POLICYENGINE_DIGEST_CACHE_DIR`` when set. Pass ``strict=True`` or set
+``POLICYENGINE_STRICT_HASHING=1`` to ignore cached digests and rehash
+every file; the fresh digests replace the cached ones. A cache that
+cannot be opened or written is skipped, never an error.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Optional, Union
+
+DIGEST_CACHE_DIR_ENV = "POLICYENGINE_DIGEST_CACHE_DIR"
+STRICT_HASHING_ENV = "POLICYENGINE_STRICT_HASHING"
+HASH_CHUNK_BYTES = 1024 * 1024
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS files ("
+    "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, "
+    "sha256 TEXT)",
+    "CREATE TABLE IF NOT EXISTS directories ("
+    "path TEXT PRIMARY KEY, signature TEXT, sha256 TEXT)",
+)
+
+# Manifest-keyed tree digests already computed or looked up by this process.
+_manifest_digests: dict[tuple[str, str], str] = {}
+_manifest_lock = threading.Lock()
+
+
+def digest_cache_dir() -> Path:
+    """Return the directory holding the digest cache database."""
+    configured = os.environ.get(DIGEST_CACHE_DIR_ENV)
+    if configured:
+        return Path(configured).expanduser()
+    return Path.home() / ".policyengine" / "digests"
+
+
+def strict_hashing() -> bool:
+    """Whether ``POLICYENGINE_STRICT_HASHING`` asks to bypass the cache."""
+    return os.environ.get(STRICT_HASHING_ENV, "").strip().lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+
+@contextmanager
+def _database() -> Iterator[Optional[sqlite3.Connection]]:
+    """Open the cache database, or yield ``None`` if it is unusable."""
+    try:
+        directory = digest_cache_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(directory / "digests.sqlite3", timeout=30)
+    except (OSError, sqlite3.Error):
+        yield None
+        return
+    with closing(connection):
+        try:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+        except sqlite3.Error:
+            yield None
+            return
+        yield connection
+
+
+def _lookup(query: str, parameters: tuple) -> Optional[str]:
+    with _database() as connection:
+        if connection is None:
+            return None
+        try:
+            row = connection.execute(query, parameters).fetchone()
+        except sqlite3.Error:
+            return None
+    return row[0] if row else None
+
+
+def _store(statement: str, parameters: tuple) -> None:
+    with _database() as connection:
+        if connection is None:
+            return
+        try:
+            with connection:
+                connection.execute(statement, parameters)
+        except sqlite3.Error:
+            return
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_sha256(path: Union[str, Path], *, strict: Optional[bool] = None) -> str:
+    """Return the sha256 of a file, reusing a cached digest when unchanged.
+
+    Args:
+        path: File to hash.
+        strict: Rehash even when a cached digest matches. Defaults to
+            ``POLICYENGINE_STRICT_HASHING``.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    if not (strict_hashing() if strict is None else strict):
+        cached = _lookup(
+            "SELECT sha256 FROM files "
+            "WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+            key,
+        )
+        if cached is not None:
+            return cached
+    sha256 = _hash_file(path)
+    _record_file(key, sha256, path)
+    return sha256
+
+
+def record_file_sha256(path: Union[str, Path], sha256: str) -> None:
+    """Cache a digest computed elsewhere, for example while downloading."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    _record_file((str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino), sha256, path)
+
+
+def _record_file(key: tuple, sha256: str, path: Path) -> None:
+    # The file may have changed while it was read; only cache the digest
+    # if it still has the stat it was hashed under.
+    stat = path.stat()
+    if key != (str(path), stat.st_size, stat.st_mtime_ns, stat.st_ino):
+        return
+    _store("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", (*key, sha256))
+
+
+def _tree_files(path: Path) -> list[tuple[str, Path]]:
+    files = []
+    for file_path in sorted(path.rglob("*")):
+        if not file_path.is_file():
+            continue
+        if "__pycache__" in file_path.parts or file_path.suffix in {".pyc", ".pyo"}:
+            continue
+        files.append((file_path.relative_to(path).as_posix(), file_path))
+    return files
+
+
+def _tree_signature(files: list[tuple[str, Path]]) -> str:
+    signature = hashlib.sha256()
+    for relative_path, file_path in files:
+        stat = file_path.stat()
+        signature.update(
+            f"{relative_path}\0{stat.st_size}\0{stat.st_mtime_ns}\0"
+            f"{stat.st_ino}\0".encode()
+        )
+    return signature.hexdigest()
+
+
+def _hash_tree(files: list[tuple[str, Path]]) -> str:
+    digest = hashlib.sha256()
+    for relative_path, file_path in files:
+        contents = file_path.read_bytes()
+        digest.update(relative_path.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(str(len(contents)).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(contents)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def directory_sha256(
+    path: Union[str, Path],
+    *,
+    strict: Optional[bool] = None,
+    manifest: Optional[str] = None,
+) -> str:
+    """Return the sha256 of a directory tree's file names and contents.
+
+    Files are hashed in sorted order as ``relative path, length, contents``.
+    Compiled bytecode (``__pycache__``, ``.pyc``, ``.pyo``) is ignored, so
+    an installed package hashes the same before and after it is imported.
+    The tree digest is cached against a signature of every file's path,
+    size, ``st_mtime_ns`` and inode, so checking an unchanged tree only
+    stats its files.
+
+    ``manifest`` is text that changes whenever the tree does, such as an
+    installed distribution's ``RECORD``. When given, the digest is cached
+    against the manifest instead and also memoized for the process, so an
+    unchanged tree is not even walked.
+    """
+    path = Path(path).resolve()
+    strict = strict_hashing() if strict is None else strict
+    if manifest is not None:
+        signature = "manifest:" + hashlib.sha256(manifest.encode()).hexdigest()
+        key = (str(path), signature)
+        # Threads asking for the same tree wait for one walk.
+        with _manifest_lock:
+            if not strict:
+                cached = _manifest_digests.get(key) or _lookup(
+                    "SELECT sha256 FROM directories WHERE path = ? AND signature = ?",
+                    key,
+                )
+                if cached is not None:
+                    _manifest_digests[key] = cached
+                    return cached
+            sha256 = _hash_tree(_tree_files(path))
+            _manifest_digests[key] = sha256
+        _store("INSERT OR REPLACE INTO directories VALUES (?, ?, ?)", (*key, sha256))
+        return sha256
+
+    files = _tree_files(path)
+    signature = _tree_signature(files)
+    if not strict:
+        cached = _lookup(
+            "SELECT sha256 FROM directories WHERE path = ? AND signature = ?",
+            (str(path), signature),
+        )
+        if cached is not None:
+            return cached
+
+    sha256 = _hash_tree(files)
+    if _tree_signature(files) == signature:
+        _store(
+            "INSERT OR REPLACE INTO directories VALUES (?, ?, ?)",
+            (str(path), signature, sha256),
+        )
+    return sha256
@@ -3,9 +3,12 @@
 import logging
 from typing import Iterable, Optional, Union
 
+import numpy as np
 import pandas as pd
 from microdf import MicroDataFrame
 
+from policyengine.utils.household_partition import household_partition_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +55,18 @@ def build_entity_relationships(
     return pd.DataFrame(columns)
 
 
+def _require_household_columns(
+    household_data: pd.DataFrame,
+    household_filter: dict[str, Union[str, int, float]],
+) -> None:
+    for variable_name in household_filter:
+        if variable_name not in household_data.columns:
+            raise ValueError(
+                f"Variable '{variable_name}' not found in household data. "
+                f"Available columns: {list(household_data.columns)}"
+            )
+
+
 def _household_mask(
     household_data: pd.DataFrame,
     variable_name: str,
@@ -63,18 +78,10 @@ def _household_mask(
     Local intermediate only — never crosses a function boundary — so no
     positional-alignment invariant leaks out (callers key on household_id).
     """
-    if variable_name not in household_data.columns:
-        raise ValueError(
-            f"Variable '{variable_name}' not found in household data. "
-            f"Available columns: {list(household_data.columns)}"
-        )
     additional_filters = additional_filters or {}
-    for extra_variable in additional_filters:
-        if extra_variable not in household_data.columns:
-            raise ValueError(
-                f"Variable '{extra_variable}' not found in household data. "
-                f"Available columns: {list(household_data.columns)}"
-            )
+    _require_household_columns(
+        household_data, {variable_name: variable_value, **additional_filters}
+    )
 
     mask = _values_match(household_data[variable_name].values, variable_value)
     for extra_variable, extra_value in additional_filters.items():
@@ -121,42 +128,39 @@ def filter_dataset_by_household_ids(
     if len(keep_household_ids) == 0:
         raise ValueError("No households match the requested household id set.")
 
-    person_data = pd.DataFrame(entity_data["person"])
-    entity_rel = build_entity_relationships(person_data, group_entities)
+    index = household_partition_index(entity_data, group_entities)
+    rows = index.entity_rows(index.household_ids_mask(keep_household_ids))
+    return index.take(entity_data, rows)
 
-    # Keep persons whose household is selected, then collect the entity IDs
-    # those persons carry (household included, since it is a group entity).
-    person_mask = entity_rel["household_id"].isin(keep_household_ids)
-    filtered_rel = entity_rel[person_mask]
 
-    filtered_ids = {"person": set(filtered_rel["person_id"])}
-    for entity in group_entities:
-        filtered_ids[entity] = set(filtered_rel[f"{entity}_id"])
-
-    result = {}
-    for entity_name, mdf in entity_data.items():
-        df = pd.DataFrame(mdf)
-        id_col = f"{entity_name}_id"
-        if entity_name in filtered_ids and id_col in df.columns:
-            filtered_df = df[df[id_col].isin(filtered_ids[entity_name])]
-        else:
-            if entity_name != "person":
-                logger.warning(
-                    "Entity '%s' not in filtered_ids or missing '%s' column; "
-                    "passing through unfiltered.",
-                    entity_name,
-                    id_col,
-                )
-            filtered_df = df
-
-        weight_col = f"{entity_name}_weight"
-        weights = weight_col if weight_col in filtered_df.columns else None
-        result[entity_name] = MicroDataFrame(
-            filtered_df.reset_index(drop=True),
-            weights=weights,
-        )
+def filter_dataset_by_household_filters(
+    entity_data: dict[str, MicroDataFrame],
+    group_entities: list[str],
+    filters: list[dict[str, Union[str, int, float]]],
+) -> dict[str, MicroDataFrame]:
+    """Filter every entity to households matching ANY of several filters.
 
-    return result
+    Each filter is a ``{variable: value}`` dict whose items must all match.
+    Matching households come from the dataset's cached partition index, so no
+    string comparisons or id-set membership tests run per call.
+
+    Raises:
+        ValueError: If a variable is missing or no households match.
+    """
+    household_data = pd.DataFrame(entity_data["household"])
+    for household_filter in filters:
+        _require_household_columns(household_data, household_filter)
+    index = household_partition_index(entity_data, group_entities)
+    mask = np.zeros(index.n_households, dtype=bool)
+    for household_filter in filters:
+        mask |= index.household_mask(household_data, household_filter)
+    if not mask.any():
+        raise ValueError("No households match any of the requested filters.")
+    if len(filters) == 1:
+        rows = index.scope_rows(household_data, filters[0])
+    else:
+        rows = index.entity_rows(mask)
+    return index.take(entity_data, rows)
 
 
 def filter_dataset_by_household_variable(
@@ -168,9 +172,10 @@ def filter_dataset_by_household_variable(
 ) -> dict[str, MicroDataFrame]:
     """Filter dataset entities to only include households matching variables.
 
-    Thin wrapper composing :func:`matching_household_ids` (which households) with
-    :func:`filter_dataset_by_household_ids` (the entity cascade). Public behavior
-    is unchanged.
+    Matching households and the entity cascade come from the dataset's cached
+    :class:`~policyengine.utils.household_partition.HouseholdPartitionIndex`,
+    and the selected rows are cached per filter, so repeat scopes of the same
+    region only slice the tables.
 
     Args:
         entity_data: Dict mapping entity names to their MicroDataFrames
@@ -187,18 +192,17 @@ def filter_dataset_by_household_variable(
     Raises:
         ValueError: If variable_name is not found or no households match.
     """
-    keep_household_ids = matching_household_ids(
-        entity_data, variable_name, variable_value, additional_filters
-    )
+    household_filter = {variable_name: variable_value, **(additional_filters or {})}
+    household_data = pd.DataFrame(entity_data["household"])
+    _require_household_columns(household_data, household_filter)
+    index = household_partition_index(entity_data, group_entities)
     # Variable-specific message (asserted by tests and referenced by a documented
-    # incident); raised here before the generic id-set guard is ever reached.
-    if len(keep_household_ids) == 0:
+    # incident); raised before any entity table is sliced.
+    if not index.household_mask(household_data, household_filter).any():
         raise ValueError(
             f"No households found matching {variable_name}={variable_value}"
         )
-    return filter_dataset_by_household_ids(
-        entity_data, group_entities, keep_household_ids
-    )
+    return index.take(entity_data, index.scope_rows(household_data, household_filter))
 
 
 def _values_match(values, expected: Union[str, int, float]):
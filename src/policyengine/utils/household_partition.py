@@ -0,0 +1,289 @@
+"""Precomputed household partition index for region scoping.
+
+Scoping a dataset to a region keeps the households matching a key (for
+example ``state_fips``) and cascades that selection to persons and every
+group entity. Doing this from scratch means rebuilding the person/entity
+relationship table and running set-membership tests against every entity
+table, once per scoped simulation.
+
+:class:`HouseholdPartitionIndex` does the structural work once per dataset:
+each person's household position and each person's row in every group
+entity table are resolved to integer arrays. Each household key column is
+factorized and its households sorted by key, so the households of one key
+value are a contiguous slice. A scope then costs a few integer gathers, and
+the resulting row selections are cached per (dataset, region).
+"""
+
+import hashlib
+import logging
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Iterable, Union
+
+import numpy as np
+import pandas as pd
+from microdf import MicroDataFrame
+
+logger = logging.getLogger(__name__)
+
+FilterValue = Union[str, int, float]
+
+# Partition indexes kept alive at once (one per distinct in-memory dataset).
+_MAX_CACHED_INDEXES = 8
+
+
+def _resolve_person_link(person_data: pd.DataFrame, entity_name: str) -> str:
+    from policyengine.utils.entity_utils import _resolve_id_column
+
+    return _resolve_id_column(person_data, entity_name)
+
+
+def _unique_ids(ids: pd.Series, entity_name: str) -> pd.Index:
+    index = pd.Index(ids.values)
+    if not index.is_unique:
+        raise ValueError(
+            f"Cannot index '{entity_name}' rows: '{entity_name}_id' values are "
+            f"not unique."
+        )
+    return index
+
+
+def _normalise_key(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
+
+
+def _column_fingerprint(values: np.ndarray) -> str:
+    hashed = pd.util.hash_array(np.asarray(values, dtype=object))
+    return hashlib.blake2b(hashed.tobytes(), digest_size=16).hexdigest()
+
+
+@dataclass
+class _KeyPartition:
+    """Households of one key column, sorted so each value is a slice."""
+
+    fingerprint: str
+    order: np.ndarray
+    bounds: dict = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, values: np.ndarray) -> "_KeyPartition":
+        codes, uniques = pd.factorize(values)
+        order = np.argsort(codes, kind="stable")
+        starts = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        bounds: dict = {}
+        for code, value in enumerate(uniques):
+            # ``b"X"`` and ``"X"`` both match a ``"X"`` filter.
+            bounds.setdefault(_normalise_key(value), []).append(
+                (int(starts[code]), int(starts[code + 1]))
+            )
+        return cls(
+            fingerprint=_column_fingerprint(values),
+            order=order,
+            bounds=bounds,
+        )
+
+    def households(self, value: FilterValue) -> np.ndarray:
+        """Household positions whose key equals ``value``, in row order."""
+        slices = self.bounds.get(_normalise_key(value), [])
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate([self.order[a:b] for a, b in slices]))
+
+
+class HouseholdPartitionIndex:
+    """Integer row links and per-key household partitions for one dataset.
+
+    Build with :func:`household_partition_index`, which caches one index per
+    in-memory dataset. Entity tables are held by weak reference and the
+    index is rebuilt when any table is replaced; household key columns are
+    fingerprinted on use, so in-place edits to a key column are picked up.
+    """
+
+    def __init__(
+        self,
+        entity_data: dict[str, MicroDataFrame],
+        group_entities: list[str],
+    ):
+        self.group_entities = list(group_entities)
+        self._refs = {name: weakref.ref(mdf) for name, mdf in entity_data.items()}
+        self._lengths = {name: len(mdf) for name, mdf in entity_data.items()}
+
+        household = pd.DataFrame(entity_data["household"])
+        person = pd.DataFrame(entity_data["person"])
+        self.n_households = len(household)
+        self._household_ids = _unique_ids(household["household_id"], "household")
+        self._person_households = self._household_ids.get_indexer(
+            person[_resolve_person_link(person, "household")].values
+        )
+
+        # Row position in each group entity table of every person (-1 when
+        # the person's group id has no row in that table).
+        self._person_entity_rows: dict[str, np.ndarray] = {}
+        for entity in self.group_entities:
+            if entity == "household":
+                self._person_entity_rows[entity] = self._person_households
+                continue
+            table = pd.DataFrame(entity_data.get(entity, pd.DataFrame()))
+            if f"{entity}_id" not in table.columns:
+                continue
+            link = person[_resolve_person_link(person, entity)].values
+            self._person_entity_rows[entity] = _unique_ids(
+                table[f"{entity}_id"], entity
+            ).get_indexer(link)
+
+        self._partitions: dict[str, _KeyPartition] = {}
+        self._scopes: dict[tuple, dict[str, np.ndarray]] = {}
+
+    def matches(self, entity_data: dict[str, MicroDataFrame]) -> bool:
+        """Whether ``entity_data`` holds the same tables this index was built on."""
+        if set(entity_data) != set(self._refs):
+            return False
+        return all(
+            self._refs[name]() is mdf and self._lengths[name] == len(mdf)
+            for name, mdf in entity_data.items()
+        )
+
+    def _partition(self, household: pd.DataFrame, variable_name: str) -> _KeyPartition:
+        values = household[variable_name].values
+        partition = self._partitions.get(variable_name)
+        if partition is None or partition.fingerprint != _column_fingerprint(values):
+            partition = _KeyPartition.build(values)
+            self._partitions[variable_name] = partition
+            # Cached scopes may depend on the old column values.
+            self._scopes.clear()
+        return partition
+
+    def household_mask(
+        self,
+        household: pd.DataFrame,
+        filters: dict[str, FilterValue],
+    ) -> np.ndarray:
+        """Boolean mask over households matching every ``filters`` item."""
+        mask = np.ones(self.n_households, dtype=bool)
+        for variable_name, value in filters.items():
+            variable_mask = np.zeros(self.n_households, dtype=bool)
+            variable_mask[
+                self._partition(household, variable_name).households(value)
+            ] = True
+            mask &= variable_mask
+        return mask
+
+    def household_ids_mask(self, household_ids: Iterable) -> np.ndarray:
+        """Boolean mask over households whose ``household_id`` is listed."""
+        positions = self._household_ids.get_indexer(pd.Index(list(household_ids)))
+        mask = np.zeros(self.n_households, dtype=bool)
+        mask[positions[positions >= 0]] = True
+        return mask
+
+    def entity_rows(self, household_mask: np.ndarray) -> dict[str, np.ndarray]:
+        """Rows of every entity belonging to the selected households.
+
+        Persons are kept when their household is selected; a group entity row
+        is kept when any kept person belongs to it. Rows keep dataset order.
+        """
+        person_households = self._person_households
+        kept_persons = np.zeros(len(person_households), dtype=bool)
+        linked = person_households >= 0
+        kept_persons[linked] = household_mask[person_households[linked]]
+
+        rows = {"person": np.flatnonzero(kept_persons)}
+        for entity, person_rows in self._person_entity_rows.items():
+            entity_mask = np.zeros(self._lengths[entity], dtype=bool)
+            selected = person_rows[kept_persons]
+            entity_mask[selected[selected >= 0]] = True
+            rows[entity] = np.flatnonzero(entity_mask)
+        return rows
+
+    def household_positions(self, entity: str) -> np.ndarray:
+        """Household table position of every row of ``entity`` (-1 if unlinked).
+
+        A group entity row takes the household of its members; persons take
+        their own household.
+        """
+        if entity == "person":
+            return self._person_households
+        if entity == "household":
+            return np.arange(self.n_households)
+        person_rows = self._person_entity_rows.get(entity)
+        positions = np.full(self._lengths.get(entity, 0), -1, dtype=np.int64)
+        if person_rows is None:
+            return positions
+        linked = person_rows >= 0
+        positions[person_rows[linked]] = self._person_households[linked]
+        return positions
+
+    def scope_rows(
+        self,
+        household: pd.DataFrame,
+        filters: dict[str, FilterValue],
+    ) -> dict[str, np.ndarray]:
+        """Cached :meth:`entity_rows` for a household key filter."""
+        # Refresh partitions first: a changed key column clears the cache.
+        mask = self.household_mask(household, filters)
+        key = tuple(sorted(filters.items(), key=lambda item: item[0]))
+        rows = self._scopes.get(key)
+        if rows is None:
+            rows = self.entity_rows(mask)
+            self._scopes[key] = rows
+        return rows
+
+    def take(
+        self,
+        entity_data: dict[str, MicroDataFrame],
+        rows: dict[str, np.ndarray],
+    ) -> dict[str, MicroDataFrame]:
+        """Slice every entity table to ``rows`` as fresh MicroDataFrames."""
+        result = {}
+        for entity_name, mdf in entity_data.items():
+            df = pd.DataFrame(mdf)
+            if entity_name in rows:
+                filtered_df = df.iloc[rows[entity_name]]
+            else:
+                logger.warning(
+                    "Entity '%s' not in filtered_ids or missing '%s' column; "
+                    "passing through unfiltered.",
+                    entity_name,
+                    f"{entity_name}_id",
+                )
+                filtered_df = df
+
+            weight_col = f"{entity_name}_weight"
+            weights = weight_col if weight_col in filtered_df.columns else None
+            result[entity_name] = MicroDataFrame(
+                filtered_df.reset_index(drop=True),
+                weights=weights,
+            )
+        return result
+
+
+_INDEX_CACHE: "OrderedDict[tuple, HouseholdPartitionIndex]" = OrderedDict()
+
+
+def household_partition_index(
+    entity_data: dict[str, MicroDataFrame],
+    group_entities: list[str],
+) -> HouseholdPartitionIndex:
+    """Return the cached partition index for ``entity_data``, building it once."""
+    key = (
+        tuple(sorted((name, id(mdf)) for name, mdf in entity_data.items())),
+        tuple(group_entities),
+    )
+    index = _INDEX_CACHE.get(key)
+    if index is not None and index.matches(entity_data):
+        _INDEX_CACHE.move_to_end(key)
+        return index
+    index = HouseholdPartitionIndex(entity_data, group_entities)
+    _INDEX_CACHE[key] = index
+    while len(_INDEX_CACHE) > _MAX_CACHED_INDEXES:
+        _INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def clear_household_partition_cache() -> None:
+    """Drop all cached partition indexes and scoped row selections."""
+    _INDEX_CACHE.clear()
@@ -2,6 +2,8 @@
 
 import pytest
 
+from policyengine.utils import digest_cache
+
 # Import fixtures from fixtures module so pytest can discover them
 from tests.fixtures.filtering_fixtures import (  # noqa: F401
     create_uk_test_dataset,
@@ -34,6 +36,37 @@ US_GROUP_ENTITIES = ["household", "tax_unit", "spm_unit", "family", "marital_uni
 UK_GROUP_ENTITIES = ["benunit", "household"]
 
 
+@pytest.fixture(autouse=True)
+def _isolated_manifest_cache(tmp_path_factory, monkeypatch):
+    """Keep data release manifests fetched by tests out of the user's cache."""
+    monkeypatch.setenv(
+        "POLICYENGINE_MANIFEST_CACHE_DIR",
+        str(tmp_path_factory.mktemp("manifest-cache")),
+    )
+    monkeypatch.delenv("POLICYENGINE_OFFLINE", raising=False)
+    monkeypatch.delenv("HF_HUB_OFFLINE", raising=False)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_digest_cache(tmp_path_factory, monkeypatch):
+    """Keep file digests cached by tests out of the user's digest cache."""
+    monkeypatch.setenv(
+        "POLICYENGINE_DIGEST_CACHE_DIR",
+        str(tmp_path_factory.mktemp("digest-cache")),
+    )
+    monkeypatch.delenv("POLICYENGINE_STRICT_HASHING", raising=False)
+    monkeypatch.setattr(digest_cache, "_manifest_digests", {})
+
+
+@pytest.fixture(autouse=True)
+def _isolated_artifact_store(tmp_path_factory, monkeypatch):
+    """Keep artifacts stored by tests out of the user's artifact store."""
+    monkeypatch.setenv(
+        "POLICYENGINE_ARTIFACT_STORE_DIR",
+        str(tmp_path_factory.mktemp("artifact-store")),
+    )
+
+
 def entity_data_of(dataset, group_entities):
     data = dataset.data
     return {entity: getattr(data, entity) for entity in ["person", *group_entities]}
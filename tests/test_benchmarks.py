@@ -0,0 +1,159 @@
+"""Tests for the offline benchmark suite behind ``policyengine bench``."""
+
+import json
+
+import pytest
+
+from policyengine.benchmarks import (
+    BenchmarkReport,
+    BenchmarkResult,
+    compare_reports,
+    fixture_dataset,
+    run_benchmarks,
+    select_cases,
+)
+from policyengine.cli import main as cli_main
+
+
+def _report(households=100, **seconds):
+    return BenchmarkReport(
+        country="uk",
+        households=households,
+        repeats=3,
+        created_at="2026-01-01T00:00:00+00:00",
+        results=[
+            BenchmarkResult(name=name.replace("__", "."), seconds=values)
+            for name, values in seconds.items()
+        ],
+    )
+
+
+def test_comparison_flags_regressions_beyond_threshold_and_noise_floor():
+    baseline = _report(
+        run=[2.0, 2.1, 1.9],
+        scoping=[0.001],
+        dataset_load=[1.0],
+        outputs__poverty=[0.5],
+        simulation_save=[0.2],
+    )
+    current = _report(
+        run=[3.0, 2.9, 3.1],
+        # Three times slower, but within the noise floor.
+        scoping=[0.003],
+        dataset_load=[0.5],
+        outputs__poverty=[0.55],
+        household__single=[1.0],
+    )
+    current.results.append(BenchmarkResult(name="simulation_load", error="boom"))
+
+    statuses = {
+        comparison.name: comparison.status
+        for comparison in compare_reports(current, baseline)
+    }
+    assert statuses == {
+        "run": "regression",
+        "scoping": "ok",
+        "dataset_load": "improvement",
+        "outputs.poverty": "ok",
+        "household.single": "new",
+        "simulation_load": "error",
+        "simulation_save": "missing",
+    }
+    run = compare_reports(current, baseline)[0]
+    assert run.ratio == pytest.approx(1.5)
+    assert compare_reports(current, baseline, threshold=0.6)[0].status == "ok"
+
+    with pytest.raises(ValueError, match="households"):
+        compare_reports(_report(households=10, run=[1.0]), baseline)
+
+
+def test_reports_round_trip_through_json(tmp_path):
+    report = _report(run=[1.0, 3.0, 2.0])
+    report.results.append(BenchmarkResult(name="scoping", error="ValueError: x"))
+    path = tmp_path / "bench.json"
+    report.write(path)
+
+    payload = json.loads(path.read_text())
+    assert payload["results"][0]["median_seconds"] == 2.0
+    assert payload["results"][0]["best_seconds"] == 1.0
+    assert BenchmarkReport.read(path) == report
+
+
+def test_cases_are_selected_by_name_prefix_or_glob():
+    assert select_cases(["outputs"]) == [
+        "outputs.aggregate",
+        "outputs.change_aggregate",
+        "outputs.decile_impact",
+        "outputs.poverty",
+        "outputs.inequality",
+    ]
+    assert select_cases(["simulation_*", "scoping"]) == [
+        "scoping",
+        "simulation_save",
+        "simulation_load",
+    ]
+    with pytest.raises(ValueError, match="No benchmark case"):
+        select_cases(["nope"])
+
+
+def test_fixture_datasets_are_deterministic():
+    first = fixture_dataset("uk", 50, seed=3)
+    second = fixture_dataset("uk", 50, seed=3)
+    assert len(first.data.household) == 50
+    assert first.data.person.equals(second.data.person)
+    assert set(first.data.person.person_household_id) == set(range(1, 51))
+    assert len(fixture_dataset("us", 20).data.tax_unit) == 20
+
+
+def test_uk_pipeline_cases_run_offline(tmp_path):
+    finished = []
+    report = run_benchmarks(
+        "uk",
+        households=30,
+        repeats=2,
+        only=["dataset_*", "scoping", "run", "outputs", "simulation_*"],
+        working_dir=tmp_path,
+        on_result=lambda result: finished.append(result.name),
+    )
+
+    assert finished == [result.name for result in report.results]
+    assert finished[:4] == ["dataset_save", "dataset_load", "scoping", "run"]
+    assert report.errors == []
+    assert all(len(result.seconds) == 2 for result in report.results)
+    assert report.environment["python"]
+
+
+def test_bench_command_writes_report_and_compares_with_baseline(tmp_path, capsys):
+    baseline = _report(households=20, scoping=[60.0], dataset_save=[0.0])
+    baseline_path = tmp_path / "baseline.json"
+    baseline.write(baseline_path)
+    output = tmp_path / "bench.json"
+
+    exit_code = cli_main(
+        [
+            "bench",
+            "--country",
+            "uk",
+            "--households",
+            "20",
+            "--repeats",
+            "1",
+            "--only",
+            "scoping",
+            "--output",
+            str(output),
+            "--baseline",
+            str(baseline_path),
+        ]
+    )
+
+    assert exit_code == 0
+    report = BenchmarkReport.read(output)
+    assert [result.name for result in report.results] == ["scoping"]
+    assert "improvement: scoping" in capsys.readouterr().err
+
+    mismatched = cli_main(
+        ["bench", "--country", "uk", "--households", "5", "--only", "scoping"]
+        + ["--baseline", str(baseline_path)]
+    )
+    assert mismatched == 1
@@ -11,7 +11,9 @@ here instead of silently returning a wrong number.
 
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
+import pytest
 from microdf import MicroDataFrame
 
 from policyengine.core import Simulation
@@ -373,3 +375,27 @@ def test_calculate_budgetary_impact_runs_against_real_output_simulation(tmp_path
     assert result.total == -100.0
     # unattributed = total - federal - state = -100 - (-100) - (-15) = 15
     assert result.unattributed == 15.0
+
+
+def test_budgetary_impact_reports_replicate_standard_error(tmp_path):
+    """With replicate weights on the baseline dataset, ``total`` gets a
+    standard error from the replicate totals of its components."""
+    baseline = _make_us_output_simulation(
+        tmp_path, "baseline", household_tax=1800.0, federal_benefit_cost=200.0
+    )
+    reform = _make_us_output_simulation(
+        tmp_path, "reform", household_tax=1660.0, federal_benefit_cost=160.0
+    )
+    assert calculate_budgetary_impact(baseline, reform).total_standard_error is None
+
+    replicate_weights = baseline.dataset.add_replicate_weights(
+        "successive_difference", replicates=4
+    )
+    result = calculate_budgetary_impact(baseline, reform)
+
+    # Only the first household changes: total = -140 - (-40) = -100.
+    assert result.total == -100.0
+    first_household = replicate_weights.factors[:, 0]
+    assert result.total_standard_error == pytest.approx(
+        100.0 * np.sqrt(np.sum((first_household - 1) ** 2))
+    )
@@ -229,6 +229,96 @@ def test_install_datasets_rejects_downloaded_hash_mismatch(tmp_path):
     assert not (tmp_path / bundle.BACKUP_DIR_NAME).exists()
 
 
+class RangeResponse(FakeResponse):
+    def __init__(self, status_code: int, payload: bytes):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = {"Content-Length": str(len(payload))}
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.payload), 3):
+            yield self.payload[start : start + 3]
+
+
+class RangeSession:
+    """Serve ``payload`` and honour Range requests unless ``ignore_range``."""
+
+    def __init__(self, payload: bytes, *, ignore_range: bool = False):
+        self.payload = payload
+        self.ignore_range = ignore_range
+        self.requested_ranges = []
+
+    def get(self, url, headers=None, **kwargs):
+        requested = (headers or {}).get("Range")
+        self.requested_ranges.append(requested)
+        if requested is None or self.ignore_range:
+            return RangeResponse(200, self.payload)
+        start = int(requested.removeprefix("bytes=").rstrip("-"))
+        return RangeResponse(206, self.payload[start:])
+
+
+@pytest.mark.parametrize("ignore_range", [False, True])
+def test_install_datasets_resumes_partial_download(tmp_path, ignore_range):
+    payload = b"certified-dataset-bytes"
+    manifest = _manifest_with_dataset_sha("us", _sha256(payload))
+    plan = bundle.dataset_plans(manifest, countries=["us"], data_dir=tmp_path)[0]
+    partial = bundle._partial_download_path(plan, tmp_path)
+    partial.write_bytes(payload[:9])
+    session = RangeSession(payload, ignore_range=ignore_range)
+    reports = []
+
+    installed = bundle.install_datasets(
+        manifest,
+        countries=["us"],
+        data_dir=tmp_path,
+        yes=True,
+        session=session,
+        progress=reports.append,
+    )
+
+    assert session.requested_ranges == ["bytes=9-"]
+    assert installed[0]["installed_sha256"] == _sha256(payload)
+    assert plan.destination.read_bytes() == payload
+    assert not partial.exists()
+    assert reports[-1].bytes_downloaded == reports[-1].total_bytes == len(payload)
+    assert reports[-1].resumed_bytes == (0 if ignore_range else 9)
+
+
+def test_install_datasets_downloads_countries_concurrently(tmp_path):
+    payloads = {"us": b"us-data", "uk": b"uk-data"}
+    manifest = _manifest_with_dataset_sha("us", _sha256(payloads["us"]))
+    uk_release = manifest["data_releases"]["uk"]
+    uk_release["datasets"][uk_release["default_dataset"]]["sha256"] = _sha256(
+        payloads["uk"]
+    )
+    uk_release["certified_data_artifact"]["sha256"] = _sha256(payloads["uk"])
+    plans = bundle.dataset_plans(manifest, countries=["us", "uk"], data_dir=tmp_path)
+    urls = {
+        bundle._download_url(plan.uri, repo_type=plan.repo_type): payloads[plan.country]
+        for plan in plans
+    }
+
+    class PerUrlSession:
+        def get(self, url, headers=None, **kwargs):
+            return RangeResponse(200, urls[url])
+
+    reports = []
+    installed = bundle.install_datasets(
+        manifest,
+        countries=["us", "uk"],
+        data_dir=tmp_path,
+        yes=True,
+        session=PerUrlSession(),
+        max_workers=2,
+        progress=reports.append,
+    )
+
+    assert [dataset["country"] for dataset in installed] == ["us", "uk"]
+    for plan in plans:
+        assert plan.destination.read_bytes() == payloads[plan.country]
+    assert {report.country for report in reports} == {"us", "uk"}
+
+
 def test_status_matches_receipt_and_packages(monkeypatch, tmp_path):
     manifest = _manifest_with_dataset_sha("uk", _sha256(b"data"))
     datasets = [
@@ -435,3 +525,30 @@ def test_bundle_verify_cli_handles_unknown_bundle(capsys):
 def test_unknown_bundle_version_is_named():
     with pytest.raises(bundle.BundleError, match="Bundle '0.0.0'"):
         bundle.load_bundle_manifest("0.0.0")
+
+
+def test_install_datasets_reuses_the_shared_artifact_store(tmp_path):
+    manifest = _manifest_with_dataset_sha("us", _sha256(b"new-data"))
+    first_dir = tmp_path / "first"
+    bundle.install_datasets(
+        manifest, countries=["us"], data_dir=first_dir, yes=True, session=FakeSession()
+    )
+
+    class NoDownloadSession:
+        def get(self, *args, **kwargs):
+            raise AssertionError("stored datasets must not be downloaded again")
+
+    second_dir = tmp_path / "second"
+    installed = bundle.install_datasets(
+        manifest,
+        countries=["us"],
+        data_dir=second_dir,
+        yes=True,
+        session=NoDownloadSession(),
+    )
+
+    first = first_dir / "populace_us_2024.h5"
+    second = second_dir / "populace_us_2024.h5"
+    assert installed[0]["installed_sha256"] == _sha256(b"new-data")
+    assert second.read_bytes() == b"new-data"
+    assert first.stat().st_ino == second.stat().st_ino
@@ -0,0 +1,89 @@
+"""Tests for the content-addressed GCS download cache."""
+
+import hashlib
+
+import pytest
+
+from policyengine.utils.artifact_store import ArtifactStore
+from policyengine.utils.data import caching_google_storage_client as module
+from policyengine.utils.data.caching_google_storage_client import (
+    CachingGoogleStorageClient,
+)
+
+
+class _FakeStorageClient:
+    """In-memory bucket that counts metadata and download requests."""
+
+    objects: dict = {}
+
+    def __init__(self):
+        self.crc_requests = 0
+        self.downloads = 0
+
+    def crc32c(self, bucket_name, key, version=None):
+        self.crc_requests += 1
+        content = self.objects.get((bucket_name, key, version))
+        return None if content is None else f"crc-{len(content)}"
+
+    def download_to_file(self, bucket_name, key, file_obj, version=None):
+        self.downloads += 1
+        content = self.objects[(bucket_name, key, version)]
+        for start in range(0, len(content), 4):
+            file_obj.write(content[start : start + 4])
+        return f"crc-{len(content)}"
+
+    def latest_metadata_version(self, bucket_name, key):
+        return "1"
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    _FakeStorageClient.objects = {
+        ("bucket", "weights.npy", "1"): b"w" * 100,
+        ("bucket", "weights.npy", "2"): b"v" * 100,
+        ("bucket", "other.npy", "1"): b"o" * 100,
+    }
+    monkeypatch.setattr(module, "VersionAwareStorageClient", _FakeStorageClient)
+
+
+def test_downloads_stream_once_and_targets_share_the_stored_object(tmp_path, storage):
+    store = ArtifactStore(tmp_path / "store")
+    client = CachingGoogleStorageClient(tmp_path / "cache", store=store)
+    first = tmp_path / "a" / "weights.npy"
+    second = tmp_path / "b" / "weights.npy"
+
+    assert client.download("bucket", "weights.npy", first, return_version=True) == "1"
+    client.download("bucket", "weights.npy", second, version="1")
+
+    assert first.read_bytes() == b"w" * 100
+    assert client.client.downloads == 1
+    # crc32c lookups are served from the TTL cache.
+    assert client.client.crc_requests == 1
+    stored = store.entry(hashlib.sha256(b"w" * 100).hexdigest()) / "weights.npy"
+    assert first.stat().st_ino == second.stat().st_ino == stored.stat().st_ino
+
+    with pytest.raises(FileNotFoundError):
+        client.download("bucket", "missing.npy", tmp_path / "missing", version="1")
+
+
+def test_evicted_objects_are_fetched_again(tmp_path, storage):
+    store = ArtifactStore(tmp_path / "store", max_bytes=150)
+    client = CachingGoogleStorageClient(tmp_path / "cache", store=store)
+    target = tmp_path / "weights.npy"
+    client.download("bucket", "weights.npy", target, version="1")
+    client.download("bucket", "weights.npy", tmp_path / "v2.npy", version="2")
+
+    # The store holds one 100-byte object; version 1 was least recently used.
+    assert store.get(hashlib.sha256(b"w" * 100).hexdigest()) is None
+    assert store.get(hashlib.sha256(b"v" * 100).hexdigest()) is not None
+    client.download("bucket", "weights.npy", target, version="1")
+    assert client.client.downloads == 3
+    assert target.read_bytes() == b"w" * 100
+
+    # Clearing forgets the index: the crc32c is looked up and the object
+    # streamed again.
+    crc_requests = client.client.crc_requests
+    client.clear()
+    client.download("bucket", "weights.npy", target, version="1")
+    assert client.client.crc_requests == crc_requests + 1
+    assert client.client.downloads == 4
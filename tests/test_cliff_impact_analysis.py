@@ -105,8 +105,8 @@ def _patch_analysis_dependencies(
         )
         monkeypatch.setattr(
             analysis_module,
-            "calculate_uk_inequality",
-            _empty_inequality,
+            "calculate_uk_inequality_batch",
+            lambda simulations: [_empty_inequality(s) for s in simulations],
         )
     else:
         monkeypatch.setattr(
@@ -116,8 +116,8 @@ def _patch_analysis_dependencies(
         )
         monkeypatch.setattr(
             analysis_module,
-            "calculate_us_inequality",
-            lambda simulation, preset: _empty_inequality(simulation),
+            "calculate_us_inequality_batch",
+            lambda simulations, preset: [_empty_inequality(s) for s in simulations],
         )
         monkeypatch.setattr(
             analysis_module,
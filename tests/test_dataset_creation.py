@@ -0,0 +1,140 @@
+"""Tests for incremental, parallel multi-year dataset creation."""
+
+import importlib
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from policyengine_uk.data import UKSingleYearDataset
+
+from policyengine.benchmarks import fixture_dataset
+from policyengine.tax_benefit_models.common.dataset_creation import (
+    entity_household_weights,
+    missing_years,
+    person_household_weights,
+    resolve_year_workers,
+    year_dataset_filepath,
+    year_worker_options,
+)
+
+
+def test_vectorised_weights_match_merge_propagation():
+    household = pd.DataFrame(
+        {"household_id": [30, 10, 20], "household_weight": [3.0, 1.0, 2.0]}
+    )
+    person = pd.DataFrame(
+        {
+            "person_household_id": [10, 10, 20, 30, 99],
+            "person_tax_unit_id": [1, 1, 2, 3, 4],
+        }
+    )
+    tax_unit = pd.DataFrame({"tax_unit_id": [3, 1, 2, 5]})
+
+    person_weights = person_household_weights(
+        person["person_household_id"],
+        household["household_id"],
+        household["household_weight"],
+    )
+    merged = person.merge(
+        household, left_on="person_household_id", right_on="household_id", how="left"
+    )
+    np.testing.assert_array_equal(person_weights, merged["household_weight"].values)
+
+    tax_unit_weights = entity_household_weights(
+        tax_unit["tax_unit_id"], person["person_tax_unit_id"], person_weights
+    )
+    np.testing.assert_array_equal(tax_unit_weights, [3.0, 1.0, 2.0, np.nan])
+
+
+def test_missing_years_and_worker_count(tmp_path):
+    (tmp_path / "populace_us_2024_year_2025.h5").touch()
+
+    assert missing_years(str(tmp_path), "populace_us_2024", [2024, 2025, 2026]) == [
+        2024,
+        2026,
+    ]
+    assert year_dataset_filepath("./data", "x", 2026) == "./data/x_year_2026.h5"
+    assert resolve_year_workers(None, 1) == 1
+    assert resolve_year_workers(8, 3) == 3
+    assert resolve_year_workers(1, 5) == 1
+    assert year_worker_options(1) == {}
+    assert year_worker_options(None) == {"max_workers": None}
+
+
+def test_ensure_datasets_only_creates_missing_years(tmp_path):
+    us_datasets = importlib.import_module("policyengine.tax_benefit_models.us.datasets")
+    (tmp_path / "populace_us_2024_year_2025.h5").touch()
+    loaded, created = object(), object()
+
+    with (
+        patch.object(
+            us_datasets,
+            "load_datasets",
+            return_value={"populace_us_2024_2025": loaded},
+        ) as load_datasets,
+        patch.object(
+            us_datasets,
+            "create_datasets",
+            return_value={
+                "populace_us_2024_2024": created,
+                "populace_us_2024_2026": created,
+            },
+        ) as create_datasets,
+    ):
+        result = us_datasets.ensure_datasets(
+            datasets=["populace_us_2024"],
+            years=[2024, 2025, 2026],
+            data_folder=str(tmp_path),
+            max_workers=2,
+        )
+
+    assert list(result) == [
+        "populace_us_2024_2024",
+        "populace_us_2024_2025",
+        "populace_us_2024_2026",
+    ]
+    assert result["populace_us_2024_2025"] is loaded
+    load_datasets.assert_called_once_with(
+        datasets=["populace_us_2024"], years=[2025], data_folder=str(tmp_path)
+    )
+    create_datasets.assert_called_once_with(
+        datasets=["populace_us_2024"],
+        years=[2024, 2026],
+        data_folder=str(tmp_path),
+        max_workers=2,
+    )
+
+
+def test_uk_create_datasets_builds_years_in_worker_processes(tmp_path):
+    uk_datasets = importlib.import_module("policyengine.tax_benefit_models.uk.datasets")
+    fixture = fixture_dataset("uk", 20).data
+    source = tmp_path / "fixture_uk.h5"
+    UKSingleYearDataset(
+        person=pd.DataFrame(fixture.person),
+        benunit=pd.DataFrame(fixture.benunit),
+        household=pd.DataFrame(fixture.household),
+        fiscal_year=2026,
+    ).save(str(source))
+
+    kwargs = {
+        "datasets": [str(source)],
+        "years": [2026, 2027],
+        "data_folder": str(tmp_path),
+    }
+    source_bytes = source.read_bytes()
+    pooled = uk_datasets.create_datasets(**kwargs, max_workers=2)
+    # Workers open their own copies; the shared source is never written.
+    assert source.read_bytes() == source_bytes
+    for year in (2026, 2027):
+        assert (tmp_path / f"fixture_uk_year_{year}.h5").exists()
+    in_process = uk_datasets.create_datasets(
+        **{**kwargs, "data_folder": str(tmp_path / "in_process")}
+    )
+
+    assert list(pooled) == ["fixture_uk_2026", "fixture_uk_2027"]
+    for key, dataset in pooled.items():
+        assert dataset.year == int(key[-4:])
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(dataset.data.person),
+            pd.DataFrame(in_process[key].data.person),
+        )
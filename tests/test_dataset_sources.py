@@ -1,5 +1,8 @@
+import hashlib
 import importlib.util
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import Mock
@@ -12,6 +15,7 @@ from policyengine.provenance.dataset_sources import (
     parse_gs_uri,
     parse_hf_uri,
 )
+from policyengine.utils.artifact_store import ArtifactStore
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
@@ -85,6 +89,57 @@ def test_materialize_dataset_source_preserves_local_path():
     )
 
 
+def test_materialize_dataset_source_downloads_pinned_artifact_once(
+    monkeypatch, tmp_path
+):
+    payload = b"certified dataset"
+    sha256 = hashlib.sha256(payload).hexdigest()
+    downloads = []
+
+    def download(bucket, key, version=None):
+        downloads.append(key)
+        time.sleep(0.05)
+        path = tmp_path / f"download-{len(downloads)}" / "enhanced_cps_2024.h5"
+        path.parent.mkdir()
+        path.write_bytes(payload)
+        return str(path), version
+
+    monkeypatch.setattr(dataset_sources, "download_file_from_gcs", download)
+    uri = "gs://policyengine-us-data/enhanced_cps_2024.h5@1.77.0"
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        paths = list(
+            executor.map(
+                lambda _: materialize_dataset_source(uri, sha256=sha256), range(4)
+            )
+        )
+
+    assert downloads == ["enhanced_cps_2024.h5"]
+    assert len(set(paths)) == 1
+    assert Path(paths[0]).name == "enhanced_cps_2024.h5"
+    assert Path(paths[0]).read_bytes() == payload
+
+    with pytest.raises(ValueError, match="expected"):
+        materialize_dataset_source(uri, sha256="0" * 64)
+
+
+def test_artifact_store_evicts_least_recently_used(tmp_path):
+    store = ArtifactStore(tmp_path / "store", max_bytes=650)
+    digests = []
+    for name in ("a.h5", "b.h5", "c.h5"):
+        source = tmp_path / name
+        source.write_bytes(name.encode() * 50)
+        digests.append(store.add(source).parent.name)
+        time.sleep(0.01)
+    # Touch the oldest, so the second is evicted when a fourth arrives.
+    assert store.get(digests[0], "renamed.h5").name == "renamed.h5"
+    (tmp_path / "d.h5").write_bytes(b"d.h5" * 50)
+    store.add(tmp_path / "d.h5")
+
+    assert store.get(digests[1]) is None
+    assert store.get(digests[0]) is not None
+    assert store.get(digests[2]) is not None
+
+
 def test_materialize_dataset_source_rejects_conflicting_versions():
     with pytest.raises(ValueError, match="Conflicting dataset versions"):
         materialize_dataset_source(
@@ -116,7 +171,8 @@ def test_us_create_datasets_passes_materialized_source_to_country_package(
     )
 
     materialize.assert_called_once_with(
-        "gs://policyengine-us-data/enhanced_cps_2024.h5@1.77.0"
+        "gs://policyengine-us-data/enhanced_cps_2024.h5@1.77.0",
+        sha256=None,
     )
     microsimulation.assert_called_once_with(dataset="/tmp/enhanced_cps_2024.h5")
 
@@ -144,6 +200,7 @@ def test_uk_create_datasets_passes_materialized_source_to_country_package(
     )
 
     materialize.assert_called_once_with(
-        "gs://policyengine-uk-data-private/enhanced_frs_2023_24.h5@1.40.3"
+        "gs://policyengine-uk-data-private/enhanced_frs_2023_24.h5@1.40.3",
+        sha256=None,
     )
     microsimulation.assert_called_once_with(dataset="/tmp/enhanced_frs_2023_24.h5")
@@ -5,7 +5,12 @@ import pandas as pd
 import pytest
 from microdf import MicroDataFrame
 
-from policyengine.outputs.decile_grouping import calculate_decile_groups
+from policyengine.core import Dataset
+from policyengine.outputs import decile_grouping
+from policyengine.outputs.decile_grouping import (
+    cached_decile_groups,
+    calculate_decile_groups,
+)
 
 
 def _household_frame(
@@ -322,3 +327,55 @@ def test_computed_groups_require_at_least_one_group(quantiles):
             entity="household",
             quantiles=quantiles,
         )
+
+
+def _cached_groups(dataset, household, weights):
+    return cached_decile_groups(
+        dataset,
+        household,
+        household["household_net_income"],
+        income_variable="household_net_income",
+        decile_variable=None,
+        entity="household",
+        quantiles=10,
+        weighting="people",
+        validated_effective_weight=weights,
+    )
+
+
+def test_cached_groups_rank_once_per_unchanged_dataset(monkeypatch):
+    dataset = Dataset(name="output", description="output", year=2026)
+    household = _household_frame(
+        [10, 20, 30, 40],
+        [2, 1, 1, 1],
+        [2, 1, 1, 1],
+        index=[100, 200, 300, 400],
+    )
+    weights = np.array([4.0, 1.0, 1.0, 1.0])
+    calls = []
+    original = decile_grouping.calculate_decile_groups
+
+    def counting_calculate(*args, **kwargs):
+        calls.append(kwargs["entity"])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(decile_grouping, "calculate_decile_groups", counting_calculate)
+
+    first = _cached_groups(dataset, household, weights)
+    second = _cached_groups(dataset, household, weights)
+
+    assert len(calls) == 1
+    assert first.tolist() == second.tolist() == [6, 8, 9, 10]
+    assert second.index.tolist() == [100, 200, 300, 400]
+
+
+def test_cached_groups_recompute_when_dataset_content_changes():
+    dataset = Dataset(name="output", description="output", year=2026)
+    household = _household_frame([10, 20, 30, 40], [1] * 4, [1] * 4)
+    weights = np.ones(4)
+
+    assert _cached_groups(dataset, household, weights).tolist() == [3, 5, 8, 10]
+
+    household["household_net_income"] = [40, 30, 20, 10]
+
+    assert _cached_groups(dataset, household, weights).tolist() == [10, 8, 5, 3]
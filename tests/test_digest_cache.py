@@ -0,0 +1,125 @@
+"""Tests for the shared digest cache for large local artifacts."""
+
+import hashlib
+import os
+
+import pytest
+
+from policyengine.utils import digest_cache
+from policyengine.utils.digest_cache import (
+    directory_sha256,
+    file_sha256,
+    record_file_sha256,
+)
+
+
+@pytest.fixture
+def hashed_files(monkeypatch):
+    """Record every file the cache actually reads to hash."""
+    reads = []
+    hash_file = digest_cache._hash_file
+
+    def counting_hash_file(path):
+        reads.append(path.name)
+        return hash_file(path)
+
+    monkeypatch.setattr(digest_cache, "_hash_file", counting_hash_file)
+    return reads
+
+
+def test_file_digest_is_reused_until_the_file_changes(tmp_path, hashed_files):
+    path = tmp_path / "dataset.h5"
+    path.write_bytes(b"a" * 1000)
+    expected = hashlib.sha256(b"a" * 1000).hexdigest()
+
+    assert file_sha256(path) == expected
+    assert file_sha256(str(path)) == expected
+    assert hashed_files == ["dataset.h5"]
+
+    # Same size, new contents and mtime.
+    path.write_bytes(b"b" * 1000)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert file_sha256(path) == hashlib.sha256(b"b" * 1000).hexdigest()
+    assert hashed_files == ["dataset.h5"] * 2
+
+
+def test_strict_mode_rehashes_and_replaces_cached_digest(
+    tmp_path, hashed_files, monkeypatch
+):
+    path = tmp_path / "dataset.h5"
+    path.write_bytes(b"payload")
+    record_file_sha256(path, "0" * 64)
+    assert file_sha256(path) == "0" * 64
+    assert hashed_files == []
+
+    expected = hashlib.sha256(b"payload").hexdigest()
+    assert file_sha256(path, strict=True) == expected
+    assert file_sha256(path) == expected
+
+    monkeypatch.setenv("POLICYENGINE_STRICT_HASHING", "1")
+    file_sha256(path)
+    assert hashed_files == ["dataset.h5"] * 2
+
+
+def test_directory_digest_ignores_bytecode_and_tracks_changes(tmp_path):
+    package = tmp_path / "policyengine_us"
+    (package / "variables").mkdir(parents=True)
+    (package / "__init__.py").write_text("VERSION = 1\n")
+    (package / "variables" / "tax.py").write_text("rate = 0.2\n")
+
+    expected = hashlib.sha256()
+    for relative_path in ("__init__.py", "variables/tax.py"):
+        contents = (package / relative_path).read_bytes()
+        expected.update(f"{relative_path}\0{len(contents)}\0".encode())
+        expected.update(contents + b"\0")
+    digest = directory_sha256(package)
+    assert digest == expected.hexdigest()
+
+    (package / "__pycache__").mkdir()
+    (package / "__pycache__" / "x.cpython-313.pyc").write_bytes(b"\0")
+    assert directory_sha256(package) == digest
+
+    (package / "variables" / "benefit.py").write_text("amount = 100\n")
+    changed = directory_sha256(package)
+    assert changed != digest
+    assert directory_sha256(package, strict=True) == changed
+
+
+def test_unusable_cache_directory_falls_back_to_hashing(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setenv("POLICYENGINE_DIGEST_CACHE_DIR", str(blocker))
+    path = tmp_path / "dataset.h5"
+    path.write_bytes(b"payload")
+
+    assert file_sha256(path) == hashlib.sha256(b"payload").hexdigest()
+
+
+def test_manifest_keyed_tree_digest_skips_the_walk_until_the_manifest_changes(
+    tmp_path, monkeypatch
+):
+    package = tmp_path / "package"
+    package.mkdir()
+    (package / "module.py").write_text("x = 1\n")
+    expected = directory_sha256(package)
+    walks = []
+    tree_files = digest_cache._tree_files
+
+    def counting_tree_files(path):
+        walks.append(path)
+        return tree_files(path)
+
+    monkeypatch.setattr(digest_cache, "_tree_files", counting_tree_files)
+    assert directory_sha256(package, manifest="RECORD v1") == expected
+    assert directory_sha256(package, manifest="RECORD v1") == expected
+    assert len(walks) == 1
+
+    # Persisted: a fresh process (empty memo) still skips the walk.
+    monkeypatch.setattr(digest_cache, "_manifest_digests", {})
+    assert directory_sha256(package, manifest="RECORD v1") == expected
+    assert len(walks) == 1
+
+    (package / "module.py").write_text("x = 2\n")
+    assert directory_sha256(package, manifest="RECORD v2") != expected
+    assert len(walks) == 2
@@ -0,0 +1,142 @@
+"""Tests for the compact dtype policy."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+
+from policyengine.core import DtypePolicy, Simulation
+from policyengine.outputs.inequality import Inequality
+from policyengine.tax_benefit_models.us import PolicyEngineUSDataset, USYearData
+
+
+def _household(n: int = 100) -> MicroDataFrame:
+    return MicroDataFrame(
+        pd.DataFrame(
+            {
+                "household_id": np.arange(n),
+                "household_weight": np.full(n, 1.5),
+                "household_net_income": np.linspace(0, 250_000, n),
+                "total_wealth": np.full(n, 5e9),
+                "age": (np.arange(n) % 90).astype(float),
+                "tenure_type": np.where(np.arange(n) % 2, "RENTED", "OWNED").astype(
+                    object
+                ),
+                "household_size": np.arange(n) % 6,
+                "is_married": np.arange(n) % 2 == 0,
+            }
+        ),
+        weights="household_weight",
+    )
+
+
+def _household_simulation(household: pd.DataFrame) -> Simulation:
+    variables = SimpleNamespace(
+        get_variable=lambda name: SimpleNamespace(entity="household", name=name)
+    )
+    return Simulation.model_construct(
+        output_dataset=SimpleNamespace(data=SimpleNamespace(household=household)),
+        tax_benefit_model_version=variables,
+    )
+
+
+def test_policy_narrows_exact_floats_enums_and_counts_but_not_keys():
+    household = _household()
+
+    DtypePolicy().compact_frame(household)
+
+    dtypes = pd.DataFrame(household).dtypes
+    assert dtypes["age"] == np.float32
+    assert isinstance(dtypes["tenure_type"], pd.CategoricalDtype)
+    assert dtypes["household_size"] == np.int8
+    assert dtypes["is_married"] == np.bool_
+    # Fractional money would be rounded, so it is only narrowed on request.
+    assert dtypes["household_net_income"] == np.float64
+    # Out-of-range values, weights and IDs keep their dtypes.
+    assert dtypes["total_wealth"] == np.float64
+    assert dtypes["household_weight"] == np.float64
+    assert dtypes["household_id"] == np.int64
+    assert (household["tenure_type"] == "RENTED").sum() == 50 * 1.5
+
+
+def test_fractional_floats_are_narrowed_only_when_requested():
+    household = _household()
+    before = household["household_net_income"].sum()
+
+    DtypePolicy(float32_fractional=True).compact_frame(household)
+
+    assert pd.DataFrame(household).dtypes["household_net_income"] == np.float32
+    assert abs(household["household_net_income"].sum() - before) < 1e-6 * before
+
+
+def test_range_filters_work_on_compacted_columns():
+    household = pd.DataFrame(_household())
+    expected = Inequality(
+        simulation=_household_simulation(household.copy()),
+        income_variable="household_net_income",
+        filter_variable="tenure_type",
+        filter_variable_leq="OWNED",
+        filter_variable_geq="OWNED",
+    )
+    expected.run()
+    DtypePolicy().compact_frame(household)
+
+    compacted = Inequality(
+        simulation=_household_simulation(household),
+        income_variable="household_net_income",
+        filter_variable="tenure_type",
+        filter_variable_leq="OWNED",
+        filter_variable_geq="OWNED",
+    )
+    compacted.run()
+    by_age = Inequality(
+        simulation=_household_simulation(household),
+        income_variable="household_net_income",
+        filter_variable="age",
+        filter_variable_leq=40,
+    )
+    by_age.run()
+
+    assert compacted.gini == pytest.approx(expected.gini)
+    assert by_age.gini is not None
+
+
+def test_disabled_rules_leave_columns_alone():
+    household = _household()
+
+    DtypePolicy(float32=False, categorical_strings=False).compact_frame(household)
+
+    dtypes = pd.DataFrame(household).dtypes
+    assert dtypes["household_net_income"] == np.float64
+    assert not isinstance(dtypes["tenure_type"], pd.CategoricalDtype)
+
+
+def test_compacted_us_dataset_round_trips_through_save(us_test_dataset, tmp_path):
+    data = us_test_dataset.data
+    data.household["tenure_type"] = [
+        "OWNED" if i % 2 else "RENTED" for i in range(len(data.household))
+    ]
+    DtypePolicy().compact_year_data(data)
+    dataset = PolicyEngineUSDataset(
+        name="compact",
+        description="compact",
+        year=2024,
+        filepath=str(tmp_path / "compact.h5"),
+        data=USYearData(**data.entity_data),
+    )
+    dataset.save()
+
+    reloaded = PolicyEngineUSDataset(
+        name="compact",
+        description="compact",
+        year=2024,
+        filepath=str(tmp_path / "compact.h5"),
+    )
+
+    for entity, frame in data.entity_data.items():
+        pd.testing.assert_series_equal(
+            pd.DataFrame(reloaded.data.entity_data[entity]).dtypes,
+            pd.DataFrame(frame).dtypes,
+        )
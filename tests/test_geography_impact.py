@@ -0,0 +1,103 @@
+"""Tests for the grouped geography impact engine."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+
+from policyengine.outputs.geography_impact import (
+    compute_geography_impacts,
+    compute_grouped_income_impacts,
+    compute_us_state_impacts,
+)
+
+
+def _make_sim(household_data: dict) -> MagicMock:
+    sim = MagicMock()
+    sim.output_dataset.data.household = MicroDataFrame(
+        pd.DataFrame(household_data),
+        weights="household_weight",
+    )
+    return sim
+
+
+def test_grouped_impacts_match_per_region_masks():
+    rng = np.random.default_rng(0)
+    keys = rng.integers(1, 40, size=2_000)
+    baseline = rng.uniform(-1_000, 100_000, size=2_000)
+    reform = baseline + rng.normal(0, 500, size=2_000)
+    weights = rng.uniform(0, 5, size=2_000)
+    people = rng.integers(1, 6, size=2_000).astype(float)
+
+    impacts = compute_grouped_income_impacts(
+        keys, baseline, reform, weights, household_count_people=people
+    )
+
+    assert impacts.keys.tolist() == sorted(np.unique(keys).tolist())
+    for i, key in enumerate(impacts.keys):
+        mask = keys == key
+        w = weights[mask]
+        b_total = (baseline[mask] * w).sum()
+        r_total = (reform[mask] * w).sum()
+        change = (reform[mask] - baseline[mask]) / np.maximum(baseline[mask], 1.0)
+        people_weights = people[mask] * w
+        assert impacts.population[i] == pytest.approx(w.sum())
+        assert impacts.average_household_income_change[i] == pytest.approx(
+            (r_total - b_total) / w.sum()
+        )
+        assert impacts.relative_household_income_change[i] == pytest.approx(
+            r_total / b_total - 1
+        )
+        assert impacts.winner_percentage[i] == pytest.approx(
+            people_weights[change > 1e-3].sum() / people_weights.sum()
+        )
+        assert impacts.loser_percentage[i] == pytest.approx(
+            people_weights[change <= -1e-3].sum() / people_weights.sum()
+        )
+
+
+def test_grouped_impacts_drop_missing_keys_and_zero_weight_groups():
+    impacts = compute_grouped_income_impacts(
+        np.array(["A", None, "B", "C"], dtype=object),
+        [10.0, 10.0, 10.0, 0.0],
+        [20.0, 20.0, 10.0, 0.0],
+        [1.0, 1.0, 1.0, 0.0],
+    )
+
+    assert impacts.keys.tolist() == ["A", "B"]
+    assert impacts.no_change_percentage.tolist() == [0.0, 1.0]
+    assert impacts.relative_household_income_change.tolist() == [1.0, 0.0]
+
+
+def test_us_state_impacts_derive_state_from_district_geoid():
+    baseline = _make_sim(
+        {
+            "congressional_district_geoid": [601, 602, 3401, 0],
+            "household_net_income": [100.0, 300.0, 200.0, 50.0],
+            "household_weight": [1.0, 1.0, 2.0, 1.0],
+        }
+    )
+    reform = _make_sim(
+        {
+            "congressional_district_geoid": [601, 602, 3401, 0],
+            "household_net_income": [110.0, 310.0, 200.0, 50.0],
+            "household_weight": [1.0, 1.0, 2.0, 1.0],
+        }
+    )
+
+    impact = compute_us_state_impacts(baseline, reform)
+
+    by_state = {row["state_fips"]: row for row in impact.geography_results}
+    assert sorted(by_state) == [6, 34]
+    assert by_state[6]["average_household_income_change"] == pytest.approx(10.0)
+    assert by_state[6]["population"] == 2.0
+    assert by_state[34]["no_change_percentage"] == 1.0
+
+
+def test_geography_impacts_require_the_key_column():
+    baseline = _make_sim({"household_net_income": [1.0], "household_weight": [1.0]})
+
+    with pytest.raises(ValueError, match="place_fips"):
+        compute_geography_impacts(baseline, baseline, geography_column="place_fips")
@@ -123,6 +123,25 @@ def test_us_household_snapshot(case_name: str) -> None:
     _check_snapshot(case_name, out)
 
 
+def test_us_household_batch_matches_snapshots() -> None:
+    pytest.importorskip("policyengine_us")
+    import policyengine as pe
+
+    names = sorted(US_CASES)
+    results = pe.us.calculate_households(
+        [
+            {key: value for key, value in US_CASES[name].items() if key != "year"}
+            for name in names
+        ],
+        year=2026,
+    )
+    assert len(results) == len(names)
+    for name, result in zip(names, results):
+        out: dict[str, float] = {}
+        _flatten("", result.to_dict(), out)
+        _check_snapshot(name, out)
+
+
 # UK cases -------------------------------------------------------------------
 
 
@@ -166,6 +185,25 @@ def test_uk_household_snapshot(case_name: str) -> None:
     _check_snapshot(case_name, out)
 
 
+def test_uk_household_batch_matches_snapshots() -> None:
+    pytest.importorskip("policyengine_uk")
+    import policyengine as pe
+
+    names = sorted(UK_CASES)
+    results = pe.uk.calculate_households(
+        [
+            {key: value for key, value in UK_CASES[name].items() if key != "year"}
+            for name in names
+        ],
+        year=2026,
+    )
+    assert len(results) == len(names)
+    for name, result in zip(names, results):
+        out: dict[str, float] = {}
+        _flatten("", result.to_dict(), out)
+        _check_snapshot(name, out)
+
+
 # Model-version metadata snapshots -------------------------------------------
 
 
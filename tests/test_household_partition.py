@@ -0,0 +1,139 @@
+"""Tests for the precomputed household partition index."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+
+from policyengine.utils.entity_utils import (
+    filter_dataset_by_household_filters,
+    filter_dataset_by_household_variable,
+)
+from policyengine.utils.household_partition import (
+    clear_household_partition_cache,
+    household_partition_index,
+)
+
+GROUP_ENTITIES = ["household", "tax_unit"]
+
+
+def _random_entity_data(seed: int = 0) -> dict[str, MicroDataFrame]:
+    rng = np.random.default_rng(seed)
+    n_households = 200
+    household_ids = rng.permutation(n_households) + 1000
+    people_per_household = rng.integers(1, 5, size=n_households)
+    person_households = np.repeat(household_ids, people_per_household)
+    # Two tax units per household, shuffled relative to the person table.
+    tax_unit_ids = person_households * 10 + rng.integers(0, 2, len(person_households))
+    tax_units = rng.permutation(np.unique(tax_unit_ids))
+
+    person = pd.DataFrame(
+        {
+            "person_id": np.arange(len(person_households)),
+            "person_household_id": person_households,
+            "person_tax_unit_id": tax_unit_ids,
+            "person_weight": rng.uniform(1, 2, len(person_households)),
+        }
+    )
+    tax_unit = pd.DataFrame(
+        {"tax_unit_id": tax_units, "tax_unit_weight": np.ones(len(tax_units))}
+    )
+    household = pd.DataFrame(
+        {
+            "household_id": household_ids,
+            "household_weight": rng.uniform(1, 2, n_households),
+            "state_fips": rng.integers(1, 8, n_households),
+            "region": rng.choice(np.array([b"NORTH", b"SOUTH"]), n_households),
+        }
+    )
+    return {
+        "person": MicroDataFrame(person, weights="person_weight"),
+        "tax_unit": MicroDataFrame(tax_unit, weights="tax_unit_weight"),
+        "household": MicroDataFrame(household, weights="household_weight"),
+    }
+
+
+def _set_based_filter(entity_data, keep_household_ids):
+    """Reference cascade: persons by household, groups by kept persons."""
+    person = pd.DataFrame(entity_data["person"])
+    kept_persons = person[person["person_household_id"].isin(keep_household_ids)]
+    kept_tax_units = set(kept_persons["person_tax_unit_id"])
+    household = pd.DataFrame(entity_data["household"])
+    tax_unit = pd.DataFrame(entity_data["tax_unit"])
+    return {
+        "person": kept_persons.reset_index(drop=True),
+        "tax_unit": tax_unit[tax_unit["tax_unit_id"].isin(kept_tax_units)].reset_index(
+            drop=True
+        ),
+        "household": household[
+            household["household_id"].isin(keep_household_ids)
+        ].reset_index(drop=True),
+    }
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_household_partition_cache()
+    yield
+    clear_household_partition_cache()
+
+
+def test_partition_scopes_match_set_based_cascade():
+    entity_data = _random_entity_data()
+    household = pd.DataFrame(entity_data["household"])
+
+    for state in range(1, 8):
+        result = filter_dataset_by_household_variable(
+            entity_data, GROUP_ENTITIES, "state_fips", state
+        )
+        keep = set(household.loc[household["state_fips"] == state, "household_id"])
+        expected = _set_based_filter(entity_data, keep)
+        for entity, expected_df in expected.items():
+            pd.testing.assert_frame_equal(
+                pd.DataFrame(result[entity]), expected_df, check_dtype=False
+            )
+
+
+def test_index_is_built_once_per_dataset_and_scopes_are_cached():
+    entity_data = _random_entity_data()
+    index = household_partition_index(entity_data, GROUP_ENTITIES)
+    household = pd.DataFrame(entity_data["household"])
+
+    first = index.scope_rows(household, {"state_fips": 3})
+    assert household_partition_index(entity_data, GROUP_ENTITIES) is index
+    assert index.scope_rows(household, {"state_fips": 3}) is first
+
+    # Replacing a table builds a new index.
+    replaced = dict(entity_data)
+    replaced["household"] = MicroDataFrame(household.copy(), weights="household_weight")
+    assert household_partition_index(replaced, GROUP_ENTITIES) is not index
+
+
+def test_in_place_key_edits_invalidate_cached_scopes():
+    entity_data = _random_entity_data()
+    filter_dataset_by_household_variable(entity_data, GROUP_ENTITIES, "state_fips", 1)
+
+    entity_data["household"]["state_fips"] = 1
+    result = filter_dataset_by_household_variable(
+        entity_data, GROUP_ENTITIES, "state_fips", 1
+    )
+
+    assert len(result["household"]) == len(entity_data["household"])
+
+
+def test_string_filters_match_bytes_keys_and_unions_do_not_double_count():
+    entity_data = _random_entity_data()
+    household = pd.DataFrame(entity_data["household"])
+
+    north = filter_dataset_by_household_variable(
+        entity_data, GROUP_ENTITIES, "region", "NORTH"
+    )
+    assert len(north["household"]) == (household["region"] == b"NORTH").sum()
+
+    union = filter_dataset_by_household_filters(
+        entity_data,
+        GROUP_ENTITIES,
+        [{"region": "NORTH"}, {"region": "NORTH", "state_fips": 2}],
+    )
+    assert len(union["household"]) == len(north["household"])
+    assert len(union["person"]) == len(north["person"])
@@ -17,6 +17,7 @@ from policyengine.outputs.inequality import (
     USInequalityPreset,
     _gini,
     calculate_us_inequality,
+    run_inequality_batch,
 )
 from policyengine.tax_benefit_models.uk import (
     PolicyEngineUKDataset,
@@ -381,3 +382,116 @@ def test_inequality_weighted():
         # 90% of weight (9 hh) has 270k = 73% of income
         # So top 10% (1 hh with weight 1) has 100k/370k = 27%
         assert abs(inequality.top_10_share - 100000 / 370000) < 0.02
+
+
+def test_inequality_reports_extended_metrics_from_one_sort():
+    """Test Palma, Theil, Atkinson, arbitrary shares and Lorenz points."""
+    incomes = [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0]
+    simulation = _make_household_simulation(
+        pd.DataFrame(
+            {
+                "household_weight": [1.0] * 10,
+                "household_net_income": incomes,
+            }
+        )
+    )
+
+    inequality = Inequality(
+        simulation=simulation,
+        income_variable="household_net_income",
+        top_share_fractions=[0.2],
+        bottom_share_fractions=[0.3],
+        atkinson_epsilons=[1.0, 2.0],
+        lorenz_points=2,
+    )
+    inequality.run()
+
+    values = np.array(incomes)
+    mean = values.mean()
+    assert inequality.top_shares == {0.2: pytest.approx(190 / 550)}
+    assert inequality.bottom_shares == {0.3: pytest.approx(60 / 550)}
+    assert inequality.palma_ratio == pytest.approx((100 / 550) / (100 / 550))
+    assert inequality.theil == pytest.approx(
+        np.mean(values / mean * np.log(values / mean))
+    )
+    assert inequality.atkinson[1.0] == pytest.approx(
+        1 - np.exp(np.mean(np.log(values))) / mean
+    )
+    assert inequality.atkinson[2.0] == pytest.approx(
+        1 - (1 / np.mean(1 / values)) / mean
+    )
+    assert inequality.lorenz_curve == pytest.approx([0.0, 150 / 550, 1.0])
+
+
+def _reference_gini(values, weights):
+    """The per-distribution Lorenz-area Gini, sorted on its own."""
+    order = np.argsort(values)
+    values, weights = values[order], weights[order]
+    lorenz_curve = np.cumsum(values * weights) / np.sum(values * weights)
+    weight_fractions = weights / weights.sum()
+    return 1 - 2 * np.sum(weight_fractions * (lorenz_curve - weight_fractions / 2))
+
+
+def _direct_theil(values, weights):
+    positive = values > 0
+    values, weights = values[positive], weights[positive]
+    ratio = values / np.average(values, weights=weights)
+    return np.sum(weights * ratio * np.log(ratio)) / weights.sum()
+
+
+def test_inequality_batch_matches_per_distribution_formulas():
+    """Test that each row of a stacked baseline/reform batch is its own."""
+    baseline = _make_household_simulation(
+        pd.DataFrame(
+            {
+                "household_weight": [2.0, 1.0, 3.0],
+                "household_net_income": [10_000.0, 50_000.0, 20_000.0],
+            }
+        )
+    )
+    reform = _make_household_simulation(
+        pd.DataFrame(
+            {
+                "household_weight": [2.0, 1.0, 3.0, 1.0],
+                "household_net_income": [12_000.0, 45_000.0, np.nan, 0.0],
+            }
+        )
+    )
+
+    batched = run_inequality_batch(
+        [
+            Inequality(simulation=baseline, income_variable="household_net_income"),
+            Inequality(
+                simulation=reform,
+                income_variable="household_net_income",
+                bottom_share_fractions=[0.25],
+                lorenz_points=4,
+            ),
+        ]
+    )
+
+    expected = [
+        # (values, weights, top 10% share, bottom shares, Lorenz curve)
+        (
+            np.array([10_000.0, 20_000.0, 50_000.0]),
+            np.array([2.0, 3.0, 1.0]),
+            50_000 / 130_000,
+            {0.5: 20_000 / 130_000, 0.4: 20_000 / 130_000},
+            None,
+        ),
+        (
+            np.array([0.0, 12_000.0, 45_000.0]),
+            np.array([1.0, 2.0, 1.0]),
+            45_000 / 69_000,
+            {0.25: 0.0},
+            [0.0, 0.0, 12_000 / 69_000, 24_000 / 69_000, 1.0],
+        ),
+    ]
+    for result, (values, weights, top_10, bottom, lorenz) in zip(batched, expected):
+        assert result.gini == pytest.approx(_reference_gini(values, weights))
+        assert result.theil == pytest.approx(_direct_theil(values, weights))
+        assert result.top_10_share == pytest.approx(top_10)
+        assert result.bottom_shares == pytest.approx(bottom)
+        if lorenz is not None:
+            assert result.lorenz_curve == pytest.approx(lorenz)
+    assert len(batched[0].lorenz_curve) == 11
@@ -0,0 +1,180 @@
+"""Tests for cross-year deduplicated dataset storage."""
+
+import importlib
+from unittest.mock import patch
+
+import h5py
+import numpy as np
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+
+from policyengine.tax_benefit_models.common.multi_year_storage import (
+    append_multi_year_dataset_year,
+    is_multi_year_dataset_file,
+    multi_year_dataset_years,
+    read_multi_year_dataset_year,
+)
+from policyengine.tax_benefit_models.uk import PolicyEngineUKDataset, UKYearData
+
+
+def _uk_frames(year: int, n: int = 100) -> dict[str, pd.DataFrame]:
+    ids = np.arange(n)
+    age = ids % 80 + (year - 2026)
+    income = np.where(ids % 3 == 0, np.nan, 1_000.0 * ids) * 1.02 ** (year - 2026)
+    region = np.where(ids % 2 == 0, "LONDON", "WALES").astype(object)
+    if year == 2028:
+        region[:5] = "SCOTLAND"
+    person = pd.DataFrame(
+        {
+            "person_id": ids,
+            "person_benunit_id": ids,
+            "person_household_id": ids,
+            "age": age,
+            "employment_income": income,
+            "person_weight": np.ones(n),
+        }
+    )
+    household = pd.DataFrame(
+        {"household_id": ids, "household_weight": np.ones(n), "region": region}
+    )
+    benunit = pd.DataFrame({"benunit_id": ids, "benunit_weight": np.ones(n)})
+    if year == 2027:
+        benunit["is_new"] = True
+    return {"person": person, "benunit": benunit, "household": household}
+
+
+def test_years_round_trip_and_only_differences_are_stored(tmp_path):
+    path = tmp_path / "panel_years.h5"
+    years = [2026, 2027, 2028]
+    for year in years:
+        append_multi_year_dataset_year(path, year, _uk_frames(year))
+
+    assert is_multi_year_dataset_file(path)
+    assert multi_year_dataset_years(path) == years
+    for year in years:
+        frames = read_multi_year_dataset_year(path, year)
+        for entity, expected in _uk_frames(year).items():
+            pd.testing.assert_frame_equal(frames[entity], expected, check_dtype=False)
+
+    with h5py.File(path, "r") as h5_file:
+        later = h5_file["years/2028"]
+        # Shared IDs and weights are not repeated; uprated incomes are.
+        assert "full" not in later["benunit"]
+        assert set(later["person/full"]) == {"age", "employment_income"}
+        # Five changed regions are stored as a sparse delta.
+        assert list(later["household/delta/region/index"][()]) == [0, 1, 2, 3, 4]
+
+
+def test_partial_reads_and_existing_years_are_rejected(tmp_path):
+    path = tmp_path / "panel_years.h5"
+    append_multi_year_dataset_year(path, 2026, _uk_frames(2026))
+    append_multi_year_dataset_year(path, 2027, _uk_frames(2027))
+
+    frames = read_multi_year_dataset_year(path, 2027, columns=["age", "person_id"])
+    assert list(frames["person"].columns) == ["person_id", "age"]
+    assert frames["household"].empty
+
+    with pytest.raises(ValueError, match="already stored"):
+        append_multi_year_dataset_year(path, 2027, _uk_frames(2027))
+    with pytest.raises(ValueError, match="Stored years: \\[2026, 2027\\]"):
+        read_multi_year_dataset_year(path, 2030)
+
+
+def _typed_frames(year: int) -> dict[str, pd.DataFrame]:
+    tenure = pd.Categorical(
+        ["RENT", "OWNED", None, "RENT"], categories=["OWNED", "RENT"]
+    )
+    if year == 2027:
+        tenure[0] = "OWNED"
+    household = pd.DataFrame(
+        {
+            "household_id": np.arange(4),
+            "name": pd.Series(["a", None, "c", "d"], dtype=object),
+            "children": pd.array([1, None, 3, 2 + (year - 2026)], dtype="Int64"),
+            "is_renting": pd.array([True, None, False, True], dtype="boolean"),
+            "tenure": tenure,
+            "band": pd.Categorical([1, 2, 2, 1], categories=[1, 2], ordered=True),
+            "weight": np.array([1.0, 2.0, 3.0, 4.0], dtype=np.float32),
+        }
+    )
+    return {"household": household}
+
+
+def test_dtypes_and_missing_values_round_trip(tmp_path):
+    path = tmp_path / "panel_years.h5"
+    for year in (2026, 2027):
+        append_multi_year_dataset_year(path, year, _typed_frames(year))
+
+    for year in (2026, 2027):
+        pd.testing.assert_frame_equal(
+            read_multi_year_dataset_year(path, year)["household"],
+            _typed_frames(year)["household"],
+        )
+    with h5py.File(path, "r") as h5_file:
+        # Changes to nullable and categorical columns are still sparse deltas.
+        assert set(h5_file["years/2027/household/delta"]) == {"children", "tenure"}
+
+
+def test_failed_append_leaves_no_partial_year(tmp_path):
+    path = tmp_path / "panel_years.h5"
+    with patch(
+        "policyengine.tax_benefit_models.common.multi_year_storage._write_column",
+        side_effect=[None, None, OSError("disk full")],
+    ):
+        with pytest.raises(OSError, match="disk full"):
+            append_multi_year_dataset_year(path, 2026, _uk_frames(2026))
+
+    assert multi_year_dataset_years(path) == []
+    append_multi_year_dataset_year(path, 2027, _uk_frames(2027))
+    assert multi_year_dataset_years(path) == [2027]
+    with h5py.File(path, "r") as h5_file:
+        assert h5_file.attrs["base_year"] == 2027
+        assert list(h5_file["pending"]) == []
+
+
+def test_uk_ensure_datasets_appends_missing_years_to_one_file(tmp_path):
+    uk_datasets = importlib.import_module("policyengine.tax_benefit_models.uk.datasets")
+
+    def fake_create(datasets, years, data_folder, max_workers=1):
+        result = {}
+        for year in years:
+            frames = _uk_frames(year)
+            dataset = PolicyEngineUKDataset(
+                name="populace_uk_2023",
+                description="",
+                year=year,
+                filepath=str(tmp_path / f"populace_uk_2023_year_{year}.h5"),
+                data=UKYearData(
+                    person=MicroDataFrame(frames["person"], weights="person_weight"),
+                    benunit=MicroDataFrame(frames["benunit"], weights="benunit_weight"),
+                    household=MicroDataFrame(
+                        frames["household"], weights="household_weight"
+                    ),
+                ),
+            )
+            dataset.save()
+            result[f"populace_uk_2023_{year}"] = dataset
+        return result
+
+    with patch.object(
+        uk_datasets, "create_datasets", side_effect=fake_create
+    ) as create_datasets:
+        uk_datasets.ensure_datasets(
+            years=[2026, 2027], data_folder=str(tmp_path), storage="multi_year"
+        )
+        result = uk_datasets.ensure_datasets(
+            years=[2026, 2027, 2028], data_folder=str(tmp_path), storage="multi_year"
+        )
+
+    assert [call.kwargs["years"] for call in create_datasets.call_args_list] == [
+        [2026, 2027],
+        [2028],
+    ]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "populace_uk_2023_years.h5"
+    ]
+    reloaded = result["populace_uk_2023_2027"]
+    assert reloaded.filepath == str(tmp_path / "populace_uk_2023_years.h5")
+    assert reloaded.data.benunit["is_new"].all()
+    assert reloaded.data.person["age"].tolist() == list(np.arange(100) % 80 + 1)
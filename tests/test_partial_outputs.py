@@ -0,0 +1,262 @@
+"""Tests for mergeable partial states of outputs computed over shards."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+
+from policyengine.core import Simulation
+from policyengine.outputs import (
+    Aggregate,
+    AggregateType,
+    ChangeAggregate,
+    ChangeAggregateType,
+    DecileImpact,
+    Inequality,
+    Poverty,
+    QuantileSketch,
+    calculate_decile_impacts,
+    merge_partials,
+)
+from policyengine.tax_benefit_models.uk import (
+    PolicyEngineUKDataset,
+    UKYearData,
+    uk_latest,
+)
+
+REGIONS = ["NORTH_EAST", "LONDON", "WALES", "SCOTLAND"]
+
+
+def _frames(n_households: int = 400, seed: int = 0, shift: float = 0.0):
+    rng = np.random.default_rng(seed)
+    household_ids = np.arange(n_households) + 1
+    people = rng.integers(1, 4, size=n_households)
+    person_households = np.repeat(household_ids, people)
+    household_weight = rng.uniform(50, 150, n_households)
+    income = rng.lognormal(10, 1, n_households)
+    # A few negative incomes, which decile groupings exclude.
+    income[:5] = -rng.uniform(100, 1_000, 5)
+    rng_reform = np.random.default_rng(seed + 1)
+    person = pd.DataFrame(
+        {
+            "person_id": np.arange(len(person_households)),
+            "benunit_id": person_households,
+            "household_id": person_households,
+            "age": rng.integers(0, 90, len(person_households)),
+            "person_weight": np.repeat(household_weight, people),
+        }
+    )
+    benunit = pd.DataFrame(
+        {"benunit_id": household_ids, "benunit_weight": household_weight}
+    )
+    household = pd.DataFrame(
+        {
+            "household_id": household_ids,
+            "household_weight": household_weight,
+            "household_count_people": people,
+            "region": rng.choice(REGIONS, n_households),
+            "household_net_income": income
+            + shift * rng_reform.integers(-1, 2, n_households) * 500,
+            "in_poverty_bhc": income < 15_000,
+        }
+    )
+    return person, benunit, household
+
+
+def _simulation(person, benunit, household):
+    dataset = PolicyEngineUKDataset(
+        name="Test",
+        description="Test dataset",
+        year=2026,
+        data=UKYearData(
+            person=MicroDataFrame(
+                person.reset_index(drop=True), weights="person_weight"
+            ),
+            benunit=MicroDataFrame(
+                benunit.reset_index(drop=True), weights="benunit_weight"
+            ),
+            household=MicroDataFrame(
+                household.reset_index(drop=True), weights="household_weight"
+            ),
+        ),
+    )
+    simulation = Simulation(dataset=dataset, tax_benefit_model_version=uk_latest)
+    simulation.use_assembled_output(dataset)
+    return simulation
+
+
+def _shards(frames):
+    """One simulation per region, each holding that region's households."""
+    person, benunit, household = frames
+    shards = []
+    for region in REGIONS:
+        ids = household.loc[household["region"] == region, "household_id"]
+        shards.append(
+            _simulation(
+                person[person["household_id"].isin(ids)],
+                benunit[benunit["benunit_id"].isin(ids)],
+                household[household["household_id"].isin(ids)],
+            )
+        )
+    return shards
+
+
+def test_sketch_merges_associatively_and_matches_weighted_quantiles():
+    rng = np.random.default_rng(3)
+    keys = rng.lognormal(10, 1, 5_000)
+    weights = rng.uniform(1, 5, 5_000)
+    parts = [
+        QuantileSketch.from_values(keys[i::3], weights[i::3], max_centroids=200)
+        for i in range(3)
+    ]
+    left = parts[0].merge(parts[1]).merge(parts[2])
+    right = parts[0].merge(parts[1].merge(parts[2]))
+    assert not left.is_exact
+    assert left.total_weight == pytest.approx(weights.sum())
+    assert len(left.keys) <= 200
+    np.testing.assert_allclose(left.weights.sum(), right.weights.sum())
+
+    order = np.argsort(keys)
+    cumulative = np.cumsum(weights[order]) / weights.sum()
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99):
+        truth = keys[order][np.searchsorted(cumulative, q)]
+        assert left.quantile(q) == pytest.approx(truth, rel=0.05)
+
+    with pytest.raises(ValueError, match="at least one"):
+        merge_partials([])
+
+
+def test_sharded_aggregates_match_full_run():
+    frames = _frames()
+    full = _simulation(*frames)
+    shards = _shards(frames)
+
+    outputs = [
+        dict(variable="household_net_income", aggregate_type=AggregateType.SUM),
+        dict(
+            variable="age",
+            aggregate_type=AggregateType.MEAN,
+            filter_variable="region",
+            filter_variable_eq="WALES",
+        ),
+        dict(
+            variable="household_net_income",
+            aggregate_type=AggregateType.MEAN,
+            filter_variable="household_net_income",
+            quantile=10,
+            quantile_eq=3,
+        ),
+    ]
+    for fields in outputs:
+        expected = Aggregate(simulation=full, **fields)
+        expected.run()
+        merged = merge_partials(
+            Aggregate(simulation=shard, **fields).partial() for shard in shards
+        ).to_output()
+        assert merged.result == pytest.approx(expected.result)
+        assert merged.variable == fields["variable"]
+
+
+def test_sharded_change_aggregate_and_poverty_match_full_run():
+    baseline_frames = _frames()
+    reform_frames = _frames(shift=1.0)
+    baseline, reform = _simulation(*baseline_frames), _simulation(*reform_frames)
+    shard_pairs = list(zip(_shards(baseline_frames), _shards(reform_frames)))
+
+    fields = dict(
+        variable="household_net_income",
+        aggregate_type=ChangeAggregateType.COUNT,
+        change_geq=1,
+        filter_variable="household_net_income",
+        quantile=5,
+        quantile_leq=2,
+    )
+    expected = ChangeAggregate(
+        baseline_simulation=baseline, reform_simulation=reform, **fields
+    )
+    expected.run()
+    merged = merge_partials(
+        ChangeAggregate(
+            baseline_simulation=shard_baseline,
+            reform_simulation=shard_reform,
+            **fields,
+        ).partial()
+        for shard_baseline, shard_reform in shard_pairs
+    ).to_output()
+    assert type(merged) is ChangeAggregate
+    assert merged.result == pytest.approx(expected.result)
+
+    poverty = Poverty(
+        simulation=baseline,
+        poverty_variable="in_poverty_bhc",
+        filter_variable="age",
+        filter_variable_leq=17,
+    )
+    poverty.run()
+    merged_poverty = merge_partials(
+        Poverty(
+            simulation=shard_baseline,
+            poverty_variable="in_poverty_bhc",
+            filter_variable="age",
+            filter_variable_leq=17,
+        ).partial()
+        for shard_baseline, _ in shard_pairs
+    ).to_output()
+    assert merged_poverty.headcount == pytest.approx(poverty.headcount)
+    assert merged_poverty.rate == pytest.approx(poverty.rate)
+
+
+@pytest.mark.parametrize("max_centroids, tolerance", [(100_000, 1e-9), (300, 0.02)])
+def test_sharded_inequality_matches_full_run(max_centroids, tolerance):
+    frames = _frames(n_households=2_000)
+    expected = Inequality(
+        simulation=_simulation(*frames), income_variable="household_net_income"
+    )
+    expected.run()
+    merged = merge_partials(
+        Inequality(simulation=shard, income_variable="household_net_income").partial(
+            max_centroids=max_centroids
+        )
+        for shard in _shards(frames)
+    ).to_output()
+
+    assert merged.gini == pytest.approx(expected.gini, abs=tolerance)
+    assert merged.top_10_share == pytest.approx(expected.top_10_share, abs=tolerance)
+    assert merged.bottom_50_share == pytest.approx(
+        expected.bottom_50_share, abs=tolerance
+    )
+
+
+@pytest.mark.parametrize("max_centroids", [100_000, 100])
+def test_sharded_decile_impacts_match_full_run(max_centroids):
+    baseline_frames = _frames(n_households=1_000)
+    reform_frames = _frames(n_households=1_000, shift=1.0)
+    expected = calculate_decile_impacts(
+        baseline_simulation=_simulation(*baseline_frames),
+        reform_simulation=_simulation(*reform_frames),
+    ).outputs
+    merged = merge_partials(
+        DecileImpact(
+            baseline_simulation=shard_baseline,
+            reform_simulation=shard_reform,
+            decile=1,
+        ).partial(max_centroids=max_centroids)
+        for shard_baseline, shard_reform in zip(
+            _shards(baseline_frames), _shards(reform_frames)
+        )
+    ).to_outputs()
+
+    assert [impact.decile for impact in merged] == list(range(1, 11))
+    if max_centroids > 1_000:
+        for got, want in zip(merged, expected):
+            assert got.baseline_mean == pytest.approx(want.baseline_mean)
+            assert got.absolute_change == pytest.approx(want.absolute_change)
+            assert got.count_better_off == pytest.approx(want.count_better_off)
+    else:
+        # Compressed centroids shift a few households between deciles, but
+        # totals over all deciles are preserved exactly.
+        assert sum(impact.count_better_off for impact in merged) == pytest.approx(
+            sum(impact.count_better_off for impact in expected)
+        )
+        for got, want in zip(merged, expected):
+            assert got.baseline_mean == pytest.approx(want.baseline_mean, rel=0.25)
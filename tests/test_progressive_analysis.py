@@ -0,0 +1,245 @@
+"""Tests for progressive refinement of reform analyses."""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+from pydantic import ConfigDict
+
+from policyengine.core import Dataset, Simulation, YearData
+from policyengine.tax_benefit_models.common.progressive_analysis import (
+    progressive_reform_analysis,
+)
+
+
+class _YearData(YearData):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    person: MicroDataFrame
+    household: MicroDataFrame
+
+    @property
+    def entity_data(self) -> dict[str, MicroDataFrame]:
+        return {"person": self.person, "household": self.household}
+
+
+class _Dataset(Dataset):
+    data: Optional[_YearData] = None
+
+
+def _dataset(n_households: int = 400) -> _Dataset:
+    rng = np.random.default_rng(0)
+    household_ids = np.arange(n_households) + 1
+    people = rng.integers(1, 4, size=n_households)
+    person_households = np.repeat(household_ids, people)
+    household_weight = rng.uniform(50, 150, n_households)
+    person = pd.DataFrame(
+        {
+            "person_id": np.arange(len(person_households)),
+            "person_household_id": person_households,
+            "employment_income": rng.lognormal(10, 1, len(person_households)),
+            "person_weight": np.repeat(household_weight, people),
+        }
+    )
+    household = pd.DataFrame(
+        {
+            "household_id": household_ids,
+            "household_weight": household_weight,
+            "state_fips": rng.integers(1, 4, n_households),
+        }
+    )
+    return _Dataset(
+        id="toy",
+        name="toy",
+        description="toy",
+        year=2026,
+        data=_YearData(
+            person=MicroDataFrame(person, weights="person_weight"),
+            household=MicroDataFrame(household, weights="household_weight"),
+        ),
+    )
+
+
+@pytest.fixture
+def simulated_households(monkeypatch):
+    """Replace ``Simulation.run`` with a toy model that records its inputs.
+
+    Household net income is the members' employment income; the reform
+    raises household tax by 10% of it.
+    """
+    runs = []
+
+    def run(simulation):
+        person = pd.DataFrame(simulation.dataset.data.person)
+        household = pd.DataFrame(simulation.dataset.data.household)
+        income = (
+            person.groupby("person_household_id")["employment_income"]
+            .sum()
+            .loc[household["household_id"]]
+            .to_numpy()
+        )
+        is_reform = simulation.id.startswith("reform")
+        tax = 0.1 * income if is_reform else np.zeros(len(household))
+        household = household.assign(
+            household_tax=tax,
+            household_benefits=0.0,
+            household_net_income=income - tax,
+        )
+        runs.append((simulation.id, len(household)))
+        simulation.output_dataset = _Dataset(
+            id=simulation.id,
+            name="output",
+            description="output",
+            year=2026,
+            is_output_dataset=True,
+            data=_YearData(
+                person=MicroDataFrame(person, weights="person_weight"),
+                household=MicroDataFrame(household, weights="household_weight"),
+            ),
+        )
+
+    monkeypatch.setattr(Simulation, "run", run)
+    return runs
+
+
+def _analyze(baseline, reform):
+    baseline.ensure()
+    reform.ensure()
+    return len(baseline.output_dataset.data.household)
+
+
+def test_stages_refine_to_full_dataset_reusing_simulated_households(
+    simulated_households,
+):
+    dataset = _dataset()
+    baseline = Simulation(id="baseline", dataset=dataset)
+    reform = Simulation(id="reform", dataset=dataset)
+    configured = []
+
+    stages = list(
+        progressive_reform_analysis(
+            baseline,
+            reform,
+            analyze=_analyze,
+            configure=lambda b, r: configured.append((b.id, r.id)),
+            interval_variables={"tax": "household_tax"},
+            fractions=(0.1, 0.5, 1.0),
+            strata=["state_fips"],
+            seed=4,
+        )
+    )
+
+    assert configured == [("baseline", "reform")]
+    assert [stage.is_final for stage in stages] == [False, False, True]
+    assert [stage.analysis for stage in stages] == [
+        stage.households for stage in stages
+    ]
+    assert stages[0].households < stages[1].households < stages[2].households == 400
+    # Every household is simulated once per side, however many stages run.
+    baseline_runs = [n for sim_id, n in simulated_households if sim_id[0] == "b"]
+    assert sum(baseline_runs) == 400
+    assert len(simulated_households) == 6
+
+    household = pd.DataFrame(dataset.data.household)
+    person = pd.DataFrame(dataset.data.person)
+    person_income = person.groupby("person_household_id")["employment_income"].sum()
+    truth = float(
+        (
+            0.1
+            * person_income.loc[household["household_id"]].to_numpy()
+            * household["household_weight"].to_numpy()
+        ).sum()
+    )
+    final = stages[-1].intervals["tax"]
+    assert final.estimate == pytest.approx(truth)
+    assert final.standard_error == 0.0
+    for stage in stages[:-1]:
+        interval = stage.intervals["tax"]
+        assert interval.standard_error > 0
+        assert interval.lower < interval.estimate < interval.upper
+        assert len(stage.sampling_design.household_ids) == stage.households
+
+    # The caller's simulations end up with full-dataset outputs and weights,
+    # in the dataset's row order.
+    for simulation in (baseline, reform):
+        for entity, frame in simulation.output_dataset.data.entity_data.items():
+            np.testing.assert_array_equal(
+                frame[f"{entity}_id"].to_numpy(),
+                dataset.data.entity_data[entity][f"{entity}_id"].to_numpy(),
+            )
+    output = pd.DataFrame(baseline.output_dataset.data.household)
+    np.testing.assert_allclose(
+        output["household_weight"].to_numpy(),
+        household["household_weight"].to_numpy(),
+    )
+
+
+def test_provisional_stage_weights_match_its_sample(simulated_households):
+    dataset = _dataset()
+    baseline = Simulation(id="baseline", dataset=dataset)
+    reform = Simulation(id="reform", dataset=dataset)
+    captured = []
+
+    def analyze(stage_baseline, stage_reform):
+        captured.append(
+            (
+                pd.DataFrame(stage_baseline.dataset.data.household),
+                pd.DataFrame(stage_baseline.output_dataset.data.household),
+            )
+        )
+
+    for _ in progressive_reform_analysis(
+        baseline,
+        reform,
+        analyze=analyze,
+        configure=lambda b, r: None,
+        interval_variables={},
+        fractions=(0.2, 0.6),
+        strata=["state_fips"],
+    ):
+        pass
+
+    for sample, output in captured:
+        weights = sample.set_index("household_id")["household_weight"]
+        np.testing.assert_allclose(
+            output["household_weight"].to_numpy(),
+            weights.loc[output["household_id"]].to_numpy(),
+        )
+    # Without a final stage the caller's simulations are left untouched.
+    assert baseline.output_dataset is None
+
+
+@pytest.mark.parametrize("fractions", [(), (0.5, 0.2), (0.0, 1.0), (0.5, 1.5)])
+def test_rejects_invalid_fractions(fractions):
+    dataset = _dataset(10)
+    with pytest.raises(ValueError, match="fractions"):
+        next(
+            progressive_reform_analysis(
+                Simulation(dataset=dataset),
+                Simulation(dataset=dataset),
+                analyze=_analyze,
+                configure=lambda b, r: None,
+                interval_variables={},
+                fractions=fractions,
+            )
+        )
+
+
+def test_only_assembled_outputs_bypass_ensure(simulated_households, monkeypatch):
+    dataset = _dataset(20)
+    loads = []
+    monkeypatch.setattr(Simulation, "load", lambda sim: loads.append(sim.id))
+    loaded = Simulation(id="loaded", dataset=dataset)
+    loaded.run()
+    assembled = Simulation(id="assembled", dataset=dataset)
+    assembled.use_assembled_output(loaded.output_dataset)
+
+    # Holding data is not enough: ensure() still loads.
+    loaded.ensure()
+    assembled.ensure()
+
+    assert loads == ["loaded"]
+    assert [sim_id for sim_id, _ in simulated_households] == ["loaded"]
+    assert assembled.output_dataset is loaded.output_dataset
@@ -0,0 +1,203 @@
+"""Tests for region-decomposed outputs from one national run."""
+
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+
+from policyengine.core import Simulation
+from policyengine.core.region import Region, RegionRegistry
+from policyengine.core.scoping_strategy import (
+    RowFilterStrategy,
+    WeightReplacementStrategy,
+)
+from policyengine.outputs import (
+    Aggregate,
+    AggregateType,
+    ChangeAggregate,
+    ChangeAggregateType,
+    calculate_decile_impacts,
+    decompose_by_region,
+    decompose_output_by_region,
+    simulation_for_region,
+)
+from policyengine.outputs.region_decomposition import RegionNotDerivableError
+from policyengine.tax_benefit_models.uk import (
+    PolicyEngineUKDataset,
+    UKYearData,
+    uk_latest,
+)
+
+
+def _uk_data(income_scale: float = 1.0, with_country: bool = True) -> UKYearData:
+    person = pd.DataFrame(
+        {
+            "person_id": [1, 2, 3, 4, 5],
+            "benunit_id": [1, 1, 2, 3, 3],
+            "household_id": [1, 1, 2, 3, 3],
+            "employment_income": [
+                v * income_scale for v in [10_000, 20_000, 30_000, 40_000, 50_000]
+            ],
+            "person_weight": [1.0, 1.0, 2.0, 3.0, 3.0],
+        }
+    )
+    benunit = pd.DataFrame({"benunit_id": [1, 2, 3], "benunit_weight": [1.0, 2.0, 3.0]})
+    household = pd.DataFrame(
+        {
+            "household_id": [1, 2, 3],
+            "household_weight": [1.0, 2.0, 3.0],
+            "household_count_people": [2, 1, 2],
+            "household_net_income": [
+                v * income_scale for v in [25_000, 30_000, 80_000]
+            ],
+        }
+    )
+    if with_country:
+        household["country"] = ["ENGLAND", "WALES", "ENGLAND"]
+    return UKYearData(
+        person=MicroDataFrame(person, weights="person_weight"),
+        benunit=MicroDataFrame(benunit, weights="benunit_weight"),
+        household=MicroDataFrame(household, weights="household_weight"),
+    )
+
+
+def _simulation(income_scale: float = 1.0) -> Simulation:
+    dataset = PolicyEngineUKDataset(
+        name="Test", description="Test", year=2024, data=_uk_data()
+    )
+    # The output lacks ``country``; decomposition borrows it from the input.
+    output = PolicyEngineUKDataset(
+        name="Test",
+        description="Test",
+        year=2024,
+        is_output_dataset=True,
+        data=_uk_data(income_scale, with_country=False),
+    )
+    return Simulation(
+        dataset=dataset, tax_benefit_model_version=uk_latest, output_dataset=output
+    )
+
+
+def _registry() -> RegionRegistry:
+    return RegionRegistry(
+        country_id="uk",
+        regions=[
+            Region(code="uk", label="UK", region_type="national"),
+            *[
+                Region(
+                    code=f"country/{name}",
+                    label=name.title(),
+                    region_type="country",
+                    parent_code="uk",
+                    scoping_strategy=RowFilterStrategy(
+                        variable_name="country", variable_value=name.upper()
+                    ),
+                )
+                for name in ["england", "wales"]
+            ],
+            Region(
+                code="constituency/X",
+                label="X",
+                region_type="constituency",
+                parent_code="uk",
+                scoping_strategy=WeightReplacementStrategy(
+                    weight_matrix_bucket="bucket",
+                    weight_matrix_key="weights.h5",
+                    lookup_csv_bucket="bucket",
+                    lookup_csv_key="lookup.csv",
+                    region_code="X",
+                ),
+            ),
+        ],
+    )
+
+
+def test_output_decomposition_matches_filtered_national_output():
+    baseline = _simulation()
+    snap = Aggregate(
+        simulation=baseline,
+        variable="employment_income",
+        aggregate_type=AggregateType.SUM,
+    )
+
+    by_country = decompose_output_by_region(snap, _registry(), region_type="country")
+
+    assert list(by_country.outputs) == ["country/england", "country/wales"]
+    assert by_country.outputs["country/england"].result == pytest.approx(
+        10_000 + 20_000 + 3 * (40_000 + 50_000)
+    )
+    assert by_country.outputs["country/wales"].result == pytest.approx(2 * 30_000)
+    # The national template is untouched.
+    assert snap.result is None
+    assert len(baseline.output_dataset.data.household) == 3
+
+    frame = by_country.dataframe
+    assert frame["region_code"].tolist() == ["country/england", "country/wales"]
+    assert frame["result"].tolist() == pytest.approx([300_000, 60_000])
+
+
+def test_baseline_reform_outputs_and_not_derivable_regions():
+    change = ChangeAggregate(
+        baseline_simulation=_simulation(),
+        reform_simulation=_simulation(income_scale=1.1),
+        variable="employment_income",
+        aggregate_type=ChangeAggregateType.SUM,
+    )
+
+    decomposition = decompose_output_by_region(change, _registry())
+
+    assert decomposition.outputs["country/wales"].result == pytest.approx(6_000)
+    assert set(decomposition.not_derivable) == {"constituency/X"}
+    assert "weight matrix" in decomposition.not_derivable["constituency/X"]
+
+
+def test_function_decomposition_and_single_region_view():
+    baseline = _simulation()
+    registry = _registry()
+
+    sizes = decompose_by_region(
+        lambda simulation: len(simulation.output_dataset.data.person),
+        registry.get_by_type("country"),
+        simulation=baseline,
+    )
+    assert sizes.outputs == {"country/england": 4, "country/wales": 1}
+
+    national = simulation_for_region(baseline, registry.get("uk"))
+    assert national is baseline
+    with pytest.raises(RegionNotDerivableError, match="weight matrix"):
+        simulation_for_region(baseline, registry.get("constituency/X"))
+
+
+def test_outputs_that_ensure_read_region_views_without_resimulating(monkeypatch):
+    def resimulate(self):
+        raise AssertionError(f"re-simulation attempted for {self.id}")
+
+    monkeypatch.setattr(Simulation, "run", resimulate)
+
+    by_country = decompose_by_region(
+        lambda **views: calculate_decile_impacts(**views, quantiles=2),
+        _registry(),
+        region_type="country",
+        baseline_simulation=_simulation(),
+        reform_simulation=_simulation(income_scale=1.1),
+    )
+
+    assert list(by_country.outputs) == ["country/england", "country/wales"]
+    wales = by_country.outputs["country/wales"].dataframe
+    assert wales["absolute_change"].sum() == pytest.approx(3_000)
+
+
+def test_missing_key_column_is_reported():
+    baseline = _simulation()
+    region = Region(
+        code="state/x",
+        label="X",
+        region_type="state",
+        scoping_strategy=RowFilterStrategy(
+            variable_name="state_fips", variable_value=1
+        ),
+    )
+
+    decomposition = decompose_by_region(len, [region], simulation=baseline)
+
+    assert decomposition.outputs == {}
+    assert "state_fips" in decomposition.not_derivable["state/x"]
@@ -0,0 +1,218 @@
+"""Tests for all-regions-at-once weight-matrix impacts."""
+
+import importlib.util
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import h5py
+import numpy as np
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+
+from policyengine.outputs.region_weight_matrix import (
+    RegionWeightMatrix,
+    compute_region_weight_matrix_impacts,
+    load_region_weight_matrix,
+)
+from policyengine.tax_benefit_models.uk import UKYearData
+
+N_HOUSEHOLDS = 6
+PEOPLE_PER_HOUSEHOLD = [1, 2, 3, 1, 2, 1]
+
+
+def _make_sim(net_income, in_poverty, benefits) -> MagicMock:
+    household_ids = np.arange(1, N_HOUSEHOLDS + 1)
+    person_household = np.repeat(household_ids, PEOPLE_PER_HOUSEHOLD)
+    person = MicroDataFrame(
+        pd.DataFrame(
+            {
+                "person_id": np.arange(len(person_household)),
+                "benunit_id": person_household,
+                "household_id": person_household,
+                "person_weight": np.ones(len(person_household)),
+                "benefits": benefits,
+            }
+        ),
+        weights="person_weight",
+    )
+    benunit = MicroDataFrame(
+        pd.DataFrame(
+            {
+                "benunit_id": household_ids,
+                "benunit_weight": np.ones(N_HOUSEHOLDS),
+                "in_poverty": in_poverty,
+            }
+        ),
+        weights="benunit_weight",
+    )
+    household = MicroDataFrame(
+        pd.DataFrame(
+            {
+                "household_id": household_ids,
+                "household_weight": np.ones(N_HOUSEHOLDS),
+                "household_net_income": net_income,
+            }
+        ),
+        weights="household_weight",
+    )
+    sim = MagicMock()
+    sim.output_dataset.data = UKYearData(
+        person=person, benunit=benunit, household=household
+    )
+    entities = {"benefits": "person", "in_poverty": "benunit"}
+    sim.tax_benefit_model_version.get_variable.side_effect = lambda name: (
+        SimpleNamespace(entity=entities[name])
+    )
+    return sim
+
+
+@pytest.fixture
+def simulations():
+    n_people = sum(PEOPLE_PER_HOUSEHOLD)
+    baseline = _make_sim(
+        net_income=[100.0, 200.0, 300.0, 400.0, 500.0, 0.0],
+        in_poverty=[True, False, True, False, False, True],
+        benefits=np.arange(n_people, dtype=float),
+    )
+    reform = _make_sim(
+        net_income=[110.0, 200.0, 250.0, 400.0, 600.0, 0.0],
+        in_poverty=[False, False, True, False, False, True],
+        benefits=np.arange(n_people, dtype=float) * 2,
+    )
+    return baseline, reform
+
+
+def _weights() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    weights = rng.uniform(0, 10, size=(4, N_HOUSEHOLDS))
+    weights[1, 3:] = 0.0
+    weights[3] = 0.0
+    return weights
+
+
+def _expected_region(weights_row, baseline, reform) -> dict:
+    b_hh = baseline.output_dataset.data.household
+    r_hh = reform.output_dataset.data.household
+    b_income = np.asarray(b_hh["household_net_income"])
+    r_income = np.asarray(r_hh["household_net_income"])
+    people = np.array(PEOPLE_PER_HOUSEHOLD, dtype=float)
+    change = (r_income - b_income) / np.maximum(b_income, 1.0)
+    people_weights = weights_row * people
+    poor = np.array([1, 0, 3, 0, 0, 1], dtype=float) * weights_row
+    return {
+        "population": weights_row.sum(),
+        "average_household_income_change": (
+            ((r_income - b_income) * weights_row).sum() / weights_row.sum()
+        ),
+        "winner_percentage": people_weights[change > 1e-3].sum() / people_weights.sum(),
+        "loser_percentage": people_weights[change <= -1e-3].sum()
+        / people_weights.sum(),
+        "baseline_in_poverty_rate": poor.sum() / people_weights.sum(),
+    }
+
+
+def test_matrix_impacts_match_per_region_reweighting(simulations):
+    baseline, reform = simulations
+    weights = _weights()
+    matrix = RegionWeightMatrix(
+        weights=weights,
+        region_codes=["A", "B", "C", "D"],
+        region_names=["Alpha", "Beta", "Gamma", "Delta"],
+    )
+
+    impact = compute_region_weight_matrix_impacts(
+        baseline,
+        reform,
+        matrix,
+        total_variables=["benefits"],
+        poverty_variables=["in_poverty"],
+    )
+
+    results = impact.region_results
+    assert [row["region_code"] for row in results] == ["A", "B", "C", "D"]
+    for row, result in enumerate(results[:3]):
+        expected = _expected_region(weights[row], baseline, reform)
+        for key, value in expected.items():
+            assert result[key] == pytest.approx(value)
+        assert result["benefits_change"] == pytest.approx(
+            result["baseline_benefits_total"]
+        )
+
+    empty = results[3]
+    assert empty["population"] == 0.0
+    assert empty["average_household_income_change"] is None
+    assert empty["winner_percentage"] is None
+    assert empty["baseline_in_poverty_rate"] is None
+
+
+def test_float32_matrix_accumulates_in_float64(simulations, tmp_path):
+    baseline, reform = simulations
+    weights = _weights()
+    matrix_path = tmp_path / "weights.h5"
+    lookup_path = tmp_path / "lookup.csv"
+    with h5py.File(matrix_path, "w") as f:
+        f.create_dataset("2025", data=weights)
+    pd.DataFrame({"code": ["A", "B", "C", "D"]}).to_csv(lookup_path, index=False)
+
+    matrix = load_region_weight_matrix(
+        str(matrix_path), str(lookup_path), 2025, dtype=np.float32
+    )
+    assert matrix.weights.dtype == np.float32
+    assert matrix.region_names == ["A", "B", "C", "D"]
+
+    reduced = compute_region_weight_matrix_impacts(baseline, reform, matrix)
+    full = compute_region_weight_matrix_impacts(
+        baseline,
+        reform,
+        RegionWeightMatrix(
+            weights=weights,
+            region_codes=matrix.region_codes,
+            region_names=matrix.region_names,
+        ),
+    )
+    for reduced_row, full_row in zip(reduced.region_results, full.region_results):
+        assert reduced_row["population"] == pytest.approx(
+            full_row["population"], rel=1e-6
+        )
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("scipy") is None, reason="scipy not installed"
+)
+def test_sparse_matrix_matches_dense(simulations, tmp_path):
+    baseline, reform = simulations
+    weights = _weights()
+    matrix_path = tmp_path / "weights.h5"
+    lookup_path = tmp_path / "lookup.csv"
+    with h5py.File(matrix_path, "w") as f:
+        f.create_dataset("2025", data=weights)
+    pd.DataFrame({"code": ["A", "B", "C", "D"]}).to_csv(lookup_path, index=False)
+
+    sparse_matrix = load_region_weight_matrix(
+        str(matrix_path), str(lookup_path), 2025, sparse=True
+    )
+    sparse = compute_region_weight_matrix_impacts(baseline, reform, sparse_matrix)
+    dense = compute_region_weight_matrix_impacts(
+        baseline,
+        reform,
+        load_region_weight_matrix(str(matrix_path), str(lookup_path), 2025),
+    )
+    for sparse_row, dense_row in zip(sparse.region_results, dense.region_results):
+        for key, value in dense_row.items():
+            if isinstance(value, float):
+                assert sparse_row[key] == pytest.approx(value)
+            else:
+                assert sparse_row[key] == value
+
+
+def test_household_count_mismatch_raises(simulations):
+    baseline, reform = simulations
+    matrix = RegionWeightMatrix(
+        weights=np.ones((1, N_HOUSEHOLDS + 1)),
+        region_codes=["A"],
+        region_names=["A"],
+    )
+
+    with pytest.raises(ValueError, match="household count"):
+        compute_region_weight_matrix_impacts(baseline, reform, matrix)
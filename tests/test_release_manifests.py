@@ -22,6 +22,7 @@ from policyengine.provenance.manifest import (
     DataCertification,
     DataReleaseManifestUnavailableError,
     _apply_dataset_overlays,
+    _cached_manifest_path,
     certify_data_release_compatibility,
     dataset_logical_name,
     get_data_release_manifest,
@@ -579,6 +580,66 @@ class TestReleaseManifests:
             else:
                 raise AssertionError("Expected missing manifest to be reported")
 
+    def test__given_cached_manifest__then_new_process_skips_network(self):
+        get_data_release_manifest.cache_clear()
+        payload = {
+            "schema_version": 1,
+            "data_package": {"name": "populace-data", "version": "0.1.0"},
+        }
+        with patch(
+            "policyengine.provenance.manifest.requests.get",
+            return_value=_response_with_json(payload),
+        ) as mock_get:
+            fetched = get_data_release_manifest("us")
+            # Clearing the in-process cache stands in for a new process.
+            get_data_release_manifest.cache_clear()
+            cached = get_data_release_manifest("us")
+
+        mock_get.assert_called_once()
+        assert cached == fetched
+        assert cached.source_sha256 == fetched.source_sha256
+
+    def test__given_tampered_cached_manifest__then_refetches(self):
+        get_data_release_manifest.cache_clear()
+        payload = {
+            "schema_version": 1,
+            "data_package": {"name": "populace-data", "version": "0.1.0"},
+        }
+        with patch(
+            "policyengine.provenance.manifest.requests.get",
+            return_value=_response_with_json(payload),
+        ) as mock_get:
+            get_data_release_manifest("us")
+            cached_path = _cached_manifest_path(get_release_manifest("us").data_package)
+            cached_path.write_text(json.dumps({**payload, "schema_version": 2}))
+            get_data_release_manifest.cache_clear()
+            manifest = get_data_release_manifest("us")
+
+        assert mock_get.call_count == 2
+        assert manifest.schema_version == 1
+
+    def test__given_offline_mode_without_cache__then_raises_without_network(
+        self, monkeypatch
+    ):
+        get_data_release_manifest.cache_clear()
+        monkeypatch.setenv("POLICYENGINE_OFFLINE", "1")
+
+        with patch("policyengine.provenance.manifest.requests.get") as mock_get:
+            try:
+                get_data_release_manifest("us")
+            except DataReleaseManifestUnavailableError as error:
+                assert "Offline mode" in str(error)
+            else:
+                raise AssertionError("Expected offline mode to skip the fetch")
+            certification = certify_data_release_compatibility(
+                "us",
+                runtime_model_version=get_release_manifest("us").model_package.version,
+            )
+
+        mock_get.assert_not_called()
+        assert certification == get_release_manifest("us").certification
+        get_data_release_manifest.cache_clear()
+
     def test__given_range_specifier__then_certification_accepts_compatible_version(
         self,
     ):
@@ -0,0 +1,185 @@
+"""Tests for replicate-weight standard errors of aggregate outputs."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+
+from policyengine.core import Simulation
+from policyengine.core.replicate_weights import (
+    bootstrap_replicate_weights,
+    successive_difference_replicate_weights,
+)
+from policyengine.outputs.aggregate import Aggregate, AggregateType
+from policyengine.outputs.change_aggregate import (
+    ChangeAggregate,
+    ChangeAggregateType,
+)
+from policyengine.outputs.poverty import Poverty
+from policyengine.tax_benefit_models.uk import (
+    PolicyEngineUKDataset,
+    UKYearData,
+    uk_latest,
+)
+
+
+def _dataset(n_households: int = 300, seed: int = 0, shift: float = 0.0):
+    rng = np.random.default_rng(seed)
+    household_ids = np.arange(n_households) + 1
+    people = rng.integers(1, 4, size=n_households)
+    person_households = np.repeat(household_ids, people)
+    household_weight = rng.uniform(50, 150, n_households)
+    income = rng.lognormal(10, 1, n_households)
+    person = pd.DataFrame(
+        {
+            "person_id": np.arange(len(person_households)),
+            "benunit_id": person_households,
+            "household_id": person_households,
+            "employment_income": rng.lognormal(10, 1, len(person_households)),
+            "person_weight": np.repeat(household_weight, people),
+        }
+    )
+    benunit = pd.DataFrame(
+        {"benunit_id": household_ids, "benunit_weight": household_weight}
+    )
+    household = pd.DataFrame(
+        {
+            "household_id": household_ids,
+            "household_weight": household_weight,
+            "region": rng.choice(["NORTH_EAST", "LONDON", "WALES"], n_households),
+            "household_net_income": income + shift * income,
+            "in_poverty_bhc": income < 15_000,
+        }
+    )
+    return PolicyEngineUKDataset(
+        name="Test",
+        description="Test dataset",
+        year=2026,
+        data=UKYearData(
+            person=MicroDataFrame(person, weights="person_weight"),
+            benunit=MicroDataFrame(benunit, weights="benunit_weight"),
+            household=MicroDataFrame(household, weights="household_weight"),
+        ),
+    )
+
+
+def _simulation(dataset):
+    return Simulation(
+        dataset=dataset, tax_benefit_model_version=uk_latest, output_dataset=dataset
+    )
+
+
+def test_successive_difference_factors_follow_the_hadamard_scheme():
+    dataset = _dataset()
+    replicate_weights = successive_difference_replicate_weights(
+        dataset.data.entity_data, replicates=16, sort_by=["region"]
+    )
+
+    assert replicate_weights.factors.shape == (16, 300)
+    assert replicate_weights.variance_multiplier == pytest.approx(4 / 16)
+    assert set(np.round(np.unique(replicate_weights.factors), 6)) <= {
+        round(1 - 2**-0.5, 6),
+        1.0,
+        round(1 + 2**-0.5, 6),
+    }
+    # Every row of the Hadamard matrix but the first sums to zero, so each
+    # household's factors average to one.
+    np.testing.assert_allclose(replicate_weights.factors.mean(axis=0), 1.0)
+
+    with pytest.raises(ValueError, match="power of two"):
+        successive_difference_replicate_weights(dataset.data.entity_data, replicates=80)
+
+
+def test_bootstrap_standard_error_matches_analytic_formula():
+    dataset = _dataset(n_households=500)
+    replicate_weights = dataset.add_replicate_weights(replicates=800, seed=1)
+    assert dataset.replicate_weights is replicate_weights
+    # Strata are resampled to their own size, so weights are unbiased.
+    assert replicate_weights.factors.sum(axis=1) == pytest.approx(500, rel=0.02)
+
+    aggregate = Aggregate(
+        simulation=_simulation(dataset),
+        variable="household_net_income",
+        aggregate_type=AggregateType.SUM,
+    )
+    aggregate.run()
+
+    household = pd.DataFrame(dataset.data.household)
+    z = household["household_weight"] * household["household_net_income"]
+    analytic = np.sqrt(len(z) * z.var(ddof=1))
+    assert aggregate.standard_error == pytest.approx(analytic, rel=0.1)
+
+
+def test_outputs_evaluate_every_replicate_in_one_product():
+    baseline_dataset = _dataset()
+    baseline_dataset.add_replicate_weights(
+        "successive_difference", replicates=32, sort_by=["region"]
+    )
+    reform_dataset = _dataset(shift=0.1)
+    baseline = _simulation(baseline_dataset)
+    reform = _simulation(reform_dataset)
+    replicate_weights = baseline_dataset.replicate_weights
+    entity_data = baseline_dataset.data.entity_data
+
+    change = ChangeAggregate(
+        baseline_simulation=baseline,
+        reform_simulation=reform,
+        variable="household_net_income",
+        aggregate_type=ChangeAggregateType.MEAN,
+        change_geq=5_000,
+    )
+    change.run()
+
+    # Brute force: recompute the filtered mean under each replicate's weights.
+    household = pd.DataFrame(baseline_dataset.data.household)
+    reform_income = pd.DataFrame(reform_dataset.data.household)["household_net_income"]
+    delta = (reform_income - household["household_net_income"]).to_numpy()
+    kept = delta >= 5_000
+    weights = household["household_weight"].to_numpy()
+    replicate_means = [
+        np.average(delta[kept], weights=(weights * factors)[kept])
+        for factors in replicate_weights.factors
+    ]
+    assert change.result == pytest.approx(
+        np.average(delta[kept], weights=weights[kept])
+    )
+    assert change.standard_error == pytest.approx(
+        replicate_weights.standard_error(change.result, replicate_means)
+    )
+
+    poverty = Poverty(
+        simulation=baseline, poverty_variable="in_poverty_bhc", entity="person"
+    )
+    poverty.run()
+    person = pd.DataFrame(entity_data["person"])
+    poor = (
+        household.set_index("household_id")
+        .loc[person["household_id"], "in_poverty_bhc"]
+        .to_numpy()
+    )
+    person_factors = pd.DataFrame(
+        replicate_weights.factors.T, index=household["household_id"]
+    ).loc[person["household_id"]]
+    replicate_rates = [
+        np.average(poor, weights=person["person_weight"] * person_factors[r].to_numpy())
+        for r in range(replicate_weights.n_replicates)
+    ]
+    assert poverty.rate_standard_error == pytest.approx(
+        replicate_weights.standard_error(poverty.rate, replicate_rates)
+    )
+    assert poverty.headcount_standard_error > 0
+
+
+def test_outputs_without_replicate_weights_have_no_standard_error():
+    dataset = _dataset(n_households=20)
+    aggregate = Aggregate(
+        simulation=_simulation(dataset),
+        variable="employment_income",
+        aggregate_type=AggregateType.COUNT,
+    )
+    aggregate.run()
+
+    assert aggregate.standard_error is None
+    assert bootstrap_replicate_weights(
+        dataset.data.entity_data, replicates=4, strata=["region"]
+    ).factors.shape == (4, 20)
@@ -0,0 +1,155 @@
+"""Tests for stratified household subsampling with reweighting."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from microdf import MicroDataFrame
+
+from policyengine.core.sampling import stratified_household_sample
+from policyengine.tax_benefit_models.us import PolicyEngineUSDataset
+
+
+def _entity_data(seed: int = 0) -> dict[str, MicroDataFrame]:
+    rng = np.random.default_rng(seed)
+    n_households = 400
+    household_ids = rng.permutation(n_households) + 1000
+    people_per_household = rng.integers(1, 5, size=n_households)
+    person_households = np.repeat(household_ids, people_per_household)
+    tax_unit_ids = person_households * 10 + rng.integers(0, 2, len(person_households))
+    tax_units = rng.permutation(np.unique(tax_unit_ids))
+    household_weight = rng.uniform(50, 150, n_households)
+    weight_by_id = dict(zip(household_ids, household_weight))
+
+    person = pd.DataFrame(
+        {
+            "person_id": np.arange(len(person_households)),
+            "person_household_id": person_households,
+            "person_tax_unit_id": tax_unit_ids,
+            "employment_income": rng.lognormal(10, 1, len(person_households)),
+            "person_weight": [weight_by_id[h] for h in person_households],
+        }
+    )
+    tax_unit = pd.DataFrame(
+        {
+            "tax_unit_id": tax_units,
+            "tax_unit_weight": [weight_by_id[t // 10] for t in tax_units],
+        }
+    )
+    household = pd.DataFrame(
+        {
+            "household_id": household_ids,
+            "household_weight": household_weight,
+            "state_fips": rng.integers(1, 5, n_households),
+        }
+    )
+    return {
+        "person": MicroDataFrame(person, weights="person_weight"),
+        "tax_unit": MicroDataFrame(tax_unit, weights="tax_unit_weight"),
+        "household": MicroDataFrame(household, weights="household_weight"),
+    }
+
+
+def test_sample_is_household_complete_and_preserves_stratum_totals():
+    entity_data = _entity_data()
+    full = pd.DataFrame(entity_data["household"])
+
+    sampled, design = stratified_household_sample(
+        entity_data,
+        fraction=0.2,
+        strata=["state_fips"],
+        income_variable="employment_income",
+        income_groups=5,
+        seed=3,
+    )
+
+    household = pd.DataFrame(sampled["household"])
+    person = pd.DataFrame(sampled["person"])
+    tax_unit = pd.DataFrame(sampled["tax_unit"])
+    assert len(design.stratum_labels) == 4 * 5
+    assert len(household) == design.sampled_households.sum()
+    assert 0.18 < design.sampling_fraction < 0.3
+    # Whole households: every member and every tax unit comes along.
+    full_person = pd.DataFrame(entity_data["person"])
+    expected_people = full_person["person_household_id"].isin(household["household_id"])
+    assert len(person) == expected_people.sum()
+    assert set(tax_unit["tax_unit_id"]) == set(person["person_tax_unit_id"])
+
+    # Weighted totals are preserved overall and per state.
+    assert household["household_weight"].sum() == pytest.approx(
+        full["household_weight"].sum()
+    )
+    by_state = household.groupby("state_fips")["household_weight"].sum()
+    full_by_state = full.groupby("state_fips")["household_weight"].sum()
+    pd.testing.assert_series_equal(by_state, full_by_state)
+    # Persons and tax units carry their household's factor.
+    factor = dict(
+        zip(
+            household["household_id"],
+            household["household_weight"]
+            / full.set_index("household_id")
+            .loc[household["household_id"]]["household_weight"]
+            .to_numpy(),
+        )
+    )
+    original_person_weight = full_person.set_index("person_id").loc[
+        person["person_id"], "person_weight"
+    ]
+    np.testing.assert_allclose(
+        person["person_weight"],
+        original_person_weight.to_numpy() * person["person_household_id"].map(factor),
+    )
+
+
+def test_same_seed_draws_same_sample_and_full_sample_has_no_error():
+    entity_data = _entity_data()
+
+    first, _ = stratified_household_sample(entity_data, n_households=50, seed=1)
+    second, _ = stratified_household_sample(entity_data, n_households=50, seed=1)
+    other, _ = stratified_household_sample(entity_data, n_households=50, seed=2)
+    ids = pd.DataFrame(first["household"])["household_id"]
+    assert ids.equals(pd.DataFrame(second["household"])["household_id"])
+    assert not ids.equals(pd.DataFrame(other["household"])["household_id"])
+
+    everything, design = stratified_household_sample(
+        entity_data, fraction=1.0, strata=["state_fips"]
+    )
+    household = pd.DataFrame(everything["household"])
+    household["ones"] = 1.0
+    assert design.total_standard_error(household, "ones") == 0.0
+
+
+def test_standard_error_matches_stratified_formula():
+    entity_data = _entity_data()
+    sampled, design = stratified_household_sample(
+        entity_data, n_households=80, strata=["state_fips"], seed=5
+    )
+    household = pd.DataFrame(sampled["household"])
+    household["value"] = np.arange(len(household), dtype=float)
+
+    variance = 0.0
+    full = pd.DataFrame(entity_data["household"])
+    for state, group in household.groupby("state_fips"):
+        z = group["household_weight"] * group["value"]
+        n, population = len(z), (full["state_fips"] == state).sum()
+        variance += (1 - n / population) * n * z.var(ddof=1)
+    assert design.total_standard_error(household, "value") == pytest.approx(
+        np.sqrt(variance)
+    )
+
+
+def test_dataset_method_returns_in_memory_sample_with_design(us_test_dataset):
+    sample = us_test_dataset.stratified_sample(n_households=2, min_per_stratum=1)
+
+    assert isinstance(sample, PolicyEngineUSDataset)
+    assert sample.filepath is None
+    assert len(sample.data.household) == 2
+    assert sample.sampling_design.sampled_households.tolist() == [2]
+    sampled_weights = pd.DataFrame(sample.data.household)["household_weight"]
+    assert sampled_weights.sum() == pytest.approx(
+        pd.DataFrame(us_test_dataset.data.household)["household_weight"].sum()
+    )
+
+    with pytest.raises(ValueError, match="exactly one"):
+        us_test_dataset.stratified_sample()
+    with pytest.raises(ValueError, match="Stratum variable 'region'"):
+        us_test_dataset.stratified_sample(fraction=0.5, strata=["region"])
@@ -138,6 +138,60 @@ class TestWeightReplacementStrategy:
         assert len(person_df) == 6
         mock_download.assert_not_called()
 
+    @patch("policyengine_core.tools.google_cloud.download_gcs_file")
+    def test__given_repeated_weight_replacement__then_reads_row_once(
+        self, mock_download, uk_test_entity_data, tmp_path, monkeypatch
+    ):
+        import h5py
+
+        monkeypatch.setenv("POLICYENGINE_UK_GEOGRAPHY_DATA_DIR", str(tmp_path))
+        pd.DataFrame({"code": ["R001", "R002"], "name": ["A", "B"]}).to_csv(
+            tmp_path / "lookup.csv", index=False
+        )
+        with h5py.File(tmp_path / "weights.h5", "w") as f:
+            f.create_dataset(
+                "2024", data=np.array([[1.0, 2.0, 3.0], [500.0, 300.0, 200.0]])
+            )
+        strategy = WeightReplacementStrategy(
+            weight_matrix_bucket="test-bucket",
+            weight_matrix_key="weights.h5",
+            lookup_csv_bucket="test-bucket",
+            lookup_csv_key="lookup.csv",
+            region_code="R002",
+        )
+
+        with patch("h5py.File", wraps=h5py.File) as mock_file:
+            for _ in range(3):
+                result = strategy.apply(
+                    entity_data=uk_test_entity_data,
+                    group_entities=["benunit", "household"],
+                    year=2024,
+                )
+        assert mock_file.call_count == 1
+
+        # Sub-entity weights follow their household's replaced weight.
+        np.testing.assert_array_almost_equal(
+            pd.DataFrame(result["person"])["person_weight"].values,
+            [500.0, 500.0, 300.0, 300.0, 200.0, 200.0],
+        )
+
+        # Rewriting the matrix invalidates the cached row.
+        with h5py.File(tmp_path / "weights.h5", "w") as f:
+            f.create_dataset(
+                "2024",
+                data=np.array([[1.0, 2.0, 3.0], [7.0, 8.0, 9.0], [0.0, 0.0, 0.0]]),
+            )
+        result = strategy.apply(
+            entity_data=uk_test_entity_data,
+            group_entities=["benunit", "household"],
+            year=2024,
+        )
+        np.testing.assert_array_almost_equal(
+            pd.DataFrame(result["household"])["household_weight"].values,
+            [7.0, 8.0, 9.0],
+        )
+        mock_download.assert_not_called()
+
     @patch("policyengine_core.tools.google_cloud.download_gcs_file")
     def test__given_weight_replacement__then_raises_on_dimension_mismatch(
         self, mock_download, uk_test_entity_data, tmp_path, monkeypatch
@@ -0,0 +1,287 @@
+"""Tests for the warm simulation worker behind ``policyengine serve``."""
+
+import http.client
+import json
+import socket
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from policyengine.benchmarks import fixture_dataset
+from policyengine.core import Simulation
+from policyengine.server import (
+    HouseholdBatcher,
+    RequestCoalescer,
+    SimulationWorker,
+    make_server,
+)
+
+
+def test_identical_in_flight_requests_share_one_computation():
+    coalescer = RequestCoalescer()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=10)
+        return "result"
+
+    outcomes = []
+    first = threading.Thread(
+        target=lambda: outcomes.append(coalescer.run("k", compute))
+    )
+    first.start()
+    started.wait(timeout=10)
+    second = threading.Thread(
+        target=lambda: outcomes.append(coalescer.run("k", compute))
+    )
+    second.start()
+    # The second caller waits on the first one's computation.
+    second.join(timeout=0.5)
+    assert second.is_alive()
+    release.set()
+    first.join()
+    second.join()
+
+    assert calls == [1]
+    assert sorted(outcomes) == [("result", False), ("result", True)]
+    # Finished keys are forgotten: the next request computes again.
+    assert coalescer.run("k", lambda: "again") == ("again", False)
+
+
+def test_households_arriving_together_are_batched_by_shared_options():
+    batches = []
+
+    def calculate_batch(country_id, options, households):
+        batches.append((country_id, options, households))
+        if any(household.get("invalid") for household in households):
+            raise ValueError("invalid household")
+        return [household["people"][0]["age"] for household in households]
+
+    batcher = HouseholdBatcher(calculate_batch, window=0.2)
+    futures = [
+        batcher.submit("us", {"people": [{"age": 30}], "year": 2026}),
+        batcher.submit("us", {"people": [{"age": 40}], "year": 2026}),
+        batcher.submit("us", {"people": [{"age": 50}], "year": 2027}),
+    ]
+    assert [future.result(timeout=10) for future in futures] == [30, 40, 50]
+    assert batches == [
+        ("us", {"year": 2026}, [{"people": [{"age": 30}]}, {"people": [{"age": 40}]}]),
+        ("us", {"year": 2027}, [{"people": [{"age": 50}]}]),
+    ]
+
+    # A failing batch is retried one household at a time.
+    good = batcher.submit("us", {"people": [{"age": 60}]})
+    bad = batcher.submit("us", {"people": [{"age": 70}], "invalid": True})
+    assert good.result(timeout=10) == 60
+    with pytest.raises(ValueError, match="invalid household"):
+        bad.result(timeout=10)
+
+
+def test_batcher_fails_stranded_requests_and_keeps_running():
+    state = {"short": True, "fail_on_batch": False}
+
+    def calculate_batch(country_id, options, households):
+        if state["short"]:
+            return []
+        return [household["people"][0]["age"] for household in households]
+
+    def on_batch(size):
+        if state["fail_on_batch"]:
+            raise RuntimeError("metrics failure")
+
+    batcher = HouseholdBatcher(calculate_batch, window=0.01, on_batch=on_batch)
+    with pytest.raises(RuntimeError, match="0 results for 1 households"):
+        batcher.submit("us", {"people": [{"age": 30}]}).result(timeout=10)
+
+    # An error outside calculate_batch fails the batch, not the thread.
+    state.update(short=False, fail_on_batch=True)
+    with pytest.raises(RuntimeError, match="metrics failure"):
+        batcher.submit("us", {"people": [{"age": 30}]}).result(timeout=10)
+    state["fail_on_batch"] = False
+    assert batcher.submit("us", {"people": [{"age": 40}]}).result(timeout=10) == 40
+
+
+def test_worker_caches_are_bounded_and_model_errors_are_not_bad_requests(
+    monkeypatch,
+):
+    worker = SimulationWorker(max_datasets=2, max_baselines=2)
+    loads = []
+
+    def ensure_datasets(datasets, years, data_folder):
+        loads.append((datasets, years))
+        if datasets == ["broken"]:
+            raise ValueError("model failure")
+        return {"loaded": object()}
+
+    module = SimpleNamespace(ensure_datasets=ensure_datasets)
+    monkeypatch.setattr(worker, "country", lambda country_id: module)
+    for year in (2026, 2027, 2028, 2026):
+        worker.dataset("us", year, "populace")
+    assert len(worker._datasets) == 2
+    # 2026 was dropped to make room for 2028, so it was loaded again.
+    assert [years for _, years in loads] == [[2026], [2027], [2028], [2026]]
+
+    status, payload = worker.handle(
+        "POST", "/simulation", {"year": 2026, "dataset": "broken"}
+    )
+    assert status == 500
+    assert payload == {"error": "model failure"}
+    status, payload = worker.handle("POST", "/simulation", {"year": None})
+    assert status == 400
+    assert "year" in payload["error"]
+
+
+def test_economic_impact_runs_each_simulation_once(monkeypatch, tmp_path):
+    worker = SimulationWorker(data_folder=tmp_path)
+    dataset = fixture_dataset("uk", 150, filepath=tmp_path / "fixture.h5")
+    monkeypatch.setattr(worker, "dataset", lambda *args: dataset)
+    runs = []
+    run = Simulation.run
+
+    def counting_run(simulation):
+        runs.append(simulation.policy is None)
+        return run(simulation)
+
+    monkeypatch.setattr(Simulation, "run", counting_run)
+    written = set(tmp_path.iterdir())
+
+    for allowance in (15_000, 16_000):
+        status, payload = worker.handle(
+            "POST",
+            "/economic-impact",
+            {
+                "country": "uk",
+                "year": 2026,
+                "reform": {
+                    "gov.hmrc.income_tax.allowances.personal_allowance.amount": (
+                        allowance
+                    )
+                },
+            },
+        )
+        assert status == 200, payload
+        assert payload["decile_impacts"]
+
+    # One baseline, shared by both requests, and one run per reform.
+    assert runs == [True, False, False]
+    assert set(tmp_path.iterdir()) == written
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    worker = SimulationWorker(batch_window=0.05)
+    batch_sizes = []
+
+    def calculate_batch(country_id, options, households):
+        batch_sizes.append(len(households))
+        return [_FakeResult(household) for household in households]
+
+    monkeypatch.setattr(worker, "_calculate_batch", calculate_batch)
+    monkeypatch.setattr(worker.batcher, "calculate_batch", calculate_batch)
+    module = SimpleNamespace(calculate_household=_calculate_household)
+    monkeypatch.setattr(worker, "country", lambda country_id: module)
+    worker.batch_sizes = batch_sizes
+    return worker
+
+
+def _calculate_household(*, people, year=None, reform=None, **unexpected):
+    raise AssertionError("household requests are calculated in batches")
+
+
+class _FakeResult:
+    def __init__(self, household):
+        self.household = household
+
+    def to_dict(self):
+        return {"people": self.household["people"]}
+
+
+def _request(port, method, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    connection.request(method, path, body=None if body is None else json.dumps(body))
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    connection.close()
+    return response.status, payload
+
+
+def test_http_server_serves_households_health_and_metrics(worker):
+    server = make_server(worker, port=0)
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        results = []
+        requests = [
+            {"people": [{"age": 30}]},
+            {"people": [{"age": 40}]},
+            {"people": [{"age": 40}]},
+        ]
+        threads = [
+            threading.Thread(
+                target=lambda body=body: results.append(
+                    _request(port, "POST", "/household", body)
+                )
+            )
+            for body in requests
+        ]
+        for request_thread in threads:
+            request_thread.start()
+        for request_thread in threads:
+            request_thread.join()
+
+        assert sorted(status for status, _ in results) == [200, 200, 200]
+        assert sorted(
+            payload["result"]["people"][0]["age"] for _, payload in results
+        ) == [30, 40, 40]
+        assert sum(worker.batch_sizes) <= 3
+
+        assert _request(port, "GET", "/health") == (
+            200,
+            {"status": "ok", "countries": [], "datasets": 0, "baselines": 0},
+        )
+        status, metrics = _request(port, "GET", "/metrics")
+        assert status == 200
+        counters = metrics["counters"]
+        assert counters["requests.household"] == 3
+        # Identical requests either shared a computation or a batch.
+        assert (
+            counters.get("coalesced", 0) + counters["household_batched_requests"] == 3
+        )
+
+        assert _request(port, "GET", "/nowhere")[0] == 404
+        status, payload = _request(port, "POST", "/economic-impact", {"year": 2026})
+        assert status == 400
+        assert "reform" in payload["error"]
+        for body, field in (({"people": [], "peeple": []}, "peeple"), ({}, "people")):
+            status, payload = _request(port, "POST", "/household", body)
+            assert status == 400
+            assert field in payload["error"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unix_socket_server_answers_health(worker, tmp_path):
+    socket_path = tmp_path / "worker.sock"
+    server = make_server(worker, socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            client.sendall(b"GET /health HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+        head, body = response.split(b"\r\n\r\n", 1)
+        assert head.startswith(b"HTTP/1.1 200")
+        assert json.loads(body)["status"] == "ok"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -11,6 +11,8 @@ third party runs instead of trusting us.
 from __future__ import annotations
 
 import hashlib
+import os
+import threading
 from pathlib import Path
 
 import pytest
@@ -180,6 +182,48 @@ class TestVerifyTraceTRO:
             assert report.artifacts[0].status == "unfetchable", location
             assert not report.ok
 
+    def test__given_cached_digest__then_rehash_only_when_strict(self, tmp_path):
+        tro = _tro_for(
+            {"results": _file_artifact(tmp_path, "results.json", b"results")}
+        )
+        assert verify_trace_tro(tro, base_dir=tmp_path).ok
+        # Tamper without changing size, mtime or inode: only a strict
+        # verification rereads the bytes.
+        path = tmp_path / "results.json"
+        stat = path.stat()
+        with path.open("r+b") as handle:
+            handle.write(b"RESULTS")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert verify_trace_tro(tro, base_dir=tmp_path).ok
+        report = verify_trace_tro(tro, base_dir=tmp_path, strict=True)
+        assert report.artifacts[0].status == "mismatch"
+
+    def test__given_chunked_fetch__then_streamed_and_checked_concurrently(
+        self, tmp_path
+    ):
+        payloads = {f"part{i}": bytes([i]) * 1000 for i in range(6)}
+        tro = _tro_for(
+            {
+                name: (
+                    hashlib.sha256(payload).hexdigest(),
+                    f"https://example.org/{name}",
+                )
+                for name, payload in payloads.items()
+            }
+        )
+        barrier = threading.Barrier(3, timeout=10)
+
+        def fetch(url: str):
+            # Three fetches must be in flight at once to pass the barrier.
+            barrier.wait()
+            payload = payloads[url.rsplit("/", 1)[1]]
+            for start in range(0, len(payload), 100):
+                yield payload[start : start + 100]
+
+        report = verify_trace_tro(tro, base_dir=tmp_path, fetch=fetch, max_workers=3)
+        assert report.ok
+        assert [check.artifact_id for check in report.artifacts] == list(payloads)
+
 
 class TestVerifyCLI:
     def test__given_valid_record__then_exit_zero_and_reports_ok(self, tmp_path, capsys):
@@ -222,6 +266,18 @@ class TestVerifyCLI:
         assert exit_code == 0
         assert "skipped: dataset" in captured.out
 
+    def test__given_jobs_flag__then_verification_still_passes(self, tmp_path, capsys):
+        tro = _tro_for(
+            {
+                "results": _file_artifact(tmp_path, "results.json", b"results"),
+                "reform": _file_artifact(tmp_path, "reform.json", b"reform"),
+            }
+        )
+        tro_path = tmp_path / "run.trace.tro.jsonld"
+        tro_path.write_bytes(canonical_json_bytes(tro))
+        assert main(["trace-tro-verify", str(tro_path), "--jobs", "2"]) == 0
+        assert "ok: reform" in capsys.readouterr().out
+
 
 @pytest.fixture(autouse=True)
 def _no_ci_env(monkeypatch):
@@ -0,0 +1,169 @@
+"""Tests for the pluggable tracing hooks."""
+
+import pytest
+
+import policyengine as pe
+from policyengine import tracing
+from policyengine.benchmarks import fixture_dataset
+from policyengine.core import Simulation
+from policyengine.outputs import Aggregate, AggregateType
+
+
+def test_default_tracer_records_nothing():
+    assert type(tracing.get_tracer()) is tracing.Tracer
+    with tracing.span("anything", attribute=1) as span:
+        assert not span.is_recording()
+        span.set_attributes({"ignored": True})
+    tracing.count("anything", 5)
+
+
+def test_recording_tracer_nests_spans_and_sums_counters():
+    @tracing.traced("outer", lambda value: {"value": value})
+    def outer(value):
+        with tracing.span("inner", skipped=None) as span:
+            span.set_attribute("seen", True)
+            tracing.count("calls", 2)
+        return value * 2
+
+    with tracing.use_tracer(tracing.RecordingTracer()) as recorder:
+        assert outer(3) == 6
+        with pytest.raises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("bad")
+    assert type(tracing.get_tracer()) is tracing.Tracer
+
+    inner, parent, failing = recorder.spans
+    assert (inner.name, inner.attributes) == ("inner", {"seen": True})
+    assert inner.parent is parent
+    assert (parent.name, parent.attributes, parent.parent) == (
+        "outer",
+        {"value": 3},
+        None,
+    )
+    assert failing.error == "ValueError: bad"
+    assert recorder.counters == {"calls": 2}
+    assert list(recorder.durations()) == sorted(
+        recorder.durations(), key=recorder.durations().get, reverse=True
+    )
+
+
+class _OtelSpan:
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes)
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        self.attributes.update(attributes)
+
+    def is_recording(self):
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+class _OtelTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_as_current_span(self, name, attributes=None):
+        span = _OtelSpan(name, attributes or {})
+        self.spans.append(span)
+        return span
+
+
+class _OtelMeter:
+    def __init__(self):
+        self.created = []
+        self.added = []
+
+    def create_counter(self, name):
+        self.created.append(name)
+        meter = self
+
+        class _Counter:
+            def add(self, amount, attributes=None):
+                meter.added.append((name, amount, attributes))
+
+        return _Counter()
+
+
+def test_opentelemetry_tracer_forwards_spans_and_counters():
+    otel_tracer, otel_meter = _OtelTracer(), _OtelMeter()
+    with tracing.use_tracer(tracing.OpenTelemetryTracer(otel_tracer, otel_meter)):
+        with tracing.span("policyengine.variable.calculate", variable="x") as span:
+            tracing.record_array(span, [1.0, 2.0], entity="person")
+
+    assert otel_tracer.spans[0].attributes == {
+        "variable": "x",
+        "entity": "person",
+        "rows": 2,
+        "bytes": 0,
+    }
+    assert otel_meter.created == [
+        "policyengine.variable.calculations",
+        "policyengine.variable.rows",
+        "policyengine.variable.bytes",
+    ]
+    assert otel_meter.added[1] == (
+        "policyengine.variable.rows",
+        2,
+        {"entity": "person"},
+    )
+
+
+def test_simulation_phases_outputs_and_households_are_traced(tmp_path):
+    dataset = fixture_dataset("uk", 10, filepath=tmp_path / "fixture.h5")
+    with tracing.use_tracer(tracing.RecordingTracer()) as recorder:
+        simulation = Simulation(
+            dataset=dataset,
+            tax_benefit_model_version=pe.uk.model,
+            policy={"gov.hmrc.income_tax.allowances.personal_allowance.amount": 15_000},
+        )
+        simulation.ensure()
+        Aggregate(
+            simulation=simulation,
+            variable="household_net_income",
+            aggregate_type=AggregateType.SUM,
+        ).run()
+        pe.uk.calculate_household(people=[{"age": 30}], year=2026)
+
+    names = {span.name for span in recorder.spans}
+    assert {
+        "policyengine.reform.compile",
+        "policyengine.simulation.ensure",
+        "policyengine.simulation.run",
+        "policyengine.population.build",
+        "policyengine.reform.apply",
+        "policyengine.variable.calculate",
+        "policyengine.output.assemble",
+        "policyengine.simulation.save",
+        "policyengine.dataset.save",
+        "policyengine.output.run",
+        "policyengine.household.calculate",
+        "policyengine.household.build",
+    } <= names
+
+    (ensure,) = recorder.named("policyengine.simulation.ensure")
+    assert ensure.attributes["source"] == "run"
+    calculation = next(
+        span
+        for span in recorder.named("policyengine.variable.calculate")
+        if span.attributes["variable"] == "household_net_income"
+    )
+    assert calculation.attributes["rows"] == 10
+    assert calculation.attributes["bytes"] > 0
+    assert calculation.parent.name == "policyengine.simulation.run"
+    assert calculation.parent.parent is ensure
+    assert recorder.named("policyengine.output.run")[0].attributes == {
+        "output": "Aggregate"
+    }
+    assert recorder.counters["policyengine.variable.calculations"] == len(
+        recorder.named("policyengine.variable.calculate")
+    )
@@ -70,15 +70,18 @@ def test_uk_economic_impact_analysis_includes_wealth_decile_outputs(monkeypatch)
     def fake_poverty_rates(_simulation):
         return _empty_collection()
 
-    def fake_inequality(simulation):
-        return Inequality.model_construct(
-            simulation=simulation,
-            income_variable="equiv_hbai_household_net_income",
-            gini=0.0,
-            top_10_share=0.0,
-            top_1_share=0.0,
-            bottom_50_share=0.0,
-        )
+    def fake_inequality(simulations):
+        return [
+            Inequality.model_construct(
+                simulation=simulation,
+                income_variable="equiv_hbai_household_net_income",
+                gini=0.0,
+                top_10_share=0.0,
+                top_1_share=0.0,
+                bottom_50_share=0.0,
+            )
+            for simulation in simulations
+        ]
 
     monkeypatch.setattr(
         uk_analysis, "calculate_decile_impacts", fake_calculate_decile_impacts
@@ -95,7 +98,7 @@ def test_uk_economic_impact_analysis_includes_wealth_decile_outputs(monkeypatch)
         program_statistics_module, "ProgramStatistics", fake_program_statistics
     )
     monkeypatch.setattr(uk_analysis, "calculate_uk_poverty_rates", fake_poverty_rates)
-    monkeypatch.setattr(uk_analysis, "calculate_uk_inequality", fake_inequality)
+    monkeypatch.setattr(uk_analysis, "calculate_uk_inequality_batch", fake_inequality)
     monkeypatch.setattr(
         uk_analysis,
         "configure_labor_supply_response_variables",
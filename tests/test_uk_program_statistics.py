@@ -191,11 +191,14 @@ def test_uk_economic_impact_analysis_returns_configured_program_statistics(
     )
     monkeypatch.setattr(
         uk_analysis,
-        "calculate_uk_inequality",
-        lambda simulation: Inequality(
-            simulation=simulation,
-            income_variable="household_net_income",
-        ),
+        "calculate_uk_inequality_batch",
+        lambda simulations: [
+            Inequality(
+                simulation=simulation,
+                income_variable="household_net_income",
+            )
+            for simulation in simulations
+        ],
     )
     monkeypatch.setattr(
         uk_analysis,
@@ -1,9 +1,11 @@
 import hashlib
 import json
+import threading
 from pathlib import Path
 from types import SimpleNamespace
 
 import h5py
+import numpy as np
 import pandas as pd
 import pytest
 from microdf import MicroDataFrame
@@ -200,6 +202,34 @@ def test__load_long_term_datasets__loads_policyengine_core_h5(tmp_path):
     assert dataset.data.household["state_code"].tolist() == ["CA"]
 
 
+def test__load_policyengine_core_h5__reads_allow_listed_columns_and_decodes_strings(
+    tmp_path,
+):
+    h5_path = tmp_path / "2100.h5"
+    _write_core_h5(h5_path, 2100)
+    with h5py.File(h5_path, "a") as h5_file:
+        h5_file.create_group("county_str").create_dataset(
+            "2100", data=np.array([b"LOS_ANGELES"])
+        )
+        h5_file.create_group("unused_person_column").create_dataset("2100", data=[1, 2])
+
+    full = PolicyEngineUSDataset(
+        name="core", description="core", filepath=str(h5_path), year=2100
+    )
+    assert full.data.household["county_str"].tolist() == ["LOS_ANGELES"]
+    assert full.data.household["state_code"].tolist() == ["CA"]
+    assert "unused_person_column" in full.data.person.columns
+
+    partial = PolicyEngineUSDataset(name="core", description="core", year=2100)
+    partial.filepath = str(h5_path)
+    partial.load(columns=["age"])
+    assert partial.data.person["age"].tolist() == [70, 68]
+    assert "unused_person_column" not in partial.data.person.columns
+    assert "state_code" not in partial.data.household.columns
+    assert partial.data.person["person_weight"].tolist() == [1_000.0, 1_000.0]
+    assert partial.data.marital_unit["marital_unit_weight"].tolist() == [1_000.0]
+
+
 def test__load_long_term_datasets__rejects_metadata_contract_mismatch(tmp_path):
     h5_path = tmp_path / "2075.h5"
     _write_us_h5(h5_path, 2075)
@@ -538,3 +568,42 @@ def test__load_long_term_datasets__can_require_runtime_policyengine_us_hash_matc
             data_folder=str(tmp_path),
             require_runtime_policyengine_us_match=True,
         )
+
+
+def test__load_long_term_datasets__loads_years_concurrently_in_order(
+    monkeypatch,
+    tmp_path,
+):
+    years = [2075, 2076, 2077, 2078]
+    for year in years:
+        h5_path = tmp_path / f"{year}.h5"
+        _write_us_h5(h5_path, year)
+        _write_metadata(h5_path, year)
+    runtime_checks = []
+    barrier = threading.Barrier(len(years), timeout=10)
+
+    def runtime_metadata():
+        # Every year's check must be in flight at once to pass the barrier.
+        runtime_checks.append(threading.get_ident())
+        barrier.wait()
+        return {
+            "version": "1.691.10",
+            "direct_url": {
+                "vcs_info": {"commit_id": "4fd79e6608bc2dac3a7fde0be37191cb4870bd85"}
+            },
+        }
+
+    monkeypatch.setattr(
+        us_datasets_module, "_runtime_policyengine_us_metadata", runtime_metadata
+    )
+
+    datasets = load_long_term_datasets(
+        years,
+        data_folder=str(tmp_path),
+        require_runtime_policyengine_us_match=True,
+        max_workers=len(years),
+    )
+
+    assert list(datasets) == [f"long_term_cps_{year}" for year in years]
+    assert [dataset.year for dataset in datasets.values()] == years
+    assert len(set(runtime_checks)) == len(years)